@@ -9,6 +9,8 @@ Features:
 - Entity extraction (breeds, diseases, medications)
 - Direct ingestion to InteliaKnowledge collection
 - Progress tracking
+- Parallel stages: process pool extraction, rate-limited enrichment,
+  single batched Weaviate writer (see parallel_ingestion.py)
 """
 
 import sys
@@ -24,7 +26,9 @@ from weaviate.classes.data import DataObject
 load_dotenv(Path(__file__).parent.parent / ".env")
 
 # Import pipeline
-from multi_format_pipeline import MultiFormatPipeline
+from multi_format_pipeline import MultiFormatPipeline, PipelineResult
+from parallel_ingestion import ParallelIngestionPipeline, ParallelIngestionConfig
+from weaviate_integration.chunk_identity import assign_chunk_uuids
 
 # Weaviate connection
 WEAVIATE_URL = os.getenv("WEAVIATE_URL")
@@ -74,10 +78,11 @@ def ingest_chunks_to_weaviate(client, chunks_with_metadata: List[Dict[str, Any]]
         # Batch insert
         ingested_count = 0
         with collection.batch.dynamic() as batch:
-            for chunk_data in chunks_with_metadata:
+            for object_id, chunk_data in assign_chunk_uuids(chunks_with_metadata).items():
                 try:
                     # Weaviate will automatically vectorize the content field
-                    batch.add_object(properties=chunk_data)
+                    # Deterministic ID: re-running the script overwrites instead of duplicating
+                    batch.add_object(properties=chunk_data, uuid=object_id)
                     ingested_count += 1
                 except Exception as e:
                     print(f"    Warning: Failed to add chunk {chunk_data.get('chunk_index', '?')}: {e}")
@@ -127,55 +132,44 @@ def main():
 
     # Statistics
     total_files = len(pdf_files)
-    success_count = 0
-    error_count = 0
-    total_chunks_created = 0
-    total_chunks_ingested = 0
+    counters = {"done": 0, "success": 0, "error": 0, "chunks_created": 0, "chunks_ingested": 0}
     start_time = datetime.now()
 
-    # Process each PDF
-    for i, pdf_path in enumerate(pdf_files, 1):
-        pdf_name = pdf_path.name
-        relative_path = pdf_path.relative_to(base_path)
-
-        print(f"\n[{i}/{total_files}] {pdf_name}")
+    def on_document_done(result: PipelineResult):
+        counters["done"] += 1
+        print(f"\n[{counters['done']}/{total_files}] {Path(result.file_path).name}")
         print("-" * 80)
 
-        try:
-            # Step 1: Extract with pipeline (includes quality scoring + entities)
-            result = pipeline.process_file(str(pdf_path))
-
-            if not result.success:
-                print(f"  ERROR: Extraction failed - {result.error}")
-                error_count += 1
-                continue
-
-            print(f"  Extraction: SUCCESS ({result.chunks_created} chunks created)")
-            total_chunks_created += result.chunks_created
-
-            # Step 2: Ingest to Weaviate
-            if result.chunks_with_metadata:
-                print(f"  Ingesting {len(result.chunks_with_metadata)} chunks to Weaviate...")
-
-                ingested = ingest_chunks_to_weaviate(
-                    weaviate_client,
-                    result.chunks_with_metadata
-                )
-
-                if ingested > 0:
-                    print(f"  Ingestion: SUCCESS ({ingested} chunks ingested)")
-                    total_chunks_ingested += ingested
-                    success_count += 1
-                else:
-                    print(f"  Ingestion: FAILED (0 chunks ingested)")
-                    error_count += 1
-            else:
-                print(f"  Ingestion: SKIP (no chunks to ingest)")
-                error_count += 1
-
-        except Exception as e:
-            print(f"  EXCEPTION: {str(e)[:200]}")
-            error_count += 1
+        if not result.success:
+            print(f"  ERROR: {result.error}")
+            counters["error"] += 1
+            return
+
+        print(f"  Extraction: SUCCESS ({result.chunks_created} chunks created)")
+        counters["chunks_created"] += result.chunks_created
+
+        if result.chunks_ingested > 0:
+            print(f"  Ingestion: SUCCESS ({result.chunks_ingested} chunks ingested)")
+            counters["chunks_ingested"] += result.chunks_ingested
+            counters["success"] += 1
+        else:
+            print(f"  Ingestion: FAILED (0 chunks ingested)")
+            counters["error"] += 1
+
+    # Process all PDFs: extraction in a process pool, enrichment rate limited,
+    # chunks written in batches by a single writer
+    parallel_pipeline = ParallelIngestionPipeline(
+        pipeline=pipeline,
+        write_chunks=lambda chunks: ingest_chunks_to_weaviate(weaviate_client, chunks),
+        on_document_done=on_document_done,
+        config=ParallelIngestionConfig(requests_per_minute=50)
+    )
+    parallel_pipeline.run([str(p) for p in pdf_files])
+
+    success_count = counters["success"]
+    error_count = counters["error"]
+    total_chunks_created = counters["chunks_created"]
+    total_chunks_ingested = counters["chunks_ingested"]
 
     # Final summary
     end_time = datetime.now()
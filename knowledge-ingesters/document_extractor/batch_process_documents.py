@@ -4,15 +4,19 @@ Processes all documents in a directory, skipping already-processed files
 """
 
 import sys
-import time
 import logging
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from datetime import datetime
 
-from multi_format_pipeline import MultiFormatPipeline
+from multi_format_pipeline import MultiFormatPipeline, PipelineResult
+from parallel_ingestion import ParallelIngestionPipeline, ParallelIngestionConfig
 from weaviate_integration.ingester_v2 import WeaviateIngesterV2
 from weaviate_integration.deduplication_tracker import DeduplicationTracker
+from weaviate_integration.chunk_identity import assign_chunk_uuids
+from weaviate_integration.batch_embedder import BatchEmbedder
+from weaviate_integration.near_duplicates import NearDuplicateIndex, DEFAULT_THRESHOLD
+from weaviate_integration.chunk_store import LocalChunkStore
 
 
 class BatchDocumentProcessor:
@@ -22,16 +26,28 @@ class BatchDocumentProcessor:
     Features:
     - Processes PDF, DOCX, and web pages
     - Automatic deduplication (skips already-processed files)
+    - Incremental re-ingestion of changed files (only changed chunks are
+      inserted/deleted, unchanged chunks keep their vectors)
     - Progress tracking with statistics
     - Error handling and recovery
     - Weaviate ingestion integration
+    - Client-side batched embeddings cached in a local vector store
+    - Near-duplicate chunk elimination (MinHash/LSH) across the corpus and
+      the existing collection, with a JSON report
+    - Parallel staged pipeline (process pool extraction, rate-limited
+      enrichment, batched Weaviate writes)
+    - Local chunk store mirrored for the RAG service (IDs-only searches)
     """
 
     def __init__(
         self,
         base_directory: str,
         collection_name: str = "InteliaKnowledgeBase",
-        max_pages_per_pdf: int = None
+        max_pages_per_pdf: int = None,
+        vector_store_directory: Optional[str] = "vector_store",
+        near_duplicate_threshold: Optional[float] = DEFAULT_THRESHOLD,
+        near_duplicate_report: Optional[str] = "near_duplicates_report.json",
+        chunk_store_directory: Optional[str] = "chunk_store"
     ):
         """
         Initialize batch processor.
@@ -40,13 +56,34 @@ class BatchDocumentProcessor:
             base_directory: Root directory containing documents
             collection_name: Weaviate collection name
             max_pages_per_pdf: Optional limit on PDF pages
+            vector_store_directory: Local embedding cache for client-side
+                vectors (None = let Weaviate vectorize every object)
+            near_duplicate_threshold: Jaccard similarity above which a chunk is
+                dropped as a near-duplicate (None = keep all chunks)
+            near_duplicate_report: JSON report written after processing
+            chunk_store_directory: Local chunk store mirrored for the RAG
+                service (None = no local copy of ingested chunks)
         """
         self.base_directory = Path(base_directory)
         self.logger = logging.getLogger(__name__)
 
         # Initialize components
         self.pipeline = MultiFormatPipeline()
-        self.ingester = WeaviateIngesterV2(collection_name=collection_name)
+        embedder = BatchEmbedder(store_directory=vector_store_directory) if vector_store_directory else None
+        near_duplicates = (
+            NearDuplicateIndex(threshold=near_duplicate_threshold)
+            if near_duplicate_threshold is not None else None
+        )
+        self.ingester = WeaviateIngesterV2(
+            collection_name=collection_name,
+            embedder=embedder,
+            near_duplicates=near_duplicates,
+            chunk_store=(
+                LocalChunkStore(chunk_store_directory, collection_name)
+                if chunk_store_directory else None
+            )
+        )
+        self.near_duplicate_report = near_duplicate_report
         self.tracker = DeduplicationTracker()
 
         self.max_pages_per_pdf = max_pages_per_pdf
@@ -58,7 +95,11 @@ class BatchDocumentProcessor:
             "processed": 0,
             "failed": 0,
             "skipped": 0,
-            "total_chunks": 0
+            "total_chunks": 0,
+            "chunks_inserted": 0,
+            "chunks_unchanged": 0,
+            "chunks_deleted": 0,
+            "chunks_near_duplicate": 0
         }
 
     def find_documents(self, extensions: List[str] = None) -> List[Path]:
@@ -85,26 +126,40 @@ class BatchDocumentProcessor:
         self,
         extensions: List[str] = None,
         force_reprocess: bool = False,
-        delay_seconds: int = 2
+        delay_seconds: Optional[float] = None,
+        max_workers: Optional[int] = None,
+        requests_per_minute: float = 50.0,
+        enrichment_concurrency: int = 4
     ) -> Dict[str, Any]:
         """
         Process all documents in base directory.
 
+        Documents flow through ParallelIngestionPipeline: extraction and
+        chunking run in a process pool, LLM enrichment is rate limited by a
+        token bucket, and a single writer batches chunks into Weaviate.
+
         Args:
             extensions: File extensions to process
             force_reprocess: If True, reprocess even if already done
-            delay_seconds: Delay between documents (for API rate limiting)
+            delay_seconds: Deprecated - converted to requests_per_minute
+                (one enrichment call per delay_seconds)
+            max_workers: Extraction processes (default: CPU count)
+            requests_per_minute: Enrichment API rate limit
+            enrichment_concurrency: Concurrent enrichment calls
 
         Returns:
             Processing statistics
         """
+        if delay_seconds:
+            requests_per_minute = 60.0 / delay_seconds
+
         print("\n" + "="*80)
         print("BATCH DOCUMENT PROCESSING - START")
         print("="*80)
         print(f"Base Directory: {self.base_directory}")
         print(f"Collection: {self.ingester.collection_name}")
         print(f"Force Reprocess: {force_reprocess}")
-        print(f"Delay: {delay_seconds}s between documents")
+        print(f"Enrichment rate limit: {requests_per_minute:.0f} requests/min")
 
         # Find all documents
         documents = self.find_documents(extensions)
@@ -116,45 +171,34 @@ class BatchDocumentProcessor:
             print("\nNo documents to process")
             return self.stats
 
-        # Process each document
-        start_time = datetime.now()
-
-        for i, doc_path in enumerate(documents, 1):
-            print(f"\n{'-'*80}")
-            print(f"[{i}/{len(documents)}] {doc_path.relative_to(self.base_directory)}")
-            print(f"{'-'*80}")
-
-            # Check if already processed
+        # Skip already-processed documents up front
+        to_process = []
+        for doc_path in documents:
             if not force_reprocess and self.tracker.is_processed(doc_path):
                 processed_info = self.tracker.get_processed_info(doc_path)
-                print(f"SKIPPED - Already processed")
+                print(f"SKIPPED - Already processed: {doc_path.relative_to(self.base_directory)}")
                 print(f"  Processed: {processed_info['processed_timestamp']}")
                 print(f"  Chunks: {processed_info['chunks_created']}")
                 self.stats["already_processed"] += 1
-                continue
-
-            # Process document
-            try:
-                result = self._process_single_document(doc_path)
-
-                if result["success"]:
-                    self.stats["processed"] += 1
-                    self.stats["total_chunks"] += result["chunks_created"]
-                    print(f"SUCCESS")
-                    print(f"  Chunks created: {result['chunks_created']}")
-                    print(f"  Ingested to Weaviate: {result['ingested']}")
-                else:
-                    self.stats["failed"] += 1
-                    print(f"FAILED: {result.get('error', 'Unknown error')}")
-
-            except Exception as e:
-                self.stats["failed"] += 1
-                self.logger.error(f"Error processing {doc_path}: {e}")
-                print(f"FAILED: {e}")
-
-            # Rate limiting delay
-            if i < len(documents):
-                time.sleep(delay_seconds)
+            else:
+                if self.tracker.get_previous_version(doc_path):
+                    print(f"CHANGED - Incremental re-sync: {doc_path.relative_to(self.base_directory)}")
+                to_process.append(doc_path)
+
+        # Process remaining documents through the staged pipeline
+        start_time = datetime.now()
+
+        parallel_pipeline = ParallelIngestionPipeline(
+            pipeline=self.pipeline,
+            write_chunks=self._write_chunks,
+            on_document_done=self._on_document_done,
+            config=ParallelIngestionConfig(
+                max_workers=max_workers,
+                enrichment_concurrency=enrichment_concurrency,
+                requests_per_minute=requests_per_minute
+            )
+        )
+        parallel_pipeline.run([str(p) for p in to_process], max_pages=self.max_pages_per_pdf)
 
         # Final statistics
         end_time = datetime.now()
@@ -168,12 +212,21 @@ class BatchDocumentProcessor:
         print(f"Newly Processed: {self.stats['processed']}")
         print(f"Failed: {self.stats['failed']}")
         print(f"Total Chunks Created: {self.stats['total_chunks']}")
+        print(f"  Inserted: {self.stats['chunks_inserted']}, Unchanged: {self.stats['chunks_unchanged']}, "
+              f"Deleted: {self.stats['chunks_deleted']}, "
+              f"Near-duplicates dropped: {self.stats['chunks_near_duplicate']}")
         print(f"Elapsed Time: {elapsed:.1f}s ({elapsed/60:.1f} minutes)")
 
         if self.stats['processed'] > 0:
             avg_time = elapsed / self.stats['processed']
             print(f"Average Time per Document: {avg_time:.1f}s")
 
+        if self.ingester.near_duplicates is not None and self.near_duplicate_report:
+            report = self.ingester.near_duplicates.write_report(self.near_duplicate_report)
+            print(f"Near-duplicate report: {self.near_duplicate_report} "
+                  f"({report['new_near_duplicates']} dropped, "
+                  f"{report['stored_near_duplicates']} already in collection)")
+
         # Show tracker statistics
         tracker_stats = self.tracker.get_statistics()
         print(f"\nOverall Statistics:")
@@ -183,51 +236,47 @@ class BatchDocumentProcessor:
 
         return self.stats
 
-    def _process_single_document(self, doc_path: Path) -> Dict[str, Any]:
-        """
-        Process a single document end-to-end.
-
-        Args:
-            doc_path: Path to document
-
-        Returns:
-            Processing result dictionary
-        """
-        # Step 1: Extract and chunk
-        pipeline_result = self.pipeline.process_file(
-            str(doc_path),
-            max_pages=self.max_pages_per_pdf
-        )
-
-        if not pipeline_result.success:
-            return {
-                "success": False,
-                "error": pipeline_result.error,
-                "chunks_created": 0,
-                "ingested": False
-            }
-
-        # Step 2: Ingest to Weaviate
-        ingestion_stats = self.ingester.ingest_chunks(pipeline_result.chunks_with_metadata)
+    def _write_chunks(self, chunks: List[Dict[str, Any]]) -> int:
+        """Writer stage: sync a batch of complete documents to Weaviate"""
+        ingestion_stats = self.ingester.sync_chunks(chunks)
 
         if ingestion_stats["failed"] > 0:
             self.logger.warning(
                 f"Partial ingestion failure: {ingestion_stats['failed']} chunks failed"
             )
 
-        # Step 3: Mark as processed in tracker
+        self.stats["chunks_inserted"] += ingestion_stats["success"]
+        self.stats["chunks_unchanged"] += ingestion_stats["unchanged"]
+        self.stats["chunks_deleted"] += ingestion_stats["deleted"]
+        self.stats["chunks_near_duplicate"] += ingestion_stats["near_duplicates"]
+
+        # Dropped near-duplicates are handled, not failed
+        return ingestion_stats["success"] + ingestion_stats["unchanged"] + ingestion_stats["near_duplicates"]
+
+    def _on_document_done(self, result: PipelineResult):
+        """Record a finished document (called once its chunks are written)"""
+        doc_path = Path(result.file_path)
+        print(f"\n{'-'*80}")
+        print(f"{doc_path.relative_to(self.base_directory)}")
+
+        if not result.success:
+            self.stats["failed"] += 1
+            print(f"FAILED: {result.error or 'Unknown error'}")
+            return
+
+        # Mark as processed in tracker
         self.tracker.mark_as_processed(
             file_path=doc_path,
-            chunks_created=len(pipeline_result.chunks_with_metadata),
-            metadata_summary=pipeline_result.metadata_summary
+            chunks_created=len(result.chunks_with_metadata),
+            metadata_summary=result.metadata_summary,
+            weaviate_ids=list(assign_chunk_uuids(result.chunks_with_metadata))
         )
 
-        return {
-            "success": True,
-            "chunks_created": len(pipeline_result.chunks_with_metadata),
-            "ingested": ingestion_stats["success"] > 0,
-            "ingestion_stats": ingestion_stats
-        }
+        self.stats["processed"] += 1
+        self.stats["total_chunks"] += result.chunks_created
+        print(f"SUCCESS")
+        print(f"  Chunks created: {result.chunks_created}")
+        print(f"  Ingested to Weaviate: {result.chunks_ingested > 0}")
 
 
 # CLI Interface
@@ -261,7 +310,7 @@ if __name__ == "__main__":
     stats = processor.process_all(
         extensions=['.pdf'],  # Start with PDFs only
         force_reprocess=force_reprocess,
-        delay_seconds=2  # 2 second delay between documents
+        requests_per_minute=50  # Enrichment API rate limit
     )
 
     # Exit code based on results
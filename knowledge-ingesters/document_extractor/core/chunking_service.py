@@ -18,7 +18,7 @@ Performance optimizations:
 import re
 import json
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterable, Iterator, Optional
 from dataclasses import dataclass
 from datetime import datetime
 
@@ -152,6 +152,34 @@ class ChunkingService:
 
         return enriched_chunks
 
+    def chunk_markdown_stream(
+        self,
+        blocks: Iterable[str],
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> Iterator[Chunk]:
+        """
+        Chunk markdown blocks (e.g. one "# Page N" block per PDF page) as they arrive
+
+        Produces the same chunks as chunk_text("\\n\\n".join(blocks)) for
+        markdown text, but each chunk is yielded (filtered and enriched) as
+        soon as it is complete, so chunking overlaps with extraction.
+
+        Args:
+            blocks: Markdown text blocks, each starting at a section boundary
+            metadata: Optional metadata to attach to all chunks
+
+        Yields:
+            Chunk objects
+        """
+        def sections() -> Iterator[str]:
+            for block in blocks:
+                yield from self._split_sections(self._clean_text(block))
+
+        for chunk in self._group_markdown_sections(sections(), metadata or {}):
+            for valid_chunk in self._filter_quality_chunks([chunk]):
+                self._enrich_chunk(valid_chunk)
+                yield valid_chunk
+
     def chunk_document(
         self,
         document: Dict[str, Any],
@@ -247,9 +275,18 @@ class ChunkingService:
         2. Group sections to fit chunk size
         3. Respect max_chunk_words limit
         """
-        chunks = []
-        sections = re.split(r'\n(?=#+\s)', text)
+        return list(self._group_markdown_sections(self._split_sections(text), metadata))
 
+    def _split_sections(self, text: str) -> List[str]:
+        """Split cleaned text before each markdown header"""
+        return re.split(r'\n(?=#+\s)', text)
+
+    def _group_markdown_sections(
+        self,
+        sections: Iterable[str],
+        metadata: Dict[str, Any]
+    ) -> Iterator[Chunk]:
+        """Greedily group sections into chunks, yielding each chunk as soon as it is closed"""
         current_segment = ""
         current_words = 0
         chunk_index = 0
@@ -268,13 +305,13 @@ class ChunkingService:
             else:
                 # Save current chunk
                 if current_segment and current_words >= self.config.min_chunk_words:
-                    chunks.append(Chunk(
+                    yield Chunk(
                         content=current_segment.strip(),
                         word_count=current_words,
                         chunk_index=chunk_index,
                         source_type="markdown_section",
                         metadata=metadata.copy()
-                    ))
+                    )
                     chunk_index += 1
 
                 # Start new chunk
@@ -283,15 +320,13 @@ class ChunkingService:
 
         # Final chunk
         if current_segment and current_words >= self.config.min_chunk_words:
-            chunks.append(Chunk(
+            yield Chunk(
                 content=current_segment.strip(),
                 word_count=current_words,
                 chunk_index=chunk_index,
                 source_type="markdown_section",
                 metadata=metadata.copy()
-            ))
-
-        return chunks
+            )
 
     def _chunk_by_paragraphs(
         self,
@@ -497,36 +532,42 @@ class ChunkingService:
 
         enriched = []
         for chunk in chunks:
-            # Calculate quality metrics
-            quality_metrics = self.quality_scorer.score_chunk(chunk.content)
-
-            # Extract entities
-            entities = self.entity_extractor.extract(chunk.content)
-
-            # Add to chunk metadata
-            chunk.metadata['quality_score'] = quality_metrics.overall_score
-            chunk.metadata['info_density'] = quality_metrics.info_density
-            chunk.metadata['completeness'] = quality_metrics.completeness
-            chunk.metadata['semantic_coherence'] = quality_metrics.semantic_coherence
-            chunk.metadata['structure_score'] = quality_metrics.structure_score
-
-            # Add entities
-            chunk.metadata['breeds'] = entities.breeds
-            chunk.metadata['diseases'] = entities.diseases
-            chunk.metadata['medications'] = entities.medications
-            chunk.metadata['has_performance_data'] = entities.has_performance_data
-            chunk.metadata['has_health_info'] = entities.has_health_info
-            chunk.metadata['has_nutrition_info'] = entities.has_nutrition_info
-
-            # Add metrics and age_ranges as JSON strings (for storage)
-            chunk.metadata['metrics'] = json.dumps(entities.metrics) if entities.metrics else '[]'
-            chunk.metadata['age_ranges'] = json.dumps(entities.age_ranges) if entities.age_ranges else '[]'
-
+            self._enrich_chunk(chunk)
             enriched.append(chunk)
 
         self.logger.info(f"✨ Enriched {len(enriched)} chunks with quality scores and entities")
         return enriched
 
+    def _enrich_chunk(self, chunk: Chunk):
+        """Add quality scores and extracted entities to a chunk's metadata"""
+        # Calculate quality metrics
+        quality_metrics = self.quality_scorer.score_chunk(chunk.content)
+
+        # Extract entities
+        entities = self.entity_extractor.extract(chunk.content)
+
+        # Add to chunk metadata
+        chunk.metadata['quality_score'] = quality_metrics.overall_score
+        chunk.metadata['info_density'] = quality_metrics.info_density
+        chunk.metadata['completeness'] = quality_metrics.completeness
+        chunk.metadata['semantic_coherence'] = quality_metrics.semantic_coherence
+        chunk.metadata['structure_score'] = quality_metrics.structure_score
+
+        # Add entities
+        chunk.metadata['breeds'] = entities.breeds
+        chunk.metadata['diseases'] = entities.diseases
+        chunk.metadata['medications'] = entities.medications
+        chunk.metadata['has_performance_data'] = entities.has_performance_data
+        chunk.metadata['has_health_info'] = entities.has_health_info
+        chunk.metadata['has_nutrition_info'] = entities.has_nutrition_info
+
+        # Add metrics and age_ranges as JSON strings (for storage)
+        chunk.metadata['metrics'] = json.dumps(entities.metrics) if entities.metrics else '[]'
+        chunk.metadata['age_ranges'] = json.dumps(entities.age_ranges) if entities.age_ranges else '[]'
+
+        # Precomputed boost features (read by RAG boosting, filterable in Weaviate)
+        chunk.metadata.update(self.entity_extractor.boost_features(chunk.content, entities))
+
     def get_stats(self, chunks: List[Chunk]) -> Dict[str, Any]:
         """
         Get statistics about chunks
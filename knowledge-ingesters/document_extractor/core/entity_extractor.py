@@ -13,6 +13,15 @@ Utilisation en retrieval:
 - Filtering: breed=Ross 308 AND age_range=21-35
 - Boosting: Si query contient "Ross 308", boost chunks avec breed="Ross 308"
 - Analytics: Statistiques sur couverture du corpus
+
+Boost features (boost_features): faits par chunk lus directement par le
+boosting du RAG (rag/retrieval/fusion_engine.py, FEATURE_FIELDS) au lieu de
+re-scanner le contenu à chaque requête:
+- breed_mentions: lignées normalisées ("ross 308", "hy line brown")
+- age_days_mentioned: âges en jours ("35j", "35 days", "day 35", plages)
+- metric_mentions: clés de métriques du RAG (fcr, poids, mortalité, ponte, gain)
+- has_medical_terms: termes médicaux / santé
+- is_technical_source: guide, standard, référence technique (niveau document)
 """
 
 import re
@@ -21,6 +30,36 @@ from typing import Dict, List, Set, Any, Optional
 from dataclasses import dataclass, asdict
 
 
+# Métriques de performance: clé RAG -> termes (IntelligentRRFFusion._extract_performance_metrics)
+BOOST_METRIC_TERMS = {
+    'fcr': ('fcr', 'conversion', 'feed conversion'),
+    'poids': ('poids', 'weight', 'masse'),
+    'mortalité': ('mortalité', 'mortality'),
+    'ponte': ('ponte', 'laying', 'egg production'),
+    'gain': ('gain', 'croissance', 'growth'),
+}
+
+MEDICAL_TERMS = (
+    'traitement', 'diagnostic', 'symptôme', 'maladie', 'vétérinaire',
+    'treatment', 'diagnosis', 'symptom', 'disease', 'veterinar',
+)
+
+TECHNICAL_SOURCE_TERMS = (
+    'guide', 'référence', 'reference', 'technique', 'technical', 'standard',
+    'handbook', 'manual',
+)
+
+# "35j", "35 jours", "35-day", "day 35" (pas "135j" pour un âge de 35)
+AGE_DAYS_PATTERN = re.compile(
+    r'(?<!\d)(\d{1,3})[ -]?(?:j|days?\b)|\bday (\d{1,3})\b', re.IGNORECASE
+)
+
+
+def normalize_breed(name: str) -> str:
+    """Forme normalisée d'une lignée: "Hy-Line_Brown" -> "hy line brown" """
+    return ' '.join(name.lower().replace('_', ' ').replace('-', ' ').split())
+
+
 @dataclass
 class ExtractedEntities:
     """Entités extraites d'un chunk"""
@@ -167,6 +206,52 @@ class EntityExtractor:
             has_nutrition_info=has_nutrition_info
         )
 
+    def boost_features(
+        self, content: str, entities: Optional[ExtractedEntities] = None
+    ) -> Dict[str, Any]:
+        """
+        Precompute the per-chunk boost features stored as Weaviate properties
+
+        Args:
+            content: Chunk content
+            entities: Entities already extracted from content (optional)
+
+        Returns:
+            Dict with breed_mentions, age_days_mentioned, metric_mentions,
+            has_medical_terms (is_technical_source is set per document,
+            see is_technical_source)
+        """
+        if entities is None:
+            entities = self.extract(content)
+        content_lower = (content or '').lower()
+
+        ages = {
+            int(suffixed or prefixed)
+            for suffixed, prefixed in AGE_DAYS_PATTERN.findall(content_lower)
+        }
+        for age_range in entities.age_ranges:
+            ages.update((age_range['start'], age_range['end']))
+
+        return {
+            'breed_mentions': sorted({normalize_breed(b) for b in entities.breeds if b}),
+            'age_days_mentioned': sorted(ages),
+            'metric_mentions': [
+                metric for metric, terms in BOOST_METRIC_TERMS.items()
+                if any(term in content_lower for term in terms)
+            ],
+            'has_medical_terms': entities.has_health_info
+            or any(term in content_lower for term in MEDICAL_TERMS),
+        }
+
+    @staticmethod
+    def is_technical_source(*sources: Optional[str]) -> bool:
+        """True if a document type / source name denotes a technical reference"""
+        return any(
+            term in source.lower()
+            for source in sources if source
+            for term in TECHNICAL_SOURCE_TERMS
+        )
+
     def _extract_breeds(self, content: str) -> List[str]:
         """Extract breed names"""
         breeds = set()
@@ -337,3 +422,4 @@ if __name__ == "__main__":
     print(f"  - Has Performance Data: {entities.has_performance_data}")
     print(f"  - Has Health Info: {entities.has_health_info}")
     print(f"  - Has Nutrition Info: {entities.has_nutrition_info}")
+    print(f"\nBoost Features: {extractor.boost_features(test_content, entities)}")
@@ -11,13 +11,35 @@ Winner from A/B/C test:
 - Cost: FREE (vs 0.21$/page with Claude Vision)
 
 Cost savings: ~490$ for 54 PDFs (2,335 pages)
+
+Large documents:
+- Pages are extracted in-process by default; with max_workers > 1, page
+  ranges are sharded across worker processes
+- Pages are streamed in order (iter_pages) so chunking starts before
+  extraction finishes
+- Bounded number of shards in flight, pdfplumber page caches released after
+  each page: memory does not grow with page count
+- Per-page timeout for pathological pages (POSIX only, SIGALRM)
 """
 
+import logging
+import os
+import signal
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
 import pdfplumber
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import Deque, Iterator, List, Optional, Dict, Any, Tuple
 from dataclasses import dataclass
 
+logger = logging.getLogger(__name__)
+
+
+class PageTimeoutError(Exception):
+    """A page took longer than the per-page timeout"""
+
 
 @dataclass
 class PDFPage:
@@ -27,6 +49,7 @@ class PDFPage:
     has_images: bool = False
     has_tables: bool = False
     word_count: int = 0
+    error: Optional[str] = None  # Set when the page was skipped (e.g. timeout)
 
 
 @dataclass
@@ -65,10 +88,26 @@ class PDFTextExtractor:
     - OCR not supported (use Claude Vision for scanned PDFs)
     """
 
-    def __init__(self):
-        """Initialize PDF Text Extractor"""
+    def __init__(
+        self,
+        max_workers: int = 1,
+        pages_per_shard: int = 16,
+        page_timeout: Optional[float] = 60.0
+    ):
+        """
+        Initialize PDF Text Extractor
+
+        Args:
+            max_workers: Worker processes for page extraction (default: 1,
+                in-process). Callers that already spread documents across
+                processes keep 1; single-document runs may opt in to more.
+            pages_per_shard: Pages extracted per worker task
+            page_timeout: Seconds before a page is skipped (None = no limit)
+        """
         # No API keys needed - completely free!
-        pass
+        self.max_workers = max(1, max_workers or 1)
+        self.pages_per_shard = max(1, pages_per_shard)
+        self.page_timeout = page_timeout
 
     def extract_pdf(self, pdf_path: str | Path, max_pages: Optional[int] = None) -> PDFExtractionResult:
         """
@@ -95,47 +134,22 @@ class PDFTextExtractor:
             )
 
         try:
-            # Open PDF with pdfplumber
-            with pdfplumber.open(pdf_path) as pdf:
-                total_pages = len(pdf.pages)
-
-                # Limit pages if specified
-                pages_to_process = min(total_pages, max_pages) if max_pages else total_pages
-
-                print(f"Processing {pages_to_process}/{total_pages} pages from {pdf_path.name}")
-                print(f"  Using FREE pdfplumber (no API costs!)")
-
-                # Extract metadata
-                metadata = self._extract_metadata(pdf)
-
-                # Process each page
-                pages = []
-                for page_num in range(pages_to_process):
-                    page = pdf.pages[page_num]
-
-                    if (page_num + 1) % 10 == 0 or page_num == 0:
-                        print(f"  Processing page {page_num + 1}/{pages_to_process}...")
-
-                    page_result = self._process_page(page, page_num + 1)
-                    pages.append(page_result)
-
-                # Combine all page text
-                full_text = "\n\n".join([
-                    f"# Page {p.page_number}\n\n{p.text_content}"
-                    for p in pages if p.text_content
-                ])
-
-                total_words = sum(p.word_count for p in pages)
-                print(f"OK Extraction complete: {total_words:,} words from {len(pages)} pages")
-
-                return PDFExtractionResult(
-                    file_path=str(pdf_path),
-                    total_pages=total_pages,
-                    pages=pages,
-                    full_text=full_text,
-                    metadata=metadata,
-                    success=True
-                )
+            document_info: Dict[str, Any] = {}
+            pages = list(self.iter_pages(pdf_path, max_pages=max_pages, document_info=document_info))
+            total_pages = document_info["total_pages"]
+            metadata = document_info["metadata"]
+
+            # Combine all page text
+            full_text = "\n\n".join(page_markdown(p) for p in pages if p.text_content)
+
+            return PDFExtractionResult(
+                file_path=str(pdf_path),
+                total_pages=total_pages,
+                pages=pages,
+                full_text=full_text,
+                metadata=metadata,
+                success=True
+            )
 
         except Exception as e:
             return PDFExtractionResult(
@@ -148,6 +162,101 @@ class PDFTextExtractor:
                 error=f"pdfplumber extraction failed: {str(e)}"
             )
 
+    def read_document_info(self, pdf_path: str | Path) -> Tuple[int, Dict[str, Any]]:
+        """
+        Read page count and metadata without extracting any page.
+
+        Returns:
+            (total_pages, metadata)
+        """
+        with pdfplumber.open(pdf_path) as pdf:
+            return len(pdf.pages), self._extract_metadata(pdf)
+
+    def iter_pages(
+        self,
+        pdf_path: str | Path,
+        max_pages: Optional[int] = None,
+        document_info: Optional[Dict[str, Any]] = None
+    ) -> Iterator[PDFPage]:
+        """
+        Extract pages in order, one at a time.
+
+        The PDF is opened once: page count, metadata and (in-process) page
+        extraction share the same handle. With max_workers > 1, page ranges
+        are extracted in parallel by worker processes; at most 2 shards per
+        worker are pending, so memory stays bounded whatever the page count.
+        Pages that exceed page_timeout are yielded with an empty text and
+        their error set.
+
+        Args:
+            pdf_path: Path to PDF file
+            max_pages: Maximum number of pages to process (None = all pages)
+            document_info: Optional dict filled with "total_pages" and
+                "metadata" when the PDF is opened
+
+        Yields:
+            PDFPage objects, in page order
+        """
+        pdf_path = Path(pdf_path)
+        with pdfplumber.open(pdf_path) as pdf:
+            total_pages = len(pdf.pages)
+            if document_info is not None:
+                document_info["total_pages"] = total_pages
+                document_info["metadata"] = self._extract_metadata(pdf)
+            pages_to_process = min(total_pages, max_pages) if max_pages else total_pages
+
+            shards = [
+                (start, min(start + self.pages_per_shard, pages_to_process))
+                for start in range(0, pages_to_process, self.pages_per_shard)
+            ]
+            workers = min(self.max_workers, len(shards))
+
+            print(f"Processing {pages_to_process}/{total_pages} pages from {pdf_path.name}")
+            print(f"  Using FREE pdfplumber (no API costs!) - {workers} worker(s)")
+
+            if workers <= 1:
+                page_stream = _iter_extracted_pages(
+                    pdf.pages[:pages_to_process], 0, self.page_timeout
+                )
+            else:
+                page_stream = self._iter_sharded(str(pdf_path), shards, workers)
+
+            total_words = 0
+            skipped = 0
+            for page in page_stream:
+                if page.page_number == 1 or page.page_number % 10 == 0:
+                    print(f"  Page {page.page_number}/{pages_to_process} extracted")
+                if page.error:
+                    skipped += 1
+                    logger.warning(f"{pdf_path.name} page {page.page_number} skipped: {page.error}")
+                total_words += page.word_count
+                yield page
+
+        skipped_note = f", {skipped} skipped" if skipped else ""
+        print(f"OK Extraction complete: {total_words:,} words from {pages_to_process} pages{skipped_note}")
+
+    def _iter_sharded(
+        self, pdf_path: str, shards: List[Tuple[int, int]], workers: int
+    ) -> Iterator[PDFPage]:
+        """Run shards in a process pool, yielding their pages in order"""
+        executor = ProcessPoolExecutor(max_workers=workers)
+        pending: Deque = deque()
+        next_shard = 0
+        try:
+            while next_shard < len(shards) or pending:
+                # Keep at most 2 shards per worker in flight
+                while next_shard < len(shards) and len(pending) < workers * 2:
+                    start, end = shards[next_shard]
+                    pending.append(executor.submit(
+                        _extract_page_range, pdf_path, start, end, self.page_timeout
+                    ))
+                    next_shard += 1
+
+                yield from pending.popleft().result()
+        finally:
+            # Also reached when the consumer stops early
+            executor.shutdown(wait=True, cancel_futures=True)
+
     def _process_page(self, page, page_num: int) -> PDFPage:
         """
         Process a single PDF page.
@@ -172,6 +281,12 @@ class PDFTextExtractor:
         # Check for images (pdfplumber can detect images)
         has_images = len(page.images) > 0 if hasattr(page, 'images') else False
 
+        # Release parsed layout objects (the bulk of pdfplumber's memory)
+        if hasattr(page, 'close'):
+            page.close()
+        elif hasattr(page, 'flush_cache'):
+            page.flush_cache()
+
         return PDFPage(
             page_number=page_num,
             text_content=text_content,
@@ -204,6 +319,81 @@ class PDFTextExtractor:
         }
 
 
+def page_markdown(page: PDFPage) -> str:
+    """Markdown block of a page, as used in full_text"""
+    return f"# Page {page.page_number}\n\n{page.text_content}"
+
+
+class _PageTimer:
+    """
+    Raise PageTimeoutError after `seconds` (no-op without SIGALRM or off the main thread).
+
+    pdfplumber wraps errors raised during layout analysis, so callers check
+    `expired` rather than the exception type.
+    """
+
+    def __init__(self, seconds: Optional[float]):
+        self.seconds = seconds
+        self.expired = False
+        self._previous = None
+        self._armed = bool(seconds) and hasattr(signal, "SIGALRM") and (
+            threading.current_thread() is threading.main_thread()
+        )
+
+    def _on_timeout(self, signum, frame):
+        self.expired = True
+        raise PageTimeoutError(f"page timeout after {self.seconds}s")
+
+    def __enter__(self):
+        if self._armed:
+            self._previous = signal.signal(signal.SIGALRM, self._on_timeout)
+            signal.setitimer(signal.ITIMER_REAL, self.seconds)
+        return self
+
+    def __exit__(self, *exc_info):
+        if self._armed:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, self._previous)
+        return False
+
+
+def _iter_extracted_pages(
+    pages, start: int, page_timeout: Optional[float]
+) -> Iterator[PDFPage]:
+    """Extract open pdfplumber pages, numbered from start + 1"""
+    extractor = PDFTextExtractor()
+    for page_num, page in enumerate(pages, start + 1):
+        timer = _PageTimer(page_timeout)
+        try:
+            with timer:
+                result = extractor._process_page(page, page_num)
+        except Exception:
+            if not timer.expired:
+                raise
+            result = PDFPage(
+                page_number=page_num,
+                text_content="",
+                error=f"page timeout after {page_timeout}s"
+            )
+        # Yield outside the timer: consumer time does not count
+        yield result
+
+
+def _iter_page_range(
+    pdf_path: str, start: int, end: int, page_timeout: Optional[float]
+) -> Iterator[PDFPage]:
+    """Extract pages [start, end) (0-indexed), opening only those pages"""
+    with pdfplumber.open(pdf_path, pages=list(range(start + 1, end + 1))) as pdf:
+        yield from _iter_extracted_pages(pdf.pages, start, page_timeout)
+
+
+def _extract_page_range(
+    pdf_path: str, start: int, end: int, page_timeout: Optional[float]
+) -> List[PDFPage]:
+    """Worker process entry point: pages [start, end) as a list"""
+    return list(_iter_page_range(pdf_path, start, end, page_timeout))
+
+
 # Example usage
 if __name__ == "__main__":
     import sys
@@ -215,8 +405,8 @@ if __name__ == "__main__":
     pdf_file = sys.argv[1]
     max_pages = int(sys.argv[2]) if len(sys.argv) > 2 else None
 
-    # Initialize extractor
-    extractor = PDFTextExtractor()
+    # Initialize extractor (single document: shard pages across all CPUs)
+    extractor = PDFTextExtractor(max_workers=os.cpu_count() or 1)
 
     # Extract PDF
     result = extractor.extract_pdf(pdf_file, max_pages=max_pages)
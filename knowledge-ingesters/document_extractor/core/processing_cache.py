@@ -5,80 +5,77 @@ Module extrait du knowledge_extractor pour une meilleure modularité
 
 import json
 import logging
-import hashlib
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from datetime import datetime
 
+from utils.file_index import FileIndex, DEFAULT_INDEX_PATH
+
 
 class ProcessingCache:
-    """Gestionnaire de cache pour éviter les retraitements inutiles"""
+    """
+    Gestionnaire de cache pour éviter les retraitements inutiles
+
+    Les enregistrements sont stockés dans l'index SQLite partagé avec
+    DeduplicationTracker (FileIndex): une mise à jour n'écrit qu'une ligne, et
+    un fichier dont la taille et le mtime n'ont pas changé n'est pas re-hashé.
+    """
 
-    def __init__(self, cache_dir: str = "processing_cache"):
+    NAMESPACE = "processing_cache"
+
+    def __init__(self, cache_dir: str = "processing_cache", index_path: Optional[str] = None):
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         self.cache_file = self.cache_dir / "processing_cache.json"
         self.reports_dir = self.cache_dir / "reports"
         self.reports_dir.mkdir(exist_ok=True)
         self.logger = logging.getLogger(f"{__name__}.ProcessingCache")
-        self.cache_data = self._load_cache()
-
-    def _load_cache(self) -> Dict:
-        """Charge le cache existant"""
-        if self.cache_file.exists():
-            try:
-                with open(self.cache_file, "r", encoding="utf-8") as f:
-                    cache_data = json.load(f)
-                    self.logger.info(
-                        f"Cache chargé: {len(cache_data.get('processed_files', {}))} fichiers"
-                    )
-                    return cache_data
-            except Exception as e:
-                self.logger.warning(f"Erreur chargement cache: {e}")
-        else:
-            self.logger.info("Nouveau cache créé")
-
-        return {
-            "processed_files": {},
-            "last_update": datetime.now().isoformat(),
-            "version": "1.0",
-        }
+        self.index = FileIndex(index_path or DEFAULT_INDEX_PATH)
+        self._import_legacy_cache()
 
-    def _save_cache(self):
-        """Sauvegarde le cache"""
+    def _import_legacy_cache(self):
+        """Importe l'ancien cache JSON (premier lancement uniquement)"""
+        if not self.cache_file.exists():
+            return
         try:
-            self.cache_data["last_update"] = datetime.now().isoformat()
-            with open(self.cache_file, "w", encoding="utf-8") as f:
-                json.dump(self.cache_data, f, indent=2, ensure_ascii=False)
-            self.logger.debug(f"Cache sauvegardé: {self.cache_file}")
+            with open(self.cache_file, "r", encoding="utf-8") as f:
+                cache_data = json.load(f)
+            imported = self.index.import_json_records(
+                self.NAMESPACE, cache_data.get("processed_files", {})
+            )
+            if imported:
+                self.logger.info(f"Cache JSON importé: {imported} fichiers")
         except Exception as e:
-            self.logger.error(f"Erreur sauvegarde cache: {e}")
+            self.logger.warning(f"Erreur import cache JSON: {e}")
 
     def get_file_hash(self, file_path: str) -> str:
-        """Calcule le hash d'un fichier pour détecter les modifications"""
-        try:
-            with open(file_path, "rb") as f:
-                content = f.read()
-            return hashlib.sha256(content).hexdigest()
-        except Exception:
-            return ""
+        """
+        Calcule le hash d'un fichier pour détecter les modifications
+
+        Lecture par blocs; les fichiers inchangés (taille + mtime) ne sont pas relus.
+        """
+        return self.index.file_hash(file_path)
+
+    def batch(self):
+        """Regroupe plusieurs mises à jour dans une transaction"""
+        return self.index.batch()
 
     def should_process_file(
         self, file_path: str, min_conformity: float = 0.95, max_age_days: int = 30
     ) -> Dict[str, Any]:
         """Détermine si un fichier doit être traité"""
         file_key = str(Path(file_path).resolve())
-        current_hash = self.get_file_hash(file_path)
+        file_info = self.index.get(self.NAMESPACE, file_key)
 
         # Fichier jamais traité
-        if file_key not in self.cache_data["processed_files"]:
+        if file_info is None:
             return {
                 "should_process": True,
                 "reason": "Fichier jamais traité",
                 "status": "new",
             }
 
-        file_info = self.cache_data["processed_files"][file_key]
+        current_hash = self.get_file_hash(file_path)
 
         # Fichier modifié
         if file_info.get("file_hash") != current_hash:
@@ -146,12 +143,11 @@ class ProcessingCache:
             "error": result.get("error"),
         }
 
-        self.cache_data["processed_files"][file_key] = processing_record
-        self._save_cache()
+        self.index.put(self.NAMESPACE, file_key, processing_record, path=file_key)
 
     def get_cache_stats(self) -> Dict[str, Any]:
         """Statistiques du cache"""
-        processed = self.cache_data["processed_files"]
+        processed = dict(self.index.items(self.NAMESPACE))
         if not processed:
             return {"total_files": 0}
 
@@ -165,7 +161,7 @@ class ProcessingCache:
 
     def cleanup_missing_files(self) -> int:
         """Nettoie le cache des fichiers qui n'existent plus"""
-        cache_data = self.cache_data["processed_files"]
+        cache_data = dict(self.index.items(self.NAMESPACE))
         files_to_remove = []
         existing_files = 0
 
@@ -180,9 +176,10 @@ class ProcessingCache:
             self.logger.warning(
                 f"Nettoyage cache: {len(files_to_remove)} fichiers inexistants supprimés"
             )
-            for file_path in files_to_remove:
-                del cache_data[file_path]
-            self._save_cache()
+            with self.index.batch():
+                for file_path in files_to_remove:
+                    self.index.delete(self.NAMESPACE, file_path)
+                    del cache_data[file_path]
 
         # Détection d'incohérence majeure
         if existing_files < len(cache_data) * 0.5:
@@ -64,9 +64,28 @@ class WebScraper:
             # Fetch page
             response = requests.get(url, headers=self.headers, timeout=self.timeout)
             response.raise_for_status()
+        except Exception as e:
+            return self._failed_result(url, str(e))
+
+        return self.parse_html(url, response.content)
+
+    def parse_html(self, url: str, content: bytes) -> WebExtractionResult:
+        """
+        Extract text content from already fetched HTML.
+
+        Used by callers that download pages themselves (e.g. the concurrent
+        web batch processor).
+
+        Args:
+            url: URL the HTML was fetched from
+            content: Raw HTML body
 
+        Returns:
+            WebExtractionResult with extracted content
+        """
+        try:
             # Parse HTML
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = BeautifulSoup(content, 'html.parser')
 
             # Extract metadata
             metadata = self._extract_metadata(soup, url)
@@ -99,15 +118,19 @@ class WebScraper:
             )
 
         except Exception as e:
-            return WebExtractionResult(
-                url=url,
-                title="",
-                full_text="",
-                metadata={},
-                word_count=0,
-                success=False,
-                error=str(e)
-            )
+            return self._failed_result(url, str(e))
+
+    def _failed_result(self, url: str, error: str) -> WebExtractionResult:
+        """Empty result for a page that could not be fetched or parsed"""
+        return WebExtractionResult(
+            url=url,
+            title="",
+            full_text="",
+            metadata={},
+            word_count=0,
+            success=False,
+            error=error
+        )
 
     def _extract_metadata(self, soup: BeautifulSoup, url: str) -> Dict[str, Any]:
         """Extract page metadata"""
@@ -0,0 +1,66 @@
+"""
+Near-Duplicate Cleanup of an Existing Weaviate Collection
+Finds stored chunks that are near-identical to another stored chunk
+(MinHash/LSH, see weaviate_integration/near_duplicates.py)
+
+The first stored chunk of each group is kept as canonical; the source files
+of the dropped copies are recorded in its duplicate_sources property.
+Dry run by default: only the report is written.
+
+Usage:
+    python deduplicate_weaviate_collection.py                      # report only
+    python deduplicate_weaviate_collection.py --apply              # delete near-duplicates
+    python deduplicate_weaviate_collection.py --threshold 0.9 --report report.json
+"""
+
+import argparse
+import logging
+import sys
+
+from weaviate_integration.ingester_v2 import WeaviateIngesterV2
+from weaviate_integration.near_duplicates import NearDuplicateIndex, DEFAULT_THRESHOLD
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Remove near-duplicate chunks from a Weaviate collection")
+    parser.add_argument("--collection", default="InteliaKnowledgeBase")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Estimated Jaccard similarity above which a chunk is a duplicate")
+    parser.add_argument("--report", default="near_duplicates_report.json")
+    parser.add_argument("--apply", action="store_true", help="Delete the near-duplicates (default: dry run)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    index = NearDuplicateIndex(threshold=args.threshold)
+    ingester = WeaviateIngesterV2(collection_name=args.collection, near_duplicates=index)
+
+    try:
+        loaded = ingester.load_near_duplicate_index()
+        report = index.write_report(args.report)
+
+        print(f"\n{'='*80}")
+        print("NEAR-DUPLICATE ANALYSIS")
+        print(f"{'='*80}")
+        print(f"Collection: {args.collection}")
+        print(f"Threshold: {args.threshold} ({index.bands} bands x {index.rows} rows)")
+        print(f"Stored chunks: {loaded}")
+        print(f"Near-duplicates: {report['stored_near_duplicates']} "
+              f"({report['reduction_ratio']:.1%} of the collection)")
+        print(f"Report: {args.report}")
+
+        if not args.apply:
+            print("\nDry run - use --apply to delete the near-duplicates")
+            return 0
+
+        result = ingester.remove_stored_near_duplicates()
+        print(f"\nDeleted: {result['deleted']}")
+        print(f"Canonical chunks updated: {result['canonicals_updated']}")
+        return 0
+
+    finally:
+        ingester.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
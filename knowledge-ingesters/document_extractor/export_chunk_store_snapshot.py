@@ -0,0 +1,55 @@
+"""
+Chunk Store Snapshot Export
+Rebuilds the local chunk store (content, metadata and vectors keyed by object
+UUID, see weaviate_integration/chunk_store.py) from the current content of a
+Weaviate collection.
+
+The RAG service maps this store to hydrate IDs-only search results and to
+build its in-process vector/BM25 index (rag/retrieval/local_index.py).
+Later ingestions keep it up to date incrementally.
+
+Usage:
+    python export_chunk_store_snapshot.py
+    python export_chunk_store_snapshot.py --collection InteliaKnowledgeBase --directory chunk_store
+"""
+
+import argparse
+import logging
+import sys
+
+from weaviate_integration.chunk_store import LocalChunkStore
+from weaviate_integration.ingester_v2 import WeaviateIngesterV2
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Export a Weaviate collection to the local chunk store")
+    parser.add_argument("--collection", default="InteliaKnowledgeBase")
+    parser.add_argument("--directory", default="chunk_store",
+                        help="Chunk store base directory (CHUNK_STORE_DIR of the RAG service)")
+    parser.add_argument("--page-size", type=int, default=500)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    ingester = WeaviateIngesterV2(
+        collection_name=args.collection,
+        chunk_store=LocalChunkStore(args.directory, args.collection)
+    )
+
+    try:
+        exported = ingester.export_chunk_store(page_size=args.page_size)
+
+        print(f"\n{'='*80}")
+        print("CHUNK STORE SNAPSHOT")
+        print(f"{'='*80}")
+        print(f"Collection: {args.collection}")
+        print(f"Chunks exported: {exported}")
+        print(f"Directory: {ingester.chunk_store.directory}")
+        return 0
+
+    finally:
+        ingester.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
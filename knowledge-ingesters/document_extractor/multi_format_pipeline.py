@@ -31,12 +31,13 @@ if not os.getenv("ANTHROPIC_API_KEY") and not os.getenv("CLAUDE_API_KEY"):
         print(f"Loaded .env from: {env_path}")
 
 # Core extractors
-from core.pdf_text_extractor import PDFTextExtractor, PDFExtractionResult  # FREE pdfplumber (was: pdf_vision_extractor)
+from core.pdf_text_extractor import PDFTextExtractor, PDFExtractionResult, page_markdown  # FREE pdfplumber (was: pdf_vision_extractor)
 from core.docx_extractor import DOCXExtractor, DOCXExtractionResult
 from core.web_scraper import WebScraper, WebExtractionResult
 from core.path_based_classifier import PathBasedClassifier, PathMetadata
 from core.metadata_enricher import MetadataEnricher, EnrichedMetadata
 from core.chunking_service import ChunkingService, ChunkConfig
+from core.entity_extractor import EntityExtractor
 
 
 @dataclass
@@ -52,6 +53,16 @@ class PipelineResult:
     metadata_summary: Dict[str, Any] = None
 
 
+@dataclass
+class ExtractedDocument:
+    """Output of the CPU-bound stages (extraction + classification + chunking)"""
+    file_path: str
+    extraction_method: str
+    full_text: str
+    path_metadata: Dict[str, Any]
+    chunk_objects: List[Any]
+
+
 class MultiFormatPipeline:
     """
     Process multi-format documents through complete extraction pipeline.
@@ -64,18 +75,27 @@ class MultiFormatPipeline:
     Note: Claude Vision API still available for table_extractor (specialized table extraction)
     """
 
-    def __init__(self):
-        """Initialize pipeline with all components"""
+    def __init__(self, enable_enrichment: bool = True, pdf_workers: int = 1):
+        """
+        Initialize pipeline with all components
+
+        Args:
+            enable_enrichment: Create the MetadataEnricher (LLM client). Workers
+                that only run extract_and_chunk() don't need it.
+            pdf_workers: Processes for page-parallel PDF extraction
+                (default: 1 = in-process; batch runs already parallelize
+                across documents)
+        """
         print("Initializing Multi-Format Knowledge Extraction Pipeline...")
 
         # Extractors
-        self.pdf_extractor = PDFTextExtractor()  # FREE pdfplumber (was: PDFVisionExtractor)
+        self.pdf_extractor = PDFTextExtractor(max_workers=pdf_workers)  # FREE pdfplumber (was: PDFVisionExtractor)
         self.docx_extractor = DOCXExtractor()
         self.web_scraper = WebScraper()
 
         # Classifiers
         self.path_classifier = PathBasedClassifier()
-        self.metadata_enricher = MetadataEnricher()
+        self.metadata_enricher = MetadataEnricher() if enable_enrichment else None
 
         # Chunking
         self.chunking_service = ChunkingService(
@@ -91,13 +111,20 @@ class MultiFormatPipeline:
 
         print("Pipeline initialized successfully")
 
-    def process_file(self, file_path: str, max_pages: Optional[int] = None) -> PipelineResult:
+    def process_file(
+        self,
+        file_path: str,
+        max_pages: Optional[int] = None,
+        web_content: Optional[bytes] = None
+    ) -> PipelineResult:
         """
         Process a single file through the complete pipeline.
 
         Args:
             file_path: Path to file (PDF, DOCX) or URL (web page)
             max_pages: For PDFs, max pages to process (None = all)
+            web_content: For URLs, HTML already fetched by the caller
+                (None = fetch the page)
 
         Returns:
             PipelineResult with processing summary
@@ -107,82 +134,21 @@ class MultiFormatPipeline:
         print(f"{'='*80}\n")
 
         try:
-            # Step 1: Detect file type and extract content
-            extraction_method, full_text, extraction_metadata = self._extract_content(
-                file_path, max_pages
-            )
+            extracted = self.extract_and_chunk(file_path, max_pages, web_content)
 
-            if not full_text:
+            if not extracted.full_text:
                 return PipelineResult(
                     file_path=file_path,
                     success=False,
                     chunks_created=0,
                     chunks_ingested=0,
-                    extraction_method=extraction_method,
+                    extraction_method=extracted.extraction_method,
                     error="No text content extracted"
                 )
 
-            print(f"OK Content extracted: {len(full_text)} characters")
-            print(f"  Method: {extraction_method}")
-
-            # Step 2: Path-based classification (70%)
-            print("\nStep 2: Path-based classification...")
-            path_metadata = self.path_classifier.classify_path(file_path)
-            print(f"OK Path classification complete")
-            print(f"  Org: {path_metadata.owner_org_id}")
-            print(f"  Site: {path_metadata.site_type}")
-            print(f"  Breed: {path_metadata.breed}")
-            print(f"  Confidence: {path_metadata.confidence_score:.2f}")
-
-            # Step 3: Vision-based enrichment (25%) + Smart defaults (5%)
-            print("\nStep 3: Metadata enrichment...")
-            enriched_metadata = self.metadata_enricher.enrich_metadata(
-                path_metadata=self._path_to_dict(path_metadata),
-                document_text=full_text,
-                extraction_method=extraction_method
-            )
-            print(f"OK Metadata enrichment complete")
-            print(f"  Species: {enriched_metadata.species}")
-            print(f"  Genetic Line: {enriched_metadata.genetic_line}")
-            print(f"  Document Type: {enriched_metadata.document_type}")
-            print(f"  Overall Confidence: {enriched_metadata.overall_confidence:.2f}")
-
-            # Step 4: Text chunking with quality scoring + entity extraction
-            print("\nStep 4: Text chunking (600 words, 120 overlap) + Quality scoring + Entity extraction...")
-            chunk_objects = self.chunking_service.chunk_text(
-                text=full_text,
-                metadata={"extraction_method": extraction_method}
-            )
-            print(f"OK Created {len(chunk_objects)} enriched chunks")
-
-            # Step 5: Prepare for ingestion (would integrate with Weaviate here)
-            print("\nStep 5: Preparing chunks for ingestion...")
-            chunks_with_metadata = self._prepare_chunks_for_ingestion(
-                chunk_objects, enriched_metadata
-            )
-            print(f"OK {len(chunks_with_metadata)} chunks ready for Weaviate")
-
-            # TODO: Step 6: Ingest into Weaviate
-            # This would call the updated WeaviateIngester with new schema
+            enriched_metadata = self.enrich(extracted)
 
-            return PipelineResult(
-                file_path=file_path,
-                success=True,
-                chunks_created=len(chunk_objects),
-                chunks_ingested=0,  # TODO: Update when ingestion implemented
-                extraction_method=extraction_method,
-                chunks_with_metadata=chunks_with_metadata,
-                metadata_summary={
-                    "owner_org_id": enriched_metadata.owner_org_id,
-                    "visibility_level": enriched_metadata.visibility_level,
-                    "site_type": enriched_metadata.site_type,
-                    "breed": enriched_metadata.breed,
-                    "species": enriched_metadata.species,
-                    "genetic_line": enriched_metadata.genetic_line,
-                    "document_type": enriched_metadata.document_type,
-                    "overall_confidence": enriched_metadata.overall_confidence
-                }
-            )
+            return self.build_result(extracted, enriched_metadata)
 
         except Exception as e:
             return PipelineResult(
@@ -194,8 +160,197 @@ class MultiFormatPipeline:
                 error=str(e)
             )
 
+    def extract_and_chunk(
+        self,
+        file_path: str,
+        max_pages: Optional[int] = None,
+        web_content: Optional[bytes] = None
+    ) -> ExtractedDocument:
+        """
+        Run the CPU-bound stages: extraction, path classification, chunking.
+
+        Chunking only depends on the extracted text, so it runs before the
+        (network-bound) metadata enrichment. The result is picklable and can
+        be produced in a worker process.
+
+        Args:
+            file_path: Path to file (PDF, DOCX) or URL (web page)
+            max_pages: For PDFs, max pages to process (None = all)
+            web_content: For URLs, HTML already fetched by the caller
+
+        Returns:
+            ExtractedDocument (full_text is empty if nothing was extracted)
+        """
+        # PDFs: pages are streamed into the chunker (Steps 1 + 4 overlap)
+        if file_path.lower().endswith('.pdf'):
+            return self._extract_and_chunk_pdf(file_path, max_pages)
+
+        # Step 1: Detect file type and extract content
+        extraction_method, full_text, extraction_metadata = self._extract_content(
+            file_path, max_pages, web_content
+        )
+
+        if not full_text:
+            return ExtractedDocument(
+                file_path=file_path,
+                extraction_method=extraction_method,
+                full_text="",
+                path_metadata={},
+                chunk_objects=[]
+            )
+
+        print(f"OK Content extracted: {len(full_text)} characters")
+        print(f"  Method: {extraction_method}")
+
+        # Step 2: Path-based classification (70%)
+        print("\nStep 2: Path-based classification...")
+        path_metadata = self.path_classifier.classify_path(file_path)
+        print(f"OK Path classification complete")
+        print(f"  Org: {path_metadata.owner_org_id}")
+        print(f"  Site: {path_metadata.site_type}")
+        print(f"  Breed: {path_metadata.breed}")
+        print(f"  Confidence: {path_metadata.confidence_score:.2f}")
+
+        # Step 4: Text chunking with quality scoring + entity extraction
+        print("\nStep 4: Text chunking (600 words, 120 overlap) + Quality scoring + Entity extraction...")
+        chunk_objects = self.chunking_service.chunk_text(
+            text=full_text,
+            metadata={"extraction_method": extraction_method}
+        )
+        print(f"OK Created {len(chunk_objects)} enriched chunks")
+
+        return ExtractedDocument(
+            file_path=file_path,
+            extraction_method=extraction_method,
+            full_text=full_text,
+            path_metadata=self._path_to_dict(path_metadata),
+            chunk_objects=chunk_objects
+        )
+
+    def _extract_and_chunk_pdf(self, file_path: str, max_pages: Optional[int]) -> ExtractedDocument:
+        """
+        Extract a PDF page by page, chunking while later pages are still extracted.
+
+        Only page text is kept in memory (pdfplumber objects are released per
+        page by the extractor).
+        """
+        extraction_method = "pdf_text"  # Using FREE pdfplumber (was: pdf_vision)
+        if not Path(file_path).exists():
+            raise Exception(f"PDF extraction failed: File not found: {file_path}")
+
+        page_blocks: List[str] = []
+
+        def blocks():
+            for page in self.pdf_extractor.iter_pages(file_path, max_pages=max_pages):
+                if page.text_content:
+                    block = page_markdown(page)
+                    page_blocks.append(block)
+                    yield block
+
+        print("\nSteps 1+4: PDF extraction streamed into chunking (600 words, 120 overlap) "
+              "+ Quality scoring + Entity extraction...")
+        try:
+            chunk_objects = list(self.chunking_service.chunk_markdown_stream(
+                blocks(), metadata={"extraction_method": extraction_method}
+            ))
+        except Exception as e:
+            raise Exception(f"PDF extraction failed: pdfplumber extraction failed: {e}")
+
+        full_text = "\n\n".join(page_blocks)
+        if not full_text:
+            return ExtractedDocument(
+                file_path=file_path,
+                extraction_method=extraction_method,
+                full_text="",
+                path_metadata={},
+                chunk_objects=[]
+            )
+
+        print(f"OK Content extracted: {len(full_text)} characters")
+        print(f"OK Created {len(chunk_objects)} enriched chunks")
+
+        # Step 2: Path-based classification (70%)
+        path_metadata = self.path_classifier.classify_path(file_path)
+        print(f"OK Path classification complete (confidence {path_metadata.confidence_score:.2f})")
+
+        return ExtractedDocument(
+            file_path=file_path,
+            extraction_method=extraction_method,
+            full_text=full_text,
+            path_metadata=self._path_to_dict(path_metadata),
+            chunk_objects=chunk_objects
+        )
+
+    def enrich(self, extracted: ExtractedDocument) -> EnrichedMetadata:
+        """
+        Run the network-bound stage: LLM metadata enrichment.
+
+        Args:
+            extracted: Output of extract_and_chunk()
+
+        Returns:
+            EnrichedMetadata for the document
+        """
+        if self.metadata_enricher is None:
+            raise RuntimeError("Pipeline was created with enable_enrichment=False")
+
+        # Step 3: Vision-based enrichment (25%) + Smart defaults (5%)
+        print("\nStep 3: Metadata enrichment...")
+        enriched_metadata = self.metadata_enricher.enrich_metadata(
+            path_metadata=extracted.path_metadata,
+            document_text=extracted.full_text,
+            extraction_method=extracted.extraction_method
+        )
+        print(f"OK Metadata enrichment complete")
+        print(f"  Species: {enriched_metadata.species}")
+        print(f"  Genetic Line: {enriched_metadata.genetic_line}")
+        print(f"  Document Type: {enriched_metadata.document_type}")
+        print(f"  Overall Confidence: {enriched_metadata.overall_confidence:.2f}")
+
+        return enriched_metadata
+
+    def build_result(
+        self, extracted: ExtractedDocument, enriched_metadata: EnrichedMetadata
+    ) -> PipelineResult:
+        """
+        Attach enriched metadata to the chunks and build the pipeline result.
+
+        Args:
+            extracted: Output of extract_and_chunk()
+            enriched_metadata: Output of enrich()
+
+        Returns:
+            PipelineResult with chunks ready for Weaviate
+        """
+        # Step 5: Prepare for ingestion
+        print("\nStep 5: Preparing chunks for ingestion...")
+        chunks_with_metadata = self._prepare_chunks_for_ingestion(
+            extracted.chunk_objects, enriched_metadata
+        )
+        print(f"OK {len(chunks_with_metadata)} chunks ready for Weaviate")
+
+        # Ingestion is done by the caller (see parallel_ingestion.py)
+        return PipelineResult(
+            file_path=extracted.file_path,
+            success=True,
+            chunks_created=len(extracted.chunk_objects),
+            chunks_ingested=0,
+            extraction_method=extracted.extraction_method,
+            chunks_with_metadata=chunks_with_metadata,
+            metadata_summary={
+                "owner_org_id": enriched_metadata.owner_org_id,
+                "visibility_level": enriched_metadata.visibility_level,
+                "site_type": enriched_metadata.site_type,
+                "breed": enriched_metadata.breed,
+                "species": enriched_metadata.species,
+                "genetic_line": enriched_metadata.genetic_line,
+                "document_type": enriched_metadata.document_type,
+                "overall_confidence": enriched_metadata.overall_confidence
+            }
+        )
+
     def _extract_content(
-        self, file_path: str, max_pages: Optional[int]
+        self, file_path: str, max_pages: Optional[int], web_content: Optional[bytes] = None
     ) -> tuple[str, str, Dict[str, Any]]:
         """
         Extract content based on file type.
@@ -221,7 +376,10 @@ class MultiFormatPipeline:
 
         # Web page (URL)
         elif file_path.startswith('http://') or file_path.startswith('https://'):
-            result = self.web_scraper.extract_web_page(file_path)
+            if web_content is not None:
+                result = self.web_scraper.parse_html(file_path, web_content)
+            else:
+                result = self.web_scraper.extract_web_page(file_path)
             if not result.success:
                 raise Exception(f"Web scraping failed: {result.error}")
             return "web_scrape", result.full_text, result.metadata
@@ -253,9 +411,12 @@ class MultiFormatPipeline:
         Each chunk gets:
         - Full enriched metadata (path-based + vision-based)
         - Quality scores from chunk_quality_scorer
-        - Extracted entities from entity_extractor
+        - Extracted entities and boost features from entity_extractor
         """
         prepared_chunks = []
+        is_technical_source = EntityExtractor.is_technical_source(
+            metadata.document_type, metadata.source_file
+        )
 
         for chunk in chunk_objects:
             # Start with base chunk metadata (quality scores + entities)
@@ -297,6 +458,9 @@ class MultiFormatPipeline:
                 # Source tracking
                 "source_file": metadata.source_file,
                 "extraction_method": metadata.extraction_method,
+
+                # Boost feature (document-level)
+                "is_technical_source": is_technical_source,
             })
 
             prepared_chunks.append(chunk_data)
@@ -318,8 +482,8 @@ def main():
     file_path = sys.argv[1]
     max_pages = int(sys.argv[2]) if len(sys.argv) > 2 else None
 
-    # Initialize pipeline
-    pipeline = MultiFormatPipeline()
+    # Initialize pipeline (single document: shard PDF pages across all CPUs)
+    pipeline = MultiFormatPipeline(pdf_workers=os.cpu_count() or 1)
 
     # Process file
     result = pipeline.process_file(file_path, max_pages=max_pages)
@@ -15,6 +15,7 @@ Usage:
 
 import os
 import sys
+import asyncio
 import logging
 import argparse
 from pathlib import Path
@@ -33,6 +34,7 @@ sys.path.insert(0, str(Path(__file__).parent))
 from multi_format_pipeline import MultiFormatPipeline
 from weaviate_integration.ingester_v2 import WeaviateIngesterV2
 from core.docx_image_extractor import DocxImageExtractor
+from utils.rate_limiter import AsyncTokenBucket
 
 # Configure logging
 logging.basicConfig(
@@ -53,7 +55,11 @@ class MultimodalExtractor:
     def __init__(
         self,
         spaces_bucket: str = "intelia-knowledge",
-        enable_image_extraction: bool = True
+        enable_image_extraction: bool = True,
+        image_concurrency: int = 4,
+        captions_per_minute: float = 50,
+        uploads_per_second: float = 20,
+        duplicate_max_distance: Optional[int] = None
     ):
         """
         Initialize multimodal extractor.
@@ -61,9 +67,17 @@ class MultimodalExtractor:
         Args:
             spaces_bucket: Digital Ocean Spaces bucket name
             enable_image_extraction: Whether to extract images (default: True)
+            image_concurrency: Max captioning/upload calls in flight
+            captions_per_minute: Caption API rate limit
+            uploads_per_second: Spaces upload rate limit
+            duplicate_max_distance: pHash/dHash Hamming distance under which an
+                image is a known duplicate (default: image_registry default)
         """
         self.spaces_bucket = spaces_bucket
         self.enable_image_extraction = enable_image_extraction
+        self.image_concurrency = image_concurrency
+        self.captions_per_minute = captions_per_minute
+        self.uploads_per_second = uploads_per_second
 
         # Initialize text extraction pipeline (existing)
         self.text_pipeline = MultiFormatPipeline()
@@ -78,15 +92,22 @@ class MultimodalExtractor:
         if enable_image_extraction:
             from services.spaces_uploader import SpacesUploader
             from services.image_ingester import ImageIngester
+            from services.image_registry import ImageRegistry, DEFAULT_MAX_DISTANCE
 
             self.spaces_uploader = SpacesUploader(bucket=spaces_bucket)
             self.image_ingester = ImageIngester()
+            self.image_registry = ImageRegistry(
+                namespace=f"known_images:{spaces_bucket}",
+                max_distance=duplicate_max_distance if duplicate_max_distance is not None else DEFAULT_MAX_DISTANCE
+            )
 
         # Statistics
         self.stats = {
             "text_chunks": 0,
             "images_extracted": 0,
             "images_uploaded": 0,
+            "images_duplicate": 0,
+            "captions_generated": 0,
             "images_ingested": 0,
             "errors": 0
         }
@@ -311,74 +332,16 @@ class MultimodalExtractor:
                 if images:
                     logger.info(f"✓ Image extraction complete: {len(images)} images")
 
-                    # Step 3: Upload images and create metadata
+                    # Step 3: Upload/caption new images, reuse known ones, ingest metadata
                     logger.info("\n[3/3] Uploading IMAGES to Spaces...")
 
-                    for image in images:
-                        try:
-                            # Upload to Digital Ocean Spaces
-                            image_url = self.spaces_uploader.upload_image(
-                                image_data=image["image_data"],
-                                filename=image["filename"],
-                                content_type=f"image/{image['format']}"
-                            )
-
-                            logger.info(f"  ✓ Uploaded: {image['filename']}")
-                            logger.info(f"    URL: {image_url}")
-                            self.stats["images_uploaded"] += 1
-
-                            # Extract context from surrounding text
-                            context = self.extract_image_context(
-                                file_path,
-                                image["page_number"],
-                                text_result.chunks_with_metadata
-                            )
-
-                            # Generate caption with Claude Vision (optional)
-                            caption = self._generate_caption(image["pil_image"], context)
-
-                            # Create image metadata for Weaviate
-                            image_metadata = {
-                                "image_id": f"{Path(file_path).stem}_page{image['page_number']}_img{image['image_index']}",
-                                "image_url": image_url,
-                                "caption": caption,
-                                "page_number": image["page_number"],
-                                "source_file": str(file_path),
-                                "image_type": self._classify_image_type(caption),
-                                "width": image["width"],
-                                "height": image["height"],
-                                "file_size_kb": image["size_bytes"] / 1024,
-                                "format": image["format"],
-                                "extracted_at": datetime.now().isoformat(),
-                                # Link to text chunks from same page
-                                "linked_chunk_ids": [
-                                    chunk.get("chunk_id")
-                                    for chunk in text_result.chunks_with_metadata
-                                    if chunk.get("page_number") == image["page_number"]
-                                ]
-                            }
-
-                            # Add classification metadata
-                            if classification_path:
-                                parts = classification_path.strip("/").split("/")
-                                if len(parts) >= 2:
-                                    image_metadata["owner_org_id"] = parts[0]
-                                    image_metadata["visibility_level"] = parts[1]
-                                if len(parts) >= 3:
-                                    image_metadata["site_type"] = parts[2]
-                                if len(parts) >= 4:
-                                    image_metadata["category"] = parts[3]
-
-                            # Ingest image metadata to Weaviate
-                            self.image_ingester.ingest_image(image_metadata)
-                            self.stats["images_ingested"] += 1
-
-                            logger.info(f"  ✓ Ingested metadata to Weaviate")
-
-                        except Exception as e:
-                            logger.error(f"  ✗ Error processing {image['filename']}: {e}")
-                            results["errors"].append(f"Image {image['filename']}: {str(e)}")
-                            self.stats["errors"] += 1
+                    image_errors = self.process_images(
+                        file_path,
+                        images,
+                        text_result.chunks_with_metadata,
+                        classification_path
+                    )
+                    results["errors"].extend(image_errors)
 
                     results["images"] = len(images)
                 else:
@@ -402,6 +365,200 @@ class MultimodalExtractor:
 
         return results
 
+    def process_images(
+        self,
+        file_path: str,
+        images: List[Dict[str, Any]],
+        text_chunks: List[Dict[str, Any]],
+        classification_path: Optional[str] = None
+    ) -> List[str]:
+        """
+        Upload, caption and ingest the images of a document.
+
+        Images already known (same or perceptually identical image in this or a
+        previous document) reuse the stored URL, thumbnail and caption. New images
+        are captioned and uploaded concurrently (bounded + rate limited), their
+        thumbnail generated once at upload. Metadata is ingested in one batch.
+
+        Args:
+            file_path: Path to source document
+            images: Extracted images (extract_images_from_pdf/docx)
+            text_chunks: Text chunks of the document (context + linked chunks)
+            classification_path: Optional classification path
+
+        Returns:
+            Error messages
+        """
+        return asyncio.run(
+            self._process_images_async(file_path, images, text_chunks, classification_path)
+        )
+
+    async def _process_images_async(
+        self,
+        file_path: str,
+        images: List[Dict[str, Any]],
+        text_chunks: List[Dict[str, Any]],
+        classification_path: Optional[str]
+    ) -> List[str]:
+        from services.image_registry import fingerprint_image
+
+        semaphore = asyncio.Semaphore(self.image_concurrency)
+        caption_bucket = AsyncTokenBucket.per_minute(self.captions_per_minute)
+        upload_bucket = AsyncTokenBucket(rate=self.uploads_per_second)
+
+        errors = []
+        assets = []  # per image: known record or task of its first occurrence
+        new_images = []  # (fingerprint, task) of images first seen in this document
+
+        for image in images:
+            # Also loads the pixel data once, before worker threads share the image
+            fingerprint = fingerprint_image(image["pil_image"], image["image_data"])
+
+            record = self.image_registry.lookup(fingerprint)
+            if record is None:
+                record = next(
+                    (task for other, task in new_images
+                     if fingerprint.matches(other, self.image_registry.max_distance)),
+                    None
+                )
+
+            if record is None:
+                context = self.extract_image_context(file_path, image["page_number"], text_chunks)
+                task = asyncio.create_task(self._upload_and_caption(
+                    image, fingerprint, context, semaphore, caption_bucket, upload_bucket
+                ))
+                new_images.append((fingerprint, task))
+                record = task
+            else:
+                logger.info(f"  = Known image: {image['filename']} (no caption/upload)")
+                self.stats["images_duplicate"] += 1
+
+            assets.append((fingerprint, record))
+
+        await asyncio.gather(*(task for _, task in new_images), return_exceptions=True)
+
+        batch = []
+        for image, (fingerprint, record) in zip(images, assets):
+            if isinstance(record, asyncio.Task):
+                if record.exception() is not None:
+                    logger.error(f"  ✗ Error processing {image['filename']}: {record.exception()}")
+                    errors.append(f"Image {image['filename']}: {record.exception()}")
+                    self.stats["errors"] += 1
+                    continue
+                record = record.result()
+
+            batch.append(self._build_image_metadata(
+                file_path, image, fingerprint, record, text_chunks, classification_path
+            ))
+
+        if batch:
+            ingestion_stats = await asyncio.to_thread(self.image_ingester.ingest_images, batch)
+            self.stats["images_ingested"] += ingestion_stats["success"]
+            logger.info(f"  ✓ Ingested metadata to Weaviate: {ingestion_stats['success']} images")
+
+        return errors
+
+    async def _upload_and_caption(
+        self,
+        image: Dict[str, Any],
+        fingerprint,
+        context: str,
+        semaphore: asyncio.Semaphore,
+        caption_bucket: AsyncTokenBucket,
+        upload_bucket: AsyncTokenBucket
+    ) -> Dict[str, Any]:
+        """Caption and upload (image + thumbnail) a new image, then register it"""
+        from services.image_registry import make_thumbnail
+
+        async def upload(data: bytes, filename: str, folder: str, content_type: str) -> str:
+            await upload_bucket.acquire()
+            async with semaphore:
+                return await asyncio.to_thread(
+                    self.spaces_uploader.upload_image,
+                    image_data=data,
+                    filename=filename,
+                    folder=folder,
+                    content_type=content_type
+                )
+
+        async def upload_with_thumbnail() -> Tuple[str, str]:
+            image_url = await upload(
+                image["image_data"], image["filename"], "documents", f"image/{image['format']}"
+            )
+            thumbnail = await asyncio.to_thread(make_thumbnail, image["pil_image"])
+            thumbnail_url = await upload(
+                thumbnail, f"{Path(image['filename']).stem}_thumb.jpg", "thumbnails", "image/jpeg"
+            )
+            return image_url, thumbnail_url
+
+        async def caption() -> str:
+            await caption_bucket.acquire()
+            async with semaphore:
+                return await asyncio.to_thread(self._generate_caption, image["pil_image"], context)
+
+        (image_url, thumbnail_url), caption_text = await asyncio.gather(
+            upload_with_thumbnail(), caption()
+        )
+
+        logger.info(f"  ✓ Uploaded: {image['filename']}")
+        logger.info(f"    URL: {image_url}")
+        self.stats["images_uploaded"] += 1
+        self.stats["captions_generated"] += 1
+
+        record = {
+            "image_url": image_url,
+            "thumbnail_url": thumbnail_url,
+            "caption": caption_text,
+            "image_type": self._classify_image_type(caption_text),
+        }
+        self.image_registry.register(fingerprint, record)
+        return record
+
+    def _build_image_metadata(
+        self,
+        file_path: str,
+        image: Dict[str, Any],
+        fingerprint,
+        record: Dict[str, Any],
+        text_chunks: List[Dict[str, Any]],
+        classification_path: Optional[str]
+    ) -> Dict[str, Any]:
+        """Weaviate metadata of one image occurrence (shared asset, own source/page)"""
+        image_metadata = {
+            "image_id": f"{Path(file_path).stem}_page{image['page_number']}_img{image['image_index']}",
+            "image_url": record["image_url"],
+            "thumbnail_url": record.get("thumbnail_url", ""),
+            "image_hash": f"{fingerprint.phash:016x}",
+            "caption": record["caption"],
+            "page_number": image["page_number"],
+            "source_file": str(file_path),
+            "image_type": record.get("image_type") or self._classify_image_type(record["caption"]),
+            "width": image["width"],
+            "height": image["height"],
+            "file_size_kb": image["size_bytes"] / 1024,
+            "format": image["format"],
+            "extracted_at": datetime.now().isoformat(),
+            # Link to text chunks from same page
+            "linked_chunk_ids": [
+                chunk.get("chunk_id")
+                for chunk in text_chunks
+                if chunk.get("page_number") == image["page_number"]
+            ]
+        }
+
+        # Add classification metadata
+        if classification_path:
+            parts = classification_path.strip("/").split("/")
+            if len(parts) >= 2:
+                image_metadata["owner_org_id"] = parts[0]
+                image_metadata["visibility_level"] = parts[1]
+            if len(parts) >= 3:
+                image_metadata["site_type"] = parts[2]
+            if len(parts) >= 4:
+                image_metadata["category"] = parts[3]
+
+        return image_metadata
+
     def _generate_caption(self, image: Image.Image, context: str) -> str:
         """
         Generate caption for an image using Claude Vision API.
@@ -454,6 +611,8 @@ class MultimodalExtractor:
         logger.info(f"Text chunks created: {self.stats['text_chunks']}")
         logger.info(f"Images extracted: {self.stats['images_extracted']}")
         logger.info(f"Images uploaded to Spaces: {self.stats['images_uploaded']}")
+        logger.info(f"Known images reused (no caption/upload): {self.stats['images_duplicate']}")
+        logger.info(f"Captions generated: {self.stats['captions_generated']}")
         logger.info(f"Image metadata ingested to Weaviate: {self.stats['images_ingested']}")
         logger.info(f"Errors: {self.stats['errors']}")
         logger.info("="*80)
@@ -466,13 +625,17 @@ def main():
     parser.add_argument("--classification", help="Classification path (e.g., intelia/public/broiler_farms/management/common)")
     parser.add_argument("--no-images", action="store_true", help="Disable image extraction")
     parser.add_argument("--spaces-bucket", default="intelia-knowledge", help="Digital Ocean Spaces bucket")
+    parser.add_argument("--image-concurrency", type=int, default=4, help="Max captioning/upload calls in flight")
+    parser.add_argument("--captions-per-minute", type=float, default=50, help="Caption API rate limit")
 
     args = parser.parse_args()
 
     # Initialize extractor
     extractor = MultimodalExtractor(
         spaces_bucket=args.spaces_bucket,
-        enable_image_extraction=not args.no_images
+        enable_image_extraction=not args.no_images,
+        image_concurrency=args.image_concurrency,
+        captions_per_minute=args.captions_per_minute
     )
 
     path = Path(args.path)
@@ -0,0 +1,271 @@
+"""
+Parallel Multi-Stage Ingestion Pipeline
+Runs MultiFormatPipeline stages concurrently instead of one document at a time
+
+Stages (connected by bounded queues for backpressure):
+1. Extraction + chunking - process pool (CPU-bound pdfplumber/docx, chunking)
+2. Metadata enrichment - asyncio tasks with bounded concurrency and a token
+   bucket (LLM API rate limit)
+3. Weaviate writer - single task, batches chunks across documents
+
+Throughput is bound by the enrichment API rate limit rather than by serial
+execution: while one document waits for the LLM, others are being extracted
+and already-enriched chunks are being written.
+"""
+
+import asyncio
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from multi_format_pipeline import MultiFormatPipeline, ExtractedDocument, PipelineResult
+from utils.rate_limiter import AsyncTokenBucket
+
+logger = logging.getLogger(__name__)
+
+# Per-process pipeline used by extraction workers (created once per worker)
+_worker_pipeline: Optional[MultiFormatPipeline] = None
+
+
+def _init_extraction_worker():
+    """Process pool initializer: build extractors/chunker without LLM client"""
+    global _worker_pipeline
+    # Documents are already spread across processes: extract PDF pages in-process
+    _worker_pipeline = MultiFormatPipeline(enable_enrichment=False, pdf_workers=1)
+
+
+def _extract_in_worker(file_path: str, max_pages: Optional[int]) -> ExtractedDocument:
+    """Run extraction + chunking in a worker process"""
+    return _worker_pipeline.extract_and_chunk(file_path, max_pages)
+
+
+@dataclass
+class ParallelIngestionConfig:
+    """Concurrency settings for the ingestion pipeline"""
+    max_workers: Optional[int] = None       # Extraction processes (default: CPU count)
+    enrichment_concurrency: int = 4         # Concurrent LLM enrichment calls
+    requests_per_minute: float = 50.0       # Enrichment API rate limit
+    queue_size: int = 8                     # Documents buffered between stages
+    write_batch_size: int = 200             # Chunks per Weaviate batch
+
+
+class ParallelIngestionPipeline:
+    """
+    Staged, concurrent document ingestion.
+
+    The caller supplies how chunks are written and what happens when a
+    document is done (e.g. marking it in the DeduplicationTracker), so the
+    same pipeline serves batch_process_documents.py and
+    batch_extract_and_ingest_all.py.
+
+    Usage:
+        pipeline = ParallelIngestionPipeline(
+            pipeline=MultiFormatPipeline(),
+            write_chunks=lambda chunks: ingester.ingest_chunks(chunks)["success"],
+            on_document_done=handle_result,
+        )
+        stats = pipeline.run(file_paths)
+    """
+
+    def __init__(
+        self,
+        pipeline: MultiFormatPipeline,
+        write_chunks: Callable[[List[Dict[str, Any]]], int],
+        on_document_done: Optional[Callable[[PipelineResult], None]] = None,
+        config: Optional[ParallelIngestionConfig] = None
+    ):
+        """
+        Initialize parallel pipeline.
+
+        Args:
+            pipeline: Pipeline with metadata enrichment enabled (main process)
+            write_chunks: Writes a batch of chunks, returns number ingested.
+                Always called from a single thread at a time.
+            on_document_done: Called once per document with its final result
+                (after its chunks were written, or on failure)
+            config: Concurrency settings
+        """
+        self.pipeline = pipeline
+        self.write_chunks = write_chunks
+        self.on_document_done = on_document_done
+        self.config = config or ParallelIngestionConfig()
+
+        self.stats = {
+            "processed": 0,
+            "failed": 0,
+            "total_chunks": 0,
+            "chunks_ingested": 0,
+            "write_batches": 0
+        }
+
+    def run(self, file_paths: List[str], max_pages: Optional[int] = None) -> Dict[str, int]:
+        """
+        Process documents through all stages (blocking).
+
+        Args:
+            file_paths: Documents to process
+            max_pages: For PDFs, max pages to process (None = all)
+
+        Returns:
+            Processing statistics
+        """
+        return asyncio.run(self.run_async(file_paths, max_pages))
+
+    async def run_async(self, file_paths: List[str], max_pages: Optional[int] = None) -> Dict[str, int]:
+        """Async version of run()"""
+        if not file_paths:
+            return self.stats
+
+        max_workers = min(self.config.max_workers or os.cpu_count() or 1, len(file_paths))
+        enrich_queue: asyncio.Queue = asyncio.Queue(maxsize=self.config.queue_size)
+        write_queue: asyncio.Queue = asyncio.Queue(maxsize=self.config.queue_size)
+        bucket = AsyncTokenBucket.per_minute(self.config.requests_per_minute)
+
+        logger.info(
+            f"Parallel ingestion: {len(file_paths)} documents, {max_workers} extraction workers, "
+            f"{self.config.enrichment_concurrency} enrichment tasks, "
+            f"{self.config.requests_per_minute} req/min"
+        )
+
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_extraction_worker) as executor:
+            enrichers = [
+                asyncio.create_task(self._enrich_stage(enrich_queue, write_queue, bucket))
+                for _ in range(self.config.enrichment_concurrency)
+            ]
+            writer = asyncio.create_task(self._write_stage(write_queue))
+
+            await self._extract_stage(executor, file_paths, max_pages, max_workers, enrich_queue)
+
+            for _ in enrichers:
+                await enrich_queue.put(None)
+            await asyncio.gather(*enrichers)
+
+            await write_queue.put(None)
+            await writer
+
+        return self.stats
+
+    async def _extract_stage(
+        self,
+        executor: ProcessPoolExecutor,
+        file_paths: List[str],
+        max_pages: Optional[int],
+        max_workers: int,
+        enrich_queue: asyncio.Queue
+    ):
+        """Submit extraction jobs, keeping at most 2 per worker in flight"""
+        loop = asyncio.get_running_loop()
+        in_flight = asyncio.Semaphore(max_workers * 2)
+
+        async def extract(file_path: str):
+            try:
+                extracted = await loop.run_in_executor(
+                    executor, _extract_in_worker, file_path, max_pages
+                )
+                if not extracted.full_text:
+                    self._finish_failed(file_path, "No text content extracted", extracted.extraction_method)
+                else:
+                    # Blocks when enrichment is behind (backpressure)
+                    await enrich_queue.put(extracted)
+            except Exception as e:
+                self._finish_failed(file_path, str(e))
+            finally:
+                in_flight.release()
+
+        tasks = []
+        for file_path in file_paths:
+            await in_flight.acquire()
+            tasks.append(asyncio.create_task(extract(str(file_path))))
+
+        await asyncio.gather(*tasks)
+
+    async def _enrich_stage(
+        self,
+        enrich_queue: asyncio.Queue,
+        write_queue: asyncio.Queue,
+        bucket: AsyncTokenBucket
+    ):
+        """Enrich documents with the LLM (rate limited), then hand off to the writer"""
+        while True:
+            extracted = await enrich_queue.get()
+            if extracted is None:
+                return
+
+            try:
+                await bucket.acquire()
+                # Sync Anthropic client: run in a thread so other stages keep going
+                enriched = await asyncio.to_thread(self.pipeline.enrich, extracted)
+                result = self.pipeline.build_result(extracted, enriched)
+            except Exception as e:
+                self._finish_failed(extracted.file_path, str(e), extracted.extraction_method)
+                continue
+
+            await write_queue.put(result)
+
+    async def _write_stage(self, write_queue: asyncio.Queue):
+        """Single writer: batch chunks across documents into Weaviate"""
+        pending_chunks: List[Dict[str, Any]] = []
+        pending_results: List[PipelineResult] = []
+
+        while True:
+            result = await write_queue.get()
+            if result is not None:
+                pending_chunks.extend(result.chunks_with_metadata or [])
+                pending_results.append(result)
+
+                if len(pending_chunks) < self.config.write_batch_size:
+                    continue
+
+            if pending_results:
+                await self._flush(pending_chunks, pending_results)
+                pending_chunks = []
+                pending_results = []
+
+            if result is None:
+                return
+
+    async def _flush(self, chunks: List[Dict[str, Any]], results: List[PipelineResult]):
+        """Write one batch, then complete the documents it contained"""
+        try:
+            ingested = await asyncio.to_thread(self.write_chunks, chunks) if chunks else 0
+        except Exception as e:
+            logger.error(f"Weaviate batch write failed ({len(chunks)} chunks): {e}")
+            for result in results:
+                self._finish_failed(result.file_path, f"Ingestion failed: {e}", result.extraction_method)
+            return
+
+        self.stats["write_batches"] += 1
+        self.stats["chunks_ingested"] += ingested
+        if ingested < len(chunks):
+            logger.warning(f"Partial ingestion failure: {len(chunks) - ingested} chunks failed")
+
+        for result in results:
+            # Per-document count is not reported by batch writers; a document
+            # counts as ingested when its batch was written
+            result.chunks_ingested = result.chunks_created if ingested else 0
+            self.stats["processed"] += 1
+            self.stats["total_chunks"] += result.chunks_created
+            self._notify(result)
+
+    def _finish_failed(self, file_path: str, error: str, extraction_method: str = "unknown"):
+        """Record a failed document"""
+        self.stats["failed"] += 1
+        logger.error(f"Error processing {file_path}: {error}")
+        self._notify(PipelineResult(
+            file_path=file_path,
+            success=False,
+            chunks_created=0,
+            chunks_ingested=0,
+            extraction_method=extraction_method,
+            error=error
+        ))
+
+    def _notify(self, result: PipelineResult):
+        if self.on_document_done is None:
+            return
+        try:
+            self.on_document_done(result)
+        except Exception as e:
+            logger.error(f"on_document_done callback failed for {result.file_path}: {e}")
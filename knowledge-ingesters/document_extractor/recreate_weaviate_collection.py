@@ -19,7 +19,7 @@ from pathlib import Path
 from datetime import datetime
 from dotenv import load_dotenv
 import weaviate
-from weaviate.classes.config import Configure, Property, DataType
+from weaviate.classes.config import Configure, Property, DataType, Tokenization
 
 # Load environment variables
 load_dotenv(Path(__file__).parent.parent / ".env")
@@ -218,6 +218,47 @@ def create_knowledge_chunks_schema(client):
             description="JSON string of age ranges normalized to days"
         ),
 
+        # ============================================================
+        # BOOST FEATURES (filterable, read by RAG boosting)
+        # ============================================================
+        Property(
+            name="breed_mentions",
+            data_type=DataType.TEXT_ARRAY,
+            skip_vectorization=True,
+            index_filterable=True,
+            tokenization=Tokenization.FIELD,
+            description="Normalized breeds mentioned in the chunk: ross 308, cobb 500, hy line brown"
+        ),
+        Property(
+            name="age_days_mentioned",
+            data_type=DataType.INT_ARRAY,
+            skip_vectorization=True,
+            index_filterable=True,
+            description="Ages in days mentioned in the chunk (35j, 35 days, day 35, age ranges)"
+        ),
+        Property(
+            name="metric_mentions",
+            data_type=DataType.TEXT_ARRAY,
+            skip_vectorization=True,
+            index_filterable=True,
+            tokenization=Tokenization.FIELD,
+            description="Performance metrics mentioned: fcr, poids, mortalité, ponte, gain"
+        ),
+        Property(
+            name="is_technical_source",
+            data_type=DataType.BOOL,
+            skip_vectorization=True,
+            index_filterable=True,
+            description="Boolean: source document is a guide, standard or technical reference"
+        ),
+        Property(
+            name="has_medical_terms",
+            data_type=DataType.BOOL,
+            skip_vectorization=True,
+            index_filterable=True,
+            description="Boolean: chunk contains medical/health terms"
+        ),
+
         # ============================================================
         # PATH-BASED METADATA (70% - from directory structure)
         # ============================================================
@@ -25,7 +25,8 @@ class ImageIngester:
     Ingest image metadata to Weaviate InteliaImages collection.
 
     Stores:
-    - image_url (link to Digital Ocean Spaces)
+    - image_url, thumbnail_url (links to Digital Ocean Spaces)
+    - image_hash (perceptual hash, identical images share one upload)
     - caption/description
     - page_number
     - source_file
@@ -113,6 +114,16 @@ class ImageIngester:
                         data_type=DataType.TEXT,
                         description="URL to image in Digital Ocean Spaces"
                     ),
+                    Property(
+                        name="thumbnail_url",
+                        data_type=DataType.TEXT,
+                        description="URL to thumbnail in Digital Ocean Spaces"
+                    ),
+                    Property(
+                        name="image_hash",
+                        data_type=DataType.TEXT,
+                        description="Perceptual hash (pHash, hex) shared by duplicate images"
+                    ),
                     Property(
                         name="caption",
                         data_type=DataType.TEXT,
@@ -216,6 +227,8 @@ class ImageIngester:
             {
                 "image_id": "nano_manual_page5_img1",
                 "image_url": "https://...",
+                "thumbnail_url": "https://...",
+                "image_hash": "c3d1e0f0b0a08080",
                 "caption": "Figure 1: Ventilation diagram",
                 "image_type": "diagram",
                 "page_number": 5,
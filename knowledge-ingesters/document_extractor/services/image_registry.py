@@ -0,0 +1,212 @@
+"""
+Perceptual Image Registry
+Version: 1.0.0
+Last modified: 2025-11-08
+
+Recognizes images already uploaded and captioned (logos, charts and diagrams
+repeated across documents) so they are not captioned or uploaded again.
+
+- Exact copies: SHA-256 of the image bytes
+- Re-encoded / resized copies: pHash (DCT) AND dHash (gradient) within a
+  Hamming distance. Both hashes must agree, which keeps charts built on the
+  same template (same axes, different curves) from matching on pHash alone.
+
+Known images are persisted in the shared processing index (utils/file_index.py),
+one namespace per Spaces bucket.
+"""
+
+import hashlib
+import io
+import logging
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from PIL import Image
+
+from utils.file_index import FileIndex, DEFAULT_INDEX_PATH
+
+logger = logging.getLogger(__name__)
+
+HASH_SIZE = 8  # 64-bit hashes
+PHASH_HIGHFREQ_FACTOR = 4  # pHash DCT computed on a 32x32 image
+DEFAULT_MAX_DISTANCE = 6  # Hamming bits (out of 64) per hash
+
+THUMBNAIL_SIZE = (320, 320)
+
+
+@dataclass(frozen=True)
+class ImageFingerprint:
+    """Exact and perceptual hashes of an image"""
+
+    sha256: str
+    phash: int
+    dhash: int
+
+    def distance(self, other: "ImageFingerprint") -> int:
+        """Largest Hamming distance of the two perceptual hashes"""
+        return max(bin(self.phash ^ other.phash).count("1"), bin(self.dhash ^ other.dhash).count("1"))
+
+    def matches(self, other: "ImageFingerprint", max_distance: int = DEFAULT_MAX_DISTANCE) -> bool:
+        return self.sha256 == other.sha256 or self.distance(other) <= max_distance
+
+
+@lru_cache(maxsize=4)
+def _dct_matrix(size: int) -> np.ndarray:
+    """Orthonormal DCT-II matrix (coeffs = M @ x @ M.T)"""
+    k = np.arange(size)[:, None]
+    n = np.arange(size)[None, :]
+    matrix = np.cos(np.pi * (2 * n + 1) * k / (2 * size)) * np.sqrt(2.0 / size)
+    matrix[0] /= np.sqrt(2.0)
+    return matrix
+
+
+def _bits_to_int(bits: np.ndarray) -> int:
+    return int.from_bytes(np.packbits(bits.flatten()).tobytes(), "big")
+
+
+def phash(image: Image.Image, hash_size: int = HASH_SIZE) -> int:
+    """Perceptual hash: low frequencies of the DCT compared to their median"""
+    size = hash_size * PHASH_HIGHFREQ_FACTOR
+    pixels = np.asarray(image.convert("L").resize((size, size), Image.LANCZOS), dtype=np.float64)
+    dct = _dct_matrix(size)
+    low_frequencies = (dct @ pixels @ dct.T)[:hash_size, :hash_size]
+    return _bits_to_int(low_frequencies > np.median(low_frequencies))
+
+
+def dhash(image: Image.Image, hash_size: int = HASH_SIZE) -> int:
+    """Difference hash: sign of the horizontal gradient"""
+    pixels = np.asarray(image.convert("L").resize((hash_size + 1, hash_size), Image.LANCZOS), dtype=np.int16)
+    return _bits_to_int(pixels[:, 1:] > pixels[:, :-1])
+
+
+def fingerprint_image(image: Image.Image, image_data: bytes) -> ImageFingerprint:
+    """
+    Hash an extracted image.
+
+    Args:
+        image: PIL Image (decoded from image_data)
+        image_data: Raw image bytes
+
+    Returns:
+        ImageFingerprint
+    """
+    return ImageFingerprint(
+        sha256=hashlib.sha256(image_data).hexdigest(),
+        phash=phash(image),
+        dhash=dhash(image),
+    )
+
+
+def make_thumbnail(image: Image.Image, max_size: tuple = THUMBNAIL_SIZE) -> bytes:
+    """JPEG thumbnail (aspect ratio preserved)"""
+    thumbnail = image.copy()
+    if thumbnail.mode not in ("RGB", "L"):
+        thumbnail = thumbnail.convert("RGB")
+    thumbnail.thumbnail(max_size)
+
+    buffer = io.BytesIO()
+    thumbnail.save(buffer, format="JPEG", quality=85, optimize=True)
+    return buffer.getvalue()
+
+
+def _popcount64(values: np.ndarray) -> np.ndarray:
+    """Set bits of each uint64"""
+    if hasattr(np, "bitwise_count"):  # numpy >= 2.0
+        return np.bitwise_count(values)
+    return np.unpackbits(values.view(np.uint8)).reshape(-1, 64).sum(axis=1)
+
+
+class ImageRegistry:
+    """
+    Known images (uploaded + captioned), looked up by exact or perceptual hash.
+
+    Records: {"image_url", "thumbnail_url", "caption", "image_type", "phash", "dhash"}
+    """
+
+    def __init__(
+        self,
+        namespace: str = "known_images",
+        index_path: str = DEFAULT_INDEX_PATH,
+        max_distance: int = DEFAULT_MAX_DISTANCE,
+        index: Optional[FileIndex] = None
+    ):
+        """
+        Initialize the registry and load the known hashes.
+
+        Args:
+            namespace: Namespace in the processing index (one per bucket)
+            index_path: SQLite processing index path
+            max_distance: Max Hamming distance of both pHash and dHash
+            index: Optional shared FileIndex instance
+        """
+        self.namespace = namespace
+        self.max_distance = max_distance
+        self.index = index or FileIndex(index_path)
+
+        self._keys: List[str] = []
+        self._records: Dict[str, Dict[str, Any]] = {}
+        self._phashes = np.zeros(0, dtype=np.uint64)
+        self._dhashes = np.zeros(0, dtype=np.uint64)
+
+        pending_keys, phashes, dhashes = [], [], []
+        for key, record in self.index.items(self.namespace):
+            self._records[key] = record
+            pending_keys.append(key)
+            phashes.append(int(record["phash"], 16))
+            dhashes.append(int(record["dhash"], 16))
+        self._append(pending_keys, phashes, dhashes)
+
+        logger.info(f"Image registry '{namespace}': {len(self._keys)} known images")
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _append(self, keys: List[str], phashes: List[int], dhashes: List[int]):
+        self._keys.extend(keys)
+        self._phashes = np.concatenate([self._phashes, np.array(phashes, dtype=np.uint64)])
+        self._dhashes = np.concatenate([self._dhashes, np.array(dhashes, dtype=np.uint64)])
+
+    def lookup(self, fingerprint: ImageFingerprint) -> Optional[Dict[str, Any]]:
+        """
+        Find a known image.
+
+        Args:
+            fingerprint: Fingerprint of the new image
+
+        Returns:
+            Record of the closest known image, or None
+        """
+        if fingerprint.sha256 in self._records:
+            return self._records[fingerprint.sha256]
+        if not self._keys:
+            return None
+
+        distances = np.maximum(
+            _popcount64(self._phashes ^ np.uint64(fingerprint.phash)),
+            _popcount64(self._dhashes ^ np.uint64(fingerprint.dhash)),
+        )
+        best = int(np.argmin(distances))
+        if distances[best] > self.max_distance:
+            return None
+        return self._records[self._keys[best]]
+
+    def register(self, fingerprint: ImageFingerprint, record: Dict[str, Any]):
+        """
+        Remember an uploaded and captioned image.
+
+        Args:
+            fingerprint: Fingerprint of the image
+            record: image_url, thumbnail_url, caption, image_type
+        """
+        record = {
+            **record,
+            "phash": f"{fingerprint.phash:016x}",
+            "dhash": f"{fingerprint.dhash:016x}",
+        }
+        self.index.put(self.namespace, fingerprint.sha256, record)
+
+        if fingerprint.sha256 not in self._records:
+            self._append([fingerprint.sha256], [fingerprint.phash], [fingerprint.dhash])
+        self._records[fingerprint.sha256] = record
@@ -4,9 +4,13 @@ Statistiques, logging, et helpers divers
 """
 
 from .statistics import ExtractionStatistics
+from .rate_limiter import AsyncTokenBucket
+from .file_index import FileIndex
 
 __all__ = [
     "ExtractionStatistics",
+    "AsyncTokenBucket",
+    "FileIndex",
 ]
 
 # Constantes utiles
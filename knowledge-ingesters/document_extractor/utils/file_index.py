@@ -0,0 +1,252 @@
+"""
+File Index - Shared SQLite state for ProcessingCache and DeduplicationTracker
+Replaces JSON files that were fully rewritten on every update
+
+Features:
+- SQLite in WAL mode: one-row updates, readers never block the writer
+- (path, size, mtime_ns) fast path: unchanged files are never re-hashed
+- Streaming SHA-256 for new/changed files (constant memory)
+- Namespaced JSON records (one namespace per tracker/cache)
+- Atomic batched updates via `with index.batch():`
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+DEFAULT_INDEX_PATH = "processing_index.sqlite"
+
+HASH_BLOCK_SIZE = 1024 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS file_hashes (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    sha256 TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS records (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    path TEXT,
+    data TEXT NOT NULL,
+    PRIMARY KEY (namespace, key)
+);
+CREATE INDEX IF NOT EXISTS idx_records_path ON records (namespace, path);
+"""
+
+
+def stream_file_hash(file_path: str | Path) -> str:
+    """SHA-256 of a file, read in 1 MB blocks"""
+    sha256_hash = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b""):
+            sha256_hash.update(block)
+    return sha256_hash.hexdigest()
+
+
+class FileIndex:
+    """
+    SQLite index of file hashes and processing records.
+
+    Usage:
+        index = FileIndex()
+        file_hash = index.file_hash(path)          # stat-only if unchanged
+        with index.batch():
+            index.put("processed_documents", file_hash, {...}, path=str(path))
+    """
+
+    def __init__(self, db_path: str | Path = DEFAULT_INDEX_PATH):
+        """
+        Open (or create) the index.
+
+        Args:
+            db_path: SQLite database file
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.logger = logging.getLogger(__name__)
+
+        self._lock = threading.RLock()
+        self._batch_depth = 0
+
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+        self.hash_stats = {"fast_path": 0, "hashed": 0}
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Group updates in one transaction (committed on exit, rolled back on error)"""
+        with self._lock:
+            self._batch_depth += 1
+            try:
+                yield
+            except BaseException:
+                self._batch_depth -= 1
+                if self._batch_depth == 0:
+                    self._conn.rollback()
+                raise
+            else:
+                self._batch_depth -= 1
+                if self._batch_depth == 0:
+                    self._conn.commit()
+
+    def _commit(self):
+        """Commit unless inside batch()"""
+        if self._batch_depth == 0:
+            self._conn.commit()
+
+    # ------------------------------------------------------------------
+    # File hashes
+    # ------------------------------------------------------------------
+
+    def file_hash(self, file_path: str | Path) -> str:
+        """
+        SHA-256 of a file, skipping the read when size and mtime are unchanged.
+
+        Args:
+            file_path: Path to file
+
+        Returns:
+            SHA-256 hex string ("" if the file cannot be read)
+        """
+        try:
+            path_key = str(Path(file_path).resolve())
+            stat = os.stat(file_path)
+        except OSError:
+            return ""
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT size, mtime_ns, sha256 FROM file_hashes WHERE path = ?", (path_key,)
+            ).fetchone()
+
+        if row and row[0] == stat.st_size and row[1] == stat.st_mtime_ns:
+            self.hash_stats["fast_path"] += 1
+            return row[2]
+
+        try:
+            sha256 = stream_file_hash(file_path)
+        except OSError as e:
+            self.logger.error(f"Error hashing file {file_path}: {e}")
+            return ""
+        self.hash_stats["hashed"] += 1
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO file_hashes (path, size, mtime_ns, sha256) VALUES (?, ?, ?, ?)",
+                (path_key, stat.st_size, stat.st_mtime_ns, sha256),
+            )
+            self._commit()
+
+        return sha256
+
+    # ------------------------------------------------------------------
+    # Records
+    # ------------------------------------------------------------------
+
+    def get(self, namespace: str, key: str) -> Optional[Dict[str, Any]]:
+        """Get a record (None if missing)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM records WHERE namespace = ? AND key = ?", (namespace, key)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, namespace: str, key: str, data: Dict[str, Any], path: Optional[str] = None):
+        """Insert or replace a record"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO records (namespace, key, path, data) VALUES (?, ?, ?, ?)",
+                (namespace, key, path, json.dumps(data, ensure_ascii=False)),
+            )
+            self._commit()
+
+    def delete(self, namespace: str, key: str) -> bool:
+        """Delete a record, returns True if it existed"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM records WHERE namespace = ? AND key = ?", (namespace, key)
+            )
+            self._commit()
+        return cursor.rowcount > 0
+
+    def delete_by_path(self, namespace: str, path: str, keep_key: Optional[str] = None) -> int:
+        """Delete records of a path (optionally keeping one key), returns count"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM records WHERE namespace = ? AND path = ? AND key != ?",
+                (namespace, path, keep_key or ""),
+            )
+            self._commit()
+        return cursor.rowcount
+
+    def find_by_path(self, namespace: str, path: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Records of a path as (key, data)"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, data FROM records WHERE namespace = ? AND path = ?", (namespace, path)
+            ).fetchall()
+        for key, data in rows:
+            yield key, json.loads(data)
+
+    def items(self, namespace: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """All records of a namespace as (key, data)"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, data FROM records WHERE namespace = ?", (namespace,)
+            ).fetchall()
+        for key, data in rows:
+            yield key, json.loads(data)
+
+    def count(self, namespace: str) -> int:
+        """Number of records in a namespace"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM records WHERE namespace = ?", (namespace,)
+            ).fetchone()[0]
+
+    def clear(self, namespace: str):
+        """Delete all records of a namespace"""
+        with self._lock:
+            self._conn.execute("DELETE FROM records WHERE namespace = ?", (namespace,))
+            self._commit()
+
+    def import_json_records(
+        self, namespace: str, records: Dict[str, Dict[str, Any]], path_field: Optional[str] = None
+    ) -> int:
+        """
+        One-time import of a legacy JSON file's records (skipped if namespace not empty).
+
+        Args:
+            namespace: Target namespace
+            records: {key: data} from the legacy JSON file
+            path_field: Field of data holding the file path (for find_by_path)
+
+        Returns:
+            Number of records imported
+        """
+        if not records or self.count(namespace) > 0:
+            return 0
+
+        with self.batch():
+            for key, data in records.items():
+                self.put(namespace, key, data, path=data.get(path_field) if path_field else None)
+
+        self.logger.info(f"Imported {len(records)} legacy records into '{namespace}'")
+        return len(records)
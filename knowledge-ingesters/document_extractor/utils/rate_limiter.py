@@ -0,0 +1,66 @@
+"""
+Token bucket rate limiter for asyncio stages
+Limits the request rate to external APIs (LLM enrichment, embeddings)
+"""
+
+import asyncio
+import time
+
+
+class AsyncTokenBucket:
+    """
+    Token bucket shared by concurrent asyncio tasks.
+
+    Tokens refill continuously at `rate` per second up to `capacity`;
+    acquire() waits until enough tokens are available.
+
+    Usage:
+        bucket = AsyncTokenBucket.per_minute(50)
+        await bucket.acquire()
+        response = await call_api()
+    """
+
+    def __init__(self, rate: float, capacity: float = None):
+        """
+        Initialize token bucket.
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum burst size (default: max(1, rate))
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    @classmethod
+    def per_minute(cls, requests_per_minute: float, burst: float = None) -> "AsyncTokenBucket":
+        """Create a bucket from a requests-per-minute limit"""
+        return cls(rate=requests_per_minute / 60.0, capacity=burst)
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, tokens: float = 1.0):
+        """
+        Wait until `tokens` are available and consume them.
+
+        Args:
+            tokens: Number of tokens to consume
+        """
+        if tokens > self.capacity:
+            raise ValueError(f"Cannot acquire {tokens} tokens (capacity {self.capacity})")
+
+        # The lock keeps waiters in FIFO order
+        async with self._lock:
+            self._refill()
+            while self._tokens < tokens:
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= tokens
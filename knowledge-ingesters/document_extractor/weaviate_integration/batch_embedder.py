@@ -0,0 +1,186 @@
+"""
+Batch Embedder - Client-side embeddings for Weaviate ingestion
+Computes chunk vectors before import instead of letting text2vec-openai call
+OpenAI once per object
+
+Features:
+- Requests packed up to the API input limits (2048 inputs / 300k tokens)
+- Concurrent requests with bounded concurrency
+- Local content-hash keyed vector store: unchanged text is never re-embedded,
+  even after a collection is dropped and recreated
+"""
+
+import asyncio
+import logging
+import os
+from typing import Dict, List, Optional
+
+from openai import AsyncOpenAI
+
+from weaviate_integration.chunk_identity import chunk_content_hash
+from weaviate_integration.vector_store import LocalVectorStore
+
+try:
+    import tiktoken
+
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+# OpenAI embeddings API limits per request
+MAX_INPUTS_PER_REQUEST = 2048
+MAX_TOKENS_PER_REQUEST = 300_000
+
+# Default dimensions of OpenAI embedding models
+MODEL_DIMENSIONS = {
+    "text-embedding-3-large": 3072,
+    "text-embedding-3-small": 1536,
+    "text-embedding-ada-002": 1536,
+}
+
+
+class BatchEmbedder:
+    """
+    Batched, concurrent, cached embedding of chunk texts.
+
+    Usage:
+        embedder = BatchEmbedder(store_directory="vector_store")
+        vectors = embedder.embed_texts([chunk["content"] for chunk in chunks])
+    """
+
+    def __init__(
+        self,
+        model: str = "text-embedding-3-large",
+        store_directory: Optional[str] = "vector_store",
+        concurrency: int = 4,
+        api_key: Optional[str] = None
+    ):
+        """
+        Initialize batch embedder.
+
+        Args:
+            model: OpenAI embedding model (must match the collection vectorizer)
+            store_directory: Local vector store directory (None = no persistence)
+            concurrency: Maximum concurrent embedding requests
+            api_key: OpenAI API key (default: OPENAI_API_KEY env var)
+        """
+        self.model = model
+        self.dim = MODEL_DIMENSIONS.get(model)
+        self.concurrency = concurrency
+        self.api_key = api_key or os.getenv("OPENAI_API_KEY")
+        self.logger = logging.getLogger(__name__)
+
+        if not self.api_key:
+            raise ValueError("OPENAI_API_KEY not found in environment")
+        if self.dim is None:
+            raise ValueError(f"Unknown embedding model: {model}")
+
+        self.store = LocalVectorStore(store_directory, model, self.dim) if store_directory else None
+
+        self._encoding = None
+        if TIKTOKEN_AVAILABLE:
+            try:
+                self._encoding = tiktoken.encoding_for_model(model)
+            except KeyError:
+                self._encoding = tiktoken.get_encoding("cl100k_base")
+
+        self.stats = {"cached": 0, "embedded": 0, "requests": 0}
+
+    def _count_tokens(self, text: str) -> int:
+        """Token count (conservative estimate without tiktoken)"""
+        if self._encoding is not None:
+            return len(self._encoding.encode(text, disallowed_special=()))
+        return len(text) // 3 + 1
+
+    def _pack_requests(self, texts: Dict[str, str]) -> List[List[str]]:
+        """Group content hashes into requests within the API input limits"""
+        requests: List[List[str]] = []
+        current: List[str] = []
+        current_tokens = 0
+
+        for content_hash, text in texts.items():
+            tokens = self._count_tokens(text)
+            if current and (
+                len(current) >= MAX_INPUTS_PER_REQUEST
+                or current_tokens + tokens > MAX_TOKENS_PER_REQUEST
+            ):
+                requests.append(current)
+                current, current_tokens = [], 0
+            current.append(content_hash)
+            current_tokens += tokens
+
+        if current:
+            requests.append(current)
+        return requests
+
+    def embed_texts(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed texts, reusing stored vectors for text already embedded.
+
+        Must not be called from a running event loop (use embed_texts_async).
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            One vector per input text, in order
+        """
+        return asyncio.run(self.embed_texts_async(texts))
+
+    async def embed_texts_async(self, texts: List[str]) -> List[List[float]]:
+        """Async version of embed_texts()"""
+        hashes = [chunk_content_hash(text) for text in texts]
+
+        vectors: Dict[str, List[float]] = {}
+        if self.store is not None:
+            vectors = {h: v.tolist() for h, v in self.store.get_many(set(hashes)).items()}
+        self.stats["cached"] += sum(1 for h in hashes if h in vectors)
+
+        # Unique texts still missing (first occurrence wins)
+        missing: Dict[str, str] = {}
+        for content_hash, text in zip(hashes, texts):
+            if content_hash not in vectors:
+                missing.setdefault(content_hash, text)
+
+        if missing:
+            vectors.update(await self._embed_missing(missing))
+
+        return [vectors[h] for h in hashes]
+
+    async def _embed_missing(self, missing: Dict[str, str]) -> Dict[str, List[float]]:
+        """Embed texts concurrently, one request per packed group"""
+        semaphore = asyncio.Semaphore(self.concurrency)
+        client = AsyncOpenAI(api_key=self.api_key)
+
+        async def embed_request(group: List[str]) -> Dict[str, List[float]]:
+            async with semaphore:
+                response = await client.embeddings.create(
+                    model=self.model, input=[missing[h] for h in group]
+                )
+            self.stats["requests"] += 1
+            group_vectors = {group[item.index]: item.embedding for item in response.data}
+            # Persist per request so a failed request does not lose the others
+            if self.store is not None:
+                self.store.put_many(group_vectors)
+            return group_vectors
+
+        groups = self._pack_requests(missing)
+        self.logger.info(
+            f"Embedding {len(missing)} texts in {len(groups)} requests "
+            f"(concurrency {self.concurrency})"
+        )
+
+        try:
+            results = await asyncio.gather(
+                *(embed_request(group) for group in groups), return_exceptions=True
+            )
+        finally:
+            await client.close()
+
+        new_vectors: Dict[str, List[float]] = {}
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
+            new_vectors.update(result)
+        self.stats["embedded"] += len(new_vectors)
+        return new_vectors
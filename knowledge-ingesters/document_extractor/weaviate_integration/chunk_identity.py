@@ -0,0 +1,77 @@
+"""
+Chunk Identity - Content-addressed Weaviate object IDs
+Deterministic UUIDs derived from (source_file, normalized chunk text hash)
+
+The same chunk text from the same document always maps to the same object
+ID, so re-ingesting a revised document only needs to insert the chunks whose
+text changed and delete the ones that disappeared. Unchanged chunks keep
+their stored objects and vectors.
+"""
+
+import hashlib
+import re
+import unicodedata
+import uuid
+from pathlib import PurePath
+from typing import Any, Dict, List
+
+# Fixed namespace so IDs are stable across runs and machines
+CHUNK_UUID_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, "intelia-expert/knowledge-chunk")
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_chunk_text(text: str) -> str:
+    """
+    Normalize chunk text before hashing.
+
+    Unicode NFKC + collapsed whitespace, so re-extraction noise (line wraps,
+    non-breaking spaces) does not change the chunk identity.
+    """
+    text = unicodedata.normalize("NFKC", text or "")
+    return _WHITESPACE_RE.sub(" ", text).strip()
+
+
+def chunk_content_hash(text: str) -> str:
+    """SHA-256 hex digest of the normalized chunk text"""
+    return hashlib.sha256(normalize_chunk_text(text).encode("utf-8")).hexdigest()
+
+
+def normalize_source_file(source_file: str) -> str:
+    """Source path with forward slashes (same ID on Windows and Linux)"""
+    return PurePath(source_file).as_posix() if source_file else ""
+
+
+def chunk_uuid(source_file: str, content: str) -> str:
+    """
+    Deterministic Weaviate object ID for a chunk.
+
+    Args:
+        source_file: Source document path
+        content: Chunk text
+
+    Returns:
+        UUID string (uuid5)
+    """
+    key = f"{normalize_source_file(source_file)}|{chunk_content_hash(content)}"
+    return str(uuid.uuid5(CHUNK_UUID_NAMESPACE, key))
+
+
+def assign_chunk_uuids(chunks: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Map deterministic UUIDs to chunks, dropping exact duplicates.
+
+    A chunk repeated verbatim within a document (headers, boilerplate)
+    resolves to the same ID and is only stored once.
+
+    Args:
+        chunks: Chunk dictionaries with 'source_file' and 'content'
+
+    Returns:
+        Ordered dict {uuid: chunk}
+    """
+    chunks_by_id: Dict[str, Dict[str, Any]] = {}
+    for chunk in chunks:
+        object_id = chunk_uuid(chunk.get("source_file", ""), chunk.get("content", ""))
+        chunks_by_id.setdefault(object_id, chunk)
+    return chunks_by_id
@@ -0,0 +1,157 @@
+"""
+Local Chunk Store - Object-ID keyed copy of the ingested chunks
+Lets the RAG service ask Weaviate for IDs and scores only, and read chunk
+bodies, metadata and precomputed boost features from a local memory-mapped
+file instead (rag/retrieval/chunk_store.py, MappedChunkStore)
+
+Chunk vectors, when known (client-side embeddings, snapshot export), are
+stored as well so the RAG service can search without Weaviate
+(rag/retrieval/local_index.py).
+
+Layout:
+- meta.json   : format version, collection name and vector dimension
+- chunks.bin  : append-only records, metadata JSON followed by content UTF-8
+- vectors.f16 : append-only float16 matrix, one row per stored vector
+- index.tsv   : append-only
+                "object_id<TAB>offset<TAB>metadata_len<TAB>content_len<TAB>vector_row"
+                lines; the last line of an ID wins, offset -1 marks a deletion,
+                vector_row -1 means no vector (format 1 lines have 4 columns)
+
+Records and vectors are appended before their index lines, so an interrupted
+write leaves at worst unreferenced bytes, never an index entry without data.
+"""
+
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+FORMAT_VERSION = 2
+
+
+class LocalChunkStore:
+    """
+    Append-only writer of the chunk store shared with the RAG service.
+
+    Usage:
+        store = LocalChunkStore("chunk_store", collection_name="InteliaKnowledgeBase")
+        store.put_many({object_id: data_object, ...})   # Weaviate properties
+        store.put_many(data_objects, vectors={object_id: vector, ...})
+        store.delete_many(object_ids)
+    """
+
+    def __init__(self, directory: str, collection_name: str):
+        """
+        Initialize (or open) a chunk store.
+
+        Args:
+            directory: Base directory (a subdirectory per collection is used)
+            collection_name: Weaviate collection the chunks belong to
+        """
+        self.directory = Path(directory) / collection_name
+        self.collection_name = collection_name
+        self.logger = logging.getLogger(__name__)
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._data_path = self.directory / "chunks.bin"
+        self._index_path = self.directory / "index.tsv"
+        self._vectors_path = self.directory / "vectors.f16"
+        self._meta_path = self.directory / "meta.json"
+
+        if self._meta_path.exists():
+            self._meta = json.loads(self._meta_path.read_text(encoding="utf-8"))
+        else:
+            self._meta = {"format": FORMAT_VERSION, "collection": collection_name}
+            self._write_meta()
+
+    def _write_meta(self):
+        self._meta_path.write_text(json.dumps(self._meta), encoding="utf-8")
+
+    def _append_vectors(self, vectors: Dict[str, List[float]]) -> Dict[str, int]:
+        """Append float16 vector rows, returns {object_id: row}"""
+        if not vectors:
+            return {}
+
+        matrix = np.asarray(list(vectors.values()), dtype=np.float16)
+        dim = self._meta.get("dim")
+        if dim is None:
+            self._meta["dim"] = dim = int(matrix.shape[1])
+            self._write_meta()
+        elif matrix.shape[1] != dim:
+            raise ValueError(f"Expected vectors of dim {dim}, got {matrix.shape[1]}")
+
+        size = self._vectors_path.stat().st_size if self._vectors_path.exists() else 0
+        start_row = size // (2 * dim)
+        with open(self._vectors_path, "ab") as f:
+            f.truncate(start_row * 2 * dim)  # drop a partial row left by a crash
+            f.write(matrix.tobytes())
+        return {object_id: start_row + i for i, object_id in enumerate(vectors)}
+
+    def put_many(
+        self,
+        data_objects: Dict[str, Dict[str, Any]],
+        vectors: Optional[Dict[str, List[float]]] = None,
+    ) -> int:
+        """
+        Append chunks (an ID written again replaces the previous record).
+
+        Args:
+            data_objects: {object_id: Weaviate properties, including "content"}
+            vectors: Optional {object_id: vector} for the same chunks
+
+        Returns:
+            Number of chunks written
+        """
+        if not data_objects:
+            return 0
+
+        vector_rows = self._append_vectors(
+            {i: v for i, v in (vectors or {}).items() if i in data_objects and v is not None}
+        )
+
+        offset = self._data_path.stat().st_size if self._data_path.exists() else 0
+        index_lines = []
+        with open(self._data_path, "ab") as f:
+            for object_id, data_object in data_objects.items():
+                metadata = {k: v for k, v in data_object.items() if k != "content"}
+                metadata_bytes = json.dumps(
+                    metadata, ensure_ascii=False, default=str
+                ).encode("utf-8")
+                content_bytes = (data_object.get("content") or "").encode("utf-8")
+
+                f.write(metadata_bytes)
+                f.write(content_bytes)
+                index_lines.append(
+                    f"{object_id}\t{offset}\t{len(metadata_bytes)}\t{len(content_bytes)}"
+                    f"\t{vector_rows.get(object_id, -1)}\n"
+                )
+                offset += len(metadata_bytes) + len(content_bytes)
+
+        with open(self._index_path, "a", encoding="utf-8") as f:
+            f.writelines(index_lines)
+        return len(index_lines)
+
+    def delete_many(self, object_ids: Iterable[str]) -> int:
+        """
+        Mark chunks as deleted.
+
+        Args:
+            object_ids: Object UUID strings
+
+        Returns:
+            Number of deletion markers written
+        """
+        lines = [f"{object_id}\t-1\t0\t0\t-1\n" for object_id in object_ids]
+        if lines:
+            with open(self._index_path, "a", encoding="utf-8") as f:
+                f.writelines(lines)
+        return len(lines)
+
+    def clear(self):
+        """Remove all chunks (collection deleted)"""
+        for path in (self._data_path, self._vectors_path, self._index_path):
+            if path.exists():
+                path.unlink()
+        self.logger.info(f"Chunk store cleared: {self.directory}")
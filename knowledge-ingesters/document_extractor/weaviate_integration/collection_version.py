@@ -0,0 +1,75 @@
+"""
+Collection Version Stamp - Invalidation of the RAG search results cache
+
+The RAG service caches fused/reranked search results (object IDs + scores)
+under keys that include a per-collection version number stored in Redis
+(rag/cache/cache_search.py). Bumping that number after every write makes
+all cached results of the collection unreachable at once; they expire by TTL.
+
+Key: "search:version:<collection_name>" (plain integer, INCR)
+"""
+
+import os
+import logging
+from typing import Optional
+
+try:
+    import redis
+except ImportError:  # Optional: without redis the cache is only invalidated by TTL
+    redis = None
+
+KEY_PREFIX = "search:version:"
+
+
+class CollectionVersionStamp:
+    """
+    Per-collection version counter shared with the RAG search cache.
+
+    Usage:
+        stamp = CollectionVersionStamp.from_env()   # None if not configured
+        stamp.bump("InteliaKnowledgeBase")
+    """
+
+    def __init__(self, redis_url: str):
+        """
+        Initialize the version stamp.
+
+        Args:
+            redis_url: Redis instance used by the RAG cache (REDIS_URL)
+        """
+        if redis is None:
+            raise ImportError("redis package required for CollectionVersionStamp")
+
+        self.logger = logging.getLogger(__name__)
+        self.client = redis.Redis.from_url(redis_url, socket_timeout=2.0)
+
+    @classmethod
+    def from_env(cls) -> Optional["CollectionVersionStamp"]:
+        """Stamp on REDIS_URL, or None when Redis is not configured/installed"""
+        redis_url = os.getenv("REDIS_URL")
+        if not redis_url or redis is None:
+            return None
+        return cls(redis_url)
+
+    def get(self, collection_name: str) -> int:
+        """Current version (0 if the collection was never stamped)"""
+        value = self.client.get(f"{KEY_PREFIX}{collection_name}")
+        return int(value) if value else 0
+
+    def bump(self, collection_name: str) -> Optional[int]:
+        """
+        Increment the version of a collection.
+
+        Failures are logged, never raised: ingestion must not fail because
+        the cache is unreachable (cached results still expire by TTL).
+
+        Returns:
+            New version, or None on error
+        """
+        try:
+            version = int(self.client.incr(f"{KEY_PREFIX}{collection_name}"))
+            self.logger.info(f"Search cache version of {collection_name}: {version}")
+            return version
+        except Exception as e:
+            self.logger.warning(f"Could not bump version of {collection_name}: {e}")
+            return None
@@ -4,12 +4,13 @@ Prevents reprocessing of already-ingested documents
 """
 
 import json
-import hashlib
 from pathlib import Path
 from typing import Dict, Optional, List
 from datetime import datetime
 import logging
 
+from utils.file_index import FileIndex, DEFAULT_INDEX_PATH
+
 
 class DeduplicationTracker:
     """
@@ -19,63 +20,66 @@ class DeduplicationTracker:
     - Tracks document hash (content-based)
     - Records processing timestamp
     - Records chunk count and metadata
-    - Persistent storage in JSON
+    - Records deterministic chunk IDs (one record per document path; a new
+      version replaces the previous one)
+    - Persistent storage in a shared SQLite index (FileIndex); unchanged
+      files are recognized by (path, size, mtime) without re-hashing
     - Query methods for batch processing
     """
 
-    def __init__(self, tracking_file: str = "processed_documents.json"):
+    def __init__(
+        self,
+        tracking_file: str = "processed_documents.json",
+        index_path: str = DEFAULT_INDEX_PATH
+    ):
         """
         Initialize deduplication tracker.
 
         Args:
-            tracking_file: Path to JSON file storing processed documents
+            tracking_file: Legacy JSON tracking file. Its name is the record
+                namespace; its content is imported once into the index.
+            index_path: SQLite index shared with ProcessingCache
         """
         self.tracking_file = Path(tracking_file)
+        self.namespace = self.tracking_file.stem
         self.logger = logging.getLogger(__name__)
-        self.processed_docs = self._load_tracking_data()
-
-    def _load_tracking_data(self) -> Dict:
-        """Load existing tracking data from JSON"""
-        if self.tracking_file.exists():
-            try:
-                with open(self.tracking_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except Exception as e:
-                self.logger.error(f"Error loading tracking data: {e}")
-                return {}
-        return {}
-
-    def _save_tracking_data(self):
-        """Save tracking data to JSON"""
+        self.index = FileIndex(index_path)
+
+        self._import_legacy_json()
+
+    def _import_legacy_json(self):
+        """Import records from the legacy JSON tracking file (first run only)"""
+        if not self.tracking_file.exists():
+            return
         try:
-            with open(self.tracking_file, 'w', encoding='utf-8') as f:
-                json.dump(self.processed_docs, f, indent=2, ensure_ascii=False)
+            with open(self.tracking_file, 'r', encoding='utf-8') as f:
+                legacy_docs = json.load(f)
+            self.index.import_json_records(self.namespace, legacy_docs, path_field="file_path")
         except Exception as e:
-            self.logger.error(f"Error saving tracking data: {e}")
+            self.logger.error(f"Error importing legacy tracking data: {e}")
+
+    @property
+    def processed_docs(self) -> Dict[str, Dict]:
+        """All records keyed by file hash (read-only snapshot)"""
+        return dict(self.index.items(self.namespace))
 
     def _calculate_file_hash(self, file_path: Path) -> str:
         """
         Calculate SHA-256 hash of file content.
 
+        Uses the index fast path: files with unchanged size and mtime are not read.
+
         Args:
             file_path: Path to file
 
         Returns:
             SHA-256 hash hex string
         """
-        sha256_hash = hashlib.sha256()
-
-        try:
-            with open(file_path, "rb") as f:
-                # Read in chunks to handle large files
-                for byte_block in iter(lambda: f.read(4096), b""):
-                    sha256_hash.update(byte_block)
-
-            return sha256_hash.hexdigest()
+        return self.index.file_hash(file_path)
 
-        except Exception as e:
-            self.logger.error(f"Error hashing file {file_path}: {e}")
-            return ""
+    def batch(self):
+        """Group several updates in one transaction"""
+        return self.index.batch()
 
     def is_processed(self, file_path: str | Path) -> bool:
         """
@@ -87,37 +91,48 @@ class DeduplicationTracker:
         Returns:
             True if already processed, False otherwise
         """
+        return self.get_processed_info(file_path) is not None
+
+    def get_processed_info(self, file_path: str | Path) -> Optional[Dict]:
+        """
+        Get processing information for a document.
+
+        Args:
+            file_path: Path to document
+
+        Returns:
+            Processing info dict or None if not processed
+        """
         file_path = Path(file_path)
 
         if not file_path.exists():
-            return False
+            return None
 
         file_hash = self._calculate_file_hash(file_path)
 
         if not file_hash:
-            return False
+            return None
 
-        # Check if hash exists in processed documents
-        return file_hash in self.processed_docs
+        return self.index.get(self.namespace, file_hash)
 
-    def get_processed_info(self, file_path: str | Path) -> Optional[Dict]:
+    def get_previous_version(self, file_path: str | Path) -> Optional[Dict]:
         """
-        Get processing information for a document.
+        Get the record of an earlier version of a document (same path, different content).
 
         Args:
             file_path: Path to document
 
         Returns:
-            Processing info dict or None if not processed
+            Processing info dict of the previous version, or None
         """
         file_path = Path(file_path)
+        file_hash = self._calculate_file_hash(file_path) if file_path.exists() else ""
 
-        if not file_path.exists():
-            return None
-
-        file_hash = self._calculate_file_hash(file_path)
+        for doc_hash, info in self.index.find_by_path(self.namespace, str(file_path)):
+            if doc_hash != file_hash:
+                return info
 
-        return self.processed_docs.get(file_hash)
+        return None
 
     def mark_as_processed(
         self,
@@ -133,7 +148,7 @@ class DeduplicationTracker:
             file_path: Path to document
             chunks_created: Number of chunks created
             metadata_summary: Metadata summary dict
-            weaviate_ids: Optional list of Weaviate object IDs
+            weaviate_ids: Optional list of Weaviate object IDs (deterministic chunk IDs)
         """
         file_path = Path(file_path)
 
@@ -147,8 +162,7 @@ class DeduplicationTracker:
             self.logger.warning(f"Could not hash file: {file_path}")
             return
 
-        # Record processing information
-        self.processed_docs[file_hash] = {
+        record = {
             "file_path": str(file_path),
             "file_name": file_path.name,
             "file_size_bytes": file_path.stat().st_size,
@@ -159,8 +173,10 @@ class DeduplicationTracker:
             "file_hash": file_hash
         }
 
-        # Save to disk
-        self._save_tracking_data()
+        # Replace records of previous versions of this document (one transaction)
+        with self.index.batch():
+            self.index.delete_by_path(self.namespace, str(file_path), keep_key=file_hash)
+            self.index.put(self.namespace, file_hash, record, path=str(file_path))
 
         self.logger.info(f"Marked as processed: {file_path.name}")
 
@@ -181,9 +197,7 @@ class DeduplicationTracker:
 
         file_hash = self._calculate_file_hash(file_path)
 
-        if file_hash in self.processed_docs:
-            del self.processed_docs[file_hash]
-            self._save_tracking_data()
+        if self.index.delete(self.namespace, file_hash):
             self.logger.info(f"Removed from tracking: {file_path.name}")
             return True
 
@@ -205,27 +219,28 @@ class DeduplicationTracker:
         Returns:
             Statistics dictionary
         """
-        if not self.processed_docs:
+        processed_docs = self.processed_docs
+
+        if not processed_docs:
             return {
                 "total_documents": 0,
                 "total_chunks": 0,
                 "total_size_mb": 0
             }
 
-        total_chunks = sum(doc["chunks_created"] for doc in self.processed_docs.values())
-        total_size_bytes = sum(doc.get("file_size_bytes", 0) for doc in self.processed_docs.values())
+        total_chunks = sum(doc["chunks_created"] for doc in processed_docs.values())
+        total_size_bytes = sum(doc.get("file_size_bytes", 0) for doc in processed_docs.values())
 
         return {
-            "total_documents": len(self.processed_docs),
+            "total_documents": len(processed_docs),
             "total_chunks": total_chunks,
             "total_size_mb": round(total_size_bytes / (1024 * 1024), 2),
-            "average_chunks_per_doc": round(total_chunks / len(self.processed_docs), 1)
+            "average_chunks_per_doc": round(total_chunks / len(processed_docs), 1)
         }
 
     def clear_all(self):
         """Clear all tracking data (use with caution!)"""
-        self.processed_docs = {}
-        self._save_tracking_data()
+        self.index.clear(self.namespace)
         self.logger.warning("Cleared all tracking data")
 
 
@@ -10,10 +10,74 @@ from typing import List, Dict, Any, Optional
 from datetime import datetime
 from pathlib import Path
 import weaviate
-from weaviate.classes.config import Configure, Property, DataType
-from weaviate.classes.query import MetadataQuery
+from weaviate.classes.config import Configure, Property, DataType, Tokenization
+from weaviate.classes.query import MetadataQuery, Filter
 from dotenv import load_dotenv
 
+from weaviate_integration.chunk_identity import assign_chunk_uuids
+from weaviate_integration.collection_version import CollectionVersionStamp
+from weaviate_integration.chunk_store import LocalChunkStore
+from weaviate_integration.near_duplicates import NearDuplicateIndex
+
+# Text properties embedded by the collection vectorizer. The collection name
+# and property names are not vectorized, so the vectorizer input is exactly
+# the 'content' value - the text the client-side embedder embeds.
+VECTORIZED_PROPERTIES = ["content"]
+
+# Properties added after the first collections were created. They are also
+# added to existing collections before the first write (see
+# _ensure_added_properties): left to auto-schema, a text[] would be created
+# vectorized with word tokenization.
+DUPLICATE_SOURCES_PROPERTY = Property(
+    name="duplicate_sources",
+    data_type=DataType.TEXT_ARRAY,
+    skip_vectorization=True,
+    description="Source files whose near-duplicate copies of this chunk were dropped"
+)
+
+# Boost features (filterable, read by RAG boosting)
+BOOST_PROPERTIES = [
+    Property(
+        name="breed_mentions",
+        data_type=DataType.TEXT_ARRAY,
+        skip_vectorization=True,
+        index_filterable=True,
+        tokenization=Tokenization.FIELD,
+        description="Normalized breeds mentioned in the chunk: ross 308, cobb 500, hy line brown"
+    ),
+    Property(
+        name="age_days_mentioned",
+        data_type=DataType.INT_ARRAY,
+        skip_vectorization=True,
+        index_filterable=True,
+        description="Ages in days mentioned in the chunk (35j, 35 days, day 35, age ranges)"
+    ),
+    Property(
+        name="metric_mentions",
+        data_type=DataType.TEXT_ARRAY,
+        skip_vectorization=True,
+        index_filterable=True,
+        tokenization=Tokenization.FIELD,
+        description="Performance metrics mentioned: fcr, poids, mortalité, ponte, gain"
+    ),
+    Property(
+        name="is_technical_source",
+        data_type=DataType.BOOL,
+        skip_vectorization=True,
+        index_filterable=True,
+        description="Boolean: source document is a guide, standard or technical reference"
+    ),
+    Property(
+        name="has_medical_terms",
+        data_type=DataType.BOOL,
+        skip_vectorization=True,
+        index_filterable=True,
+        description="Boolean: chunk contains medical/health terms"
+    ),
+]
+
+ADDED_PROPERTIES = [DUPLICATE_SOURCES_PROPERTY, *BOOST_PROPERTIES]
+
 # Load environment variables
 load_dotenv()
 # Also try parent directories
@@ -30,21 +94,63 @@ class WeaviateIngesterV2:
     Features:
     - Creates InteliaKnowledgeBase collection with rich metadata schema
     - Batch ingestion with progress tracking
+    - Deterministic chunk IDs (source_file + content hash): re-ingestion is an upsert
+    - Incremental document sync (only changed chunks are inserted/deleted)
+    - Optional client-side embeddings (BatchEmbedder + local vector store):
+      objects are imported with precomputed vectors, provided the collection
+      vectorizer embeds the same input (raw 'content', no collection name)
+    - Optional near-duplicate elimination (MinHash/LSH) against the chunks
+      already stored and those ingested earlier in the run
+    - Optional collection version stamp: every write invalidates the RAG
+      search results cache
+    - Optional local chunk store: written/deleted chunks are mirrored to a
+      memory-mapped store read by the RAG service (IDs-only searches)
     - Error handling and retry logic
     - Collection cleanup and recreation
     """
 
-    def __init__(self, collection_name: str = "InteliaKnowledgeBase"):
+    def __init__(
+        self,
+        collection_name: str = "InteliaKnowledgeBase",
+        embedder=None,
+        near_duplicates: Optional[NearDuplicateIndex] = None,
+        version_stamp: Optional[CollectionVersionStamp] = None,
+        chunk_store: Optional[LocalChunkStore] = None
+    ):
         """
         Initialize Weaviate ingester.
 
         Args:
             collection_name: Name of collection (default: InteliaKnowledgeBase)
+            embedder: Optional BatchEmbedder. When set, vectors are computed
+                client-side (cached by content hash) instead of by text2vec-openai.
+                Only used if the collection vectorizer embeds the same input
+                with the same model (see _client_vectors_compatible).
+            near_duplicates: Optional NearDuplicateIndex. When set, it is loaded
+                with the stored chunks on first ingestion and near-duplicate
+                chunks are dropped before writing.
+            version_stamp: Optional CollectionVersionStamp. The collection
+                version is bumped after each write so the RAG search results
+                cache never serves stale chunks. Defaults to
+                CollectionVersionStamp.from_env() (no stamp without REDIS_URL).
+            chunk_store: Optional LocalChunkStore. When set, every chunk
+                written to (or deleted from) Weaviate is mirrored to it.
         """
         self.collection_name = collection_name
         self.logger = logging.getLogger(__name__)
         self.client = None
         self.collection = None
+        self.embedder = embedder
+        self._client_vectors: Optional[bool] = None
+        self._added_properties_checked = False
+        self.near_duplicates = near_duplicates
+        self._near_duplicates_loaded = False
+        self.version_stamp = (
+            version_stamp
+            if version_stamp is not None
+            else CollectionVersionStamp.from_env()
+        )
+        self.chunk_store = chunk_store
 
         self._setup_weaviate_client()
 
@@ -85,6 +191,9 @@ class WeaviateIngesterV2:
             if self.client.collections.exists(self.collection_name):
                 self.client.collections.delete(self.collection_name)
                 self.logger.info(f"Deleted existing collection: {self.collection_name}")
+                if self.chunk_store is not None:
+                    self.chunk_store.clear()
+                self._bump_version()
                 return True
             else:
                 self.logger.info(f"Collection does not exist: {self.collection_name}")
@@ -107,9 +216,11 @@ class WeaviateIngesterV2:
                 name=self.collection_name,
                 description="Multi-format knowledge base with rich metadata for Intelia",
 
-                # Vectorizer configuration
+                # Vectorizer configuration: embeds only VECTORIZED_PROPERTIES,
+                # without the collection name, like the client-side embedder
                 vectorizer_config=Configure.Vectorizer.text2vec_openai(
-                    model="text-embedding-3-large"
+                    model="text-embedding-3-large",
+                    vectorize_collection_name=False
                 ),
 
                 # Properties (metadata fields)
@@ -120,6 +231,7 @@ class WeaviateIngesterV2:
                     Property(
                         name="content",
                         data_type=DataType.TEXT,
+                        vectorize_property_name=False,
                         description="Main text content of the chunk (vectorized)"
                     ),
 
@@ -286,6 +398,12 @@ class WeaviateIngesterV2:
                         skip_vectorization=True,
                         description="Timestamp of extraction (RFC3339)"
                     ),
+                    DUPLICATE_SOURCES_PROPERTY,
+
+                    # ============================================================
+                    # BOOST FEATURES (filterable, read by RAG boosting)
+                    # ============================================================
+                    *BOOST_PROPERTIES,
                 ]
             )
 
@@ -304,45 +422,486 @@ class WeaviateIngesterV2:
         """
         Ingest chunks into Weaviate.
 
+        Objects get deterministic IDs (see chunk_identity), so ingesting the
+        same chunk twice overwrites it instead of creating a duplicate.
+
         Args:
             chunks: List of chunk dictionaries with metadata
 
         Returns:
-            Statistics: {"success": N, "failed": N}
+            Statistics: {"success": N, "failed": N, "near_duplicates": N}
+        """
+        if not self.collection:
+            self.collection = self.client.collections.get(self.collection_name)
+        self._ensure_added_properties()
+
+        kept_chunks = self._drop_near_duplicates(chunks)
+
+        chunks_by_id = assign_chunk_uuids(kept_chunks)
+        if len(chunks_by_id) < len(kept_chunks):
+            self.logger.info(f"Skipped {len(kept_chunks) - len(chunks_by_id)} duplicate chunks")
+
+        stats = self._batch_insert(chunks_by_id)
+        stats["near_duplicates"] = len(chunks) - len(kept_chunks)
+
+        self.logger.info(f"Ingestion complete: {stats['success']} success, {stats['failed']} failed")
+        return stats
+
+    def sync_chunks(self, chunks: List[Dict[str, Any]]) -> Dict[str, int]:
+        """
+        Incrementally re-ingest documents: insert new chunks, delete removed ones.
+
+        Chunks are grouped by source_file. For each document, the IDs stored
+        in Weaviate are compared with the deterministic IDs of the new chunks;
+        chunks whose text did not change are left untouched (no re-embedding).
+
+        Near-duplicates of chunks from other documents are not written; a
+        document whose chunks were all dropped still has its stale objects
+        removed.
+
+        Args:
+            chunks: Chunk dictionaries for one or more complete documents
+
+        Returns:
+            Statistics: {"success": N, "unchanged": N, "deleted": N, "failed": N,
+            "near_duplicates": N}
         """
         if not self.collection:
             self.collection = self.client.collections.get(self.collection_name)
+        self._ensure_added_properties()
+
+        kept_chunks = self._drop_near_duplicates(chunks)
+
+        stats = {
+            "success": 0,
+            "unchanged": 0,
+            "deleted": 0,
+            "failed": 0,
+            "near_duplicates": len(chunks) - len(kept_chunks)
+        }
+
+        documents: Dict[str, List[Dict[str, Any]]] = {
+            chunk.get("source_file", ""): [] for chunk in chunks
+        }
+        for chunk in kept_chunks:
+            documents[chunk.get("source_file", "")].append(chunk)
+
+        for source_file, document_chunks in documents.items():
+            chunks_by_id = assign_chunk_uuids(document_chunks)
+
+            try:
+                existing_ids = self.get_document_chunk_ids(source_file)
+            except Exception as e:
+                self.logger.error(f"Could not list existing chunks for {source_file}: {e}")
+                stats["failed"] += len(chunks_by_id)
+                continue
+
+            new_chunks = {
+                object_id: chunk
+                for object_id, chunk in chunks_by_id.items()
+                if object_id not in existing_ids
+            }
+            stale_ids = existing_ids - chunks_by_id.keys()
+
+            insert_stats = self._batch_insert(new_chunks)
+            stats["success"] += insert_stats["success"]
+            stats["failed"] += insert_stats["failed"]
+            stats["unchanged"] += len(chunks_by_id) - len(new_chunks)
+
+            # Delete removed chunks only once the new version is in place
+            if stale_ids and insert_stats["failed"] == 0:
+                stats["deleted"] += self.delete_chunks(stale_ids)
+                if self.near_duplicates is not None:
+                    self.near_duplicates.discard(stale_ids)
+
+            self.logger.info(
+                f"Synced {Path(source_file).name}: {len(new_chunks)} new, "
+                f"{len(chunks_by_id) - len(new_chunks)} unchanged, {len(stale_ids)} removed"
+            )
+
+        return stats
+
+    def get_document_chunk_ids(self, source_file: str, page_size: int = 1000) -> set:
+        """
+        List IDs of objects stored for a source document.
+
+        Args:
+            source_file: Source document path (as stored in 'source_file')
+            page_size: Objects per request
+
+        Returns:
+            Set of object UUID strings
+        """
+        if not self.collection:
+            self.collection = self.client.collections.get(self.collection_name)
+
+        object_ids = set()
+        offset = 0
+        while True:
+            response = self.collection.query.fetch_objects(
+                filters=Filter.by_property("source_file").equal(source_file),
+                return_properties=[],
+                limit=page_size,
+                offset=offset
+            )
+            object_ids.update(str(obj.uuid) for obj in response.objects)
+
+            if len(response.objects) < page_size:
+                return object_ids
+            offset += page_size
+
+    def delete_chunks(self, object_ids) -> int:
+        """
+        Delete objects by ID.
+
+        Args:
+            object_ids: Iterable of object UUID strings
+
+        Returns:
+            Number of objects deleted
+        """
+        object_ids = list(object_ids)
+        if not object_ids:
+            return 0
+
+        try:
+            result = self.collection.data.delete_many(
+                where=Filter.by_id().contains_any(object_ids)
+            )
+            if result.successful:
+                if self.chunk_store is not None:
+                    self.chunk_store.delete_many(object_ids)
+                self._bump_version()
+            return result.successful
+        except Exception as e:
+            self.logger.error(f"Error deleting {len(object_ids)} chunks: {e}")
+            return 0
+
+    def load_near_duplicate_index(self, page_size: int = 1000) -> int:
+        """
+        Register the chunks already stored in the collection in the
+        near-duplicate index (done automatically on first ingestion).
+
+        Args:
+            page_size: Objects fetched per request
+
+        Returns:
+            Number of stored objects read
+        """
+        if self.near_duplicates is None:
+            return 0
+        if not self.collection:
+            self.collection = self.client.collections.get(self.collection_name)
+
+        loaded = 0
+        for obj in self.collection.iterator(cache_size=page_size):
+            properties = obj.properties
+            self.near_duplicates.add_stored(
+                object_id=str(obj.uuid),
+                source_file=properties.get("source_file") or "",
+                content=properties.get("content") or "",
+                chunk_id=properties.get("chunk_id") or "",
+                duplicate_sources=properties.get("duplicate_sources") or []
+            )
+            loaded += 1
+
+        self._near_duplicates_loaded = True
+        self.logger.info(
+            f"Near-duplicate index: {loaded} stored chunks, "
+            f"{len(self.near_duplicates.stored_duplicate_ids)} already near-duplicates"
+        )
+        return loaded
 
+    def export_chunk_store(self, page_size: int = 500) -> int:
+        """
+        Rebuild the local chunk store from a snapshot of the collection
+        (properties and vectors), e.g. for a store created after ingestion.
+
+        Args:
+            page_size: Objects fetched per request (and written per batch)
+
+        Returns:
+            Number of chunks exported
+        """
+        if self.chunk_store is None:
+            raise ValueError("No chunk store configured")
+        if not self.collection:
+            self.collection = self.client.collections.get(self.collection_name)
+
+        self.chunk_store.clear()
+        exported = 0
+        data_objects: Dict[str, Dict[str, Any]] = {}
+        vectors: Dict[str, List[float]] = {}
+
+        for obj in self.collection.iterator(include_vector=True, cache_size=page_size):
+            object_id = str(obj.uuid)
+            data_objects[object_id] = dict(obj.properties)
+            vector = obj.vector.get("default") if isinstance(obj.vector, dict) else obj.vector
+            if vector:
+                vectors[object_id] = vector
+
+            if len(data_objects) >= page_size:
+                exported += self.chunk_store.put_many(data_objects, vectors=vectors)
+                data_objects, vectors = {}, {}
+
+        exported += self.chunk_store.put_many(data_objects, vectors=vectors)
+        self._bump_version()
+        self.logger.info(f"Chunk store snapshot: {exported} chunks exported")
+        return exported
+
+    def remove_stored_near_duplicates(self) -> Dict[str, int]:
+        """
+        Delete stored chunks that are near-duplicates of another stored chunk
+        and record their sources on the canonical chunks.
+
+        Returns:
+            Statistics: {"deleted": N, "canonicals_updated": N}
+        """
+        if self.near_duplicates is None:
+            return {"deleted": 0, "canonicals_updated": 0}
+        if not self._near_duplicates_loaded:
+            self.load_near_duplicate_index()
+
+        updated = self.update_duplicate_sources(self.near_duplicates.stored_duplicate_updates())
+        deleted = self.delete_chunks(self.near_duplicates.stored_duplicate_ids)
+        return {"deleted": deleted, "canonicals_updated": updated}
+
+    def update_duplicate_sources(self, updates: Dict[str, List[str]]) -> int:
+        """
+        Store provenance links on canonical chunks.
+
+        Args:
+            updates: {object UUID: duplicate_sources}
+
+        Returns:
+            Number of objects updated
+        """
+        if updates:
+            self._ensure_added_properties()
+
+        updated_ids = []
+        for object_id, duplicate_sources in updates.items():
+            try:
+                self.collection.data.update(
+                    uuid=object_id,
+                    properties={"duplicate_sources": duplicate_sources}
+                )
+                updated_ids.append(object_id)
+            except Exception as e:
+                self.logger.error(f"Error updating duplicate_sources of {object_id}: {e}")
+
+        if updated_ids:
+            if self.chunk_store is not None:
+                self._refresh_chunk_store(updated_ids)
+            self._bump_version()
+        return len(updated_ids)
+
+    def _refresh_chunk_store(self, object_ids: List[str], page_size: int = 500):
+        """
+        Rewrite chunks updated in place into the local chunk store.
+
+        The updated objects are read back (properties and vector) so the
+        store records stay complete: IDs-only searches hydrate from them.
+
+        Args:
+            object_ids: Object UUID strings
+            page_size: Objects fetched per request
+        """
+        for start in range(0, len(object_ids), page_size):
+            page = object_ids[start:start + page_size]
+            try:
+                response = self.collection.query.fetch_objects(
+                    filters=Filter.by_id().contains_any(page),
+                    include_vector=True,
+                    limit=len(page)
+                )
+            except Exception as e:
+                self.logger.error(f"Error reading updated chunks for the chunk store: {e}")
+                continue
+
+            data_objects: Dict[str, Dict[str, Any]] = {}
+            vectors: Dict[str, List[float]] = {}
+            for obj in response.objects:
+                object_id = str(obj.uuid)
+                data_objects[object_id] = dict(obj.properties)
+                vector = obj.vector.get("default") if isinstance(obj.vector, dict) else obj.vector
+                if vector:
+                    vectors[object_id] = vector
+            self.chunk_store.put_many(data_objects, vectors=vectors)
+
+    def _ensure_added_properties(self):
+        """
+        Add to an existing collection the properties created after it
+        (duplicate_sources and the boost features), with their declared
+        definitions.
+
+        Without it, Weaviate auto-schema creates them on the first write as
+        vectorized text[] with word tokenization: text2vec-openai embeds the
+        lists into the chunk vectors (and client-side vectors get disabled,
+        see _client_vectors_compatible), and ContainsAny(["ross 308"])
+        matches single tokens.
+        """
+        if self._added_properties_checked:
+            return
+        try:
+            existing = {prop.name for prop in self.collection.config.get().properties}
+            for prop in ADDED_PROPERTIES:
+                if prop.name not in existing:
+                    self.collection.config.add_property(prop)
+                    self.logger.info(f"Added {prop.name} property to {self.collection_name}")
+            self._added_properties_checked = True
+        except Exception as e:
+            self.logger.error(f"Error checking added properties: {e}")
+
+    def _drop_near_duplicates(self, chunks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Filter chunks through the near-duplicate index (no-op when disabled)"""
+        if self.near_duplicates is None or not chunks:
+            return chunks
+        if not self._near_duplicates_loaded:
+            self.load_near_duplicate_index()
+
+        kept_chunks, updates = self.near_duplicates.filter_chunks(chunks)
+        if len(kept_chunks) < len(chunks):
+            self.logger.info(f"Dropped {len(chunks) - len(kept_chunks)} near-duplicate chunks")
+
+        # Canonicals written earlier: add the new provenance links
+        self.update_duplicate_sources(updates)
+        return kept_chunks
+
+    def _batch_insert(self, chunks_by_id: Dict[str, Dict[str, Any]]) -> Dict[str, int]:
+        """Batch insert (upsert) chunks under their deterministic IDs"""
         stats = {"success": 0, "failed": 0}
+        if not chunks_by_id:
+            return stats
+
+        vectors = self._compute_vectors(chunks_by_id)
+        data_objects: Dict[str, Dict[str, Any]] = {}
 
         try:
             # Use batch insert for efficiency
             with self.collection.batch.dynamic() as batch:
-                for i, chunk in enumerate(chunks):
+                for i, (object_id, chunk) in enumerate(chunks_by_id.items()):
                     try:
                         # Prepare data object
                         data_object = self._prepare_data_object(chunk)
 
-                        # Add to batch
-                        batch.add_object(properties=data_object)
+                        data_objects[object_id] = data_object
+
+                        # Add to batch (no vector = vectorized by Weaviate)
+                        batch.add_object(
+                            properties=data_object,
+                            uuid=object_id,
+                            vector=vectors.get(object_id)
+                        )
 
                         stats["success"] += 1
 
                         if (i + 1) % 10 == 0:
-                            self.logger.info(f"Ingested {i + 1}/{len(chunks)} chunks")
+                            self.logger.info(f"Ingested {i + 1}/{len(chunks_by_id)} chunks")
 
                     except Exception as e:
                         self.logger.error(f"Error adding chunk {i}: {e}")
                         stats["failed"] += 1
 
-            self.logger.info(f"Ingestion complete: {stats['success']} success, {stats['failed']} failed")
-
+            # Objects rejected by the server are only known after the batch
+            failed_objects = self.collection.batch.failed_objects
+            if failed_objects:
+                stats["success"] -= len(failed_objects)
+                stats["failed"] += len(failed_objects)
+                for failed in failed_objects:
+                    failed_id = getattr(getattr(failed, "object_", None), "uuid", None)
+                    data_objects.pop(str(failed_id), None)
+
+            if self.chunk_store is not None:
+                self.chunk_store.put_many(data_objects, vectors=vectors)
+            if stats["success"]:
+                self._bump_version()
             return stats
 
         except Exception as e:
             self.logger.error(f"Batch ingestion error: {e}")
             return stats
 
+    def _bump_version(self):
+        """Invalidate the RAG search results cache of the collection"""
+        if self.version_stamp is not None:
+            self.version_stamp.bump(self.collection_name)
+
+    def _compute_vectors(self, chunks_by_id: Dict[str, Dict[str, Any]]) -> Dict[str, List[float]]:
+        """Precompute vectors with the client-side embedder (empty if disabled or failed)"""
+        if self.embedder is None:
+            return {}
+
+        if self._client_vectors is None:
+            self._client_vectors = self._client_vectors_compatible()
+        if not self._client_vectors:
+            return {}
+
+        try:
+            embeddings = self.embedder.embed_texts(
+                [chunk.get("content", "") for chunk in chunks_by_id.values()]
+            )
+            return dict(zip(chunks_by_id.keys(), embeddings))
+        except Exception as e:
+            # Fall back to server-side vectorization
+            self.logger.warning(f"Client-side embedding failed, using Weaviate vectorizer: {e}")
+            return {}
+
+    def _client_vectors_compatible(self) -> bool:
+        """
+        Check that client-side vectors live in the collection's vector space.
+
+        text2vec-openai embeds the collection name (unless disabled) followed
+        by every vectorized text property, while the client-side embedder
+        embeds the raw 'content'. Mixing both kinds of vectors in one
+        collection silently degrades near-vector and hybrid ranking, so
+        client-side vectors are only used when the vectorizer input is
+        exactly 'content' and the model is the same.
+
+        Collections created before vectorize_collection_name=False must be
+        recreated (delete_collection + create_collection) and re-ingested
+        to use client-side vectors; until then Weaviate vectorizes.
+
+        Returns:
+            True if client-side vectors can be written
+        """
+        try:
+            config = self.collection.config.get()
+        except Exception as e:
+            self.logger.warning(f"Could not read collection config, using Weaviate vectorizer: {e}")
+            return False
+
+        problems = []
+        vectorizer = config.vectorizer_config
+        if vectorizer is not None:
+            if vectorizer.vectorize_collection_name:
+                problems.append("collection name is vectorized")
+            model = (vectorizer.model or {}).get("model")
+            if model and model != self.embedder.model:
+                problems.append(f"vectorizer model {model} != {self.embedder.model}")
+
+        vectorized = []
+        for prop in config.properties:
+            if prop.data_type not in (DataType.TEXT, DataType.TEXT_ARRAY):
+                continue
+            prop_vectorizer = prop.vectorizer_config
+            if prop_vectorizer is not None and prop_vectorizer.skip:
+                continue
+            vectorized.append(prop.name)
+            if prop_vectorizer is not None and prop_vectorizer.vectorize_property_name:
+                problems.append(f"property name '{prop.name}' is vectorized")
+        if sorted(vectorized) != VECTORIZED_PROPERTIES:
+            problems.append(f"vectorized properties {sorted(vectorized)} != {VECTORIZED_PROPERTIES}")
+
+        if problems:
+            self.logger.warning(
+                f"Client-side vectors disabled for {self.collection_name} "
+                f"({'; '.join(problems)}): objects are vectorized by Weaviate. "
+                "Recreate the collection and re-ingest to use client-side vectors."
+            )
+            return False
+        return True
+
     def _prepare_data_object(self, chunk: Dict[str, Any]) -> Dict[str, Any]:
         """
         Prepare chunk data for Weaviate ingestion.
@@ -396,6 +955,14 @@ class WeaviateIngesterV2:
             "extraction_method": chunk.get("extraction_method", ""),
             "chunk_id": chunk.get("chunk_id", ""),
             "extraction_timestamp": timestamp,
+            "duplicate_sources": chunk.get("duplicate_sources", []),
+
+            # Boost features
+            "breed_mentions": chunk.get("breed_mentions", []),
+            "age_days_mentioned": chunk.get("age_days_mentioned", []),
+            "metric_mentions": chunk.get("metric_mentions", []),
+            "is_technical_source": chunk.get("is_technical_source", False),
+            "has_medical_terms": chunk.get("has_medical_terms", False),
         }
 
         return data_object
@@ -0,0 +1,431 @@
+"""
+Near-Duplicate Chunks - MinHash signatures + LSH banding
+Drops chunks that are near-identical to a chunk already kept, across the
+whole corpus and the existing Weaviate collection
+
+Revisions of the same management guide, or web pages mirroring a PDF,
+produce chunks that differ by a few words. Their exact content hashes
+differ (see chunk_identity), but their word-shingle sets overlap almost
+entirely. Each chunk gets a MinHash signature; LSH bands find candidate
+canonicals in near-constant time, and a candidate is accepted when the
+estimated Jaccard similarity reaches the threshold.
+
+The first chunk seen is canonical (chunks already in the collection come
+first). Canonicals keep provenance links to the documents whose copies
+were dropped (duplicate_sources). A dropped copy is not restored if its
+canonical is later deleted: re-ingest the documents listed in its
+duplicate_sources.
+"""
+
+import json
+import re
+import zlib
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from weaviate_integration.chunk_identity import chunk_uuid, normalize_chunk_text
+
+DEFAULT_THRESHOLD = 0.85
+DEFAULT_NUM_PERM = 128
+DEFAULT_SHINGLE_SIZE = 5
+
+_TOKEN_RE = re.compile(r"\w+")
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+# numpy >= 2.0 renamed trapz
+_trapezoid = getattr(np, "trapezoid", None) or np.trapz
+
+
+def word_shingles(text: str, size: int = DEFAULT_SHINGLE_SIZE) -> Set[str]:
+    """
+    Word n-grams of the normalized, lowercased text.
+
+    Args:
+        text: Chunk text
+        size: Words per shingle
+
+    Returns:
+        Set of shingles (a single shingle for texts shorter than size)
+    """
+    tokens = _TOKEN_RE.findall(normalize_chunk_text(text).lower())
+    if len(tokens) <= size:
+        return {" ".join(tokens)} if tokens else set()
+    return {" ".join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)}
+
+
+def lsh_params(threshold: float, num_perm: int) -> Tuple[int, int]:
+    """
+    Choose (bands, rows) minimizing false positives + false negatives.
+
+    A pair with Jaccard similarity s shares at least one band with
+    probability 1 - (1 - s^rows)^bands.
+
+    Args:
+        threshold: Jaccard similarity threshold
+        num_perm: Signature length
+
+    Returns:
+        (bands, rows) with bands * rows <= num_perm
+    """
+    def collision(s, bands, rows):
+        return 1.0 - (1.0 - s ** rows) ** bands
+
+    below = np.linspace(0.0, threshold, 50)
+    above = np.linspace(threshold, 1.0, 50)
+
+    best, best_error = (1, num_perm), float("inf")
+    for bands in range(1, num_perm + 1):
+        rows = num_perm // bands
+        false_positive = _trapezoid(collision(below, bands, rows), below)
+        false_negative = _trapezoid(1.0 - collision(above, bands, rows), above)
+        error = false_positive + false_negative
+        if error < best_error:
+            best, best_error = (bands, rows), error
+    return best
+
+
+class MinHasher:
+    """MinHash signatures with a fixed seed (comparable across runs)"""
+
+    def __init__(self, num_perm: int = DEFAULT_NUM_PERM, seed: int = 1):
+        """
+        Initialize hash permutations.
+
+        Args:
+            num_perm: Signature length
+            seed: Permutation seed
+        """
+        self.num_perm = num_perm
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, _MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, _MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+
+    def signature(self, shingles: Set[str]) -> np.ndarray:
+        """
+        MinHash signature of a shingle set.
+
+        Args:
+            shingles: Output of word_shingles()
+
+        Returns:
+            uint32 array of length num_perm
+        """
+        if not shingles:
+            return np.full(self.num_perm, _MAX_HASH, dtype=np.uint32)
+
+        hashes = np.fromiter(
+            (zlib.crc32(s.encode("utf-8")) for s in shingles),
+            dtype=np.uint64,
+            count=len(shingles)
+        )
+        # (a * h + b) mod p, uint64 wraparound as in the usual numpy MinHash
+        permuted = ((hashes[:, None] * self._a + self._b) % _MERSENNE_PRIME) & _MAX_HASH
+        return permuted.min(axis=0).astype(np.uint32)
+
+
+@dataclass
+class _Entry:
+    """A canonical chunk registered in the LSH index"""
+    object_id: str
+    source_file: str
+    chunk_id: str
+    signature: np.ndarray
+    stored: bool
+    duplicate_sources: List[str] = field(default_factory=list)
+    removed: bool = False
+
+
+class NearDuplicateIndex:
+    """
+    LSH index of canonical chunks.
+
+    Usage:
+        index = NearDuplicateIndex(threshold=0.85)
+        index.add_stored(object_id, source_file, content)   # existing collection
+        kept, updates = index.filter_chunks(chunks)          # new chunks
+        index.write_report("near_duplicates_report.json")
+    """
+
+    def __init__(
+        self,
+        threshold: float = DEFAULT_THRESHOLD,
+        num_perm: int = DEFAULT_NUM_PERM,
+        shingle_size: int = DEFAULT_SHINGLE_SIZE
+    ):
+        """
+        Initialize index.
+
+        Args:
+            threshold: Estimated Jaccard similarity above which a chunk is a duplicate
+            num_perm: MinHash signature length (estimate error ~ 1/sqrt(num_perm))
+            shingle_size: Words per shingle
+        """
+        if not 0.0 < threshold <= 1.0:
+            raise ValueError("threshold must be in (0, 1]")
+
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        self.hasher = MinHasher(num_perm)
+        self.bands, self.rows = lsh_params(threshold, num_perm)
+
+        self._entries: List[_Entry] = []
+        self._buckets: List[Dict[bytes, List[int]]] = [{} for _ in range(self.bands)]
+        self._by_object_id: Dict[str, int] = {}
+
+        self.duplicates: List[Dict[str, Any]] = []
+        self.stored_duplicate_ids: List[str] = []
+        self.stats = {
+            "stored_chunks": 0,
+            "stored_near_duplicates": 0,
+            "new_chunks": 0,
+            "new_near_duplicates": 0,
+        }
+
+    def __len__(self) -> int:
+        return len(self._by_object_id)
+
+    def _signature(self, content: str) -> np.ndarray:
+        return self.hasher.signature(word_shingles(content, self.shingle_size))
+
+    def _band_keys(self, signature: np.ndarray):
+        for band in range(self.bands):
+            yield band, signature[band * self.rows:(band + 1) * self.rows].tobytes()
+
+    def _add(self, entry: _Entry) -> int:
+        entry_idx = len(self._entries)
+        self._entries.append(entry)
+        # Same object re-ingested (unchanged chunk of a re-synced document)
+        previous_idx = self._by_object_id.get(entry.object_id)
+        if previous_idx is not None:
+            self._entries[previous_idx].removed = True
+            entry.duplicate_sources = self._entries[previous_idx].duplicate_sources
+        self._by_object_id[entry.object_id] = entry_idx
+        for band, key in self._band_keys(entry.signature):
+            self._buckets[band].setdefault(key, []).append(entry_idx)
+        return entry_idx
+
+    def _find_canonical(
+        self, signature: np.ndarray, source_file: str, skip_stored_same_source: bool,
+        same_source_only: bool = False
+    ) -> Optional[Tuple[int, float]]:
+        """Most similar canonical above the threshold, as (entry index, similarity)"""
+        candidates = set()
+        for band, key in self._band_keys(signature):
+            candidates.update(self._buckets[band].get(key, ()))
+
+        best = None
+        for entry_idx in candidates:
+            entry = self._entries[entry_idx]
+            if entry.removed:
+                continue
+            stored_same_source = entry.stored and entry.source_file == source_file
+            # A document's stored chunks are replaced when it is re-synced
+            if (skip_stored_same_source and stored_same_source) or \
+                    (same_source_only and not stored_same_source):
+                continue
+            similarity = float(np.mean(entry.signature == signature))
+            if similarity >= self.threshold and (best is None or similarity > best[1]):
+                best = (entry_idx, similarity)
+        return best
+
+    def _record_duplicate(
+        self, canonical: _Entry, object_id: str, source_file: str, chunk_id: str,
+        similarity: float, stored: bool
+    ):
+        if source_file and source_file not in canonical.duplicate_sources:
+            canonical.duplicate_sources.append(source_file)
+        self.duplicates.append({
+            "object_id": object_id,
+            "source_file": source_file,
+            "chunk_id": chunk_id,
+            "canonical_id": canonical.object_id,
+            "canonical_source_file": canonical.source_file,
+            "canonical_chunk_id": canonical.chunk_id,
+            "similarity": round(similarity, 3),
+            "stored": stored,
+        })
+
+    def add_stored(
+        self,
+        object_id: str,
+        source_file: str,
+        content: str,
+        chunk_id: str = "",
+        duplicate_sources: Optional[List[str]] = None
+    ) -> Optional[str]:
+        """
+        Register a chunk already stored in the collection.
+
+        Args:
+            object_id: Weaviate object UUID
+            source_file: Source document path
+            content: Chunk text
+            chunk_id: Chunk identifier (report only)
+            duplicate_sources: Provenance links already stored on the object
+
+        Returns:
+            Canonical object ID if this stored chunk is itself a near-duplicate
+            (it is then listed in stored_duplicate_ids), else None
+        """
+        self.stats["stored_chunks"] += 1
+        signature = self._signature(content)
+
+        match = self._find_canonical(signature, source_file, skip_stored_same_source=False)
+        if match is not None:
+            canonical = self._entries[match[0]]
+            self._record_duplicate(canonical, object_id, source_file, chunk_id, match[1], stored=True)
+            for source in duplicate_sources or []:
+                if source not in canonical.duplicate_sources:
+                    canonical.duplicate_sources.append(source)
+            self.stored_duplicate_ids.append(object_id)
+            self.stats["stored_near_duplicates"] += 1
+            return canonical.object_id
+
+        self._add(_Entry(
+            object_id=object_id,
+            source_file=source_file,
+            chunk_id=chunk_id,
+            signature=signature,
+            stored=True,
+            duplicate_sources=list(duplicate_sources or [])
+        ))
+        return None
+
+    def filter_chunks(
+        self, chunks: List[Dict[str, Any]]
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, List[str]]]:
+        """
+        Drop near-duplicates from a batch of new chunks.
+
+        Kept chunks become canonicals for later batches. Canonicals in this
+        batch get their 'duplicate_sources' set; canonicals written earlier
+        are returned as updates.
+
+        Args:
+            chunks: Chunk dictionaries with 'source_file' and 'content'
+
+        Returns:
+            (kept chunks, {canonical object ID: duplicate_sources} for
+            canonicals already stored)
+        """
+        kept: List[Dict[str, Any]] = []
+        batch_chunks: Dict[int, Dict[str, Any]] = {}
+        updated: Set[int] = set()
+
+        for chunk in chunks:
+            self.stats["new_chunks"] += 1
+            source_file = chunk.get("source_file", "")
+            content = chunk.get("content", "")
+            object_id = chunk_uuid(source_file, content)
+            signature = self._signature(content)
+
+            match = self._find_canonical(signature, source_file, skip_stored_same_source=True)
+            if match is not None:
+                entry_idx, similarity = match
+                self._record_duplicate(
+                    self._entries[entry_idx], object_id, source_file,
+                    chunk.get("chunk_id", ""), similarity, stored=False
+                )
+                self.stats["new_near_duplicates"] += 1
+                updated.add(entry_idx)
+                continue
+
+            # Revised chunk of a stored document keeps the provenance links
+            previous = self._find_canonical(
+                signature, source_file, skip_stored_same_source=False, same_source_only=True
+            )
+            entry_idx = self._add(_Entry(
+                object_id=object_id,
+                source_file=source_file,
+                chunk_id=chunk.get("chunk_id", ""),
+                signature=signature,
+                stored=False,
+                duplicate_sources=list(self._entries[previous[0]].duplicate_sources) if previous else []
+            ))
+            batch_chunks[entry_idx] = chunk
+            kept.append(chunk)
+
+        updates = {
+            self._entries[entry_idx].object_id: list(self._entries[entry_idx].duplicate_sources)
+            for entry_idx in updated
+            if entry_idx not in batch_chunks
+        }
+
+        # The caller writes the kept chunks next
+        for entry_idx, chunk in batch_chunks.items():
+            entry = self._entries[entry_idx]
+            entry.stored = True
+            if entry.duplicate_sources:
+                chunk["duplicate_sources"] = list(entry.duplicate_sources)
+
+        return kept, updates
+
+    def discard(self, object_ids) -> int:
+        """
+        Stop using deleted objects as canonicals.
+
+        Args:
+            object_ids: UUIDs of objects deleted from the collection
+
+        Returns:
+            Number of canonicals discarded
+        """
+        discarded = 0
+        for object_id in object_ids:
+            entry_idx = self._by_object_id.pop(object_id, None)
+            if entry_idx is not None:
+                self._entries[entry_idx].removed = True
+                discarded += 1
+        return discarded
+
+    def stored_duplicate_updates(self) -> Dict[str, List[str]]:
+        """Provenance of canonicals whose stored copies are listed in stored_duplicate_ids"""
+        canonical_ids = {d["canonical_id"] for d in self.duplicates if d["stored"]}
+        return {
+            entry.object_id: list(entry.duplicate_sources)
+            for entry in self._entries
+            if entry.object_id in canonical_ids
+        }
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Summary and list of dropped chunks.
+
+        Returns:
+            Report dictionary (JSON-serializable)
+        """
+        total = self.stats["stored_chunks"] + self.stats["new_chunks"]
+        removed = self.stats["stored_near_duplicates"] + self.stats["new_near_duplicates"]
+
+        return {
+            "generated_at": datetime.now().isoformat(),
+            "threshold": self.threshold,
+            "num_perm": self.hasher.num_perm,
+            "bands": self.bands,
+            "rows": self.rows,
+            "shingle_size": self.shingle_size,
+            **self.stats,
+            "canonical_chunks": len(self._by_object_id),
+            "reduction_ratio": round(removed / total, 4) if total else 0.0,
+            "duplicates": self.duplicates,
+        }
+
+    def write_report(self, path: str | Path) -> Dict[str, Any]:
+        """
+        Write report() as JSON.
+
+        Args:
+            path: Output file
+
+        Returns:
+            The report
+        """
+        report = self.report()
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        return report
@@ -4,7 +4,7 @@ Updated schema with path-based + vision-based metadata
 Multi-tenant support via metadata filtering
 """
 
-from weaviate.classes.config import Configure, Property, DataType
+from weaviate.classes.config import Configure, Property, DataType, Tokenization
 from typing import List, Dict, Any
 
 
@@ -304,6 +304,47 @@ def create_knowledge_chunks_schema() -> Dict[str, Any]:
             description="JSON string of age ranges: [{start: 1, end: 21, unit: 'days'}, ...]"
         ),
 
+        # ============================================================
+        # BOOST FEATURES (filterable, read by RAG boosting)
+        # ============================================================
+        Property(
+            name="breed_mentions",
+            data_type=DataType.TEXT_ARRAY,
+            skip_vectorization=True,
+            index_filterable=True,
+            tokenization=Tokenization.FIELD,
+            description="Normalized breeds mentioned in the chunk: ross 308, cobb 500, hy line brown"
+        ),
+        Property(
+            name="age_days_mentioned",
+            data_type=DataType.INT_ARRAY,
+            skip_vectorization=True,
+            index_filterable=True,
+            description="Ages in days mentioned in the chunk (35j, 35 days, day 35, age ranges)"
+        ),
+        Property(
+            name="metric_mentions",
+            data_type=DataType.TEXT_ARRAY,
+            skip_vectorization=True,
+            index_filterable=True,
+            tokenization=Tokenization.FIELD,
+            description="Performance metrics mentioned: fcr, poids, mortalité, ponte, gain"
+        ),
+        Property(
+            name="is_technical_source",
+            data_type=DataType.BOOL,
+            skip_vectorization=True,
+            index_filterable=True,
+            description="Boolean: source document is a guide, standard or technical reference"
+        ),
+        Property(
+            name="has_medical_terms",
+            data_type=DataType.BOOL,
+            skip_vectorization=True,
+            index_filterable=True,
+            description="Boolean: chunk contains medical/health terms"
+        ),
+
         # ============================================================
         # SOURCE TRACKING
         # ============================================================
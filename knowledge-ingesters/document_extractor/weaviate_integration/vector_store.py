@@ -0,0 +1,153 @@
+"""
+Local Vector Store - Content-hash keyed embedding cache
+Persists embeddings so collection recreation / reindexing does not pay for
+the same text twice
+
+Layout (one directory per embedding model):
+- meta.json    : model name and vector dimension
+- vectors.f32  : float32 matrix, one row per vector (memory-mapped for reads)
+- index.tsv    : append-only "content_hash<TAB>row" lines
+
+Vectors are appended before their index lines, so an interrupted write
+leaves at worst unreferenced rows, never an index entry without a vector.
+A partial row left by a torn write is truncated before the next append, so
+later rows stay aligned with their index entries.
+"""
+
+import json
+import logging
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+
+class LocalVectorStore:
+    """
+    Append-only, memory-mapped store of embeddings keyed by content hash.
+
+    Usage:
+        store = LocalVectorStore("vector_store", model="text-embedding-3-large", dim=3072)
+        cached = store.get_many(hashes)          # {hash: np.ndarray}
+        store.put_many({hash: vector, ...})
+    """
+
+    def __init__(self, directory: str, model: str, dim: int):
+        """
+        Initialize (or open) a vector store.
+
+        Args:
+            directory: Base directory (a subdirectory per model is used)
+            model: Embedding model name (vectors of different models never mix)
+            dim: Vector dimension
+        """
+        self.directory = Path(directory) / model.replace("/", "_")
+        self.model = model
+        self.dim = dim
+        self.logger = logging.getLogger(__name__)
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._vectors_path = self.directory / "vectors.f32"
+        self._index_path = self.directory / "index.tsv"
+        self._meta_path = self.directory / "meta.json"
+
+        self._check_meta()
+        self._index: Dict[str, int] = self._load_index()
+        self._matrix: Optional[np.memmap] = None
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, content_hash: str) -> bool:
+        return content_hash in self._index
+
+    def _check_meta(self):
+        """Write meta.json on creation, refuse to reuse a store with another dimension"""
+        if self._meta_path.exists():
+            meta = json.loads(self._meta_path.read_text(encoding="utf-8"))
+            if meta.get("dim") != self.dim:
+                raise ValueError(
+                    f"Vector store {self.directory} has dim {meta.get('dim')}, expected {self.dim}"
+                )
+        else:
+            self._meta_path.write_text(
+                json.dumps({"model": self.model, "dim": self.dim}), encoding="utf-8"
+            )
+
+    def _row_count(self) -> int:
+        """Number of complete rows in vectors.f32"""
+        if not self._vectors_path.exists():
+            return 0
+        return self._vectors_path.stat().st_size // (4 * self.dim)
+
+    def _load_index(self) -> Dict[str, int]:
+        """Load index.tsv, ignoring entries without a stored row"""
+        index: Dict[str, int] = {}
+        if not self._index_path.exists():
+            return index
+
+        rows = self._row_count()
+        with open(self._index_path, "r", encoding="utf-8") as f:
+            for line in f:
+                parts = line.rstrip("\n").split("\t")
+                if len(parts) != 2:
+                    continue
+                content_hash, row = parts[0], int(parts[1])
+                if row < rows:
+                    index[content_hash] = row
+
+        self.logger.info(f"Vector store loaded: {len(index)} vectors ({self.directory})")
+        return index
+
+    def _get_matrix(self) -> Optional[np.memmap]:
+        """Memory-map the vector file (re-mapped after appends)"""
+        rows = self._row_count()
+        if rows == 0:
+            return None
+        if self._matrix is None or self._matrix.shape[0] != rows:
+            self._matrix = np.memmap(
+                self._vectors_path, dtype=np.float32, mode="r", shape=(rows, self.dim)
+            )
+        return self._matrix
+
+    def get_many(self, content_hashes: Iterable[str]) -> Dict[str, np.ndarray]:
+        """
+        Look up stored vectors.
+
+        Args:
+            content_hashes: Content hashes to look up
+
+        Returns:
+            {content_hash: vector} for the hashes found
+        """
+        found = {h: self._index[h] for h in content_hashes if h in self._index}
+        if not found:
+            return {}
+
+        matrix = self._get_matrix()
+        return {h: np.array(matrix[row]) for h, row in found.items()}
+
+    def put_many(self, vectors: Dict[str, List[float]]):
+        """
+        Append vectors (hashes already stored are skipped).
+
+        Args:
+            vectors: {content_hash: vector}
+        """
+        new_items = [(h, v) for h, v in vectors.items() if h not in self._index]
+        if not new_items:
+            return
+
+        matrix = np.asarray([v for _, v in new_items], dtype=np.float32)
+        if matrix.shape[1] != self.dim:
+            raise ValueError(f"Expected vectors of dim {self.dim}, got {matrix.shape[1]}")
+
+        start_row = self._row_count()
+        with open(self._vectors_path, "ab") as f:
+            f.truncate(start_row * 4 * self.dim)  # drop a partial row left by a crash
+            f.write(matrix.tobytes())
+
+        with open(self._index_path, "a", encoding="utf-8") as f:
+            for offset, (content_hash, _) in enumerate(new_items):
+                f.write(f"{content_hash}\t{start_row + offset}\n")
+                self._index[content_hash] = start_row + offset
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Benchmark du chargement PostgreSQL des métriques
+=================================================
+
+Compare, sur les mêmes fichiers Excel, l'ancien chemin ligne par ligne
+(upserts des dimensions + executemany) et le chemin bulk (dimensions en
+cache + COPY vers staging + fusion ensembliste).
+
+Les documents sont upsertés sur (filename, file_hash): relancer le benchmark
+réécrit les mêmes lignes, sans créer de doublons.
+
+Usage:
+    python benchmark_bulk_load.py <fichier.xlsx|répertoire> [...] [--rounds N]
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+from config import DATABASE_CONFIG, validate_database_config
+from converter import IntelligentExcelConverter
+
+
+def find_excel_files(paths: List[str]) -> List[Path]:
+    """Fichiers .xlsx donnés directement ou trouvés dans des répertoires"""
+    files = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            files.extend(sorted(path.rglob("*.xlsx")))
+        elif path.suffix.lower() == ".xlsx":
+            files.append(path)
+    # Ignorer les fichiers temporaires d'Excel (~$...)
+    return [f for f in files if not f.name.startswith("~$")]
+
+
+async def run_mode(files: List[Path], bulk_load: bool) -> dict:
+    """Convertit tous les fichiers dans un run (cache froid au départ)"""
+    converter = IntelligentExcelConverter(DATABASE_CONFIG, bulk_load=bulk_load)
+    await converter.initialize()
+
+    start = time.perf_counter()
+    try:
+        for file_path in files:
+            try:
+                await converter.convert_file(str(file_path))
+            except Exception as e:
+                print(f"  [ERREUR] {file_path.name}: {e}")
+    finally:
+        total_seconds = time.perf_counter() - start
+        stats = dict(converter.db_manager.stats)
+        await converter.close()
+
+    stats["total_seconds"] = total_seconds
+    return stats
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark chargement métriques PostgreSQL")
+    parser.add_argument("paths", nargs="+", help="Fichiers .xlsx ou répertoires")
+    parser.add_argument("--rounds", type=int, default=1, help="Répétitions par mode")
+    args = parser.parse_args()
+
+    validate_database_config()
+
+    files = find_excel_files(args.paths)
+    if not files:
+        print("Aucun fichier .xlsx trouvé")
+        sys.exit(1)
+
+    # Logs de conversion trop verbeux pour un benchmark
+    logging.getLogger().setLevel(logging.WARNING)
+
+    print(f"{len(files)} fichiers Excel, {args.rounds} round(s) par mode\n")
+
+    results = {}
+    for label, bulk_load in (("ligne par ligne", False), ("bulk COPY", True)):
+        runs = [await run_mode(files, bulk_load) for _ in range(args.rounds)]
+        best = min(runs, key=lambda r: r["db_seconds"])
+        results[label] = best
+
+        rate = best["metrics"] / best["db_seconds"] if best["db_seconds"] else 0
+        print(f"{label:>16}: {best['documents']} documents, {best['metrics']} métriques")
+        print(f"{'':>16}  base: {best['db_seconds']:.2f}s ({rate:,.0f} métriques/s), "
+              f"total: {best['total_seconds']:.2f}s")
+
+    row_db = results["ligne par ligne"]["db_seconds"]
+    bulk_db = results["bulk COPY"]["db_seconds"]
+    if bulk_db:
+        print(f"\nAccélération (temps base): x{row_db / bulk_db:.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Benchmark de l'extraction des classeurs Excel
+==============================================
+
+Compare temps et mémoire de pointe pour trois modes:
+- complet:   load_workbook() classique (modèle objet complet en mémoire)
+- streaming: read_only + iter_rows(values_only=True), feuilles en série
+- parallele: streaming, une feuille par processus
+
+Chaque mode tourne dans un sous-processus séparé pour que les pics de
+mémoire ne se mélangent pas. Aucune écriture en base.
+
+Usage:
+    python benchmark_excel_extraction.py <fichier.xlsx|répertoire> [...] [--workers N]
+"""
+
+import argparse
+import json
+import logging
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import List
+
+from openpyxl import load_workbook
+
+from config import IntentsConfigLoader
+from data_extractor import IntelligentDataExtractor, extract_workbook_sheets
+from format_detector import EnhancedFormatDetector
+from sheet_data import PREVIEW_ROWS, load_workbook_data
+
+try:
+    import resource
+
+    RESOURCE_AVAILABLE = True
+except ImportError:  # Windows
+    RESOURCE_AVAILABLE = False
+
+MODES = ["complet", "streaming", "parallele"]
+
+
+def find_excel_files(paths: List[str]) -> List[Path]:
+    """Fichiers .xlsx donnés directement ou trouvés dans des répertoires"""
+    files = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            files.extend(sorted(path.rglob("*.xlsx")))
+        elif path.suffix.lower() == ".xlsx":
+            files.append(path)
+    return [f for f in files if not f.name.startswith("~$")]
+
+
+def extract_file(file_path: Path, mode: str, workers: int, intents_config) -> int:
+    """Détection + extraction d'un fichier, retourne le nombre de métriques"""
+    detector = EnhancedFormatDetector(intents_config)
+
+    if mode == "complet":
+        workbook = load_workbook(file_path, data_only=True)
+        format_type, data_type, _ = detector.detect_format_and_type(workbook, file_path.name)
+        extractor = IntelligentDataExtractor(format_type, data_type, intents_config)
+        metrics = extractor.extract_metrics(workbook)
+        workbook.close()
+        return len(metrics)
+
+    preview = load_workbook_data(file_path, max_rows=PREVIEW_ROWS)
+    format_type, data_type, _ = detector.detect_format_and_type(preview, file_path.name)
+    results = extract_workbook_sheets(
+        str(file_path),
+        preview.sheetnames,
+        format_type,
+        data_type,
+        intents_config,
+        max_workers=workers if mode == "parallele" else 1,
+    )
+    return sum(len(metrics) for _, metrics, _ in results)
+
+
+def peak_memory_mb() -> float:
+    """Pic RSS du processus et de ses enfants (tracemalloc sans module resource)"""
+    if RESOURCE_AVAILABLE:
+        # ru_maxrss en Ko sous Linux, en octets sous macOS
+        scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+        self_peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+        children_peak = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / scale
+        return self_peak + children_peak
+    return tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+
+
+def run_mode(files: List[Path], mode: str, workers: int) -> dict:
+    """Exécuté dans le sous-processus d'un mode"""
+    if not RESOURCE_AVAILABLE:
+        tracemalloc.start()
+
+    intents_config = IntentsConfigLoader()
+    start = time.perf_counter()
+    total_metrics = sum(extract_file(f, mode, workers, intents_config) for f in files)
+
+    return {
+        "mode": mode,
+        "metrics": total_metrics,
+        "seconds": time.perf_counter() - start,
+        "peak_mb": peak_memory_mb(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark extraction Excel")
+    parser.add_argument("paths", nargs="+", help="Fichiers .xlsx ou répertoires")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--run-mode", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+
+    files = find_excel_files(args.paths)
+    if not files:
+        print("Aucun fichier .xlsx trouvé")
+        sys.exit(1)
+
+    if args.run_mode:
+        print(json.dumps(run_mode(files, args.run_mode, args.workers)))
+        return
+
+    print(f"{len(files)} fichiers Excel, {args.workers} workers pour le mode parallèle\n")
+    print(f"{'mode':>10} {'métriques':>10} {'temps (s)':>10} {'pic mémoire (Mo)':>17}")
+
+    for mode in MODES:
+        completed = subprocess.run(
+            [sys.executable, __file__, *map(str, files),
+             "--workers", str(args.workers), "--run-mode", mode],
+            capture_output=True,
+            text=True,
+        )
+        if completed.returncode != 0:
+            print(f"{mode:>10} [ERREUR] {completed.stderr.strip().splitlines()[-1:]}")
+            continue
+
+        result = json.loads(completed.stdout.strip().splitlines()[-1])
+        print(f"{mode:>10} {result['metrics']:>10} {result['seconds']:>10.2f} {result['peak_mb']:>17.1f}")
+
+
+if __name__ == "__main__":
+    main()
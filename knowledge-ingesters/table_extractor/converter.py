@@ -9,11 +9,10 @@ import sys
 import logging
 import hashlib
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 try:
-    from openpyxl import load_workbook
-    from openpyxl.worksheet.worksheet import Worksheet
+    import openpyxl  # noqa: F401
 except ImportError:
     print("ERREUR: openpyxl requis. Installez avec: pip install openpyxl")
     sys.exit(1)
@@ -21,8 +20,9 @@ except ImportError:
 from config import DATABASE_CONFIG, validate_database_config, IntentsConfigLoader
 from models import TaxonomyInfo
 from format_detector import EnhancedFormatDetector
-from data_extractor import IntelligentDataExtractor
+from data_extractor import IntelligentDataExtractor, extract_workbook_sheets
 from database import PostgreSQLManager
+from sheet_data import PREVIEW_ROWS, SheetData, load_workbook_data
 
 # Configuration logging
 logging.basicConfig(
@@ -34,10 +34,24 @@ logger = logging.getLogger(__name__)
 class IntelligentExcelConverter:
     """Convertisseur Excel intelligent avec support intents.json"""
 
-    def __init__(self, db_config: Dict[str, Any], intents_config_path: str = None):
+    def __init__(
+        self,
+        db_config: Dict[str, Any],
+        intents_config_path: str = None,
+        bulk_load: bool = True,
+        max_workers: Optional[int] = None,
+    ):
+        """
+        Args:
+            db_config: Paramètres de connexion PostgreSQL
+            intents_config_path: Chemin de intents.json (None = détection auto)
+            bulk_load: Chargement COPY des métriques (voir PostgreSQLManager)
+            max_workers: Processus pour l'extraction des feuilles (1 = sans pool)
+        """
+        self.max_workers = max_workers
         self.intents_config = IntentsConfigLoader(intents_config_path)
         self.format_detector = EnhancedFormatDetector(self.intents_config)
-        self.db_manager = PostgreSQLManager(db_config)
+        self.db_manager = PostgreSQLManager(db_config, bulk_load=bulk_load)
 
     async def initialize(self):
         await self.db_manager.initialize()
@@ -52,24 +66,28 @@ class IntelligentExcelConverter:
             logger.info(f"Conversion intelligente: {file_path}")
             filename = Path(file_path).name
 
-            # Calcul hash
-            with open(file_path, "rb") as f:
-                current_file_hash = hashlib.md5(f.read()).hexdigest()
+            # Calcul hash (lecture par blocs)
+            current_file_hash = self._file_md5(file_path)
 
-            # Chargement et analyse
-            workbook = load_workbook(file_path, read_only=True, data_only=True)
+            # Aperçu: premières lignes de chaque feuille (détection + métadonnées)
+            preview = load_workbook_data(file_path, max_rows=PREVIEW_ROWS)
 
             # Détection format et type global avec intents.json
             format_type, data_type, global_taxonomy = (
-                self.format_detector.detect_format_and_type(workbook, filename)
+                self.format_detector.detect_format_and_type(preview, filename)
             )
 
             # Vérifier si le fichier contient des feuilles avec métadonnées individuelles
-            metadata_sheets = []
-            for sheet_name in workbook.sheetnames:
-                sheet = workbook[sheet_name]
-                if self._has_metadata_format(sheet):
-                    metadata_sheets.append(sheet_name)
+            metadata_sheets = [
+                sheet_name
+                for sheet_name in preview.sheetnames
+                if self._has_metadata_format(preview[sheet_name])
+            ]
+
+            # Pour detect_unit_system (ne dépend que des métadonnées de table)
+            unit_detector = IntelligentDataExtractor(
+                format_type, data_type, self.intents_config
+            )
 
             total_documents_created = 0
             total_metrics_created = 0
@@ -80,19 +98,23 @@ class IntelligentExcelConverter:
                     f"Mode multi-feuilles détecté: {len(metadata_sheets)} feuilles avec métadonnées"
                 )
 
-                for sheet_name in metadata_sheets:
-                    sheet = workbook[sheet_name]
+                # Feuilles indépendantes: extraites en parallèle
+                sheet_results = await asyncio.to_thread(
+                    extract_workbook_sheets,
+                    file_path,
+                    metadata_sheets,
+                    format_type,
+                    data_type,
+                    self.intents_config,
+                    True,
+                    self.max_workers,
+                )
 
+                for sheet_name, sheet_metrics, table_metadata in sheet_results:
                     # Extraire taxonomie spécifique à cette feuille
                     sheet_taxonomy = self._extract_sheet_specific_taxonomy(
-                        sheet, sheet_name, global_taxonomy
-                    )
-
-                    # Extraire métriques pour cette feuille uniquement
-                    extractor = IntelligentDataExtractor(
-                        format_type, data_type, self.intents_config
+                        preview[sheet_name], sheet_name, global_taxonomy
                     )
-                    sheet_metrics = extractor._extract_metadata_sheet(sheet, sheet_name)
 
                     if sheet_metrics:
                         # Créer un nom de fichier unique pour cette feuille
@@ -102,15 +124,11 @@ class IntelligentExcelConverter:
                         ).hexdigest()
 
                         # Transférer métadonnées si disponibles
-                        if hasattr(extractor, "_current_table_metadata"):
-                            self.db_manager._current_table_metadata = (
-                                extractor._current_table_metadata
-                            )
+                        if table_metadata is not None:
+                            self.db_manager._current_table_metadata = table_metadata
 
                             # Détecter le système d'unités pour cette feuille
-                            unit_system = extractor.detect_unit_system(
-                                extractor._current_table_metadata
-                            )
+                            unit_system = unit_detector.detect_unit_system(table_metadata)
                             sheet_taxonomy.unit_system = unit_system
                             logger.info(f"Système d'unités détecté pour '{sheet_name}': {unit_system}")
 
@@ -140,37 +158,48 @@ class IntelligentExcelConverter:
                     logger.info(f"  - Documents créés: {total_documents_created}")
                     logger.info(f"  - Métriques totales: {total_metrics_created}")
                     logger.info(f"  - Format: {format_type}, Type: {data_type}")
-                    workbook.close()
                     return True
                 else:
                     logger.error("Aucun document créé en mode multi-feuilles")
-                    workbook.close()
                     return False
 
             else:
                 # Mode fichier unique : traitement classique
                 logger.info("Mode fichier unique: traitement global")
 
-                extractor = IntelligentDataExtractor(
-                    format_type, data_type, self.intents_config
+                sheet_results = await asyncio.to_thread(
+                    extract_workbook_sheets,
+                    file_path,
+                    preview.sheetnames,
+                    format_type,
+                    data_type,
+                    self.intents_config,
+                    False,
+                    self.max_workers,
+                )
+
+                metrics = []
+                table_metadata = None
+                for _, sheet_metrics, sheet_table_metadata in sheet_results:
+                    metrics.extend(sheet_metrics)
+                    # Comme avec un seul extracteur: la dernière feuille guidée l'emporte
+                    if sheet_table_metadata is not None:
+                        table_metadata = sheet_table_metadata
+
+                logger.info(
+                    f"Total métriques extraites: {len(metrics)} (type: {data_type})"
                 )
-                metrics = extractor.extract_metrics(workbook)
 
                 if not metrics:
                     logger.warning(f"Aucune métrique extraite de {filename}")
-                    workbook.close()
                     return False
 
                 # Transférer les métadonnées de table vers le gestionnaire de base de données
-                if hasattr(extractor, "_current_table_metadata"):
-                    self.db_manager._current_table_metadata = (
-                        extractor._current_table_metadata
-                    )
+                if table_metadata is not None:
+                    self.db_manager._current_table_metadata = table_metadata
 
                     # Détecter le système d'unités
-                    unit_system = extractor.detect_unit_system(
-                        extractor._current_table_metadata
-                    )
+                    unit_system = unit_detector.detect_unit_system(table_metadata)
                     global_taxonomy.unit_system = unit_system
                     logger.info(f"Système d'unités détecté: {unit_system}")
 
@@ -198,21 +227,29 @@ class IntelligentExcelConverter:
                             f"  - {metric.metric_name}: {metric.value_numeric} {metric.unit or ''}"
                         )
 
-                workbook.close()
                 return True
 
         except Exception as e:
             logger.error(f"Erreur conversion {file_path}: {e}")
             raise
 
+    @staticmethod
+    def _file_md5(file_path: str) -> str:
+        """MD5 du fichier, lu par blocs de 1 Mo"""
+        md5 = hashlib.md5()
+        with open(file_path, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                md5.update(block)
+        return md5.hexdigest()
+
     async def close(self):
         await self.db_manager.close()
 
-    def _has_metadata_format(self, sheet: Worksheet) -> bool:
+    def _has_metadata_format(self, sheet: SheetData) -> bool:
         """Vérifie si la feuille a un format metadata/value"""
         try:
-            cell_a1 = sheet["A1"].value
-            cell_b1 = sheet["B1"].value
+            cell_a1 = sheet.value(1, 1)
+            cell_b1 = sheet.value(1, 2)
             return (
                 cell_a1
                 and cell_b1
@@ -223,7 +260,7 @@ class IntelligentExcelConverter:
             return False
 
     def _extract_sheet_specific_taxonomy(
-        self, sheet: Worksheet, sheet_name: str, global_taxonomy: TaxonomyInfo
+        self, sheet: SheetData, sheet_name: str, global_taxonomy: TaxonomyInfo
     ) -> TaxonomyInfo:
         """Extrait la taxonomie spécifique à une feuille depuis ses métadonnées"""
 
@@ -231,9 +268,9 @@ class IntelligentExcelConverter:
         metadata_pairs = {}
         try:
             for row in sheet.iter_rows(min_row=2, max_row=50):
-                if row[0].value and row[1].value:
-                    key = str(row[0].value).lower().strip()
-                    value = str(row[1].value).strip()
+                if row[0] and row[1]:
+                    key = str(row[0]).lower().strip()
+                    value = str(row[1]).strip()
                     metadata_pairs[key] = value
         except Exception:
             pass
@@ -297,11 +334,18 @@ async def main():
         await converter.initialize()
 
         if len(sys.argv) >= 2:
-            file_path = sys.argv[1]
-            success = await converter.convert_file(file_path)
-            print(f"Conversion {'réussie' if success else 'échouée'}")
+            # Plusieurs fichiers: un seul run, cache des dimensions partagé
+            for file_path in sys.argv[1:]:
+                success = await converter.convert_file(file_path)
+                print(f"Conversion {file_path} {'réussie' if success else 'échouée'}")
+
+            stats = converter.db_manager.stats
+            print(
+                f"Base de données: {stats['documents']} documents, "
+                f"{stats['metrics']} métriques en {stats['db_seconds']:.2f}s"
+            )
         else:
-            print("Usage: python converter.py <fichier.xlsx>")
+            print("Usage: python converter.py <fichier.xlsx> [<fichier2.xlsx> ...]")
             print(
                 "Le fichier intents.json sera automatiquement détecté s'il est présent"
             )
@@ -3,15 +3,15 @@
 Extracteur de données Excel intelligent
 """
 
+import os
 import re
 import logging
+from concurrent.futures import ProcessPoolExecutor
 from typing import List, Tuple, Optional, Dict, Any
 
-from openpyxl.worksheet.worksheet import Worksheet
-import openpyxl
-
 from models import MetricData
 from config import IntentsConfigLoader
+from sheet_data import SheetData, load_workbook_data, read_sheet
 
 logger = logging.getLogger(__name__)
 
@@ -45,33 +45,43 @@ class IntelligentDataExtractor:
             "other": [],
         }
 
-    def extract_metrics(self, workbook: openpyxl.Workbook) -> List[MetricData]:
-        """Extraction adaptative avec reconnaissance intelligente"""
+    def extract_metrics(self, workbook) -> List[MetricData]:
+        """
+        Extraction adaptative avec reconnaissance intelligente
+
+        Args:
+            workbook: WorkbookData ou classeur openpyxl (chaque feuille est
+                alors lue une fois en lignes de valeurs)
+        """
         all_metrics = []
 
         for sheet_name in workbook.sheetnames:
             sheet = workbook[sheet_name]
+            if not isinstance(sheet, SheetData):
+                sheet = read_sheet(sheet)
 
-            if self.data_type == "performance":
-                metrics = self._extract_performance_data(sheet, sheet_name)
-            elif self.data_type == "pharmaceutical":
-                metrics = self._extract_pharmaceutical_data(sheet, sheet_name)
-            elif self.data_type == "nutrition":
-                metrics = self._extract_nutrition_data(sheet, sheet_name)
-            elif self.data_type == "carcass":
-                metrics = self._extract_carcass_data(sheet, sheet_name)
-            else:
-                metrics = self._extract_generic_data(sheet, sheet_name)
-
-            all_metrics.extend(metrics)
+            all_metrics.extend(self.extract_sheet(sheet, sheet_name))
 
         logger.info(
             f"Total métriques extraites: {len(all_metrics)} (type: {self.data_type})"
         )
         return all_metrics
 
+    def extract_sheet(self, sheet: SheetData, sheet_name: str) -> List[MetricData]:
+        """Extraction d'une feuille selon le type de données"""
+        if self.data_type == "performance":
+            return self._extract_performance_data(sheet, sheet_name)
+        elif self.data_type == "pharmaceutical":
+            return self._extract_pharmaceutical_data(sheet, sheet_name)
+        elif self.data_type == "nutrition":
+            return self._extract_nutrition_data(sheet, sheet_name)
+        elif self.data_type == "carcass":
+            return self._extract_carcass_data(sheet, sheet_name)
+        else:
+            return self._extract_generic_data(sheet, sheet_name)
+
     def _extract_performance_data(
-        self, sheet: Worksheet, sheet_name: str
+        self, sheet: SheetData, sheet_name: str
     ) -> List[MetricData]:
         """Extraction spécialisée pour données de performance"""
         if self._has_metadata_format(sheet):
@@ -80,7 +90,7 @@ class IntelligentDataExtractor:
             return self._extract_tabular_performance_data(sheet, sheet_name)
 
     def _extract_metadata_sheet(
-        self, sheet: Worksheet, sheet_name: str
+        self, sheet: SheetData, sheet_name: str
     ) -> List[MetricData]:
         """Extraction format metadata/value avec support métadonnées de structure"""
         table_metadata = self._extract_table_metadata(sheet)
@@ -98,16 +108,16 @@ class IntelligentDataExtractor:
             )
             return self._extract_classic_metadata(sheet, sheet_name)
 
-    def _extract_table_metadata(self, sheet: Worksheet) -> Optional[Dict[str, Any]]:
+    def _extract_table_metadata(self, sheet: SheetData) -> Optional[Dict[str, Any]]:
         """Extrait les métadonnées de structure de table"""
         metadata = {}
 
         for row in sheet.iter_rows(min_row=1, max_row=50):
-            if not row[0].value or not row[1].value:
+            if not row[0] or not row[1]:
                 continue
 
-            key = str(row[0].value).strip().lower()
-            value = str(row[1].value).strip()
+            key = str(row[0]).strip().lower()
+            value = str(row[1]).strip()
 
             if key == "table_header_row":
                 metadata["header_row"] = int(value)
@@ -223,7 +233,7 @@ class IntelligentDataExtractor:
         return result
 
     def _extract_with_metadata_guidance(
-        self, sheet: Worksheet, sheet_name: str, table_metadata: Dict[str, Any]
+        self, sheet: SheetData, sheet_name: str, table_metadata: Dict[str, Any]
     ) -> List[MetricData]:
         """Extraction dirigée par métadonnées"""
         metrics = []
@@ -240,10 +250,9 @@ class IntelligentDataExtractor:
         )
 
         headers = []
-        header_row_data = sheet[header_row]
-        for cell in header_row_data:
-            if cell.value and str(cell.value).strip():
-                headers.append(str(cell.value).strip())
+        for value in sheet.row(header_row):
+            if value and str(value).strip():
+                headers.append(str(value).strip())
             else:
                 break
 
@@ -256,13 +265,12 @@ class IntelligentDataExtractor:
 
         for row_idx in range(header_row + 1, header_row + 1 + data_rows):
             try:
-                row = sheet[row_idx]
-                first_cell = row[0]
-                if first_cell.value is None or first_cell.value == "":
+                row = sheet.row(row_idx)
+                if row[0] is None or row[0] == "":
                     logger.warning(f"Ligne {row_idx}: première cellule vide, arrêt")
                     break
 
-                first_value = str(first_cell.value).strip()
+                first_value = str(row[0]).strip()
 
                 if first_col_type == "age_days":
                     try:
@@ -298,17 +306,17 @@ class IntelligentDataExtractor:
                     age_min, age_max = None, None
 
                 for col_idx, header in enumerate(headers):
-                    if col_idx >= len(row) or not row[col_idx].value:
+                    if col_idx >= len(row) or not row[col_idx]:
                         continue
 
-                    cell = row[col_idx]
+                    value = row[col_idx]
 
                     if col_idx == 0:
                         metric = self._create_primary_key_metric(
                             sheet_name,
                             category,
                             first_col_type,
-                            cell,
+                            value,
                             header,
                             primary_key,
                             age_min,
@@ -324,7 +332,7 @@ class IntelligentDataExtractor:
                     metric_key = f"{primary_key}_{normalized_metric}"
                     metric_name = f"{normalized_metric} for {first_value}"
 
-                    value_numeric, unit = self._parse_numeric_value(str(cell.value))
+                    value_numeric, unit = self._parse_numeric_value(str(value))
 
                     if "column_definitions" in table_metadata:
                         col_def = table_metadata["column_definitions"].get(
@@ -338,7 +346,7 @@ class IntelligentDataExtractor:
                         category=category,
                         metric_key=metric_key,
                         metric_name=metric_name,
-                        value_text=str(cell.value),
+                        value_text=str(value),
                         value_numeric=value_numeric,
                         unit=unit,
                         age_min=age_min,
@@ -381,7 +389,7 @@ class IntelligentDataExtractor:
         sheet_name: str,
         category: str,
         first_col_type: str,
-        cell,
+        value: Any,
         header: str,
         primary_key: str,
         age_min: Optional[int],
@@ -408,7 +416,7 @@ class IntelligentDataExtractor:
                 category=category,
                 metric_key=f"age_{primary_key}",
                 metric_name=f"Age at {primary_key}",
-                value_text=str(cell.value),
+                value_text=str(value),
                 value_numeric=float(age_min) if age_min is not None else None,
                 unit="days",
                 age_min=age_min,
@@ -416,13 +424,13 @@ class IntelligentDataExtractor:
                 metadata=base_metadata,
             )
         elif first_col_type == "weight_grams":
-            weight_value = str(cell.value).strip()
+            weight_value = str(value).strip()
             return MetricData(
                 sheet_name=sheet_name,
                 category=category,
                 metric_key=f"reference_{primary_key}",
                 metric_name=f"Live weight: {weight_value}g",
-                value_text=str(cell.value),
+                value_text=str(value),
                 value_numeric=(
                     float(weight_value)
                     if weight_value.replace(".", "", 1).isdigit()
@@ -438,13 +446,13 @@ class IntelligentDataExtractor:
                 sheet_name=sheet_name,
                 category=category,
                 metric_key=f"label_{primary_key}",
-                metric_name=f"Nutrient/Item: {str(cell.value)}",
-                value_text=str(cell.value),
+                metric_name=f"Nutrient/Item: {str(value)}",
+                value_text=str(value),
                 metadata=base_metadata,
             )
 
     def _detect_first_column_type(
-        self, sheet: Worksheet, header_row: int, first_header: str
+        self, sheet: SheetData, header_row: int, first_header: str
     ) -> str:
         """Détecte le type de données dans la première colonne"""
         header_lower = first_header.lower()
@@ -469,9 +477,9 @@ class IntelligentDataExtractor:
 
         sample_values = []
         for row_idx in range(header_row + 1, min(header_row + 6, sheet.max_row + 1)):
-            cell = sheet.cell(row_idx, 1)
-            if cell.value:
-                sample_values.append(str(cell.value).strip())
+            value = sheet.value(row_idx, 1)
+            if value:
+                sample_values.append(str(value).strip())
 
         if not sample_values:
             return "unknown"
@@ -501,18 +509,18 @@ class IntelligentDataExtractor:
         return "text_label"
 
     def _extract_classic_metadata(
-        self, sheet: Worksheet, sheet_name: str
+        self, sheet: SheetData, sheet_name: str
     ) -> List[MetricData]:
         """Méthode d'extraction classique (fallback)"""
         metrics = []
         category = self._categorize_sheet(sheet_name)
 
         for row in sheet.iter_rows(min_row=2):
-            if not row[0].value:
+            if not row[0]:
                 break
 
-            metric_key = str(row[0].value).strip()
-            value_raw = row[1].value if row[1].value else ""
+            metric_key = str(row[0]).strip()
+            value_raw = row[1] if row[1] else ""
 
             if metric_key.lower().startswith(("table_", "column_", "validation_")):
                 continue
@@ -550,7 +558,7 @@ class IntelligentDataExtractor:
         return metrics
 
     def _extract_tabular_performance_data(
-        self, sheet: Worksheet, sheet_name: str
+        self, sheet: SheetData, sheet_name: str
     ) -> List[MetricData]:
         """Extraction format tabulaire"""
         metrics = []
@@ -563,21 +571,20 @@ class IntelligentDataExtractor:
         logger.info(f"En-têtes trouvés ligne {header_row}: {headers}")
 
         for row_idx in range(header_row + 1, sheet.max_row + 1):
-            row = sheet[row_idx]
-            age_cell = row[0]
-            if not age_cell.value:
+            row = sheet.row(row_idx)
+            if not row[0]:
                 break
 
             try:
-                age = int(float(age_cell.value))
+                age = int(float(row[0]))
             except (ValueError, TypeError):
                 logger.warning(
-                    f"Âge invalide ligne {row_idx}: '{age_cell.value}', ignoré"
+                    f"Âge invalide ligne {row_idx}: '{row[0]}', ignoré"
                 )
                 continue
 
-            for col_idx, cell in enumerate(row):
-                if col_idx >= len(headers) or not cell.value:
+            for col_idx, value in enumerate(row):
+                if col_idx >= len(headers) or not value:
                     continue
 
                 if col_idx == 0:
@@ -586,7 +593,7 @@ class IntelligentDataExtractor:
                         category=category,
                         metric_key=f"age_day_{age}",
                         metric_name=f"Age at day {age}",
-                        value_text=str(cell.value),
+                        value_text=str(value),
                         value_numeric=float(age),
                         unit="days",
                         age_min=age,
@@ -606,14 +613,14 @@ class IntelligentDataExtractor:
                 metric_key = f"day_{age}_{normalized_metric}"
                 metric_name = f"{normalized_metric} at day {age}"
 
-                value_numeric, unit = self._parse_numeric_value(str(cell.value))
+                value_numeric, unit = self._parse_numeric_value(str(value))
 
                 metric = MetricData(
                     sheet_name=sheet_name,
                     category=category,
                     metric_key=metric_key,
                     metric_name=metric_name,
-                    value_text=str(cell.value),
+                    value_text=str(value),
                     value_numeric=value_numeric,
                     unit=unit,
                     age_min=age,
@@ -664,7 +671,7 @@ class IntelligentDataExtractor:
         return cleaned
 
     def _extract_pharmaceutical_data(
-        self, sheet: Worksheet, sheet_name: str
+        self, sheet: SheetData, sheet_name: str
     ) -> List[MetricData]:
         """Extraction données pharmaceutiques"""
         metrics = []
@@ -675,14 +682,14 @@ class IntelligentDataExtractor:
             return self._extract_generic_data(sheet, sheet_name)
 
         for row_idx in range(header_row + 1, sheet.max_row + 1):
-            row = sheet[row_idx]
-            if not row[0].value:
+            row = sheet.row(row_idx)
+            if not row[0]:
                 break
 
-            primary_key = str(row[0].value).strip()
+            primary_key = str(row[0]).strip()
 
             for col_idx, header in enumerate(headers):
-                if col_idx >= len(row) or not row[col_idx].value:
+                if col_idx >= len(row) or not row[col_idx]:
                     continue
 
                 if col_idx == 0:
@@ -691,7 +698,7 @@ class IntelligentDataExtractor:
                         category=category,
                         metric_key=f"pharma_ref_{primary_key}",
                         metric_name=f"Reference: {primary_key}",
-                        value_text=str(row[col_idx].value),
+                        value_text=str(row[col_idx]),
                         metadata={
                             "format": "pharmaceutical",
                             "data_type": "pharmaceutical",
@@ -705,7 +712,7 @@ class IntelligentDataExtractor:
                 metric_key = f"{primary_key}_{header.lower()}"
                 metric_name = f"{header} for {primary_key}"
 
-                value_raw = str(row[col_idx].value)
+                value_raw = str(row[col_idx])
                 value_numeric, unit = self._parse_numeric_value(value_raw)
                 age_min, age_max = self._parse_age_range(header, value_raw)
 
@@ -732,7 +739,7 @@ class IntelligentDataExtractor:
         return metrics
 
     def _extract_nutrition_data(
-        self, sheet: Worksheet, sheet_name: str
+        self, sheet: SheetData, sheet_name: str
     ) -> List[MetricData]:
         """Extraction données nutritionnelles"""
         metrics = []
@@ -743,14 +750,14 @@ class IntelligentDataExtractor:
             return self._extract_generic_data(sheet, sheet_name)
 
         for row_idx in range(header_row + 1, sheet.max_row + 1):
-            row = sheet[row_idx]
-            if not row[0].value:
+            row = sheet.row(row_idx)
+            if not row[0]:
                 break
 
-            nutrient_name = str(row[0].value).strip()
+            nutrient_name = str(row[0]).strip()
 
             for col_idx, header in enumerate(headers):
-                if col_idx >= len(row) or not row[col_idx].value:
+                if col_idx >= len(row) or not row[col_idx]:
                     continue
 
                 if col_idx == 0:
@@ -759,7 +766,7 @@ class IntelligentDataExtractor:
                         category=category,
                         metric_key=f"nutrient_{nutrient_name}",
                         metric_name=f"Nutrient: {nutrient_name}",
-                        value_text=str(row[col_idx].value),
+                        value_text=str(row[col_idx]),
                         metadata={
                             "format": "nutrition",
                             "data_type": "nutrition",
@@ -773,7 +780,7 @@ class IntelligentDataExtractor:
                 metric_key = f"{nutrient_name}_{header.lower()}"
                 metric_name = f"{header} of {nutrient_name}"
 
-                value_raw = str(row[col_idx].value)
+                value_raw = str(row[col_idx])
                 value_numeric, unit = self._parse_numeric_value(value_raw)
 
                 metric = MetricData(
@@ -797,7 +804,7 @@ class IntelligentDataExtractor:
         return metrics
 
     def _extract_carcass_data(
-        self, sheet: Worksheet, sheet_name: str
+        self, sheet: SheetData, sheet_name: str
     ) -> List[MetricData]:
         """Extraction données carcasse"""
         metrics = []
@@ -808,15 +815,15 @@ class IntelligentDataExtractor:
             return self._extract_generic_data(sheet, sheet_name)
 
         for row_idx in range(header_row + 1, sheet.max_row + 1):
-            row = sheet[row_idx]
-            if not row[0].value:
+            row = sheet.row(row_idx)
+            if not row[0]:
                 break
 
-            primary_value = str(row[0].value).strip()
+            primary_value = str(row[0]).strip()
             age_min, age_max = self._parse_age_range(primary_value, primary_value)
 
             for col_idx, header in enumerate(headers):
-                if col_idx >= len(row) or not row[col_idx].value:
+                if col_idx >= len(row) or not row[col_idx]:
                     continue
 
                 if col_idx == 0:
@@ -826,7 +833,7 @@ class IntelligentDataExtractor:
                             category=category,
                             metric_key=f"carcass_age_day_{age_min}",
                             metric_name=f"Carcass processing age: day {age_min}",
-                            value_text=str(row[col_idx].value),
+                            value_text=str(row[col_idx]),
                             value_numeric=float(age_min),
                             unit="days",
                             age_min=age_min,
@@ -844,7 +851,7 @@ class IntelligentDataExtractor:
                             category=category,
                             metric_key=f"carcass_ref_{primary_value}",
                             metric_name=f"Carcass reference: {primary_value}",
-                            value_text=str(row[col_idx].value),
+                            value_text=str(row[col_idx]),
                             metadata={
                                 "format": "carcass",
                                 "data_type": "carcass",
@@ -859,7 +866,7 @@ class IntelligentDataExtractor:
                 metric_key = f"{primary_value}_{header.lower()}"
                 metric_name = f"{header} at {primary_value}"
 
-                value_raw = str(row[col_idx].value)
+                value_raw = str(row[col_idx])
                 value_numeric, unit = self._parse_numeric_value(value_raw)
 
                 metric = MetricData(
@@ -884,15 +891,15 @@ class IntelligentDataExtractor:
         return metrics
 
     def _extract_generic_data(
-        self, sheet: Worksheet, sheet_name: str
+        self, sheet: SheetData, sheet_name: str
     ) -> List[MetricData]:
         """Extraction générique"""
         potential_headers = []
         header_row_idx = None
 
         for row_idx in range(1, min(11, sheet.max_row + 1)):
-            row = sheet[row_idx]
-            row_values = [str(cell.value).strip() for cell in row[:10] if cell.value]
+            row = sheet.row(row_idx)
+            row_values = [str(value).strip() for value in row[:10] if value]
 
             if len(row_values) >= 3 and any(
                 keyword in " ".join(row_values).lower()
@@ -924,18 +931,18 @@ class IntelligentDataExtractor:
             return self._extract_cell_by_cell_generic(sheet, sheet_name)
 
     def _extract_tabular_like_generic(
-        self, sheet: Worksheet, sheet_name: str, header_row: int, headers: List[str]
+        self, sheet: SheetData, sheet_name: str, header_row: int, headers: List[str]
     ) -> List[MetricData]:
         """Extraction tabulaire générique"""
         metrics = []
         category = self._categorize_sheet(sheet_name)
 
         for row_idx in range(header_row + 1, sheet.max_row + 1):
-            row = sheet[row_idx]
-            if not row[0].value:
+            row = sheet.row(row_idx)
+            if not row[0]:
                 break
 
-            first_value = str(row[0].value).strip()
+            first_value = str(row[0]).strip()
             age_detected = None
 
             try:
@@ -946,10 +953,10 @@ class IntelligentDataExtractor:
                     age_detected = int(age_match.group(1))
 
             for col_idx, header in enumerate(headers):
-                if col_idx >= len(row) or not row[col_idx].value:
+                if col_idx >= len(row) or not row[col_idx]:
                     continue
 
-                cell = row[col_idx]
+                value = row[col_idx]
 
                 if col_idx == 0:
                     if age_detected is not None:
@@ -958,7 +965,7 @@ class IntelligentDataExtractor:
                             category=category,
                             metric_key=f"generic_age_day_{age_detected}",
                             metric_name=f"Age at day {age_detected}",
-                            value_text=str(cell.value),
+                            value_text=str(value),
                             value_numeric=float(age_detected),
                             unit="days",
                             age_min=age_detected,
@@ -977,7 +984,7 @@ class IntelligentDataExtractor:
                             category=category,
                             metric_key=f"generic_ref_{first_value}",
                             metric_name=f"Reference: {first_value}",
-                            value_text=str(cell.value),
+                            value_text=str(value),
                             metadata={
                                 "format": "generic_tabular",
                                 "is_reference_column": True,
@@ -999,14 +1006,14 @@ class IntelligentDataExtractor:
                     metric_name = f"{header} for {first_value}"
                     age_min, age_max = None, None
 
-                value_numeric, unit = self._parse_numeric_value(str(cell.value))
+                value_numeric, unit = self._parse_numeric_value(str(value))
 
                 metric = MetricData(
                     sheet_name=sheet_name,
                     category=category,
                     metric_key=metric_key,
                     metric_name=metric_name,
-                    value_text=str(cell.value),
+                    value_text=str(value),
                     value_numeric=value_numeric,
                     unit=unit,
                     age_min=age_min,
@@ -1024,22 +1031,22 @@ class IntelligentDataExtractor:
         return metrics
 
     def _extract_cell_by_cell_generic(
-        self, sheet: Worksheet, sheet_name: str
+        self, sheet: SheetData, sheet_name: str
     ) -> List[MetricData]:
         """Extraction cellule par cellule"""
         metrics = []
         category = self._categorize_sheet(sheet_name)
 
         for row_idx, row in enumerate(sheet.iter_rows(max_row=100), 1):
-            for col_idx, cell in enumerate(row):
-                if cell.value and isinstance(cell.value, (int, float)):
+            for col_idx, value in enumerate(row):
+                if value and isinstance(value, (int, float)):
                     metric = MetricData(
                         sheet_name=sheet_name,
                         category=category,
                         metric_key=f"cell_R{row_idx}C{col_idx+1}",
                         metric_name=f"Value at R{row_idx}C{col_idx+1}",
-                        value_numeric=float(cell.value),
-                        value_text=str(cell.value),
+                        value_numeric=float(value),
+                        value_text=str(value),
                         metadata={
                             "format": "generic_cell",
                             "row": row_idx,
@@ -1050,15 +1057,15 @@ class IntelligentDataExtractor:
 
         return metrics
 
-    def _find_headers_row(self, sheet: Worksheet) -> Tuple[int, List[str]]:
+    def _find_headers_row(self, sheet: SheetData) -> Tuple[int, List[str]]:
         """Trouve la ligne d'en-têtes dans une feuille"""
         for row_idx in range(1, min(30, sheet.max_row + 1)):
-            row = sheet[row_idx]
+            row = sheet.row(row_idx)
             headers = []
 
-            for cell in row:
-                if cell.value and isinstance(cell.value, str):
-                    header = str(cell.value).strip()
+            for value in row:
+                if value and isinstance(value, str):
+                    header = str(value).strip()
                     if header:
                         headers.append(header)
                 else:
@@ -1082,14 +1089,16 @@ class IntelligentDataExtractor:
 
         return 0, []
 
-    def _has_metadata_format(self, sheet: Worksheet) -> bool:
+    def _has_metadata_format(self, sheet: SheetData) -> bool:
         """Vérifie si la feuille utilise le format metadata/value"""
         try:
+            cell_a1 = sheet.value(1, 1)
+            cell_b1 = sheet.value(1, 2)
             return (
-                sheet["A1"].value
-                and sheet["B1"].value
-                and str(sheet["A1"].value).lower() == "metadata"
-                and str(sheet["B1"].value).lower() == "value"
+                cell_a1
+                and cell_b1
+                and str(cell_a1).lower() == "metadata"
+                and str(cell_b1).lower() == "value"
             )
         except Exception:
             return False
@@ -1164,3 +1173,90 @@ class IntelligentDataExtractor:
         cleaned = re.sub(r"[_-]+", " ", metric_key)
         cleaned = re.sub(r"\s+", " ", cleaned)
         return cleaned.title().strip()
+
+
+# Résultat par feuille: (nom, métriques, métadonnées de table ou None)
+SheetExtraction = Tuple[str, List[MetricData], Optional[Dict[str, Any]]]
+
+
+def _extract_sheet_data(
+    sheet: SheetData,
+    format_type: str,
+    data_type: str,
+    intents_config: Optional[IntentsConfigLoader],
+    metadata_only: bool,
+) -> SheetExtraction:
+    """Extraction d'une feuille avec un extracteur dédié"""
+    extractor = IntelligentDataExtractor(format_type, data_type, intents_config)
+    if metadata_only:
+        metrics = extractor._extract_metadata_sheet(sheet, sheet.title)
+    else:
+        metrics = extractor.extract_sheet(sheet, sheet.title)
+    return sheet.title, metrics, getattr(extractor, "_current_table_metadata", None)
+
+
+def _extract_sheet_in_worker(
+    file_path: str,
+    sheet_name: str,
+    format_type: str,
+    data_type: str,
+    intents_config: Optional[IntentsConfigLoader],
+    metadata_only: bool,
+) -> SheetExtraction:
+    """Point d'entrée process pool: lit une seule feuille puis l'extrait"""
+    sheet = load_workbook_data(file_path, sheet_names=[sheet_name])[sheet_name]
+    return _extract_sheet_data(sheet, format_type, data_type, intents_config, metadata_only)
+
+
+def extract_workbook_sheets(
+    file_path: str,
+    sheet_names: List[str],
+    format_type: str,
+    data_type: str,
+    intents_config: Optional[IntentsConfigLoader] = None,
+    metadata_only: bool = False,
+    max_workers: Optional[int] = None,
+) -> List[SheetExtraction]:
+    """
+    Extrait des feuilles indépendantes, en parallèle si plusieurs.
+
+    Chaque worker ouvre le classeur en read_only et ne lit que sa feuille.
+
+    Args:
+        file_path: Fichier .xlsx
+        sheet_names: Feuilles à extraire
+        format_type: Format détecté
+        data_type: Type de données détecté
+        intents_config: Configuration intents.json (transmise aux workers)
+        metadata_only: Extraction format metadata/value uniquement
+        max_workers: Processus (défaut: nombre de CPU, 1 = sans pool)
+
+    Returns:
+        Une SheetExtraction par feuille, dans l'ordre de sheet_names
+    """
+    workers = min(max_workers or os.cpu_count() or 1, len(sheet_names))
+
+    if workers <= 1:
+        workbook = load_workbook_data(file_path, sheet_names=sheet_names)
+        return [
+            _extract_sheet_data(
+                workbook[name], format_type, data_type, intents_config, metadata_only
+            )
+            for name in sheet_names
+        ]
+
+    logger.info(f"Extraction parallèle: {len(sheet_names)} feuilles, {workers} processus")
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(
+                _extract_sheet_in_worker,
+                str(file_path),
+                name,
+                format_type,
+                data_type,
+                intents_config,
+                metadata_only,
+            )
+            for name in sheet_names
+        ]
+        return [future.result() for future in futures]
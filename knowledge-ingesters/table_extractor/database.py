@@ -1,11 +1,19 @@
 #!/usr/bin/env python3
 """
 Gestionnaire de base de données PostgreSQL
+
+Chargement des métriques:
+- Mode bulk (défaut): COPY (copy_records_to_table) vers une table de staging
+  temporaire puis fusion ensembliste (DELETE + INSERT ... SELECT) dans metrics
+- Dimensions (companies/breeds/strains/catégories) en cache mémoire pour la
+  durée du run: une seule requête par valeur distincte
+- Une transaction par document
 """
 
 import json
 import logging
-from typing import Dict, Any, List
+import time
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 
 import asyncpg
@@ -15,13 +23,72 @@ from models import TaxonomyInfo, MetricData
 logger = logging.getLogger(__name__)
 
 
+# Colonnes copiées dans la table de staging (ordre des tuples de métriques)
+STAGING_COLUMNS = [
+    "document_id",
+    "category_name",
+    "sheet_name",
+    "metric_key",
+    "metric_name",
+    "value_text",
+    "value_numeric",
+    "unit",
+    "age_min",
+    "age_max",
+    "metadata",
+]
+
+# Table temporaire par connexion, vidée à chaque commit
+CREATE_STAGING_SQL = """
+CREATE TEMP TABLE IF NOT EXISTS metrics_staging (
+    document_id INTEGER,
+    category_name VARCHAR(100),
+    sheet_name VARCHAR(100),
+    metric_key VARCHAR(200),
+    metric_name VARCHAR(200),
+    value_text TEXT,
+    value_numeric DOUBLE PRECISION,
+    unit VARCHAR(50),
+    age_min INTEGER,
+    age_max INTEGER,
+    metadata TEXT
+) ON COMMIT DELETE ROWS
+"""
+
+# Fusion ensembliste staging -> metrics (catégorie inconnue -> 'other')
+MERGE_STAGING_SQL = """
+INSERT INTO metrics (document_id, category_id, sheet_name, metric_key, metric_name,
+                     value_text, value_numeric, unit, age_min, age_max, metadata)
+SELECT s.document_id,
+       COALESCE(c.id, other.id),
+       s.sheet_name, s.metric_key, s.metric_name, s.value_text,
+       s.value_numeric::DECIMAL(15,6), s.unit, s.age_min, s.age_max,
+       s.metadata::JSONB
+FROM metrics_staging s
+LEFT JOIN data_categories c ON c.category_name = s.category_name
+LEFT JOIN data_categories other ON other.category_name = 'other'
+"""
+
+
 class PostgreSQLManager:
     """Gestionnaire PostgreSQL avec support intents.json"""
 
-    def __init__(self, config: Dict[str, Any]):
+    def __init__(self, config: Dict[str, Any], bulk_load: bool = True):
+        """
+        Args:
+            config: Paramètres de connexion (voir config.DATABASE_CONFIG)
+            bulk_load: COPY + fusion ensembliste et dimensions en cache
+                (False = ancien chemin ligne par ligne, gardé pour comparaison)
+        """
         self.config = config
+        self.bulk_load = bulk_load
         self.pool = None
 
+        # Cache des dimensions pour la durée du run: clé -> id
+        self._dimension_cache: Dict[Tuple, int] = {}
+
+        self.stats = {"documents": 0, "metrics": 0, "db_seconds": 0.0}
+
     async def initialize(self):
         """Initialise la connexion et crée les tables"""
         logger.info("Connexion à PostgreSQL...")
@@ -157,46 +224,15 @@ class PostgreSQLManager:
     ) -> int:
         """Insert un document avec support data_type et logging amélioré"""
 
+        start_time = time.perf_counter()
+        # Ids créés dans cette transaction: mis en cache seulement après commit
+        new_dimensions: Dict[Tuple, int] = {}
+
         async with self.pool.acquire() as conn:
             async with conn.transaction():
 
                 # Insertion company/breed/strain
-                company_id = await conn.fetchval(
-                    "INSERT INTO companies (company_name) VALUES ($1) ON CONFLICT (company_name) DO UPDATE SET company_name = EXCLUDED.company_name RETURNING id",
-                    taxonomy.company,
-                )
-
-                breed_id = await conn.fetchval(
-                    "INSERT INTO breeds (company_id, breed_name) VALUES ($1, $2) ON CONFLICT (company_id, breed_name) DO UPDATE SET breed_name = EXCLUDED.breed_name RETURNING id",
-                    company_id,
-                    taxonomy.breed,
-                )
-
-                strain_id = await conn.fetchval(
-                    "INSERT INTO strains (breed_id, strain_name, species) VALUES ($1, $2, $3) ON CONFLICT (breed_id, strain_name) DO UPDATE SET species = EXCLUDED.species RETURNING id",
-                    breed_id,
-                    taxonomy.strain,
-                    taxonomy.species,
-                )
-
-                # Construire métadonnées complètes
-                full_metadata = {
-                    "processed_at": datetime.now().isoformat(),
-                    "data_type": taxonomy.data_type,
-                    "intents_config_version": "v1.2",
-                }
-
-                # Ajouter métadonnées de structure si disponibles
-                if hasattr(self, "_current_table_metadata"):
-                    table_meta = self._current_table_metadata
-                    if "descriptive_metadata" in table_meta:
-                        full_metadata.update(table_meta["descriptive_metadata"])
-
-                    full_metadata["table_structure"] = {
-                        k: v
-                        for k, v in table_meta.items()
-                        if k not in ["descriptive_metadata"]
-                    }
+                strain_id = await self._get_strain_id(conn, taxonomy, new_dimensions)
 
                 document_id = await conn.fetchval(
                     """
@@ -220,58 +256,181 @@ class PostgreSQLManager:
                     taxonomy.data_type,
                     taxonomy.unit_system,
                     file_hash,
-                    json.dumps(full_metadata),
+                    json.dumps(self._build_document_metadata(taxonomy)),
                 )
 
                 # Insertion métriques
-                categories = await conn.fetch(
-                    "SELECT id, category_name FROM data_categories"
-                )
-                category_map = {row["category_name"]: row["id"] for row in categories}
-
                 await conn.execute(
                     "DELETE FROM metrics WHERE document_id = $1", document_id
                 )
 
-                metric_records = []
-                for metric in metrics:
-                    category_id = category_map.get(
-                        metric.category, category_map.get("other")
-                    )
-
-                    metric_records.append(
-                        (
-                            document_id,
-                            category_id,
-                            metric.sheet_name,
-                            metric.metric_key,
-                            metric.metric_name,
-                            metric.value_text,
-                            metric.value_numeric,
-                            metric.unit,
-                            metric.age_min,
-                            metric.age_max,
-                            json.dumps(metric.metadata) if metric.metadata else None,
-                        )
-                    )
-
-                if metric_records:
-                    await conn.executemany(
-                        """
-                        INSERT INTO metrics (document_id, category_id, sheet_name, metric_key, metric_name,
-                                           value_text, value_numeric, unit, age_min, age_max, metadata)
-                        VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11)
-                    """,
-                        metric_records,
-                    )
-
-                logger.info("Document inséré avec succès:")
-                logger.info(f"  - ID: {document_id}")
-                logger.info(f"  - Métriques: {len(metric_records)}")
-                logger.info(f"  - Type: {taxonomy.data_type}")
-                logger.info(f"  - Lignée: {taxonomy.strain}")
-
-                return document_id
+                if self.bulk_load:
+                    inserted = await self._copy_metrics(conn, document_id, metrics)
+                else:
+                    inserted = await self._insert_metrics_rows(conn, document_id, metrics)
+
+        self._dimension_cache.update(new_dimensions)
+        self.stats["documents"] += 1
+        self.stats["metrics"] += inserted
+        self.stats["db_seconds"] += time.perf_counter() - start_time
+
+        logger.info("Document inséré avec succès:")
+        logger.info(f"  - ID: {document_id}")
+        logger.info(f"  - Métriques: {inserted}")
+        logger.info(f"  - Type: {taxonomy.data_type}")
+        logger.info(f"  - Lignée: {taxonomy.strain}")
+
+        return document_id
+
+    def _build_document_metadata(self, taxonomy: TaxonomyInfo) -> Dict[str, Any]:
+        """Construire métadonnées complètes"""
+        full_metadata = {
+            "processed_at": datetime.now().isoformat(),
+            "data_type": taxonomy.data_type,
+            "intents_config_version": "v1.2",
+        }
+
+        # Ajouter métadonnées de structure si disponibles
+        if hasattr(self, "_current_table_metadata"):
+            table_meta = self._current_table_metadata
+            if "descriptive_metadata" in table_meta:
+                full_metadata.update(table_meta["descriptive_metadata"])
+
+            full_metadata["table_structure"] = {
+                k: v
+                for k, v in table_meta.items()
+                if k not in ["descriptive_metadata"]
+            }
+
+        return full_metadata
+
+    async def _get_dimension_id(
+        self, conn, key: Tuple, sql: str, args: tuple, new_dimensions: Dict[Tuple, int]
+    ) -> int:
+        """Upsert d'une dimension, évité si la clé est déjà en cache"""
+        if self.bulk_load:
+            cached = self._dimension_cache.get(key, new_dimensions.get(key))
+            if cached is not None:
+                return cached
+
+        dimension_id = await conn.fetchval(sql, *args)
+        new_dimensions[key] = dimension_id
+        return dimension_id
+
+    async def _get_strain_id(
+        self, conn, taxonomy: TaxonomyInfo, new_dimensions: Dict[Tuple, int]
+    ) -> int:
+        """Ids company -> breed -> strain (cache puis upsert RETURNING id)"""
+        company_id = await self._get_dimension_id(
+            conn,
+            ("company", taxonomy.company),
+            "INSERT INTO companies (company_name) VALUES ($1) ON CONFLICT (company_name) DO UPDATE SET company_name = EXCLUDED.company_name RETURNING id",
+            (taxonomy.company,),
+            new_dimensions,
+        )
+
+        breed_id = await self._get_dimension_id(
+            conn,
+            ("breed", company_id, taxonomy.breed),
+            "INSERT INTO breeds (company_id, breed_name) VALUES ($1, $2) ON CONFLICT (company_id, breed_name) DO UPDATE SET breed_name = EXCLUDED.breed_name RETURNING id",
+            (company_id, taxonomy.breed),
+            new_dimensions,
+        )
+
+        # species dans la clé: un changement d'espèce refait l'upsert
+        return await self._get_dimension_id(
+            conn,
+            ("strain", breed_id, taxonomy.strain, taxonomy.species),
+            "INSERT INTO strains (breed_id, strain_name, species) VALUES ($1, $2, $3) ON CONFLICT (breed_id, strain_name) DO UPDATE SET species = EXCLUDED.species RETURNING id",
+            (breed_id, taxonomy.strain, taxonomy.species),
+            new_dimensions,
+        )
+
+    async def _copy_metrics(
+        self, conn, document_id: int, metrics: List[MetricData]
+    ) -> int:
+        """COPY des métriques en staging puis fusion ensembliste dans metrics"""
+        if not metrics:
+            return 0
+
+        records = [
+            (
+                document_id,
+                metric.category,
+                metric.sheet_name,
+                metric.metric_key,
+                metric.metric_name,
+                metric.value_text,
+                self._to_float(metric.value_numeric),
+                metric.unit,
+                metric.age_min,
+                metric.age_max,
+                json.dumps(metric.metadata) if metric.metadata else None,
+            )
+            for metric in metrics
+        ]
+
+        await conn.execute(CREATE_STAGING_SQL)
+        await conn.copy_records_to_table(
+            "metrics_staging", records=records, columns=STAGING_COLUMNS
+        )
+        status = await conn.execute(MERGE_STAGING_SQL)
+
+        # Statut "INSERT 0 <n>"
+        return int(status.split()[-1])
+
+    async def _insert_metrics_rows(
+        self, conn, document_id: int, metrics: List[MetricData]
+    ) -> int:
+        """Ancien chemin: une requête INSERT par métrique (executemany)"""
+        categories = await conn.fetch(
+            "SELECT id, category_name FROM data_categories"
+        )
+        category_map = {row["category_name"]: row["id"] for row in categories}
+
+        metric_records = []
+        for metric in metrics:
+            category_id = category_map.get(
+                metric.category, category_map.get("other")
+            )
+
+            metric_records.append(
+                (
+                    document_id,
+                    category_id,
+                    metric.sheet_name,
+                    metric.metric_key,
+                    metric.metric_name,
+                    metric.value_text,
+                    metric.value_numeric,
+                    metric.unit,
+                    metric.age_min,
+                    metric.age_max,
+                    json.dumps(metric.metadata) if metric.metadata else None,
+                )
+            )
+
+        if metric_records:
+            await conn.executemany(
+                """
+                INSERT INTO metrics (document_id, category_id, sheet_name, metric_key, metric_name,
+                                   value_text, value_numeric, unit, age_min, age_max, metadata)
+                VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11)
+            """,
+                metric_records,
+            )
+
+        return len(metric_records)
+
+    @staticmethod
+    def _to_float(value: Any) -> Optional[float]:
+        """Valeur numérique pour COPY binaire (float8)"""
+        if value is None:
+            return None
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return None
 
     async def close(self):
         if self.pool:
@@ -8,11 +8,9 @@ import logging
 from pathlib import Path
 from typing import List, Tuple, Optional, Dict
 
-import openpyxl
-from openpyxl.worksheet.worksheet import Worksheet
-
 from models import TaxonomyInfo
 from config import IntentsConfigLoader
+from sheet_data import PREVIEW_ROWS, SheetData, WorkbookData, as_workbook_data
 
 logger = logging.getLogger(__name__)
 
@@ -101,10 +99,16 @@ class EnhancedFormatDetector:
         return cleaned_aliases
 
     def detect_format_and_type(
-        self, workbook: openpyxl.Workbook, filename: str
+        self, workbook: WorkbookData, filename: str
     ) -> Tuple[str, str, TaxonomyInfo]:
-        """Détection améliorée avec reconnaissance des lignées via intents.json"""
+        """
+        Détection améliorée avec reconnaissance des lignées via intents.json
+
+        Seules les PREVIEW_ROWS premières lignes de chaque feuille sont
+        utilisées (voir sheet_data.load_workbook_data(max_rows=...)).
+        """
         logger.info(f"Détection intelligente pour: {filename}")
+        workbook = as_workbook_data(workbook, PREVIEW_ROWS)
 
         filename_lower = filename.lower()
         detected_format = "generic"
@@ -170,16 +174,16 @@ class EnhancedFormatDetector:
 
         return detected_format, data_type, taxonomy
 
-    def _extract_headers_from_sheet(self, sheet: Worksheet) -> List[str]:
+    def _extract_headers_from_sheet(self, sheet: SheetData) -> List[str]:
         """Extrait les en-têtes potentiels d'une feuille"""
         headers = []
 
         for row_idx in range(1, min(21, sheet.max_row + 1)):
             row_headers = []
             for col_idx in range(1, min(11, sheet.max_column + 1)):
-                cell = sheet.cell(row_idx, col_idx)
-                if cell.value and isinstance(cell.value, str):
-                    row_headers.append(str(cell.value).strip())
+                value = sheet.value(row_idx, col_idx)
+                if value and isinstance(value, str):
+                    row_headers.append(str(value).strip())
 
             if len(row_headers) >= 3:
                 headers.extend(row_headers)
@@ -188,7 +192,7 @@ class EnhancedFormatDetector:
 
     def _extract_enhanced_taxonomy(
         self,
-        workbook: openpyxl.Workbook,
+        workbook: WorkbookData,
         format_type: str,
         filename: str,
         data_type: str,
@@ -209,7 +213,7 @@ class EnhancedFormatDetector:
             return self._extract_intelligent_taxonomy(workbook, filename, data_type)
 
     def _extract_intelligent_taxonomy(
-        self, workbook: openpyxl.Workbook, filename: str, data_type: str
+        self, workbook: WorkbookData, filename: str, data_type: str
     ) -> TaxonomyInfo:
         """Extraction intelligente basée sur intents.json"""
 
@@ -262,7 +266,7 @@ class EnhancedFormatDetector:
 
         return None
 
-    def _extract_sex_from_sheets(self, workbook: openpyxl.Workbook) -> Optional[str]:
+    def _extract_sex_from_sheets(self, workbook: WorkbookData) -> Optional[str]:
         """Extrait le sexe depuis les métadonnées des feuilles"""
 
         for sheet_name in workbook.sheetnames:
@@ -346,7 +350,7 @@ class EnhancedFormatDetector:
         return "Unknown", "Mixed", species
 
     def _extract_ross_taxonomy(
-        self, workbook: openpyxl.Workbook, filename: str, data_type: str
+        self, workbook: WorkbookData, filename: str, data_type: str
     ) -> TaxonomyInfo:
         """Extraction spécifique Ross/Aviagen"""
 
@@ -380,7 +384,7 @@ class EnhancedFormatDetector:
         )
 
     def _extract_cobb_taxonomy(
-        self, workbook: openpyxl.Workbook, filename: str, data_type: str
+        self, workbook: WorkbookData, filename: str, data_type: str
     ) -> TaxonomyInfo:
         """Extraction spécifique Cobb"""
         return TaxonomyInfo(
@@ -392,7 +396,7 @@ class EnhancedFormatDetector:
         )
 
     def _extract_hyline_taxonomy(
-        self, workbook: openpyxl.Workbook, filename: str, data_type: str
+        self, workbook: WorkbookData, filename: str, data_type: str
     ) -> TaxonomyInfo:
         """Extraction spécifique Hyline"""
 
@@ -423,7 +427,7 @@ class EnhancedFormatDetector:
         )
 
     def _extract_pharmaceutical_taxonomy(
-        self, workbook: openpyxl.Workbook, filename: str
+        self, workbook: WorkbookData, filename: str
     ) -> TaxonomyInfo:
         """Extraction pour données pharmaceutiques"""
 
@@ -442,7 +446,7 @@ class EnhancedFormatDetector:
         )
 
     def _extract_nutrition_taxonomy(
-        self, workbook: openpyxl.Workbook, filename: str
+        self, workbook: WorkbookData, filename: str
     ) -> TaxonomyInfo:
         """Extraction pour données nutritionnelles"""
 
@@ -460,11 +464,11 @@ class EnhancedFormatDetector:
             data_type="nutrition",
         )
 
-    def _has_metadata_format(self, sheet: Worksheet) -> bool:
+    def _has_metadata_format(self, sheet: SheetData) -> bool:
         """Vérifie si la feuille a un format metadata/value"""
         try:
-            cell_a1 = sheet["A1"].value
-            cell_b1 = sheet["B1"].value
+            cell_a1 = sheet.value(1, 1)
+            cell_b1 = sheet.value(1, 2)
             return (
                 cell_a1
                 and cell_b1
@@ -474,15 +478,15 @@ class EnhancedFormatDetector:
         except Exception:
             return False
 
-    def _extract_metadata_pairs(self, sheet: Worksheet) -> Dict[str, str]:
+    def _extract_metadata_pairs(self, sheet: SheetData) -> Dict[str, str]:
         """Extrait les paires métadonnées/valeurs"""
         metadata = {}
 
         try:
             for row in sheet.iter_rows(min_row=2, max_row=30):
-                if row[0].value and row[1].value:
-                    key = str(row[0].value).lower().strip()
-                    value = str(row[1].value).strip()
+                if row[0] and row[1]:
+                    key = str(row[0]).lower().strip()
+                    value = str(row[1]).strip()
                     metadata[key] = value
         except Exception:
             pass
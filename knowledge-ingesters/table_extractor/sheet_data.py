@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Lecture compacte des classeurs Excel
+
+Les feuilles sont lues en une seule passe (read_only=True, data_only=True,
+iter_rows(values_only=True)) dans des tuples de valeurs. Les extracteurs
+travaillent sur ces lignes au lieu d'adresser les cellules une par une
+(sheet[row] / sheet.cell() relisent le XML en mode read_only).
+"""
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from openpyxl import load_workbook
+
+# Lignes lues pour la détection de format et les métadonnées de feuille
+PREVIEW_ROWS = 50
+
+
+@dataclass
+class SheetData:
+    """Valeurs d'une feuille, lignes indexées à partir de 1 comme dans Excel"""
+
+    title: str
+    rows: List[tuple] = field(default_factory=list)
+
+    @property
+    def max_row(self) -> int:
+        return len(self.rows)
+
+    @property
+    def max_column(self) -> int:
+        return max((len(row) for row in self.rows), default=0)
+
+    def row(self, row_idx: int) -> tuple:
+        """Valeurs de la ligne row_idx (tuple vide hors feuille)"""
+        if 1 <= row_idx <= len(self.rows):
+            return self.rows[row_idx - 1]
+        return ()
+
+    def value(self, row_idx: int, col_idx: int) -> Any:
+        """Valeur de la cellule (row_idx, col_idx), None hors feuille"""
+        row = self.row(row_idx)
+        return row[col_idx - 1] if 1 <= col_idx <= len(row) else None
+
+    def iter_rows(self, min_row: int = 1, max_row: Optional[int] = None) -> Iterator[tuple]:
+        """Lignes min_row..max_row incluses"""
+        end = len(self.rows) if max_row is None else min(max_row, len(self.rows))
+        for row_idx in range(max(min_row, 1), end + 1):
+            yield self.rows[row_idx - 1]
+
+
+@dataclass
+class WorkbookData:
+    """Feuilles d'un classeur (éventuellement limitées aux premières lignes)"""
+
+    sheets: Dict[str, SheetData]
+
+    @property
+    def sheetnames(self) -> List[str]:
+        return list(self.sheets)
+
+    def __getitem__(self, sheet_name: str) -> SheetData:
+        return self.sheets[sheet_name]
+
+
+def read_sheet(worksheet, max_rows: Optional[int] = None) -> SheetData:
+    """Lit une feuille openpyxl en une passe"""
+    rows = list(worksheet.iter_rows(max_row=max_rows, values_only=True))
+    return SheetData(title=worksheet.title, rows=rows)
+
+
+def as_workbook_data(workbook, max_rows: Optional[int] = None) -> WorkbookData:
+    """WorkbookData inchangé, ou lecture d'un classeur openpyxl déjà ouvert"""
+    if isinstance(workbook, WorkbookData):
+        return workbook
+    return WorkbookData(
+        sheets={name: read_sheet(workbook[name], max_rows) for name in workbook.sheetnames}
+    )
+
+
+def load_workbook_data(
+    file_path: str | Path,
+    max_rows: Optional[int] = None,
+    sheet_names: Optional[List[str]] = None,
+) -> WorkbookData:
+    """
+    Lit un classeur en mode streaming.
+
+    Args:
+        file_path: Fichier .xlsx
+        max_rows: Lignes lues par feuille (None = toutes)
+        sheet_names: Feuilles à lire (None = toutes)
+
+    Returns:
+        WorkbookData avec une SheetData par feuille
+    """
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        names = sheet_names if sheet_names is not None else workbook.sheetnames
+        return WorkbookData(
+            sheets={name: read_sheet(workbook[name], max_rows) for name in names}
+        )
+    finally:
+        workbook.close()
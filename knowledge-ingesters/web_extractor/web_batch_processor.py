@@ -1,16 +1,26 @@
 """
 Web Batch Processor - Process URLs from Excel file
 Reads websites.xlsx (sheet: URL), processes each site, updates Status
+
+Pages are fetched concurrently (asyncio + one shared HTTP client) under a
+global concurrency cap, with one token bucket per domain: pages from the
+same domain stay domain_delay_seconds apart, other domains are not held up.
+Status updates are appended to a CSV journal as rows finish and merged into
+the Excel file once at the end of the run.
 """
 
 import sys
-import os
-import time
+import asyncio
+import csv
+import argparse
 import logging
+import threading
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Any, List
-from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional
+from datetime import datetime
 from urllib.parse import urlparse
+import httpx
 import pandas as pd
 
 # Add document_extractor directory to path for imports
@@ -20,6 +30,102 @@ sys.path.insert(0, str(document_extractor_path))
 from multi_format_pipeline import MultiFormatPipeline
 from weaviate_integration.ingester_v2 import WeaviateIngesterV2
 from weaviate_integration.deduplication_tracker import DeduplicationTracker
+from weaviate_integration.near_duplicates import NearDuplicateIndex, DEFAULT_THRESHOLD
+from utils.rate_limiter import AsyncTokenBucket
+
+# Columns managed by the processor (created if missing)
+STATUS_COLUMNS = [
+    "Status",
+    "Processed Date",
+    "Chunks Created",
+    "Error Message",
+    "ETag",
+    "Last-Modified"
+]
+
+
+@dataclass
+class FetchResult:
+    """Response of a (possibly conditional) page request"""
+    status_code: int
+    content: bytes = b""
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    @property
+    def not_modified(self) -> bool:
+        return self.status_code == 304
+
+
+class StatusJournal:
+    """
+    Append-only CSV log of row status updates.
+
+    One line is appended per finished URL instead of rewriting the whole
+    workbook. The journal is merged into the Excel file at the end of the
+    run, or replayed on the next start if the run was interrupted.
+    """
+
+    FIELDS = ["Website Address"] + STATUS_COLUMNS
+
+    def __init__(self, path: Path):
+        """
+        Initialize journal.
+
+        Args:
+            path: CSV journal file (created on first append)
+        """
+        self.path = Path(path)
+
+    def append(self, url: str, status: Dict[str, Any]):
+        """
+        Append the status of one URL.
+
+        Args:
+            url: Website Address of the row
+            status: Values of STATUS_COLUMNS for the row
+        """
+        write_header = not self.path.exists()
+        with open(self.path, "a", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=self.FIELDS)
+            if write_header:
+                writer.writeheader()
+            writer.writerow({
+                "Website Address": url,
+                **{col: "" if pd.isna(status.get(col)) else status.get(col) for col in STATUS_COLUMNS}
+            })
+
+    def replay(self, df: pd.DataFrame) -> int:
+        """
+        Apply journaled updates to the DataFrame (latest line per URL wins).
+
+        Args:
+            df: URL sheet loaded by load_urls()
+
+        Returns:
+            Number of journal lines applied
+        """
+        if not self.path.exists():
+            return 0
+
+        applied = 0
+        with open(self.path, newline="", encoding="utf-8") as f:
+            for record in csv.DictReader(f):
+                mask = df["Website Address"] == record["Website Address"]
+                if not mask.any():
+                    continue
+                for col in STATUS_COLUMNS:
+                    value = record.get(col) or None
+                    if col == "Chunks Created" and value is not None:
+                        value = int(value)
+                    df.loc[mask, col] = value
+                applied += 1
+
+        return applied
+
+    def clear(self):
+        """Remove the journal once its updates are saved in the Excel file"""
+        self.path.unlink(missing_ok=True)
 
 
 class WebBatchProcessor:
@@ -30,15 +136,22 @@ class WebBatchProcessor:
     - Reads URLs from websites.xlsx (sheet: URL)
     - Processes only rows with Status = pending or empty
     - Updates Status to "processed" or "failed"
-    - Adds processing metadata (date, chunks, errors)
+    - Adds processing metadata (date, chunks, errors, ETag/Last-Modified)
     - Prevents duplicate processing via URL hash
+    - Concurrent fetching with per-domain rate limiting
+    - Optional revalidation of processed rows with conditional requests
+      (unchanged pages answer 304 and are not re-ingested)
     """
 
     def __init__(
         self,
         excel_file: str = "websites.xlsx",
         sheet_name: str = "URL",
-        collection_name: str = "InteliaKnowledge"
+        collection_name: str = "InteliaKnowledge",
+        max_concurrency: int = 4,
+        domain_delay_seconds: float = 180,
+        request_timeout: float = 30.0,
+        near_duplicate_threshold: Optional[float] = DEFAULT_THRESHOLD
     ):
         """
         Initialize web batch processor.
@@ -47,6 +160,12 @@ class WebBatchProcessor:
             excel_file: Path to Excel file with URLs
             sheet_name: Sheet name to read (default: URL)
             collection_name: Weaviate collection name
+            max_concurrency: URLs fetched/processed at the same time (all domains)
+            domain_delay_seconds: Minimum delay between pages from the same domain
+                (0 = no per-domain limit)
+            request_timeout: HTTP request timeout in seconds
+            near_duplicate_threshold: Drop chunks near-identical to stored ones
+                (e.g. pages mirroring an ingested PDF); None = keep all chunks
         """
         self.excel_file = Path(excel_file)
         self.sheet_name = sheet_name
@@ -54,9 +173,19 @@ class WebBatchProcessor:
 
         # Initialize components
         self.pipeline = MultiFormatPipeline()
-        self.ingester = WeaviateIngesterV2(collection_name=collection_name)
+        near_duplicates = (
+            NearDuplicateIndex(threshold=near_duplicate_threshold)
+            if near_duplicate_threshold is not None else None
+        )
+        self.ingester = WeaviateIngesterV2(
+            collection_name=collection_name,
+            near_duplicates=near_duplicates
+        )
         self.tracker = DeduplicationTracker(tracking_file="processed_websites.json")
 
+        # Status updates journaled next to the Excel file (websites.status.csv)
+        self.journal = StatusJournal(self.excel_file.with_suffix(".status.csv"))
+
         # Statistics
         self.stats = {
             "total_rows": 0,
@@ -64,13 +193,22 @@ class WebBatchProcessor:
             "processed": 0,
             "failed": 0,
             "skipped": 0,
+            "unchanged": 0,
+            "revalidation_errors": 0,
             "total_chunks": 0
         }
 
-        # Rate limiting: Track last access time per domain
-        # Format: {"domain.com": datetime}
-        self.domain_last_access = {}
-        self.domain_delay_seconds = 180  # 3 minutes between pages from same domain
+        # Concurrency
+        self.max_concurrency = max_concurrency
+        self.request_timeout = request_timeout
+
+        # Rate limiting: one token bucket per domain, created on first use
+        # Format: {"domain.com": AsyncTokenBucket}
+        self.domain_buckets: Dict[str, AsyncTokenBucket] = {}
+        self.domain_delay_seconds = domain_delay_seconds  # Default: 3 minutes between pages
+
+        # Weaviate batches and tracker writes: one worker thread at a time
+        self._write_lock = threading.Lock()
 
     def _get_domain(self, url: str) -> str:
         """
@@ -85,26 +223,29 @@ class WebBatchProcessor:
         parsed = urlparse(url)
         return parsed.netloc
 
-    def _wait_for_domain_rate_limit(self, url: str):
+    def _get_domain_bucket(self, url: str) -> Optional[AsyncTokenBucket]:
         """
-        Wait if necessary to respect rate limit for domain.
+        Get the rate limiter of the URL's domain.
+
+        Buckets hold a single token (no burst) refilled every
+        domain_delay_seconds, so requests to one domain are spaced out while
+        other domains proceed in parallel.
 
         Args:
             url: URL to process
-        """
-        domain = self._get_domain(url)
-
-        if domain in self.domain_last_access:
-            last_access = self.domain_last_access[domain]
-            elapsed = (datetime.now() - last_access).total_seconds()
 
-            if elapsed < self.domain_delay_seconds:
-                wait_time = self.domain_delay_seconds - elapsed
-                print(f"  Rate limit: Waiting {wait_time:.1f}s for domain {domain}")
-                time.sleep(wait_time)
+        Returns:
+            Token bucket, or None if per-domain rate limiting is disabled
+        """
+        if self.domain_delay_seconds <= 0:
+            return None
 
-        # Update last access time
-        self.domain_last_access[domain] = datetime.now()
+        domain = self._get_domain(url)
+        if domain not in self.domain_buckets:
+            self.domain_buckets[domain] = AsyncTokenBucket(
+                rate=1.0 / self.domain_delay_seconds, capacity=1.0
+            )
+        return self.domain_buckets[domain]
 
     def load_urls(self) -> pd.DataFrame:
         """
@@ -122,17 +263,13 @@ class WebBatchProcessor:
                 if col not in df.columns:
                     raise ValueError(f"Missing required column: {col}")
 
-            # Add Status column if not present
-            if "Status" not in df.columns:
-                df["Status"] = None
+            # Add Status and metadata columns if not present
+            for col in STATUS_COLUMNS:
+                if col not in df.columns:
+                    df[col] = None
 
-            # Add metadata columns if not present
-            if "Processed Date" not in df.columns:
-                df["Processed Date"] = None
-            if "Chunks Created" not in df.columns:
-                df["Chunks Created"] = None
-            if "Error Message" not in df.columns:
-                df["Error Message"] = None
+            # Empty columns are read as float: allow text values
+            df[STATUS_COLUMNS] = df[STATUS_COLUMNS].astype(object)
 
             self.logger.info(f"Loaded {len(df)} URLs from {self.excel_file}")
             return df
@@ -185,21 +322,35 @@ class WebBatchProcessor:
 
         return False
 
-    def process_all(self, force_reprocess: bool = False) -> Dict[str, Any]:
+    def process_all(
+        self,
+        force_reprocess: bool = False,
+        revalidate: bool = False
+    ) -> Dict[str, Any]:
         """
         Process all URLs in Excel file.
 
         Args:
             force_reprocess: If True, reprocess even if marked as processed
+            revalidate: If True, re-check processed rows with conditional
+                requests (ETag/Last-Modified) and reprocess changed pages only
 
         Returns:
             Processing statistics
 
         Note:
             Rate limiting is handled automatically per domain (3 minutes between
-            requests to the same domain). URLs from different domains can be
-            processed immediately without delay.
+            requests to the same domain). URLs from different domains are
+            fetched concurrently, up to max_concurrency at a time.
         """
+        return asyncio.run(self.process_all_async(force_reprocess, revalidate))
+
+    async def process_all_async(
+        self,
+        force_reprocess: bool = False,
+        revalidate: bool = False
+    ) -> Dict[str, Any]:
+        """Async version of process_all()"""
         print("\n" + "="*80)
         print("WEB BATCH PROCESSING - START")
         print("="*80)
@@ -207,9 +358,14 @@ class WebBatchProcessor:
         print(f"Sheet: {self.sheet_name}")
         print(f"Collection: {self.ingester.collection_name}")
         print(f"Force Reprocess: {force_reprocess}")
+        print(f"Revalidate: {revalidate}")
 
-        # Load URLs
+        # Load URLs (and status updates of an interrupted run)
         df = self.load_urls()
+        recovered = self.journal.replay(df)
+        if recovered:
+            print(f"Recovered {recovered} status updates from {self.journal.path.name}")
+
         self.stats["total_rows"] = len(df)
 
         print(f"\nTotal URLs: {len(df)}")
@@ -218,86 +374,70 @@ class WebBatchProcessor:
             print("\nNo URLs to process")
             return self.stats
 
-        # Process each row
+        # Select rows to fetch
         start_time = datetime.now()
+        jobs = []
 
         for idx, row in df.iterrows():
             url = row["Website Address"]
-            classification = row["Classification"]
-
-            print(f"\n{'-'*80}")
-            print(f"[{idx+1}/{len(df)}] {url}")
-            print(f"Classification: {classification}")
-            print(f"{'-'*80}")
+            conditional_headers: Dict[str, str] = {}
+            revalidating = False
 
             # Check if should process
             if not force_reprocess and not self.should_process_row(row):
-                print(f"SKIPPED - Status: {row['Status']}")
-                self.stats["skipped"] += 1
-                continue
+                if revalidate and row["Status"] == "processed":
+                    conditional_headers = self._conditional_headers(row)
+                    revalidating = True
+                else:
+                    self.stats["skipped"] += 1
+                    continue
 
             # Check deduplication tracker
-            if not force_reprocess and self.tracker.is_processed(url):
+            elif not force_reprocess and self.tracker.is_processed(url):
                 processed_info = self.tracker.get_processed_info(url)
-                print(f"SKIPPED - Already processed")
-                print(f"  Date: {processed_info['processed_timestamp']}")
-                print(f"  Chunks: {processed_info['chunks_created']}")
+                print(f"SKIPPED - Already processed: {url}")
                 self.stats["already_processed"] += 1
 
                 # Update Excel status
-                df.at[idx, "Status"] = "processed"
-                df.at[idx, "Processed Date"] = processed_info["processed_timestamp"]
-                df.at[idx, "Chunks Created"] = processed_info["chunks_created"]
+                self._record_status(df, idx, {
+                    "Status": "processed",
+                    "Processed Date": processed_info["processed_timestamp"],
+                    "Chunks Created": processed_info["chunks_created"]
+                })
                 continue
 
-            # Rate limiting: Wait if necessary for same domain
-            self._wait_for_domain_rate_limit(url)
-
-            # Process URL
-            try:
-                result = self._process_single_url(url, classification)
+            jobs.append((idx, url, row["Classification"], conditional_headers, revalidating))
 
-                if result["success"]:
-                    self.stats["processed"] += 1
-                    self.stats["total_chunks"] += result["chunks_created"]
+        domains = {self._get_domain(url) for _, url, _, _, _ in jobs}
+        print(f"URLs to fetch: {len(jobs)} ({len(domains)} domains, "
+              f"{self.max_concurrency} concurrent, {self.domain_delay_seconds}s per domain)")
 
-                    # Update Excel
-                    df.at[idx, "Status"] = "processed"
-                    df.at[idx, "Processed Date"] = datetime.now().isoformat()
-                    df.at[idx, "Chunks Created"] = result["chunks_created"]
-                    df.at[idx, "Error Message"] = None
-
-                    print(f"SUCCESS")
-                    print(f"  Chunks created: {result['chunks_created']}")
-                    print(f"  Ingested to Weaviate: {result['ingested']}")
-                else:
-                    self.stats["failed"] += 1
-
-                    # Update Excel
-                    df.at[idx, "Status"] = "failed"
-                    df.at[idx, "Processed Date"] = datetime.now().isoformat()
-                    df.at[idx, "Chunks Created"] = 0
-                    df.at[idx, "Error Message"] = result.get("error", "Unknown error")
-
-                    print(f"FAILED: {result.get('error', 'Unknown error')}")
-
-            except Exception as e:
-                self.stats["failed"] += 1
-                self.logger.error(f"Error processing {url}: {e}")
-
-                # Update Excel
-                df.at[idx, "Status"] = "failed"
-                df.at[idx, "Processed Date"] = datetime.now().isoformat()
-                df.at[idx, "Chunks Created"] = 0
-                df.at[idx, "Error Message"] = str(e)
-
-                print(f"FAILED: {e}")
-
-            # Save after each row (incremental save)
-            self.save_urls(df)
+        # Process rows concurrently; status is journaled as each row finishes
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        limits = httpx.Limits(
+            max_connections=self.max_concurrency,
+            max_keepalive_connections=self.max_concurrency
+        )
 
-            # No fixed delay needed - rate limiting is handled per domain
-            # in _wait_for_domain_rate_limit() method
+        try:
+            async with httpx.AsyncClient(
+                headers=self.pipeline.web_scraper.headers,
+                timeout=self.request_timeout,
+                follow_redirects=True,
+                limits=limits
+            ) as client:
+                await asyncio.gather(*(
+                    self._process_row(
+                        client, semaphore, df, idx, url, classification, headers, revalidating
+                    )
+                    for idx, url, classification, headers, revalidating in jobs
+                ))
+        finally:
+            # Single write of the Excel file (if any row changed); the journal
+            # is kept if the write fails
+            if self.journal.path.exists():
+                self.save_urls(df)
+                self.journal.clear()
 
         # Final statistics
         end_time = datetime.now()
@@ -309,8 +449,10 @@ class WebBatchProcessor:
         print(f"Total URLs: {self.stats['total_rows']}")
         print(f"Already Processed (skipped): {self.stats['already_processed']}")
         print(f"Skipped (status): {self.stats['skipped']}")
+        print(f"Unchanged (304): {self.stats['unchanged']}")
         print(f"Newly Processed: {self.stats['processed']}")
         print(f"Failed: {self.stats['failed']}")
+        print(f"Revalidation Errors (kept): {self.stats['revalidation_errors']}")
         print(f"Total Chunks Created: {self.stats['total_chunks']}")
         print(f"Elapsed Time: {elapsed:.1f}s ({elapsed/60:.1f} minutes)")
 
@@ -320,13 +462,163 @@ class WebBatchProcessor:
 
         return self.stats
 
-    def _process_single_url(self, url: str, classification_path: str) -> Dict[str, Any]:
+    async def _process_row(
+        self,
+        client: httpx.AsyncClient,
+        semaphore: asyncio.Semaphore,
+        df: pd.DataFrame,
+        idx: int,
+        url: str,
+        classification: str,
+        conditional_headers: Dict[str, str],
+        revalidating: bool = False
+    ):
+        """
+        Fetch, process and ingest one URL, then record its status.
+
+        The domain token is taken inside the global slot, right before the
+        request: tasks still queued on the semaphore do not consume tokens,
+        so pages from one domain stay domain_delay_seconds apart.
+
+        A revalidated row (already processed) that fails keeps its previous
+        status and validators, so it is checked again on the next run.
+        """
+        bucket = self._get_domain_bucket(url)
+
+        async with semaphore:
+            try:
+                if bucket is not None:
+                    await bucket.acquire()
+
+                fetched = await self._fetch(client, url, conditional_headers)
+
+                if fetched.not_modified:
+                    self.stats["unchanged"] += 1
+                    print(f"UNCHANGED (304): {url}")
+                    return
+
+                # Extraction, enrichment and ingestion are blocking: worker thread
+                result = await asyncio.to_thread(
+                    self._process_single_url, url, classification, fetched.content
+                )
+            except Exception as e:
+                self.logger.error(f"Error processing {url}: {e}")
+                result = {"success": False, "error": str(e), "chunks_created": 0}
+
+        if result["success"]:
+            self.stats["processed"] += 1
+            self.stats["total_chunks"] += result["chunks_created"]
+
+            self._record_status(df, idx, {
+                "Status": "processed",
+                "Processed Date": datetime.now().isoformat(),
+                "Chunks Created": result["chunks_created"],
+                "Error Message": None,
+                "ETag": fetched.etag,
+                "Last-Modified": fetched.last_modified
+            })
+
+            print(f"SUCCESS: {url}")
+            print(f"  Chunks created: {result['chunks_created']}")
+            print(f"  Ingested to Weaviate: {result['ingested']}")
+        elif revalidating:
+            self.stats["revalidation_errors"] += 1
+            print(f"REVALIDATION ERROR (kept previous version): {url}: "
+                  f"{result.get('error', 'Unknown error')}")
+        else:
+            self.stats["failed"] += 1
+
+            self._record_status(df, idx, {
+                "Status": "failed",
+                "Processed Date": datetime.now().isoformat(),
+                "Chunks Created": 0,
+                "Error Message": result.get("error", "Unknown error"),
+                "ETag": None,
+                "Last-Modified": None
+            })
+
+            print(f"FAILED: {url}: {result.get('error', 'Unknown error')}")
+
+    async def _fetch(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        conditional_headers: Dict[str, str]
+    ) -> FetchResult:
+        """
+        Download a page (conditional request if validators are given).
+
+        Args:
+            client: Shared HTTP client (connection reuse across requests)
+            url: URL to fetch
+            conditional_headers: If-None-Match / If-Modified-Since headers
+
+        Returns:
+            FetchResult (status 304 when the page did not change)
+        """
+        response = await client.get(url, headers=conditional_headers)
+
+        if response.status_code == 304:
+            return FetchResult(status_code=304)
+
+        response.raise_for_status()
+
+        return FetchResult(
+            status_code=response.status_code,
+            content=response.content,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified")
+        )
+
+    def _conditional_headers(self, row: pd.Series) -> Dict[str, str]:
+        """
+        Build conditional request headers from the validators stored in a row.
+
+        Args:
+            row: DataFrame row
+
+        Returns:
+            Headers dict (empty if the row has no ETag/Last-Modified)
+        """
+        headers = {}
+        if not pd.isna(row.get("ETag")) and row.get("ETag"):
+            headers["If-None-Match"] = str(row["ETag"])
+        if not pd.isna(row.get("Last-Modified")) and row.get("Last-Modified"):
+            headers["If-Modified-Since"] = str(row["Last-Modified"])
+        return headers
+
+    def _record_status(self, df: pd.DataFrame, idx: int, updates: Dict[str, Any]):
+        """
+        Update a row in memory and append its status to the journal.
+
+        Args:
+            df: URL sheet
+            idx: Row index
+            updates: Status column values to set
+        """
+        for col, value in updates.items():
+            df.at[idx, col] = value
+
+        self.journal.append(
+            df.at[idx, "Website Address"],
+            {col: df.at[idx, col] for col in STATUS_COLUMNS}
+        )
+
+    def _process_single_url(
+        self,
+        url: str,
+        classification_path: str,
+        web_content: Optional[bytes] = None
+    ) -> Dict[str, Any]:
         """
         Process a single URL end-to-end.
 
+        Runs in a worker thread; several URLs can be processed at once.
+
         Args:
             url: URL to process
             classification_path: Classification path (e.g., intelia/public/broiler_farms/management/common)
+            web_content: HTML already downloaded (None = fetch the page)
 
         Returns:
             Processing result dictionary
@@ -336,7 +628,7 @@ class WebBatchProcessor:
         virtual_path = f"Sources/{classification_path}/webpage.html"
 
         # Step 1: Process URL (web scraping + classification + enrichment + chunking)
-        pipeline_result = self.pipeline.process_file(url)
+        pipeline_result = self.pipeline.process_file(url, web_content=web_content)
 
         if not pipeline_result.success:
             return {
@@ -367,25 +659,27 @@ class WebBatchProcessor:
             # Update source file to show it's from web
             chunk["source_file"] = url
 
-        # Step 2: Ingest to Weaviate
-        ingestion_stats = self.ingester.ingest_chunks(pipeline_result.chunks_with_metadata)
-
-        if ingestion_stats["failed"] > 0:
-            self.logger.warning(
-                f"Partial ingestion failure: {ingestion_stats['failed']} chunks failed"
+        with self._write_lock:
+            # Step 2: Ingest to Weaviate (a changed page replaces its old
+            # chunks: unchanged ones are kept, removed ones deleted)
+            ingestion_stats = self.ingester.sync_chunks(pipeline_result.chunks_with_metadata)
+
+            if ingestion_stats["failed"] > 0:
+                self.logger.warning(
+                    f"Partial ingestion failure: {ingestion_stats['failed']} chunks failed"
+                )
+
+            # Step 3: Mark as processed in tracker
+            self.tracker.mark_as_processed(
+                file_path=url,  # Use URL as "file path"
+                chunks_created=len(pipeline_result.chunks_with_metadata),
+                metadata_summary=pipeline_result.metadata_summary
             )
 
-        # Step 3: Mark as processed in tracker
-        self.tracker.mark_as_processed(
-            file_path=url,  # Use URL as "file path"
-            chunks_created=len(pipeline_result.chunks_with_metadata),
-            metadata_summary=pipeline_result.metadata_summary
-        )
-
         return {
             "success": True,
             "chunks_created": len(pipeline_result.chunks_with_metadata),
-            "ingested": ingestion_stats["success"] > 0,
+            "ingested": ingestion_stats["success"] + ingestion_stats["unchanged"] > 0,
             "ingestion_stats": ingestion_stats
         }
 
@@ -413,30 +707,29 @@ if __name__ == "__main__":
         format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     )
 
-    # Default configuration
-    excel_file = Path(__file__).parent / "websites.xlsx"
-    sheet_name = "URL"
-    collection_name = "InteliaKnowledge"
-    force_reprocess = False
-
-    # Parse command line arguments
-    if len(sys.argv) > 1:
-        excel_file = sys.argv[1]
-
-    if len(sys.argv) > 2:
-        if sys.argv[2].lower() in ['true', '1', 'yes', 'force']:
-            force_reprocess = True
+    parser = argparse.ArgumentParser(description="Process URLs from websites.xlsx")
+    parser.add_argument("excel_file", nargs="?", default=str(Path(__file__).parent / "websites.xlsx"))
+    parser.add_argument("force", nargs="?", default="", help="true/1/yes/force to reprocess all rows")
+    parser.add_argument("--revalidate", action="store_true",
+                        help="Re-check processed rows with conditional requests")
+    parser.add_argument("--max-concurrency", type=int, default=4)
+    parser.add_argument("--domain-delay", type=float, default=180,
+                        help="Seconds between pages from the same domain")
+    args = parser.parse_args()
 
     # Initialize processor
     processor = WebBatchProcessor(
-        excel_file=excel_file,
-        sheet_name=sheet_name,
-        collection_name=collection_name
+        excel_file=args.excel_file,
+        sheet_name="URL",
+        collection_name="InteliaKnowledge",
+        max_concurrency=args.max_concurrency,
+        domain_delay_seconds=args.domain_delay
     )
 
     # Process all URLs
     stats = processor.process_all(
-        force_reprocess=force_reprocess
+        force_reprocess=args.force.lower() in ['true', '1', 'yes', 'force'],
+        revalidate=args.revalidate
     )
 
     # Exit code based on results
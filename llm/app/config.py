@@ -44,6 +44,12 @@ class Settings(BaseSettings):
     # 0.0 = all medium queries to 8B, 1.0 = all medium queries to 3B
     ab_test_ratio: float = 0.5  # 50% to 3B, 50% to 8B
 
+    # Prompt prefix caching
+    # Emit explicit cache_control markers on the static system prompt segment.
+    # Only enable for OpenAI-compatible gateways that accept Anthropic-style
+    # content blocks; vLLM/OpenAI reuse the stable prefix automatically.
+    prompt_cache_control: bool = False
+
     # Response Caching (Option 1)
     cache_enabled: bool = True
     redis_host: str = "localhost"
@@ -34,6 +34,7 @@ def get_llm_client() -> LLMClient:
             provider="huggingface",
             api_key=settings.huggingface_api_key,
             model=settings.huggingface_model,
+            cache_control=settings.prompt_cache_control,
         )
 
     elif settings.llm_provider == "vllm":
@@ -48,6 +48,9 @@ class AvicultureConfig:
         # Initialize terminology injector
         self.terminology_injector = get_terminology_injector()
 
+        # Memoized static system prompts keyed by (query_type, language_name)
+        self._static_prompt_cache: Dict[tuple, str] = {}
+
         # Aviculture-specific breed keywords
         self.breed_keywords = [
             "ross",
@@ -231,6 +234,95 @@ class AvicultureConfig:
             logger.error(f"Invalid JSON in {file_path}: {e}")
             return {}
 
+    # Language names used to format the {language_name} placeholder in prompts
+    LANGUAGE_NAMES = {
+        "ar": "Arabic",
+        "de": "German",
+        "en": "English",
+        "es": "Spanish",
+        "fr": "French",
+        "hi": "Hindi",
+        "id": "Indonesian",
+        "it": "Italian",
+        "ja": "Japanese",
+        "nl": "Dutch",
+        "pl": "Polish",
+        "pt": "Portuguese",
+        "th": "Thai",
+        "tr": "Turkish",
+        "vi": "Vietnamese",
+        "zh": "Chinese",
+    }
+
+    def get_static_system_prompt(
+        self, query_type: str = "general_poultry", language: str = "en"
+    ) -> str:
+        """
+        Get the query-independent part of the system prompt
+
+        The result only depends on (query_type, language) and is memoized so the
+        exact same string object is reused across requests. Keeping this prefix
+        byte-stable lets providers reuse their KV-cache (vLLM automatic prefix
+        caching, OpenAI/Anthropic prompt caching) for the ~2-4k token prompt.
+
+        Args:
+            query_type: Type of query (general_poultry, nutrition_query, etc.)
+            language: Response language code (fr, en, es, etc.)
+
+        Returns:
+            Formatted static system prompt with language directive
+        """
+        specialized_prompts = self.system_prompts.get("specialized_prompts", {})
+        if query_type not in specialized_prompts:
+            query_type = "general_poultry"
+        language_name = self.LANGUAGE_NAMES.get(language, "English")
+
+        cache_key = (query_type, language_name)
+        cached = self._static_prompt_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        base_prompts = self.system_prompts.get("base_prompts", {})
+        expert_identity = base_prompts.get("expert_identity", "")
+        response_guidelines = base_prompts.get("response_guidelines", "")
+        specialized = specialized_prompts.get(query_type, "")
+
+        static_prompt = (
+            f"{expert_identity}\n\n{response_guidelines}\n\n{specialized}"
+        ).format(language_name=language_name)
+
+        self._static_prompt_cache[cache_key] = static_prompt
+        return static_prompt
+
+    def get_terminology_section(
+        self, query: str, language: str = "en", max_terminology_tokens: int = 1000
+    ) -> str:
+        """
+        Get the query-dependent terminology section of the system prompt
+
+        Args:
+            query: User query text used for terminology matching
+            language: Response language code
+            max_terminology_tokens: Maximum tokens to use for terminology
+
+        Returns:
+            Terminology section, or empty string if nothing relevant was found
+        """
+        if not query:
+            return ""
+        try:
+            return (
+                self.terminology_injector.format_terminology_for_prompt(
+                    query=query,
+                    max_tokens=max_terminology_tokens,
+                    language=language,
+                )
+                or ""
+            )
+        except Exception as e:
+            logger.warning(f"Failed to inject terminology: {e}")
+            return ""
+
     def get_system_prompt(
         self,
         query_type: str = "general_poultry",
@@ -242,6 +334,9 @@ class AvicultureConfig:
         """
         Get system prompt for a specific query type with optional terminology injection
 
+        The static domain content always comes first, followed by the
+        query-dependent terminology, so the prompt prefix stays cacheable.
+
         Args:
             query_type: Type of query (general_poultry, nutrition_query, health_diagnosis, etc.)
             language: Response language code (fr, en, es, etc.)
@@ -252,62 +347,18 @@ class AvicultureConfig:
         Returns:
             Formatted system prompt with language directive and optional terminology
         """
-        # Get base prompts
-        expert_identity = self.system_prompts.get("base_prompts", {}).get(
-            "expert_identity", ""
-        )
-        response_guidelines = self.system_prompts.get("base_prompts", {}).get(
-            "response_guidelines", ""
-        )
-
-        # Get specialized prompt
-        specialized = self.system_prompts.get("specialized_prompts", {}).get(
-            query_type,
-            self.system_prompts.get("specialized_prompts", {}).get(
-                "general_poultry", ""
-            ),
-        )
-
-        # Combine prompts
-        full_prompt = f"{expert_identity}\n\n{response_guidelines}\n\n{specialized}"
+        full_prompt = self.get_static_system_prompt(query_type, language)
 
-        # Inject terminology if requested and query is provided
         if inject_terminology and query:
-            try:
-                terminology_section = (
-                    self.terminology_injector.format_terminology_for_prompt(
-                        query=query,
-                        max_tokens=max_terminology_tokens,
-                        language=language,
-                    )
-                )
-                if terminology_section:
-                    full_prompt = f"{full_prompt}\n\n{terminology_section}"
-            except Exception as e:
-                logger.warning(f"Failed to inject terminology: {e}")
-
-        # Format with language name
-        language_names = {
-            "ar": "Arabic",
-            "de": "German",
-            "en": "English",
-            "es": "Spanish",
-            "fr": "French",
-            "hi": "Hindi",
-            "id": "Indonesian",
-            "it": "Italian",
-            "ja": "Japanese",
-            "nl": "Dutch",
-            "pl": "Polish",
-            "pt": "Portuguese",
-            "th": "Thai",
-            "tr": "Turkish",
-            "vi": "Vietnamese",
-            "zh": "Chinese",
-        }
-        language_name = language_names.get(language, "English")
+            terminology_section = self.get_terminology_section(
+                query=query,
+                language=language,
+                max_terminology_tokens=max_terminology_tokens,
+            )
+            if terminology_section:
+                full_prompt = f"{full_prompt}\n\n{terminology_section}"
 
-        return full_prompt.format(language_name=language_name)
+        return full_prompt
 
     @cached_property
     def post_processor(self):
@@ -12,6 +12,7 @@ from fastapi.responses import JSONResponse
 from app.config import settings
 from app.routers import chat, models, health, generation
 from app.utils.logger import setup_logging
+from app.utils.tracing import start_trace, end_trace, get_current_trace
 import logging
 import time
 
@@ -57,8 +58,9 @@ app.add_middleware(
 # Request logging middleware
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
-    """Log all requests with timing"""
+    """Log all requests with timing and expose per-stage spans as Server-Timing"""
     start_time = time.time()
+    trace_token = start_trace()
 
     logger.info(f"-> {request.method} {request.url.path}")
 
@@ -66,6 +68,13 @@ async def log_requests(request: Request, call_next):
         response = await call_next(request)
         duration = time.time() - start_time
 
+        # Streaming responses return before their stages run: their spans
+        # only reach Prometheus and the SSE end event
+        trace = get_current_trace()
+        if trace is not None and trace.spans:
+            response.headers["Server-Timing"] = trace.server_timing_header()
+            logger.info(f"   Stages {request.url.path}: {trace.stage_durations()}")
+
         logger.info(
             f"<- {request.method} {request.url.path} "
             f"- Status: {response.status_code} "
@@ -82,6 +91,8 @@ async def log_requests(request: Request, call_next):
             exc_info=True,
         )
         raise
+    finally:
+        end_trace(trace_token)
 
 
 # Exception handler
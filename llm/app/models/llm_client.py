@@ -6,20 +6,31 @@ Supports HuggingFace Inference API and vLLM (self-hosted)
 import logging
 import json
 from abc import ABC, abstractmethod
-from typing import List, Dict, Tuple
+from typing import Any, List, Dict, Tuple
 from huggingface_hub import InferenceClient
 import httpx
 
+from app.utils.metrics import track_prompt_cache
+from app.utils.prompt_layout import extract_cached_tokens
+
 logger = logging.getLogger(__name__)
 
 
 class LLMClient(ABC):
     """Abstract base class for LLM providers"""
 
+    # Whether the provider accepts explicit cache_control content blocks
+    supports_cache_control: bool = False
+
+    @property
+    @abstractmethod
+    def model_id(self) -> str:
+        """Identifier of the model this provider actually calls"""
+
     @abstractmethod
     async def generate(
         self,
-        messages: List[Dict[str, str]],
+        messages: List[Dict[str, Any]],
         temperature: float = 0.7,
         max_tokens: int = 2000,
         top_p: float = 1.0,
@@ -42,7 +53,7 @@ class LLMClient(ABC):
 
     async def generate_stream(
         self,
-        messages: List[Dict[str, str]],
+        messages: List[Dict[str, Any]],
         temperature: float = 0.7,
         max_tokens: int = 2000,
         top_p: float = 1.0,
@@ -78,28 +89,34 @@ class HuggingFaceProvider(LLMClient):
     Phase 1: Pay-per-use, no dedicated infrastructure
     """
 
-    def __init__(self, api_key: str, model: str):
+    def __init__(self, api_key: str, model: str, cache_control: bool = False):
         """
         Initialize HuggingFace provider
 
         Args:
             api_key: HuggingFace API token (starts with hf_)
             model: Model ID (e.g., meta-llama/Llama-3.1-8B-Instruct)
+            cache_control: Whether the routed provider accepts cache_control blocks
         """
         if not api_key:
             raise ValueError("HuggingFace API key is required")
 
         self.api_key = api_key
         self.model = model
+        self.supports_cache_control = cache_control
         # Initialize client for HuggingFace Inference Providers
         # This routes through router.huggingface.co to multiple providers (Together, Replicate, etc.)
         self.client = InferenceClient(token=api_key)
 
         logger.info(f"HuggingFace Inference Providers initialized: {model}")
 
+    @property
+    def model_id(self) -> str:
+        return self.model
+
     async def generate(
         self,
-        messages: List[Dict[str, str]],
+        messages: List[Dict[str, Any]],
         temperature: float = 0.7,
         max_tokens: int = 2000,
         top_p: float = 1.0,
@@ -143,6 +160,7 @@ class HuggingFaceProvider(LLMClient):
             usage = data.get("usage", {})
             prompt_tokens = usage.get("prompt_tokens", 0)
             completion_tokens = usage.get("completion_tokens", 0)
+            track_prompt_cache(self.model, extract_cached_tokens(usage))
 
             # Fallback to estimation if not provided
             if prompt_tokens == 0:
@@ -184,7 +202,7 @@ class HuggingFaceProvider(LLMClient):
 
     async def generate_stream(
         self,
-        messages: List[Dict[str, str]],
+        messages: List[Dict[str, Any]],
         temperature: float = 0.7,
         max_tokens: int = 2000,
         top_p: float = 1.0,
@@ -222,6 +240,8 @@ class HuggingFaceProvider(LLMClient):
                         "top_p": top_p,
                         "stop": stop if stop else [],
                         "stream": True,  # ⚡ Enable streaming
+                        # Ask for a final usage chunk (prompt/cached token counts)
+                        "stream_options": {"include_usage": True},
                     },
                 ) as response:
                     response.raise_for_status()
@@ -229,6 +249,7 @@ class HuggingFaceProvider(LLMClient):
                     full_text = ""
                     prompt_tokens = 0
                     completion_tokens = 0
+                    cached_tokens = 0
 
                     async for line in response.aiter_lines():
                         if not line.strip():
@@ -240,12 +261,14 @@ class HuggingFaceProvider(LLMClient):
                             # Check for end of stream
                             if data_str.strip() == "[DONE]":
                                 # Final chunk with metadata
+                                track_prompt_cache(self.model, cached_tokens)
                                 yield (
                                     "",
                                     True,
                                     {
                                         "prompt_tokens": prompt_tokens,
                                         "completion_tokens": completion_tokens,
+                                        "cached_tokens": cached_tokens,
                                         "full_text": full_text,
                                     },
                                 )
@@ -253,7 +276,8 @@ class HuggingFaceProvider(LLMClient):
 
                             try:
                                 chunk_data = json.loads(data_str)
-                                delta = chunk_data["choices"][0].get("delta", {})
+                                choices = chunk_data.get("choices") or [{}]
+                                delta = choices[0].get("delta", {})
                                 content = delta.get("content", "")
 
                                 if content:
@@ -264,12 +288,13 @@ class HuggingFaceProvider(LLMClient):
                                     yield (content, False, {})
 
                                 # Extract usage info if available (usually in last chunk)
-                                if "usage" in chunk_data:
+                                if chunk_data.get("usage"):
                                     usage = chunk_data["usage"]
                                     prompt_tokens = usage.get("prompt_tokens", 0)
                                     completion_tokens = usage.get(
                                         "completion_tokens", 0
                                     )
+                                    cached_tokens = extract_cached_tokens(usage)
 
                             except json.JSONDecodeError:
                                 # Skip malformed chunks
@@ -316,12 +341,19 @@ class HuggingFaceProvider(LLMClient):
 
         return "".join(prompt_parts)
 
-    def _estimate_tokens(self, messages: List[Dict[str, str]]) -> int:
+    def _estimate_tokens(self, messages: List[Dict[str, Any]]) -> int:
         """
         Estimate token count (rough approximation)
         Rule of thumb: 1 token ≈ 4 characters for English
         """
-        total_chars = sum(len(msg.get("content", "")) for msg in messages)
+        total_chars = 0
+        for msg in messages:
+            content = msg.get("content", "")
+            if isinstance(content, list):
+                # Content blocks (explicit prompt caching layout)
+                total_chars += sum(len(block.get("text", "")) for block in content)
+            else:
+                total_chars += len(content)
         return int(total_chars / 4)
 
 
@@ -347,9 +379,13 @@ class vLLMProvider(LLMClient):
 
         logger.info(f"vLLM provider initialized: {base_url}")
 
+    @property
+    def model_id(self) -> str:
+        return self.model_name
+
     async def generate(
         self,
-        messages: List[Dict[str, str]],
+        messages: List[Dict[str, Any]],
         temperature: float = 0.7,
         max_tokens: int = 2000,
         top_p: float = 1.0,
@@ -379,8 +415,12 @@ class vLLMProvider(LLMClient):
 
             # Extract response
             generated_text = data["choices"][0]["message"]["content"]
-            prompt_tokens = data.get("usage", {}).get("prompt_tokens", 0)
-            completion_tokens = data.get("usage", {}).get("completion_tokens", 0)
+            usage = data.get("usage", {})
+            prompt_tokens = usage.get("prompt_tokens", 0)
+            completion_tokens = usage.get("completion_tokens", 0)
+            # Reported when vLLM runs with --enable-prefix-caching
+            # and --enable-prompt-tokens-details
+            track_prompt_cache(self.model_name, extract_cached_tokens(usage))
 
             logger.info(
                 f"vLLM generation successful. Tokens: {prompt_tokens}+{completion_tokens}"
@@ -417,6 +457,7 @@ def get_llm_client(
     api_key: str = "",
     model: str = "",
     base_url: str = "",
+    cache_control: bool = False,
 ) -> LLMClient:
     """
     Factory function to create LLM client
@@ -426,6 +467,7 @@ def get_llm_client(
         api_key: API key for HuggingFace
         model: Model ID for HuggingFace
         base_url: Base URL for vLLM
+        cache_control: Emit explicit cache_control blocks (HuggingFace router only)
 
     Returns:
         LLMClient instance
@@ -438,7 +480,9 @@ def get_llm_client(
             raise ValueError("HuggingFace API key is required")
         if not model:
             raise ValueError("HuggingFace model ID is required")
-        return HuggingFaceProvider(api_key=api_key, model=model)
+        return HuggingFaceProvider(
+            api_key=api_key, model=model, cache_control=cache_control
+        )
 
     elif provider == "vllm":
         if not base_url:
@@ -5,6 +5,7 @@ Provides domain-aware LLM generation with automatic configuration
 
 import logging
 import json
+import time
 from fastapi import APIRouter, HTTPException, Depends
 from fastapi.responses import StreamingResponse
 from typing import Dict, Any
@@ -25,6 +26,9 @@ from app.models.llm_client import LLMClient
 from app.utils.adaptive_length import get_adaptive_length
 from app.utils.semantic_cache import get_semantic_cache
 from app.utils.model_router import get_model_router, ModelSize
+from app.utils.prompt_layout import build_prompt_layout
+from app.utils.stream_post_processor import StreamingPostProcessor
+from app.utils.tracing import span, get_current_trace
 
 # Import domain configuration (now properly within app package)
 from app.domain_config.domains.aviculture.config import get_aviculture_config
@@ -85,13 +89,14 @@ async def generate(
             ),
         )
 
-        cache_entry = await semantic_cache.get(
-            query=request.query,
-            entities=request.entities,
-            language=request.language,
-            domain=request.domain,
-            query_type=request.query_type,
-        )
+        with span("cache_lookup"):
+            cache_entry = await semantic_cache.get(
+                query=request.query,
+                entities=request.entities,
+                language=request.language,
+                domain=request.domain,
+                query_type=request.query_type,
+            )
 
         if cache_entry:
             # Cache hit - return cached response immediately (5ms vs 5000ms!)
@@ -125,71 +130,61 @@ async def generate(
             )
 
         # Calculate max_tokens if not provided (with user_category for role-based adjustment)
-        adaptive_calc = get_adaptive_length()
-        calculated_max_tokens = adaptive_calc.calculate_max_tokens(
-            query=request.query,
-            entities=request.entities,
-            query_type=request.query_type,
-            context_docs=request.context_docs,
-            domain=request.domain,
-            user_category=request.user_category,
-        )
-        max_tokens = request.max_tokens or calculated_max_tokens
-
-        # Get complexity info for metadata
-        complexity_info = adaptive_calc.get_complexity_info(
-            query=request.query,
-            entities=request.entities,
-            query_type=request.query_type,
-            context_docs=request.context_docs,
-            domain=request.domain,
-            user_category=request.user_category,
-        )
+        with span("adaptive_length"):
+            adaptive_calc = get_adaptive_length()
+            calculated_max_tokens = adaptive_calc.calculate_max_tokens(
+                query=request.query,
+                entities=request.entities,
+                query_type=request.query_type,
+                context_docs=request.context_docs,
+                domain=request.domain,
+                user_category=request.user_category,
+            )
+            max_tokens = request.max_tokens or calculated_max_tokens
 
-        # Build messages
-        if request.messages:
-            messages = request.messages
-        else:
-            # Get system prompt from domain config with terminology injection
-            system_prompt = domain_config.get_system_prompt(
-                query_type=request.query_type or "general_poultry",
-                language=request.language,
-                query=request.query,  # Pass query for terminology matching
-                inject_terminology=True,  # Enable terminology injection
-                max_terminology_tokens=1000,  # Limit terminology to 1000 tokens
+            # Get complexity info for metadata
+            complexity_info = adaptive_calc.get_complexity_info(
+                query=request.query,
+                entities=request.entities,
+                query_type=request.query_type,
+                context_docs=request.context_docs,
+                domain=request.domain,
+                user_category=request.user_category,
             )
 
-            # 🔴 CRITICAL FIX: Include context documents in user message
-            # Format context_docs into a readable context section
-            user_content = request.query
-            if request.context_docs and len(request.context_docs) > 0:
-                context_section = "\n\n---\n\nRELEVANT CONTEXT DOCUMENTS:\n\n"
-                for i, doc in enumerate(request.context_docs, 1):
-                    # Extract content and metadata from each document
-                    content = doc.get("content", "")
-                    metadata = doc.get("metadata", {})
-                    source = metadata.get("source_file", metadata.get("source", "Unknown"))
-                    page = metadata.get("page_number", "")
-
-                    # Format document entry
-                    context_section += f"[Document {i}]\n"
-                    if source:
-                        context_section += f"Source: {source}"
-                        if page:
-                            context_section += f" (Page {page})"
-                        context_section += "\n"
-                    context_section += f"Content: {content}\n\n"
-
-                # Prepend context to the query
-                user_content = f"{context_section}---\n\nUSER QUESTION: {request.query}"
-                logger.info(f"📄 Formatted {len(request.context_docs)} context documents for LLM")
+        # Build messages
+        with span("prompt_assembly"):
+            if request.messages:
+                messages = request.messages
             else:
-                logger.warning("⚠️ No context_docs provided - LLM will answer without context")
+                # Static domain prompt first (byte-stable, prefix-cacheable), then
+                # query-dependent terminology, then context documents + question
+                prompt_layout = build_prompt_layout(
+                    domain_config,
+                    query=request.query,
+                    query_type=request.query_type,
+                    language=request.language,
+                    context_docs=request.context_docs,
+                    inject_terminology=True,
+                    max_terminology_tokens=1000,  # Limit terminology to 1000 tokens
+                )
+
+                if request.context_docs:
+                    logger.info(
+                        f"📄 Formatted {len(request.context_docs)} context documents for LLM"
+                    )
+                else:
+                    logger.warning(
+                        "⚠️ No context_docs provided - LLM will answer without context"
+                    )
 
-            messages = [
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_content},
-            ]
+                messages = prompt_layout.to_messages(
+                    cache_control=llm_client.supports_cache_control
+                )
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(
+                        f"Prompt static prefix hash: {prompt_layout.prefix_hash()}"
+                    )
 
         # Get generation parameters from domain config if not provided
         domain_reqs = domain_config.get_requirements()
@@ -202,34 +197,33 @@ async def generate(
 
         if settings.enable_model_routing and settings.llm_provider == "huggingface":
             # Determine query complexity and select optimal model
-            import time
+            with span("model_routing"):
+                routing_start = time.time()
 
-            routing_start = time.time()
-
-            model_router = get_model_router(
-                ab_test_ratio=settings.ab_test_ratio, enable_routing=True
-            )
+                model_router = get_model_router(
+                    ab_test_ratio=settings.ab_test_ratio, enable_routing=True
+                )
 
-            # Determine complexity
-            complexity = model_router.determine_complexity(
-                query=request.query,
-                query_type=request.query_type,
-                entities=request.entities,
-                context_docs=request.context_docs,
-            )
+                # Determine complexity
+                complexity = model_router.determine_complexity(
+                    query=request.query,
+                    query_type=request.query_type,
+                    entities=request.entities,
+                    context_docs=request.context_docs,
+                )
 
-            # Select model
-            model_size = model_router.select_model(
-                complexity=complexity, query=request.query
-            )
+                # Select model
+                model_size = model_router.select_model(
+                    complexity=complexity, query=request.query
+                )
 
-            # Get model name
-            if model_size == ModelSize.SMALL:
-                model_used = settings.model_3b_name
-                routing_decision = "3b"
-            else:
-                model_used = settings.model_8b_name
-                routing_decision = "8b"
+                # Get model name
+                if model_size == ModelSize.SMALL:
+                    model_used = settings.model_3b_name
+                    routing_decision = "3b"
+                else:
+                    model_used = settings.model_8b_name
+                    routing_decision = "8b"
 
             routing_time = int((time.time() - routing_start) * 1000)
             logger.info(
@@ -241,24 +235,27 @@ async def generate(
                 from app.models.llm_client import HuggingFaceProvider
 
                 llm_client = HuggingFaceProvider(
-                    api_key=settings.huggingface_api_key, model=model_used
+                    api_key=settings.huggingface_api_key,
+                    model=model_used,
+                    cache_control=settings.prompt_cache_control,
                 )
 
         # Generate completion
         logger.info(
             f" Generating with model={model_used}, max_tokens={max_tokens}, temperature={temperature}"
         )
-        import time
-
         gen_start = time.time()
 
-        generated_text, prompt_tokens, completion_tokens = await llm_client.generate(
-            messages=messages,
-            temperature=temperature,
-            max_tokens=max_tokens,
-            top_p=top_p,
-            stop=None,
-        )
+        with span("provider_call", model=llm_client.model_id):
+            generated_text, prompt_tokens, completion_tokens = (
+                await llm_client.generate(
+                    messages=messages,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    top_p=top_p,
+                    stop=None,
+                )
+            )
 
         gen_time = int((time.time() - gen_start) * 1000)
 
@@ -274,15 +271,16 @@ async def generate(
         disclaimer_added = False
         if request.post_process:
             # [FAST] Use cached PostProcessor from domain config (saves ~2ms per request)
-            generated_text, post_metadata = (
-                domain_config.post_processor.post_process_response(
-                    response=generated_text,
-                    query=request.query,
-                    language=request.language,
-                    context_docs=request.context_docs,
-                    user_category=request.user_category,
+            with span("post_processing"):
+                generated_text, post_metadata = (
+                    domain_config.post_processor.post_process_response(
+                        response=generated_text,
+                        query=request.query,
+                        language=request.language,
+                        context_docs=request.context_docs,
+                        user_category=request.user_category,
+                    )
                 )
-            )
 
             # Extract compliance metadata
             disclaimer_added = post_metadata.get("disclaimer_added", False)
@@ -293,17 +291,18 @@ async def generate(
             )
 
         # [FAST] OPTIMIZATION Phase 1: Store in cache for future requests
-        await semantic_cache.set(
-            query=request.query,
-            response=generated_text,
-            entities=request.entities,
-            language=request.language,
-            domain=request.domain,
-            query_type=request.query_type or "general",
-            prompt_tokens=prompt_tokens,
-            completion_tokens=completion_tokens,
-            complexity=complexity_info["complexity"],
-        )
+        with span("cache_store"):
+            await semantic_cache.set(
+                query=request.query,
+                response=generated_text,
+                entities=request.entities,
+                language=request.language,
+                domain=request.domain,
+                query_type=request.query_type or "general",
+                prompt_tokens=prompt_tokens,
+                completion_tokens=completion_tokens,
+                complexity=complexity_info["complexity"],
+            )
 
         return GenerateResponse(
             generated_text=generated_text,
@@ -344,7 +343,8 @@ async def generate_stream(
     - Streams response chunks as they are generated
     - Automatically calculates optimal max_tokens based on query complexity
     - Selects appropriate system prompts based on domain and query type
-    - Can optionally post-process the final response
+    - Post-processes the stream paragraph by paragraph (cleanup, metric
+      validation) and appends the compliance disclaimer at the end
 
     **Example:**
     ```json
@@ -387,71 +387,55 @@ async def generate_stream(
                 )
 
             # Calculate max_tokens if not provided (with user_category for role-based adjustment)
-            adaptive_calc = get_adaptive_length()
-            calculated_max_tokens = adaptive_calc.calculate_max_tokens(
-                query=request.query,
-                entities=request.entities,
-                query_type=request.query_type,
-                context_docs=request.context_docs,
-                domain=request.domain,
-                user_category=request.user_category,
-            )
-            max_tokens = request.max_tokens or calculated_max_tokens
-
-            # Get complexity info for metadata
-            complexity_info = adaptive_calc.get_complexity_info(
-                query=request.query,
-                entities=request.entities,
-                query_type=request.query_type,
-                context_docs=request.context_docs,
-                domain=request.domain,
-                user_category=request.user_category,
-            )
+            with span("adaptive_length"):
+                adaptive_calc = get_adaptive_length()
+                calculated_max_tokens = adaptive_calc.calculate_max_tokens(
+                    query=request.query,
+                    entities=request.entities,
+                    query_type=request.query_type,
+                    context_docs=request.context_docs,
+                    domain=request.domain,
+                    user_category=request.user_category,
+                )
+                max_tokens = request.max_tokens or calculated_max_tokens
 
-            # Build messages
-            if request.messages:
-                messages = request.messages
-            else:
-                # Get system prompt from domain config with terminology injection
-                system_prompt = domain_config.get_system_prompt(
-                    query_type=request.query_type or "general_poultry",
-                    language=request.language,
+                # Get complexity info for metadata
+                complexity_info = adaptive_calc.get_complexity_info(
                     query=request.query,
-                    inject_terminology=True,
-                    max_terminology_tokens=1000,
+                    entities=request.entities,
+                    query_type=request.query_type,
+                    context_docs=request.context_docs,
+                    domain=request.domain,
+                    user_category=request.user_category,
                 )
 
-                # 🔴 CRITICAL FIX: Include context documents in user message
-                # Format context_docs into a readable context section
-                user_content = request.query
-                if request.context_docs and len(request.context_docs) > 0:
-                    context_section = "\n\n---\n\nRELEVANT CONTEXT DOCUMENTS:\n\n"
-                    for i, doc in enumerate(request.context_docs, 1):
-                        # Extract content and metadata from each document
-                        content = doc.get("content", "")
-                        metadata = doc.get("metadata", {})
-                        source = metadata.get("source_file", metadata.get("source", "Unknown"))
-                        page = metadata.get("page_number", "")
-
-                        # Format document entry
-                        context_section += f"[Document {i}]\n"
-                        if source:
-                            context_section += f"Source: {source}"
-                            if page:
-                                context_section += f" (Page {page})"
-                            context_section += "\n"
-                        context_section += f"Content: {content}\n\n"
-
-                    # Prepend context to the query
-                    user_content = f"{context_section}---\n\nUSER QUESTION: {request.query}"
-                    logger.info(f"[STREAM] Formatted {len(request.context_docs)} context documents for LLM")
+            # Build messages
+            with span("prompt_assembly"):
+                if request.messages:
+                    messages = request.messages
                 else:
-                    logger.warning("[STREAM] No context_docs provided - LLM will answer without context")
+                    prompt_layout = build_prompt_layout(
+                        domain_config,
+                        query=request.query,
+                        query_type=request.query_type,
+                        language=request.language,
+                        context_docs=request.context_docs,
+                        inject_terminology=True,
+                        max_terminology_tokens=1000,
+                    )
 
-                messages = [
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_content},
-                ]
+                    if request.context_docs:
+                        logger.info(
+                            f"[STREAM] Formatted {len(request.context_docs)} context documents for LLM"
+                        )
+                    else:
+                        logger.warning(
+                            "[STREAM] No context_docs provided - LLM will answer without context"
+                        )
+
+                    messages = prompt_layout.to_messages(
+                        cache_control=llm_client.supports_cache_control
+                    )
 
             # Get generation parameters
             domain_reqs = domain_config.get_requirements()
@@ -480,54 +464,63 @@ async def generate_stream(
             full_text = ""
             prompt_tokens = 0
             completion_tokens = 0
+            cached_tokens = 0
 
-            async for chunk_text, is_final, metadata in llm_client.generate_stream(
-                messages=messages,
-                temperature=temperature,
-                max_tokens=max_tokens,
-                top_p=top_p,
-                stop=None,
-            ):
-                if is_final:
-                    # Final chunk - extract metadata
-                    prompt_tokens = metadata.get("prompt_tokens", 0)
-                    completion_tokens = metadata.get("completion_tokens", 0)
-                    full_text = metadata.get("full_text", full_text)
-                    break
-                else:
-                    # Regular chunk - stream to client
-                    if chunk_text:
-                        full_text += chunk_text
-                        chunk_data = {"content": chunk_text}
-                        yield f"event: chunk\ndata: {json.dumps(chunk_data)}\n\n"
-
-            # Post-process if requested
-            final_text = full_text
-            disclaimer_added = False
+            # Post-process incrementally: cleanup and metric validation run per
+            # paragraph, so the final event is not delayed by a full-text pass
+            stream_processor = None
             if request.post_process:
-                original_length = len(full_text)
-                final_text, post_metadata = (
-                    domain_config.post_processor.post_process_response(
-                        response=full_text,
-                        query=request.query,
-                        language=request.language,
-                        context_docs=request.context_docs,
-                        user_category=request.user_category,
-                    )
+                stream_processor = StreamingPostProcessor(
+                    domain_config.post_processor,
+                    query=request.query,
+                    language=request.language,
+                    context_docs=request.context_docs,
+                    user_category=request.user_category,
                 )
 
-                # Extract compliance metadata
-                disclaimer_added = post_metadata.get("disclaimer_added", False)
+            with span("provider_call", model=llm_client.model_id):
+                async for chunk_text, is_final, metadata in llm_client.generate_stream(
+                    messages=messages,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    top_p=top_p,
+                    stop=None,
+                ):
+                    if is_final:
+                        # Final chunk - extract metadata
+                        prompt_tokens = metadata.get("prompt_tokens", 0)
+                        completion_tokens = metadata.get("completion_tokens", 0)
+                        cached_tokens = metadata.get("cached_tokens", 0)
+                        full_text = metadata.get("full_text", full_text)
+                        break
+                    else:
+                        # Regular chunk - stream to client
+                        if chunk_text:
+                            full_text += chunk_text
+                            if stream_processor is not None:
+                                chunk_text = stream_processor.feed(chunk_text)
+                                if not chunk_text:
+                                    continue
+                            chunk_data = {"content": chunk_text}
+                            yield f"event: chunk\ndata: {json.dumps(chunk_data)}\n\n"
+
+            # Flush post-processed tail (last paragraph + compliance disclaimer)
+            disclaimer_added = False
+            blocked = False
+            if stream_processor is not None:
+                with span("post_processing"):
+                    tail_text, post_metadata = stream_processor.finish()
 
-                # If post-processing added content (disclaimer), send it as additional chunk
-                if len(final_text) > original_length:
-                    added_content = final_text[original_length:]
-                    chunk_data = {"content": added_content}
+                if tail_text:
+                    chunk_data = {"content": tail_text}
                     yield f"event: chunk\ndata: {json.dumps(chunk_data)}\n\n"
 
+                disclaimer_added = post_metadata.get("disclaimer_added", False)
+                blocked = post_metadata.get("blocked", False)
+
                 logger.info(
                     f"[CLEAN] Post-processing applied: compliance={post_metadata.get('compliance_level')}, "
-                    f"disclaimer={disclaimer_added}"
+                    f"disclaimer={disclaimer_added}, blocked={blocked}"
                 )
 
             # Send END event with final metadata
@@ -536,11 +529,16 @@ async def generate_stream(
                 "prompt_tokens": prompt_tokens,
                 "completion_tokens": completion_tokens,
                 "total_tokens": prompt_tokens + completion_tokens,
+                "cached_prompt_tokens": cached_tokens,
                 "complexity": complexity_info["complexity"],
                 "calculated_max_tokens": calculated_max_tokens,
                 "post_processed": request.post_process,
                 "disclaimer_added": disclaimer_added,
+                "blocked": blocked,
             }
+            trace = get_current_trace()
+            if trace is not None:
+                end_data["timings"] = trace.stage_durations()
             yield f"event: end\ndata: {json.dumps(end_data)}\n\n"
 
             logger.info(
@@ -33,6 +33,28 @@ llm_inference_duration_seconds = Histogram(
     buckets=[0.1, 0.5, 1.0, 2.0, 3.0, 5.0, 10.0, 30.0],
 )
 
+# Per-stage latency (see app.utils.tracing)
+llm_stage_duration_seconds = Histogram(
+    "llm_stage_duration_seconds",
+    "Latency of individual request stages in seconds",
+    ["stage"],
+    buckets=[
+        0.001,
+        0.005,
+        0.01,
+        0.025,
+        0.05,
+        0.1,
+        0.25,
+        0.5,
+        1.0,
+        2.5,
+        5.0,
+        10.0,
+        30.0,
+    ],
+)
+
 # Token counters
 llm_tokens_generated_total = Counter(
     "llm_tokens_generated_total", "Total tokens generated", ["model"]
@@ -42,6 +64,12 @@ llm_tokens_prompt_total = Counter(
     "llm_tokens_prompt_total", "Total prompt tokens processed", ["model"]
 )
 
+llm_tokens_prompt_cached_total = Counter(
+    "llm_tokens_prompt_cached_total",
+    "Total prompt tokens served from the provider prefix cache",
+    ["model"],
+)
+
 # Model availability
 llm_model_loaded = Gauge(
     "llm_model_loaded",
@@ -70,12 +98,23 @@ def track_latency(model: str, duration: float):
     llm_inference_duration_seconds.labels(model=model).observe(duration)
 
 
+def track_stage_latency(stage: str, duration: float):
+    """Track the latency of a request stage"""
+    llm_stage_duration_seconds.labels(stage=stage).observe(duration)
+
+
 def track_tokens(model: str, prompt_tokens: int, completion_tokens: int):
     """Track token usage"""
     llm_tokens_prompt_total.labels(model=model).inc(prompt_tokens)
     llm_tokens_generated_total.labels(model=model).inc(completion_tokens)
 
 
+def track_prompt_cache(model: str, cached_tokens: int):
+    """Track prompt tokens reused from the provider prefix cache"""
+    if cached_tokens > 0:
+        llm_tokens_prompt_cached_total.labels(model=model).inc(cached_tokens)
+
+
 def track_error(model: str, error_type: str):
     """Track an error"""
     llm_errors_total.labels(model=model, error_type=error_type).inc()
@@ -20,6 +20,7 @@ from typing import List, Dict, Optional, Tuple, Any
 
 from app.utils.domain_validators import get_poultry_validator
 from app.utils.compliance import get_compliance_wrapper
+from app.utils.tracing import span
 
 logger = logging.getLogger(__name__)
 
@@ -34,6 +35,13 @@ class ResponsePostProcessor:
     - Remove unwanted formatting artifacts
     """
 
+    # Safe fallback messages when metric validation blocks a response
+    BLOCKED_MESSAGES = {
+        "en": "I apologize, but I detected potentially incorrect numerical values in my response. For accurate information about this topic, please consult a veterinarian or poultry specialist.",
+        "fr": "Je m'excuse, mais j'ai détecté des valeurs numériques potentiellement incorrectes dans ma réponse. Pour des informations précises sur ce sujet, veuillez consulter un vétérinaire ou un spécialiste avicole.",
+        "es": "Me disculpo, pero he detectado valores numéricos potencialmente incorrectos en mi respuesta. Para obtener información precisa sobre este tema, consulte a un veterinario o especialista avícola.",
+    }
+
     def __init__(
         self,
         veterinary_terms: Optional[Dict] = None,
@@ -97,12 +105,13 @@ class ResponsePostProcessor:
         """
         Pre-compile all regex patterns for cleanup operations.
         This saves ~6ms per request by compiling patterns once at initialization.
+
+        Passes that always match disjoint text are merged into a single
+        alternation (8 passes instead of 10, same output).
         """
         self.cleanup_patterns = [
-            # 1. Remove markdown headers (##, ###, ####, etc.)
-            (re.compile(r"^#{1,6}\s+", re.MULTILINE), ""),
-            # 2. Remove list numbers (1., 2., etc.)
-            (re.compile(r"^\d+\.\s+", re.MULTILINE), ""),
+            # 1+2. Remove markdown headers (##, ###, ...) and list numbers (1., 2., ...)
+            (re.compile(r"^(?=[#\d])(?:#{1,6}\s+)?(?:\d+\.\s+)?", re.MULTILINE), ""),
             # 3. Clean orphan asterisks
             (re.compile(r"^\*\*\s*$", re.MULTILINE), ""),
             # 4. Remove bold headers (**Title:** or **Title**)
@@ -115,14 +124,34 @@ class ResponsePostProcessor:
                 re.compile(r"^([A-ZÀ-Ý][^\n]{5,60}[a-zà-ÿ])\n([a-zà-ÿ])", re.MULTILINE),
                 r"\1 \2",
             ),
-            # 7. Clean multiple empty lines (3+ -> 2)
-            (re.compile(r"\n{3,}"), "\n\n"),
-            # 8. Remove trailing spaces
-            (re.compile(r" +$", re.MULTILINE), ""),
+            # 7+8. Clean multiple empty lines (3+ -> 2) and remove trailing spaces
+            (
+                re.compile(r"\n{3,}| +$", re.MULTILINE),
+                lambda m: "\n\n" if m.group(0)[0] == "\n" else "",
+            ),
             # 9. Ensure space after bullet points
             (re.compile(r"^-([^ ])", re.MULTILINE), r"- \1"),
         ]
 
+    def clean_formatting(self, text: str) -> str:
+        """
+        Apply the formatting cleanup passes to a (stripped) response or block
+
+        Args:
+            text: Response text, or a block cut at a safe boundary
+
+        Returns:
+            Cleaned text
+        """
+        # [FAST] Apply pre-compiled regex patterns (optimized from 9ms to ~3ms)
+        for pattern, replacement in self.cleanup_patterns:
+            text = pattern.sub(replacement, text)
+        return text
+
+    def get_blocked_message(self, language: str = "en") -> str:
+        """Safe fallback message returned when metric validation blocks a response"""
+        return self.BLOCKED_MESSAGES.get(language, self.BLOCKED_MESSAGES["en"])
+
     def post_process_response(
         self,
         response: str,
@@ -158,14 +187,14 @@ class ResponsePostProcessor:
         """
         response = response.strip()
 
-        # [FAST] Apply pre-compiled regex patterns (optimized from 9ms to ~3ms)
-        for pattern, replacement in self.cleanup_patterns:
-            response = pattern.sub(replacement, response)
+        with span("post_cleanup"):
+            response = self.clean_formatting(response)
 
         # GARDE-FOUS: Validate poultry metrics to prevent dangerous hallucinations
-        validation_result = self.metrics_validator.validate_response(
-            response, language=language
-        )
+        with span("metric_validation"):
+            validation_result = self.metrics_validator.validate_response(
+                response, language=language
+            )
 
         if validation_result["blocked"]:
             # CRITICAL: Response contains dangerous metric hallucinations
@@ -174,12 +203,7 @@ class ResponsePostProcessor:
                 f"Suggestion: {validation_result['suggestion']}"
             )
             # Return safe fallback message instead of hallucinated response
-            safe_messages = {
-                "en": "I apologize, but I detected potentially incorrect numerical values in my response. For accurate information about this topic, please consult a veterinarian or poultry specialist.",
-                "fr": "Je m'excuse, mais j'ai détecté des valeurs numériques potentiellement incorrectes dans ma réponse. Pour des informations précises sur ce sujet, veuillez consulter un vétérinaire ou un spécialiste avicole.",
-                "es": "Me disculpo, pero he detectado valores numéricos potencialmente incorrectos en mi respuesta. Para obtener información precisa sobre este tema, consulte a un veterinario o especialista avícola.",
-            }
-            return safe_messages.get(language, safe_messages["en"]), {
+            return self.get_blocked_message(language), {
                 "blocked": True,
                 "validation": validation_result,
             }
@@ -195,13 +219,14 @@ class ResponsePostProcessor:
         is_veterinary = query and self.is_veterinary_query(query, context_docs)
 
         # COMPLIANCE: Add role-based compliance disclaimers
-        response, compliance_metadata = self.compliance_wrapper.wrap_response(
-            response=response,
-            query=query,
-            user_category=user_category,
-            is_veterinary_query=is_veterinary,
-            language=language,
-        )
+        with span("compliance_wrapping"):
+            response, compliance_metadata = self.compliance_wrapper.wrap_response(
+                response=response,
+                query=query,
+                user_category=user_category,
+                is_veterinary_query=is_veterinary,
+                language=language,
+            )
 
         # Prepare metadata
         metadata = {
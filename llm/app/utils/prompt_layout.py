@@ -0,0 +1,208 @@
+"""
+Prompt Layout - Cache-friendly prompt assembly
+
+Builds chat messages so that provider-side prefix caching can be reused
+across requests:
+1. Static domain content first (identity, guidelines, specialized prompt),
+   byte-stable for a given (query_type, language)
+2. Query-dependent terminology after the static prefix
+3. Context documents and the user question last, in the user message
+
+Segments flagged as cacheable can be marked with explicit cache control for
+providers that support it (Anthropic-style ``cache_control`` content blocks).
+Providers with automatic prefix caching (vLLM, OpenAI) only need the stable
+ordering and receive plain string contents.
+"""
+
+import hashlib
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from app.utils.tracing import span
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PromptSegment:
+    """A contiguous piece of a chat message"""
+
+    name: str
+    text: str
+    cacheable: bool = False
+
+
+@dataclass
+class PromptLayout:
+    """Ordered prompt segments for the system and user messages"""
+
+    system_segments: List[PromptSegment] = field(default_factory=list)
+    user_segments: List[PromptSegment] = field(default_factory=list)
+
+    @property
+    def system_text(self) -> str:
+        """System message as a single string"""
+        return "\n\n".join(s.text for s in self.system_segments if s.text)
+
+    @property
+    def user_text(self) -> str:
+        """User message as a single string"""
+        return "".join(s.text for s in self.user_segments)
+
+    @property
+    def static_prefix(self) -> str:
+        """Leading cacheable part of the system message"""
+        parts = []
+        for segment in self.system_segments:
+            if not segment.cacheable:
+                break
+            parts.append(segment.text)
+        return "\n\n".join(parts)
+
+    def prefix_hash(self) -> str:
+        """Short hash of the static prefix (useful to log cache-key stability)"""
+        return hashlib.sha256(self.static_prefix.encode("utf-8")).hexdigest()[:12]
+
+    def to_messages(self, cache_control: bool = False) -> List[Dict[str, Any]]:
+        """
+        Render the layout as chat messages
+
+        Args:
+            cache_control: Emit content blocks with an ephemeral cache_control
+                marker on the last cacheable segment (explicit prompt caching)
+
+        Returns:
+            List of message dicts with 'role' and 'content'
+        """
+        if not cache_control:
+            return [
+                {"role": "system", "content": self.system_text},
+                {"role": "user", "content": self.user_text},
+            ]
+
+        blocks: List[Dict[str, Any]] = []
+        last_cacheable: Optional[int] = None
+        for segment in self.system_segments:
+            if not segment.text:
+                continue
+            # Separators are folded into the following block to keep the
+            # rendered text identical to the plain string variant
+            text = segment.text if not blocks else f"\n\n{segment.text}"
+            blocks.append({"type": "text", "text": text})
+            if segment.cacheable:
+                last_cacheable = len(blocks) - 1
+
+        if last_cacheable is not None:
+            blocks[last_cacheable]["cache_control"] = {"type": "ephemeral"}
+
+        return [
+            {"role": "system", "content": blocks},
+            {"role": "user", "content": self.user_text},
+        ]
+
+
+def format_context_documents(query: str, context_docs: Optional[List[Dict]]) -> str:
+    """
+    Format context documents and the question into the user message
+
+    Args:
+        query: User query text
+        context_docs: Retrieved documents with 'content' and 'metadata'
+
+    Returns:
+        User message content
+    """
+    if not context_docs:
+        return query
+
+    parts = ["\n\n---\n\nRELEVANT CONTEXT DOCUMENTS:\n\n"]
+    for i, doc in enumerate(context_docs, 1):
+        content = doc.get("content", "")
+        metadata = doc.get("metadata", {})
+        source = metadata.get("source_file", metadata.get("source", "Unknown"))
+        page = metadata.get("page_number", "")
+
+        parts.append(f"[Document {i}]\n")
+        if source:
+            parts.append(f"Source: {source}")
+            if page:
+                parts.append(f" (Page {page})")
+            parts.append("\n")
+        parts.append(f"Content: {content}\n\n")
+
+    parts.append(f"---\n\nUSER QUESTION: {query}")
+    return "".join(parts)
+
+
+def build_prompt_layout(
+    domain_config,
+    query: str,
+    query_type: Optional[str] = None,
+    language: str = "en",
+    context_docs: Optional[List[Dict]] = None,
+    inject_terminology: bool = True,
+    max_terminology_tokens: int = 1000,
+) -> PromptLayout:
+    """
+    Assemble the generation prompt in a cache-friendly order
+
+    Args:
+        domain_config: Domain configuration (e.g. AvicultureConfig)
+        query: User query text
+        query_type: Query type used to select the specialized prompt
+        language: Response language code
+        context_docs: Retrieved context documents
+        inject_terminology: Whether to inject query-relevant terminology
+        max_terminology_tokens: Maximum tokens to use for terminology
+
+    Returns:
+        PromptLayout with static segments first
+    """
+    static_prompt = domain_config.get_static_system_prompt(
+        query_type=query_type or "general_poultry", language=language
+    )
+    system_segments = [PromptSegment("domain_static", static_prompt, cacheable=True)]
+
+    if inject_terminology and query:
+        with span("terminology_injection"):
+            terminology = domain_config.get_terminology_section(
+                query=query,
+                language=language,
+                max_terminology_tokens=max_terminology_tokens,
+            )
+        if terminology:
+            system_segments.append(PromptSegment("terminology", terminology))
+
+    user_segments = [
+        PromptSegment("user_query", format_context_documents(query, context_docs))
+    ]
+
+    return PromptLayout(system_segments=system_segments, user_segments=user_segments)
+
+
+def extract_cached_tokens(usage: Optional[Dict[str, Any]]) -> int:
+    """
+    Extract the number of prompt tokens served from the provider cache
+
+    Handles the OpenAI/vLLM format (``prompt_tokens_details.cached_tokens``)
+    and the Anthropic format (``cache_read_input_tokens``).
+
+    Args:
+        usage: 'usage' object from the provider response
+
+    Returns:
+        Cached prompt token count (0 if not reported)
+    """
+    if not usage:
+        return 0
+
+    details = usage.get("prompt_tokens_details") or {}
+    cached = details.get("cached_tokens")
+    if cached is None:
+        cached = usage.get("cache_read_input_tokens")
+
+    try:
+        return int(cached or 0)
+    except (TypeError, ValueError):
+        return 0
@@ -0,0 +1,244 @@
+# -*- coding: utf-8 -*-
+"""
+stream_post_processor.py - Incremental post-processing for streamed responses
+
+Applies ResponsePostProcessor cleanup, metric validation and compliance
+disclaimers chunk by chunk instead of after the whole response exists.
+
+Text is buffered until a safe boundary is seen: a blank line followed by the
+first character of the next paragraph (bounded lookahead). Every cleanup
+pass is line-local except a few that can consume trailing whitespace or join
+two lines; the boundary rules below exclude exactly those cases, so cleaning
+block by block produces the same text as cleaning the full response.
+"""
+
+import logging
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.utils.post_processor import ResponsePostProcessor
+
+logger = logging.getLogger(__name__)
+
+# Whitespace run containing at least one blank line, followed by content
+_PARAGRAPH_BOUNDARY = re.compile(r"\s*\n\s*\n\s*(?=\S)")
+
+# Last line of a block that the header/list-number pass could extend over the boundary
+_BARE_LIST_NUMBER = re.compile(r"\s*(?:#{1,6}\s+)?\d+\.")
+
+# Characters that can safely end a block (cleanup passes never consume the
+# whitespace that follows them)
+_SAFE_BLOCK_END = set(".!?)]\"'»%")
+
+
+def _is_safe_boundary(text: str, start: int, end: int, final: bool = False) -> bool:
+    """
+    Check whether text can be cut at a paragraph boundary
+
+    Args:
+        text: Buffered text
+        start: Start of the whitespace run (end of the emitted block)
+        end: End of the whitespace run (start of the next paragraph)
+        final: Skip the bold-marker lookahead (used when forcing a cut)
+
+    Returns:
+        True if cleaning text[:start] and text[start:] separately gives the
+        same result as cleaning text
+    """
+    if start == 0:
+        return False
+
+    # Next paragraph must start with a letter (no header, list, bold or colon)
+    if not text[end].isalpha():
+        return False
+
+    # Block must not end with a marker whose pattern consumes trailing whitespace
+    last_char = text[start - 1]
+    if not (last_char.isalnum() or last_char in _SAFE_BLOCK_END):
+        return False
+    if last_char == ".":
+        line_start = text.rfind("\n", 0, start) + 1
+        if _BARE_LIST_NUMBER.fullmatch(text, line_start, start):
+            return False
+
+    if final:
+        return True
+
+    # Bold-header passes ("**...:**") may span paragraphs when a "**" before
+    # the boundary is followed by star-free text up to a closing "**" after it
+    last_star = text.rfind("*", 0, start)
+    if last_star > 0 and text[last_star - 1] == "*":
+        next_star = text.find("*", end)
+        if next_star == -1 or text[next_star + 1 : next_star + 2] in ("*", ""):
+            return False
+
+    return True
+
+
+def find_safe_cut(text: str, force: bool = False) -> int:
+    """
+    Find the last position where the buffered text can be cut
+
+    Args:
+        text: Buffered text
+        force: Accept the last paragraph boundary even if a bold marker is
+            still open (used when the buffer exceeds its lookahead budget)
+
+    Returns:
+        Cut position (0 if no safe boundary was found)
+    """
+    cut = 0
+    for match in _PARAGRAPH_BOUNDARY.finditer(text):
+        if _is_safe_boundary(text, match.start(), match.end(), final=force):
+            cut = match.start()
+    return cut
+
+
+class StreamingPostProcessor:
+    """
+    Chunk-by-chunk wrapper around ResponsePostProcessor
+
+    Usage:
+        stream_processor = StreamingPostProcessor(post_processor, query, language)
+        for chunk in llm_chunks:
+            cleaned = stream_processor.feed(chunk)
+            if cleaned:
+                send(cleaned)
+        tail, metadata = stream_processor.finish()
+        send(tail)
+    """
+
+    def __init__(
+        self,
+        post_processor: ResponsePostProcessor,
+        query: str = "",
+        language: str = "en",
+        context_docs: Optional[List[Dict]] = None,
+        user_category: Optional[str] = None,
+        max_buffer_chars: int = 4000,
+    ) -> None:
+        """
+        Initialize streaming post-processor
+
+        Args:
+            post_processor: Cached domain ResponsePostProcessor
+            query: Original user question
+            language: Response language code
+            context_docs: Context documents used for generation
+            user_category: User category (health_veterinary, farm_operations, etc.)
+            max_buffer_chars: Lookahead budget before a cut is forced
+        """
+        self.post_processor = post_processor
+        self.query = query
+        self.language = language
+        self.context_docs = context_docs
+        self.user_category = user_category
+        self.max_buffer_chars = max_buffer_chars
+
+        self._buffer = ""
+        self._started = False
+        self._blocked = False
+        self._validation_warnings = 0
+        self._emitted: List[str] = []
+
+    @property
+    def blocked(self) -> bool:
+        """True once metric validation blocked the response"""
+        return self._blocked
+
+    @property
+    def text(self) -> str:
+        """Post-processed text emitted so far"""
+        return "".join(self._emitted)
+
+    def feed(self, chunk: str) -> str:
+        """
+        Add a raw chunk and return the post-processed text that became final
+
+        Args:
+            chunk: Raw text chunk from the LLM
+
+        Returns:
+            Cleaned text to stream (may be empty while buffering)
+        """
+        if self._blocked or not chunk:
+            return ""
+
+        if not self._started:
+            chunk = chunk.lstrip()
+            if not chunk:
+                return ""
+            self._started = True
+
+        self._buffer += chunk
+
+        cut = find_safe_cut(self._buffer)
+        if not cut and len(self._buffer) > self.max_buffer_chars:
+            cut = find_safe_cut(self._buffer, force=True)
+        if not cut:
+            return ""
+
+        block, self._buffer = self._buffer[:cut], self._buffer[cut:]
+        return self._process_block(block)
+
+    def finish(self) -> Tuple[str, Dict[str, Any]]:
+        """
+        Flush the buffer and append the compliance disclaimer
+
+        Returns:
+            Tuple of (remaining text to stream, metadata dict)
+        """
+        tail = ""
+        if self._buffer and not self._blocked:
+            tail = self._process_block(self._buffer.rstrip())
+        self._buffer = ""
+
+        if self._blocked:
+            return tail, {
+                "blocked": True,
+                "validation_warnings": self._validation_warnings,
+            }
+
+        # The disclaimer only depends on the query and user, so wrapping an
+        # empty response yields exactly the text to append
+        is_veterinary = bool(self.query) and self.post_processor.is_veterinary_query(
+            self.query, self.context_docs
+        )
+        disclaimer, compliance_metadata = (
+            self.post_processor.compliance_wrapper.wrap_response(
+                response="",
+                query=self.query,
+                user_category=self.user_category,
+                is_veterinary_query=is_veterinary,
+                language=self.language,
+            )
+        )
+
+        tail += disclaimer
+        self._emitted.append(disclaimer)
+
+        metadata = {"blocked": False, "validation_warnings": self._validation_warnings}
+        metadata.update(compliance_metadata)
+        return tail, metadata
+
+    def _process_block(self, block: str) -> str:
+        """Clean and validate one block; switch to the safe message if blocked"""
+        cleaned = self.post_processor.clean_formatting(block)
+
+        validation_result = self.post_processor.metrics_validator.validate_response(
+            cleaned, language=self.language
+        )
+        self._validation_warnings += len(validation_result["warnings"])
+
+        if validation_result["blocked"]:
+            # Never stream the hallucinated block itself
+            logger.error(
+                f"[BLOCKED] Streamed block contains {len(validation_result['warnings'])} "
+                f"critical metric hallucination(s). Suggestion: {validation_result['suggestion']}"
+            )
+            self._blocked = True
+            safe_message = self.post_processor.get_blocked_message(self.language)
+            cleaned = f"\n\n{safe_message}" if self._emitted else safe_message
+
+        self._emitted.append(cleaned)
+        return cleaned
@@ -0,0 +1,148 @@
+"""
+Request Tracing - Lightweight per-stage latency spans
+
+Records the duration of each stage of a request (cache lookup, token
+calculation, routing, provider call, post-processing...) without requiring a
+tracing collector:
+1. Spans are collected in a per-request trace stored in a contextvar
+2. Each span duration is observed in a Prometheus histogram (/metrics)
+3. The trace is rendered as a Server-Timing response header
+
+If OpenTelemetry is installed and configured, every span is also emitted as an
+OpenTelemetry span with the same name and attributes.
+
+Usage:
+    with span("provider_call", model=model_used):
+        text, prompt_tokens, completion_tokens = await llm_client.generate(...)
+"""
+
+import logging
+import sys
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+
+from app.utils.metrics import track_stage_latency
+
+logger = logging.getLogger(__name__)
+
+try:
+    from opentelemetry import trace as otel_trace
+
+    _otel_tracer = otel_trace.get_tracer("intelia.llm")
+    OTEL_AVAILABLE = True
+except ImportError:
+    _otel_tracer = None
+    OTEL_AVAILABLE = False
+
+
+@dataclass
+class SpanRecord:
+    """A finished span"""
+
+    name: str
+    start: float
+    duration_ms: float
+    attributes: Dict[str, Any] = field(default_factory=dict)
+
+
+class RequestTrace:
+    """Spans recorded during a single request"""
+
+    def __init__(self, trace_id: Optional[str] = None):
+        self.trace_id = trace_id or uuid.uuid4().hex
+        self.start = time.perf_counter()
+        self.spans: List[SpanRecord] = []
+
+    def add(self, record: SpanRecord) -> None:
+        """Append a finished span"""
+        self.spans.append(record)
+
+    def elapsed_ms(self) -> float:
+        """Time since the trace was started"""
+        return (time.perf_counter() - self.start) * 1000
+
+    def stage_durations(self) -> Dict[str, float]:
+        """Total duration per stage name (ms)"""
+        durations: Dict[str, float] = {}
+        for record in self.spans:
+            durations[record.name] = (
+                durations.get(record.name, 0.0) + record.duration_ms
+            )
+        return {name: round(ms, 2) for name, ms in durations.items()}
+
+    def server_timing_header(self, include_total: bool = True) -> str:
+        """
+        Render spans as a Server-Timing header value
+
+        Example: "cache_lookup;dur=1.2, provider_call;dur=2310.5, total;dur=2350.1"
+        """
+        parts = [f"{name};dur={ms:.1f}" for name, ms in self.stage_durations().items()]
+        if include_total:
+            parts.append(f"total;dur={self.elapsed_ms():.1f}")
+        return ", ".join(parts)
+
+
+_current_trace: ContextVar[Optional[RequestTrace]] = ContextVar(
+    "llm_request_trace", default=None
+)
+
+
+def start_trace(trace_id: Optional[str] = None) -> Token:
+    """
+    Start a new trace for the current request
+
+    Returns:
+        Token to pass to end_trace()
+    """
+    return _current_trace.set(RequestTrace(trace_id))
+
+
+def end_trace(token: Token) -> None:
+    """Restore the trace that was active before start_trace()"""
+    _current_trace.reset(token)
+
+
+def get_current_trace() -> Optional[RequestTrace]:
+    """Get the trace of the current request (None outside a request)"""
+    return _current_trace.get()
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Dict[str, Any]]:
+    """
+    Time a stage of the current request
+
+    Works in both sync and async code. Outside a request trace, the duration
+    is still observed in Prometheus.
+
+    Args:
+        name: Stage name (used as Prometheus label and Server-Timing metric)
+        **attributes: Optional attributes attached to the span
+
+    Yields:
+        Mutable attribute dict, so callers can add attributes during the stage
+    """
+    otel_cm = _otel_tracer.start_as_current_span(name) if OTEL_AVAILABLE else None
+    otel_span = otel_cm.__enter__() if otel_cm is not None else None
+
+    start = time.perf_counter()
+    try:
+        yield attributes
+    finally:
+        duration = time.perf_counter() - start
+
+        track_stage_latency(name, duration)
+
+        trace = _current_trace.get()
+        if trace is not None:
+            trace.add(SpanRecord(name, start, duration * 1000, attributes))
+
+        if otel_span is not None:
+            for key, value in attributes.items():
+                if isinstance(value, (str, bool, int, float)):
+                    otel_span.set_attribute(key, value)
+            otel_cm.__exit__(*sys.exc_info())
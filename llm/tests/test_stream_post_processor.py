@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Streaming Post-Processor Test + Benchmark
+
+Validates that chunk-by-chunk post-processing produces the same text as the
+batch post-processor, and measures both on long responses:
+1. Batch: post_process_response() once the full response exists
+2. Streaming: StreamingPostProcessor.feed() per token chunk + finish()
+
+The relevant number for streaming is the time spent after the last token
+(finish), which is what delays the final SSE event.
+"""
+
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.utils.post_processor import create_post_processor
+from app.utils.stream_post_processor import StreamingPostProcessor, find_safe_cut
+
+NUM_ITERATIONS = 50
+
+PARAGRAPHS = [
+    "## Recommandations pour réduire la mortalité",
+    "**Points clés:**\n\n1. Surveillance de la température\n2. Contrôle de l'humidité\n3. Qualité de l'aliment",
+    "La mortalité peut être causée par plusieurs facteurs incluant des maladies comme la coccidiose, "
+    "la bronchite infectieuse, ou des problèmes environnementaux.   ",
+    "Standardisation des\nprocédures de nettoyage entre les lots.",
+    "-Vérifier la ventilation\n-Contrôler la densité",
+    "**Important**: la qualité de l'eau reste un facteur déterminant.",
+    "Le poids moyen d'un Ross 308 à 35 jours est d'environ 2,2 kg avec un FCR proche de 1,5.",
+    "Il est important de consulter un vétérinaire pour établir un diagnostic précis.",
+]
+
+
+def build_response(num_paragraphs: int, seed: int = 0) -> str:
+    """Build a long LLM-like response from sample paragraphs"""
+    rng = random.Random(seed)
+    return "\n\n".join(rng.choice(PARAGRAPHS) for _ in range(num_paragraphs)) + "\n"
+
+
+def split_chunks(text: str, seed: int = 0):
+    """Split text into token-sized chunks (1-8 chars)"""
+    rng = random.Random(seed)
+    i = 0
+    while i < len(text):
+        j = i + rng.randint(1, 8)
+        yield text[i:j]
+        i = j
+
+
+def run_stream(processor, response: str, **kwargs):
+    """Feed a response chunk by chunk and return (text, metadata, finish_ms)"""
+    stream = StreamingPostProcessor(processor, **kwargs)
+    parts = [stream.feed(chunk) for chunk in split_chunks(response)]
+
+    start = time.perf_counter()
+    tail, metadata = stream.finish()
+    finish_ms = (time.perf_counter() - start) * 1000
+
+    parts.append(tail)
+    return "".join(parts), metadata, finish_ms
+
+
+def test_stream_matches_batch():
+    """Streaming output equals batch output (cleanup + disclaimer)"""
+    processor = create_post_processor()
+    query = "Comment réduire la mortalité chez les poulets Ross 308?"
+
+    for seed in range(20):
+        response = build_response(30, seed)
+        batch_text, batch_meta = processor.post_process_response(
+            response=response, query=query, language="fr"
+        )
+        stream_text, stream_meta, _ = run_stream(
+            processor, response, query=query, language="fr"
+        )
+
+        assert stream_text == batch_text, f"Mismatch for seed {seed}"
+        assert stream_meta["disclaimer_added"] == batch_meta["disclaimer_added"]
+
+    print("[OK] Streaming output matches batch output")
+
+
+def test_safe_cut_positions():
+    """Cuts only happen at blank lines before a plain paragraph"""
+    assert find_safe_cut("First paragraph.\n\nSecond") == len("First paragraph.")
+    # Next paragraph is a header: wait for more text
+    assert find_safe_cut("First paragraph.\n\n## Title") == 0
+    # Bold header could consume the blank line
+    assert find_safe_cut("**Title:**\n\nText") == 0
+    # Single newline: broken-title join may apply
+    assert find_safe_cut("Standardisation des\nprocédures") == 0
+    print("[OK] Safe cut positions")
+
+
+def benchmark_long_responses():
+    """Compare batch vs streaming post-processing on long responses"""
+    print("\n" + "=" * 70)
+    print("STREAMING POST-PROCESSOR BENCHMARK")
+    print("=" * 70)
+
+    processor = create_post_processor()
+
+    for num_paragraphs in (20, 100, 400):
+        response = build_response(num_paragraphs)
+
+        batch_times = []
+        finish_times = []
+        for _ in range(NUM_ITERATIONS):
+            start = time.perf_counter()
+            processor.post_process_response(response=response, query="", language="en")
+            batch_times.append((time.perf_counter() - start) * 1000)
+
+            _, _, finish_ms = run_stream(processor, response, query="", language="en")
+            finish_times.append(finish_ms)
+
+        print(
+            f"{len(response):>7} chars | batch after last token: "
+            f"{statistics.median(batch_times):7.3f} ms | "
+            f"streaming after last token: {statistics.median(finish_times):7.3f} ms"
+        )
+
+
+if __name__ == "__main__":
+    test_safe_cut_positions()
+    test_stream_matches_batch()
+    benchmark_long_responses()
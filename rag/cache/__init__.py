@@ -22,6 +22,11 @@ try:
 except ImportError:
     SemanticCacheManager = None
 
+try:
+    from .cache_search import SearchResultsCache
+except ImportError:
+    SearchResultsCache = None
+
 try:
     from .cache_stats import CacheStatsManager
 except ImportError:
@@ -35,5 +40,6 @@ __all__ = [
     "create_cache_core",
     "RAGCacheManager",
     "SemanticCacheManager",
+    "SearchResultsCache",
     "CacheStatsManager",
 ]
@@ -8,6 +8,14 @@ Last modified: 2025-10-26
 cache_core.py - Module central du cache Redis robuste
 Version corrigée: Configuration simplifiée, gestion mémoire stable, monitoring amélioré
 CORRIGÉ: Ajout protection_stats manquant et cohérence des attributs
+
+Chemin d'écriture en un seul aller-retour: SET + PFADD (HyperLogLog de
+comptage du namespace, fenêtré par TTL) dans un même pipeline, admission sur
+les stats mémoire échantillonnées en tâche de fond (INFO memory + DBSIZE,
+toutes les memory_sample_interval secondes). Aucune commande KEYS: purge et
+invalidation parcourent les clés par SCAN incrémental et évincent par
+échantillon (LFU via OBJECT FREQ si la politique maxmemory est LFU, sinon
+temps d'inactivité, puis TTL restant) avec UNLINK.
 """
 
 import os
@@ -17,7 +25,7 @@ import asyncio
 import msgpack
 import zlib
 from typing import TYPE_CHECKING
-from utils.types import Dict, Optional, Any
+from utils.types import Dict, Iterable, List, Optional, Any, Tuple
 from dataclasses import dataclass, asdict
 from enum import Enum
 from core.base import InitializableMixin
@@ -43,6 +51,17 @@ else:
 
 logger = logging.getLogger(__name__)
 
+# HyperLogLog de comptage des clés par namespace (hors préfixes purgés)
+NAMESPACE_HLL_PREFIX = "intelia_rag:ns_hll:"
+
+# Clés demandées par itération SCAN (purge, invalidation)
+SCAN_COUNT = 500
+
+# Jamais évincées par la purge: compteurs de version des collections
+# (search:version:<collection>, voir cache_search.py). Supprimé, un compteur
+# repartirait de 0 et rendrait à nouveau lisibles des résultats périmés.
+PROTECTED_KEY_PREFIXES = ("search:version:",)
+
 
 class CacheStatus(Enum):
     """États du cache"""
@@ -76,10 +95,12 @@ class CacheConfig:
     enable_auto_purge: bool = True
     enable_compression: bool = False  # Désactivé par défaut pour simplifier
     purge_ratio: float = 0.3  # Purge 30% en cas de surcharge
+    eviction_sample_size: int = 500  # Clés évaluées par lot d'éviction
 
     # Monitoring
     stats_log_interval: int = 300  # 5 minutes (réduit de 10)
     health_check_interval: int = 60  # 1 minute
+    memory_sample_interval: int = 10  # Rafraîchissement stats mémoire (s)
 
     # TTL spécialisés
     ttl_embeddings: int = 7200  # 2 heures
@@ -115,6 +136,12 @@ class CacheConfig:
             stats_log_interval=int(
                 os.getenv("CACHE_STATS_LOG_INTERVAL", cls.stats_log_interval)
             ),
+            memory_sample_interval=int(
+                os.getenv("CACHE_MEMORY_SAMPLE_INTERVAL", cls.memory_sample_interval)
+            ),
+            eviction_sample_size=int(
+                os.getenv("CACHE_EVICTION_SAMPLE_SIZE", cls.eviction_sample_size)
+            ),
         )
 
 
@@ -176,6 +203,12 @@ class RedisCacheCore(InitializableMixin):
         self.max_consecutive_errors = 5
         self.error_backoff_until = 0.0
 
+        # Échantillonneur mémoire et purge en tâche de fond
+        self._sampler_task: Optional[asyncio.Task] = None
+        self._purge_task: Optional[asyncio.Task] = None
+        self._written_namespaces = set()
+        self._lfu_supported: Optional[bool] = None
+
         # Namespaces pour organisation
         self.namespaces = {
             "embeddings": "emb:",
@@ -246,6 +279,7 @@ class RedisCacheCore(InitializableMixin):
 
             self.status = CacheStatus.HEALTHY
             self.consecutive_errors = 0
+            self._start_memory_sampler()
 
             logger.info(f"Cache Redis initialisé avec succès: {self.config.redis_url}")
             logger.info(f"Configuration: {self._get_config_summary()}")
@@ -295,6 +329,7 @@ class RedisCacheCore(InitializableMixin):
         """Désactive le cache en cas d'erreur"""
         self.enabled = False
         self.is_initialized = False
+        self._stop_background_tasks()
         if self.client:
             try:
                 asyncio.create_task(self.client.close())
@@ -397,24 +432,26 @@ class RedisCacheCore(InitializableMixin):
             # TTL selon le namespace
             effective_ttl = ttl or self._get_namespace_ttl(namespace)
 
-            # Vérification de l'espace disponible
+            # Vérification de l'espace disponible (stats échantillonnées)
             if not await self._check_memory_limits():
                 logger.warning("Limite mémoire atteinte - stockage refusé")
                 self.protection_stats["memory_limit_hits"] += 1
                 return False
 
-            # Stockage avec timeout
-            success = await asyncio.wait_for(
-                self.client.set(full_key, final_value, ex=effective_ttl), timeout=1.0
-            )
+            # Stockage + comptage du namespace en un seul aller-retour
+            hll_key, _ = self._namespace_hll_keys(namespace)
+            pipe = self.client.pipeline(transaction=False)
+            pipe.set(full_key, final_value, ex=effective_ttl)
+            pipe.pfadd(hll_key, full_key)
+            pipe.expire(hll_key, 2 * self._namespace_window(namespace))
+            results = await asyncio.wait_for(pipe.execute(), timeout=1.0)
+            success = results[0]
 
             if success:
                 self.stats.sets += 1
+                self._written_namespaces.add(namespace)
                 self._reset_error_backoff()
 
-                # Monitoring des namespaces
-                await self._monitor_namespace_limits(namespace)
-
             return bool(success)
 
         except asyncio.TimeoutError:
@@ -453,19 +490,13 @@ class RedisCacheCore(InitializableMixin):
         full_pattern = self._build_key(pattern, namespace)
 
         try:
-            # Recherche des clés
-            keys = await asyncio.wait_for(self.client.keys(full_pattern), timeout=5.0)
-
-            if not keys:
-                return 0
-
-            # Suppression par batch
+            # Parcours SCAN incrémental, suppression non bloquante par lot
             deleted = 0
-            batch_size = 100
+            async for keys in self._scan_batches(full_pattern):
+                deleted += await self.client.unlink(*keys)
 
-            for i in range(0, len(keys), batch_size):
-                batch = keys[i : i + batch_size]
-                deleted += await self.client.delete(*batch)
+            if not deleted:
+                return 0
 
             self.stats.deletes += deleted
             logger.info(f"Pattern {full_pattern}: {deleted} clés supprimées")
@@ -500,7 +531,7 @@ class RedisCacheCore(InitializableMixin):
             self.protection_stats["memory_limit_hits"] += 1
             return False
 
-        # Vérification namespace (optionnelle, on vérifie dans monitor_namespace_limits)
+        # Vérification namespace: faite par l'échantillonneur de fond
         return True
 
     async def get_cache_stats(self) -> Dict[str, Any]:
@@ -598,64 +629,125 @@ class RedisCacheCore(InitializableMixin):
                 self.status = CacheStatus.HEALTHY
 
     async def _check_memory_limits(self) -> bool:
-        """Vérifie les limites mémoire et déclenche le nettoyage si nécessaire"""
-        try:
-            await self._update_memory_stats()
-
-            usage_percent = (
-                self.stats.memory_usage_mb / self.config.total_memory_limit_mb
-            ) * 100
-
-            if (
-                usage_percent
-                > (self.config.purge_threshold_mb / self.config.total_memory_limit_mb)
-                * 100
-            ):
-                if self.config.enable_auto_purge:
-                    await self._auto_purge_cache()
-                return False
-            elif (
-                usage_percent
-                > (self.config.warning_threshold_mb / self.config.total_memory_limit_mb)
-                * 100
-            ):
-                self.status = CacheStatus.WARNING
-            else:
-                self.status = CacheStatus.HEALTHY
-
-            return True
+        """
+        Admission d'écriture sur les stats mémoire échantillonnées
+
+        Aucun appel Redis: les stats sont rafraîchies par l'échantillonneur de
+        fond. Au-delà du seuil de purge, l'écriture est refusée et une purge
+        est lancée en tâche de fond.
+        """
+        usage_mb = self.stats.memory_usage_mb
+
+        if usage_mb > self.config.purge_threshold_mb:
+            if self.config.enable_auto_purge:
+                self._schedule_purge()
+            return False
+        elif usage_mb > self.config.warning_threshold_mb:
+            self.status = CacheStatus.WARNING
+        else:
+            self.status = CacheStatus.HEALTHY
 
-        except Exception as e:
-            logger.error(f"Erreur vérification mémoire: {e}")
-            return True  # Autorise en cas d'erreur pour éviter le blocage
+        return True
 
     async def _update_memory_stats(self):
-        """Met à jour les statistiques mémoire"""
+        """Met à jour les statistiques mémoire (INFO memory + DBSIZE, O(1))"""
         try:
             info = await self.client.info("memory")
             used_memory_bytes = info.get("used_memory", 0)
             self.stats.memory_usage_mb = used_memory_bytes / (1024 * 1024)
 
-            # Estimation du nombre de clés
-            keyspace_info = await self.client.info("keyspace")
-            total_keys = sum(
-                int(db_info.split("keys=")[1].split(",")[0])
-                for db_info in keyspace_info.values()
-                if isinstance(db_info, str) and "keys=" in db_info
-            )
+            total_keys = await self.client.dbsize()
             self.stats.key_count = total_keys
 
             # Calcul de la taille moyenne des valeurs
             if total_keys > 0:
-                self.stats.avg_value_size = (
-                    (used_memory_bytes / total_keys) if total_keys > 0 else 0
-                )
+                self.stats.avg_value_size = used_memory_bytes / total_keys
 
             self.last_memory_check = time.time()
 
         except Exception as e:
             logger.warning(f"Impossible de mettre à jour les stats mémoire: {e}")
 
+    def _start_memory_sampler(self):
+        """Lance l'échantillonneur mémoire de fond"""
+        if self._sampler_task is None or self._sampler_task.done():
+            self._sampler_task = asyncio.create_task(self._memory_sampler_loop())
+
+    def _stop_background_tasks(self):
+        """Arrête l'échantillonneur et une purge en cours"""
+        for task in (self._sampler_task, self._purge_task):
+            if task is not None and not task.done():
+                task.cancel()
+        self._sampler_task = None
+        self._purge_task = None
+
+    async def _memory_sampler_loop(self):
+        """Rafraîchit périodiquement les stats utilisées par l'admission"""
+        while self.client is not None:
+            await asyncio.sleep(self.config.memory_sample_interval)
+            try:
+                await self._sample_cache_state()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Erreur échantillonnage cache: {e}")
+
+    async def _sample_cache_state(self):
+        """Stats mémoire, statut, limites par namespace (purges ciblées)"""
+        await self._update_memory_stats()
+        await self._check_memory_limits()
+
+        counts = await self._estimate_namespace_keys()
+        for namespace, key_count in counts.items():
+            if key_count > self.config.max_keys_per_namespace:
+                logger.warning(
+                    f"Namespace {namespace} dépasse la limite: ~{key_count} clés"
+                )
+                self.protection_stats["namespace_limit_hits"] += 1
+                await self._purge_namespace(namespace, 0.2)  # Purge 20%
+
+    def _schedule_purge(self):
+        """Lance la purge automatique en tâche de fond (une seule à la fois)"""
+        if self._purge_task is None or self._purge_task.done():
+            self._purge_task = asyncio.create_task(self._auto_purge_cache())
+
+    def _namespace_window(self, namespace: str) -> int:
+        """Fenêtre de comptage d'un namespace: son TTL par défaut"""
+        return max(1, self._get_namespace_ttl(namespace))
+
+    def _namespace_hll_keys(self, namespace: str) -> Tuple[str, str]:
+        """HyperLogLog de la fenêtre courante et de la précédente"""
+        window = self._namespace_window(namespace)
+        epoch = int(time.time() // window)
+        base = f"{NAMESPACE_HLL_PREFIX}{namespace}:"
+        return f"{base}{epoch}", f"{base}{epoch - 1}"
+
+    async def _estimate_namespace_keys(
+        self, namespaces: Optional[Iterable[str]] = None
+    ) -> Dict[str, int]:
+        """
+        Nombre de clés écrites par namespace sur les deux dernières fenêtres TTL
+
+        Borne haute des clés vivantes (les clés plus anciennes ont expiré),
+        estimée par PFCOUNT en un seul pipeline.
+        """
+        if namespaces is None:
+            namespaces = set(self.namespaces) | self._written_namespaces
+        namespaces = sorted(namespaces)
+        if not namespaces:
+            return {}
+
+        pipe = self.client.pipeline(transaction=False)
+        for namespace in namespaces:
+            pipe.pfcount(*self._namespace_hll_keys(namespace))
+        results = await pipe.execute(raise_on_error=False)
+
+        return {
+            namespace: int(count)
+            for namespace, count in zip(namespaces, results)
+            if not isinstance(count, Exception)
+        }
+
     async def _auto_purge_cache(self):
         """Purge automatique du cache en cas de surcharge"""
         logger.warning("Déclenchement purge automatique du cache")
@@ -679,80 +771,144 @@ class RedisCacheCore(InitializableMixin):
 
                 # Vérification si suffisant
                 await self._update_memory_stats()
-                usage_percent = (
-                    self.stats.memory_usage_mb / self.config.total_memory_limit_mb
-                ) * 100
-
-                if usage_percent < self.config.warning_threshold_mb:
+                if self.stats.memory_usage_mb < self.config.warning_threshold_mb:
                     break
 
         except Exception as e:
             logger.error(f"Erreur purge automatique: {e}")
 
     async def _purge_namespace(self, namespace: str, ratio: float) -> int:
-        """Purge un pourcentage des clés d'un namespace"""
+        """
+        Évince environ ratio des clés d'un namespace, par échantillons SCAN
+
+        Dans chaque lot parcouru, les clés les moins utilisées (puis les plus
+        proches de l'expiration) sont supprimées par UNLINK, jusqu'à atteindre
+        ratio de l'estimation HyperLogLog du namespace. Les clés protégées
+        (PROTECTED_KEY_PREFIXES) ne sont jamais candidates.
+        """
         try:
-            pattern = self.namespaces.get(namespace, f"{namespace}:") + "*"
-            keys = await self.client.keys(pattern)
-
-            if not keys:
+            estimate = (await self._estimate_namespace_keys([namespace])).get(
+                namespace, 0
+            )
+            target = int(estimate * ratio)
+            if target == 0:
                 return 0
 
-            # Suppression d'un pourcentage des clés (les plus anciennes en priorité)
-            keys_to_delete = int(len(keys) * ratio)
-            if keys_to_delete == 0:
-                return 0
+            pattern = self.namespaces.get(namespace, f"{namespace}:") + "*"
+            deleted = 0
 
-            # Simple: prendre les premières clés (Redis keys() n'est pas ordonné mais suffisant)
-            selected_keys = keys[:keys_to_delete]
+            async for keys in self._scan_batches(pattern):
+                keys = [key for key in keys if not self._is_protected_key(key)]
+                if not keys:
+                    continue
+                ranked = await self._rank_eviction_candidates(keys)
+                batch_quota = max(1, int(len(ranked) * ratio))
+                victims = ranked[: min(batch_quota, target - deleted)]
+                if victims:
+                    deleted += await self.client.unlink(*victims)
+                if deleted >= target:
+                    break
 
-            return await self.client.delete(*selected_keys)
+            return deleted
 
         except Exception as e:
             logger.error(f"Erreur purge namespace {namespace}: {e}")
             return 0
 
-    async def _monitor_namespace_limits(self, namespace: str):
-        """Surveille les limites par namespace"""
-        try:
-            pattern = self.namespaces.get(namespace, f"{namespace}:") + "*"
-            keys = await self.client.keys(pattern)
+    async def _scan_batches(self, pattern: str):
+        """
+        Lots d'au plus eviction_sample_size clés correspondant à pattern
 
-            if len(keys) > self.config.max_keys_per_namespace:
-                logger.warning(
-                    f"Namespace {namespace} dépasse la limite: {len(keys)} clés"
-                )
-                self.protection_stats["namespace_limit_hits"] += 1
-                # Purge ciblée du namespace
-                await self._purge_namespace(namespace, 0.2)  # Purge 20%
+        SCAN incrémental: chaque appel ne parcourt qu'une portion du keyspace,
+        Redis n'est jamais bloqué comme avec KEYS.
+        """
+        batch_size = max(1, self.config.eviction_sample_size)
+        cursor = 0
+        pending: List[bytes] = []
 
-        except Exception as e:
-            logger.warning(f"Erreur monitoring namespace {namespace}: {e}")
+        while True:
+            cursor, keys = await self.client.scan(
+                cursor=cursor, match=pattern, count=SCAN_COUNT
+            )
+            pending.extend(keys)
+
+            while len(pending) >= batch_size:
+                yield pending[:batch_size]
+                pending = pending[batch_size:]
+
+            if cursor == 0:
+                break
+
+        if pending:
+            yield pending
+
+    @staticmethod
+    def _is_protected_key(key) -> bool:
+        """Clé exclue de l'éviction (compteur de version de collection)"""
+        if isinstance(key, bytes):
+            key = key.decode("utf-8", errors="replace")
+        return key.startswith(PROTECTED_KEY_PREFIXES)
+
+    async def _rank_eviction_candidates(self, keys: List[bytes]) -> List[bytes]:
+        """
+        Trie les clés de la moins à la plus précieuse
+
+        LFU (OBJECT FREQ) si la politique maxmemory de Redis est LFU, sinon
+        temps d'inactivité (OBJECT IDLETIME); à égalité, TTL restant le plus
+        court d'abord. Un seul pipeline par lot.
+        """
+        use_lfu = self._lfu_supported is not False
+        pipe = self.client.pipeline(transaction=False)
+        for key in keys:
+            pipe.ttl(key)
+            pipe.object("freq" if use_lfu else "idletime", key)
+        results = await pipe.execute(raise_on_error=False)
+
+        ranked = []
+        for i, key in enumerate(keys):
+            ttl, usage = results[2 * i], results[2 * i + 1]
+            if isinstance(ttl, Exception) or ttl == -2:
+                continue  # Expirée entre-temps
+
+            if isinstance(usage, Exception):
+                if use_lfu and self._lfu_supported is None:
+                    self._lfu_supported = False
+                usage = 0
+            elif use_lfu:
+                self._lfu_supported = True
+
+            # LFU: fréquence croissante; LRU: inactivité décroissante
+            usage_rank = usage if use_lfu else -usage
+            remaining = ttl if ttl >= 0 else float("inf")
+            ranked.append(((usage_rank, remaining), key))
+
+        ranked.sort(key=lambda item: item[0])
+        return [key for _, key in ranked]
 
     async def _get_namespace_stats(self) -> Dict[str, Dict[str, Any]]:
-        """Statistiques par namespace"""
+        """Statistiques par namespace (estimations HyperLogLog)"""
         stats = {}
 
-        for namespace, prefix in self.namespaces.items():
-            try:
-                pattern = prefix + "*"
-                keys = await self.client.keys(pattern)
-
-                stats[namespace] = {
-                    "key_count": len(keys),
-                    "limit": self.config.max_keys_per_namespace,
-                    "usage_percent": (len(keys) / self.config.max_keys_per_namespace)
-                    * 100,
-                    "ttl": self._get_namespace_ttl(namespace),
-                }
-
-            except Exception as e:
-                stats[namespace] = {"error": str(e)}
+        try:
+            counts = await self._estimate_namespace_keys()
+        except Exception as e:
+            return {namespace: {"error": str(e)} for namespace in self.namespaces}
+
+        for namespace, key_count in counts.items():
+            stats[namespace] = {
+                "key_count": key_count,
+                "estimated": True,
+                "limit": self.config.max_keys_per_namespace,
+                "usage_percent": (key_count / self.config.max_keys_per_namespace)
+                * 100,
+                "ttl": self._get_namespace_ttl(namespace),
+            }
 
         return stats
 
     async def cleanup(self):
         """Nettoyage des ressources"""
+        self._stop_background_tasks()
         if self.client:
             try:
                 await self.client.close()
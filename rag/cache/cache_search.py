@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+"""
+cache_search.py - Cache des résultats de recherche (niveau retrieval)
+Version: 1.0.0
+Last modified: 2025-11-10
+"""
+"""
+cache_search.py - Cache des résultats de recherche (niveau retrieval)
+
+Le cache de réponses (resp:) rate dès que les entrées de génération changent
+(langue, contexte conversationnel). Ce cache stocke uniquement la liste finale
+fusionnée/rerankée des documents: identifiants + scores.
+
+- Clé: collection + version de la collection + signature quantifiée de
+  l'embedding + where-filter + top_k + alpha (deux collections à la même
+  version ne partagent jamais une entrée)
+- Valeur: [{"id": ..., "score": ...}] (les contenus sont réhydratés depuis le
+  chunk store local, voir retrieval/chunk_store.py)
+- Invalidation: la version de la collection (search:version:<collection>) est
+  incrémentée à chaque ingestion; les anciennes entrées deviennent
+  inaccessibles et expirent par TTL
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import numpy as np
+from utils.types import Dict, List, Optional, Any
+
+logger = logging.getLogger(__name__)
+
+# Préfixe partagé avec knowledge-ingesters (collection_version.py)
+VERSION_KEY_PREFIX = "version:"
+RESULTS_KEY_PREFIX = "results:"
+
+
+def embedding_signature(query_vector: List[float], scale: int = 64) -> str:
+    """
+    Signature stable d'un embedding
+
+    Le vecteur est normalisé puis quantifié en int8 (pas de 1/scale): deux
+    embeddings quasi identiques (bruit flottant, même texte re-embeddé)
+    partagent la même signature.
+    """
+    vector = np.asarray(query_vector, dtype=np.float32)
+    norm = float(np.linalg.norm(vector))
+    if norm > 0:
+        vector = vector / norm
+    quantized = np.clip(np.rint(vector * scale), -127, 127).astype(np.int8)
+    return hashlib.md5(quantized.tobytes(), usedforsecurity=False).hexdigest()
+
+
+class SearchResultsCache:
+    """Cache Redis des listes (id, score) issues de la recherche"""
+
+    def __init__(self, core_cache):
+        self.core = core_cache
+
+        self.quantization_scale = int(os.getenv("CACHE_SEARCH_QUANT_SCALE", "64"))
+        # Relecture de la version au plus toutes les N secondes
+        self.version_refresh_seconds = float(
+            os.getenv("CACHE_SEARCH_VERSION_REFRESH", "5")
+        )
+
+        self._versions: Dict[str, int] = {}
+        self._versions_checked_at: Dict[str, float] = {}
+
+        self.cache_stats = {
+            "hits": 0,
+            "misses": 0,
+            "sets": 0,
+            "version_bumps": 0,
+            "errors": 0,
+        }
+
+    def _generate_key(
+        self,
+        query_vector: List[float],
+        where_filter: Optional[Dict],
+        top_k: int,
+        alpha: Optional[float],
+        collection: str,
+        version: int,
+    ) -> str:
+        """Clé: collection + version + signature embedding + filtre + top_k + alpha"""
+        signature = embedding_signature(query_vector, self.quantization_scale)
+        filter_str = json.dumps(where_filter or {}, sort_keys=True, default=str)
+        filter_hash = hashlib.md5(
+            filter_str.encode("utf-8"), usedforsecurity=False
+        ).hexdigest()[:16]
+        alpha_str = "none" if alpha is None else f"{alpha:.2f}"
+        return (
+            f"{RESULTS_KEY_PREFIX}{collection}:v{version}:{signature}:{filter_hash}:"
+            f"k{top_k}:a{alpha_str}"
+        )
+
+    def _version_key(self, collection: str) -> str:
+        return self.core._build_key(f"{VERSION_KEY_PREFIX}{collection}", "searches")
+
+    async def get_collection_version(
+        self, collection: str, refresh: bool = False
+    ) -> int:
+        """Version courante de la collection (0 si jamais ingérée)"""
+        now = time.time()
+        checked_at = self._versions_checked_at.get(collection, 0.0)
+        if (
+            not refresh
+            and collection in self._versions
+            and now - checked_at < self.version_refresh_seconds
+        ):
+            return self._versions[collection]
+
+        raw = await self.core.client.get(self._version_key(collection))
+        version = int(raw) if raw else 0
+        self._versions[collection] = version
+        self._versions_checked_at[collection] = now
+        return version
+
+    async def bump_collection_version(self, collection: str) -> int:
+        """Incrémente la version (invalide tous les résultats en cache)"""
+        version = int(await self.core.client.incr(self._version_key(collection)))
+        self._versions[collection] = version
+        self._versions_checked_at[collection] = time.time()
+        self.cache_stats["version_bumps"] += 1
+        logger.info(f"Version collection {collection}: {version}")
+        return version
+
+    async def get(
+        self,
+        query_vector: List[float],
+        where_filter: Optional[Dict],
+        top_k: int,
+        alpha: Optional[float],
+        collection: str,
+    ) -> Optional[List[Dict]]:
+        """Récupère [{"id", "score"}] ou None"""
+        if not self.core._is_operational():
+            return None
+        try:
+            version = await self.get_collection_version(collection)
+            key = self._generate_key(
+                query_vector, where_filter, top_k, alpha, collection, version
+            )
+            cached = await self.core.get(key, "searches")
+        except Exception as e:
+            self.cache_stats["errors"] += 1
+            logger.warning(f"Erreur lecture cache recherche: {e}")
+            return None
+
+        if not cached:
+            self.cache_stats["misses"] += 1
+            return None
+
+        self.cache_stats["hits"] += 1
+        return cached
+
+    async def set(
+        self,
+        query_vector: List[float],
+        where_filter: Optional[Dict],
+        top_k: int,
+        alpha: Optional[float],
+        collection: str,
+        results: List[Dict],
+    ) -> bool:
+        """Stocke [{"id", "score"}] sous la version courante"""
+        if not self.core._is_operational() or not results:
+            return False
+        try:
+            version = await self.get_collection_version(collection)
+            key = self._generate_key(
+                query_vector, where_filter, top_k, alpha, collection, version
+            )
+            payload = [
+                {"id": str(r["id"]), "score": float(r["score"])} for r in results
+            ]
+            success = await self.core.set(key, payload, namespace="searches")
+        except Exception as e:
+            self.cache_stats["errors"] += 1
+            logger.warning(f"Erreur écriture cache recherche: {e}")
+            return False
+
+        if success:
+            self.cache_stats["sets"] += 1
+        return success
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.cache_stats["hits"] + self.cache_stats["misses"]
+        return {
+            **self.cache_stats,
+            "hit_rate": self.cache_stats["hits"] / lookups if lookups else 0.0,
+            "collection_versions": dict(self._versions),
+        }
@@ -38,6 +38,15 @@ except ImportError as e:
     logger.warning(f"Semantic cache module not available: {e}")
     SEMANTIC_AVAILABLE = False
 
+try:
+    from .cache_search import SearchResultsCache
+
+    SEARCH_CACHE_AVAILABLE = True
+    logger.debug("Search results cache importé avec succès")
+except ImportError as e:
+    logger.warning(f"Search results cache module not available: {e}")
+    SEARCH_CACHE_AVAILABLE = False
+
 try:
     from .cache_stats import CacheStatsManager
 
@@ -89,6 +98,14 @@ class RAGCacheManager(InitializableMixin):
                 logger.error(f"Failed to initialize semantic cache: {e}")
                 self.semantic = None
 
+            try:
+                self.search = (
+                    SearchResultsCache(self.core) if SEARCH_CACHE_AVAILABLE else None
+                )
+            except Exception as e:
+                logger.error(f"Failed to initialize search results cache: {e}")
+                self.search = None
+
             try:
                 if STATS_AVAILABLE:
                     self.stats = CacheStatsManager(self.core)
@@ -346,17 +363,21 @@ class RAGCacheManager(InitializableMixin):
 
     # ===== MÉTHODES RECHERCHE =====
     async def get_search_results(
-        self, query_vector: List[float], where_filter: Dict = None, top_k: int = 10
+        self,
+        query_vector: List[float],
+        where_filter: Dict = None,
+        top_k: int = 10,
+        alpha: Optional[float] = None,
+        collection: str = "InteliaKnowledge",
     ) -> Optional[List[Dict]]:
-        """Récupère des résultats de recherche depuis le cache"""
-        if not self.core:
-            logger.debug("Core cache not available for get_search_results")
+        """Récupère des résultats de recherche ([{"id", "score"}]) depuis le cache"""
+        if not self.search:
+            logger.debug("Search cache not available for get_search_results")
             return None
         try:
-            logger.debug(
-                "get_search_results: Méthode non encore implémentée dans cache_core"
+            return await self.search.get(
+                query_vector, where_filter, top_k, alpha, collection
             )
-            return None
         except Exception as e:
             logger.warning(f"Erreur get_search_results: {e}")
             return None
@@ -367,19 +388,40 @@ class RAGCacheManager(InitializableMixin):
         where_filter: Dict,
         top_k: int,
         results: List[Dict],
+        alpha: Optional[float] = None,
+        collection: str = "InteliaKnowledge",
     ):
-        """Met en cache des résultats de recherche"""
-        if not self.core:
-            logger.debug("Core cache not available for set_search_results")
+        """Met en cache des résultats de recherche ([{"id", "score"}])"""
+        if not self.search:
+            logger.debug("Search cache not available for set_search_results")
             return
         try:
-            logger.debug(
-                "set_search_results: Méthode non encore implémentée dans cache_core"
+            await self.search.set(
+                query_vector, where_filter, top_k, alpha, collection, results
             )
-            return
         except Exception as e:
             logger.warning(f"Erreur set_search_results: {e}")
 
+    async def get_collection_version(self, collection: str) -> Optional[int]:
+        """Version de la collection utilisée dans les clés de recherche"""
+        if not self.search or not self._is_operational():
+            return None
+        try:
+            return await self.search.get_collection_version(collection)
+        except Exception as e:
+            logger.warning(f"Erreur get_collection_version: {e}")
+            return None
+
+    async def bump_collection_version(self, collection: str) -> Optional[int]:
+        """Invalide les résultats de recherche en cache d'une collection"""
+        if not self.search or not self._is_operational():
+            return None
+        try:
+            return await self.search.bump_collection_version(collection)
+        except Exception as e:
+            logger.warning(f"Erreur bump_collection_version: {e}")
+            return None
+
     # ===== MÉTHODES INTENTIONS =====
     async def get_intent_result(self, query: str) -> Optional[Dict]:
         """Récupère un résultat d'analyse d'intention"""
@@ -439,6 +481,8 @@ class RAGCacheManager(InitializableMixin):
             "stats_available": STATS_AVAILABLE,
             "operational": self._is_operational(),
         }
+        if self.search:
+            base_stats["search_results_cache"] = self.search.get_stats()
 
         if not self.stats:
             logger.debug("Stats module not available")
@@ -119,6 +119,27 @@ MAX_CONVERSATION_CONTEXT = int(os.getenv("MAX_CONVERSATION_CONTEXT", "8"))
 HYBRID_SEARCH_ENABLED = os.getenv("HYBRID_SEARCH_ENABLED", "true").lower() == "true"
 DEFAULT_ALPHA = float(os.getenv("HYBRID_ALPHA", "0.6"))
 
+# Index local en mémoire (vecteurs float16 + BM25) construit depuis le chunk
+# store (CHUNK_STORE_DIR): "off", "fallback" (Weaviate en erreur ou au-delà
+# de LOCAL_INDEX_DEADLINE secondes) ou "primary" (Weaviate seulement si
+# l'index local ne trouve rien)
+LOCAL_INDEX_MODE = os.getenv("LOCAL_INDEX_MODE", "off").lower()
+LOCAL_INDEX_DEADLINE = float(os.getenv("LOCAL_INDEX_DEADLINE", "3.0"))
+
+# Profondeur de recherche adaptative: première passe à ADAPTIVE_DEPTH_INITIAL_K
+# candidats, élargie à RAG_SIMILARITY_TOP_K seulement si la confiance est basse
+# (confiance/pertinence des scores, écart top-1/top-5, score du reranker)
+ADAPTIVE_RETRIEVAL_DEPTH = (
+    os.getenv("ADAPTIVE_RETRIEVAL_DEPTH", "false").lower() == "true"
+)
+ADAPTIVE_DEPTH_INITIAL_K = int(os.getenv("ADAPTIVE_DEPTH_INITIAL_K", "20"))
+ADAPTIVE_DEPTH_MIN_CONFIDENCE = float(os.getenv("ADAPTIVE_DEPTH_MIN_CONFIDENCE", "0.7"))
+ADAPTIVE_DEPTH_MIN_RELEVANCE = float(os.getenv("ADAPTIVE_DEPTH_MIN_RELEVANCE", "0.06"))
+ADAPTIVE_DEPTH_MIN_GAP = float(os.getenv("ADAPTIVE_DEPTH_MIN_GAP", "0.25"))
+ADAPTIVE_DEPTH_MIN_RERANK_SCORE = float(
+    os.getenv("ADAPTIVE_DEPTH_MIN_RERANK_SCORE", "0.5")
+)
+
 # ===== EXTERNAL SOURCES CONFIGURATION =====
 # Query-driven document ingestion from external scientific sources
 ENABLE_EXTERNAL_SOURCES = os.getenv("ENABLE_EXTERNAL_SOURCES", "true").lower() == "true"
@@ -363,6 +384,9 @@ def validate_config() -> tuple[bool, list[str]]:
     if RAG_SIMILARITY_TOP_K <= 0:
         errors.append("RAG_SIMILARITY_TOP_K doit être > 0")
 
+    if ADAPTIVE_RETRIEVAL_DEPTH and ADAPTIVE_DEPTH_INITIAL_K <= 0:
+        errors.append("ADAPTIVE_DEPTH_INITIAL_K doit être > 0")
+
     if not (0.0 <= DEFAULT_ALPHA <= 1.0):
         errors.append("HYBRID_ALPHA doit être entre 0.0 et 1.0")
 
@@ -503,6 +527,14 @@ __all__ = [
     "RAG_VERIFICATION_SMART",
     "HYBRID_SEARCH_ENABLED",
     "DEFAULT_ALPHA",
+    "LOCAL_INDEX_MODE",
+    "LOCAL_INDEX_DEADLINE",
+    "ADAPTIVE_RETRIEVAL_DEPTH",
+    "ADAPTIVE_DEPTH_INITIAL_K",
+    "ADAPTIVE_DEPTH_MIN_CONFIDENCE",
+    "ADAPTIVE_DEPTH_MIN_RELEVANCE",
+    "ADAPTIVE_DEPTH_MIN_GAP",
+    "ADAPTIVE_DEPTH_MIN_RERANK_SCORE",
     "MAX_CONVERSATION_CONTEXT",
     # External Sources
     "ENABLE_EXTERNAL_SOURCES",
@@ -11,6 +11,7 @@ Fusionne: comparison_handler + comparison_utils + comparison_response_generator
 Utilise: metric_calculator (conservé pour calculs purs)
 """
 
+import asyncio
 import logging
 from utils.types import Dict, List, Any, Optional
 from dataclasses import dataclass, field
@@ -314,10 +315,18 @@ class ComparisonEngine:
         Returns:
             Liste de résultats avec données
         """
-        entity_results = []
+        fetched = await self._fetch_entities_data(
+            comparison_entities,
+            queries=[
+                f"Métrique pour {self._build_entity_description(entity_set)}"
+                for entity_set in comparison_entities
+            ],
+            top_k=12,
+            strict_sex_match=True,
+        )
 
-        for entity_set in comparison_entities:
-            result = await self._fetch_entity_data(entity_set)
+        entity_results = []
+        for entity_set, result in zip(comparison_entities, fetched):
             if result:
                 entity_results.append(result)
             else:
@@ -329,48 +338,91 @@ class ComparisonEngine:
 
         return entity_results
 
-    async def _fetch_entity_data(self, entity_set: Dict[str, Any]) -> Optional[Dict]:
+    async def _fetch_entities_data(
+        self,
+        comparison_entities: List[Dict[str, Any]],
+        queries: List[str],
+        top_k: int,
+        strict_sex_match: bool,
+    ) -> List[Optional[Dict]]:
         """
-        Récupère données pour une entité spécifique
+        Récupère les données de toutes les entités en un seul aller-retour
+
+        search_metrics_batch regroupe les races dans une requête ANY($1): la
+        latence ne croît plus avec le nombre d'entités. Sans batch, les appels
+        search_metrics partent en parallèle.
 
         Args:
-            entity_set: Dict avec breed, age_days, sex, etc.
+            comparison_entities: Liste d'entités (breed, age_days, sex, etc.)
+            queries: Une requête par entité
+            top_k: Nombre de résultats par entité
+            strict_sex_match: Filtrage strict du sexe
 
         Returns:
-            Dict avec label, data, entity_set ou None
+            Un dict (label, data, entity_set, result_object) ou None par entité
         """
         if not self.postgresql_system:
             logger.warning("PostgreSQL système non disponible")
-            return None
+            return [None] * len(comparison_entities)
 
         try:
-            # Construction query pour logging
-            query_desc = self._build_entity_description(entity_set)
-
-            # Récupération via PostgreSQL
-            result = await self.postgresql_system.search_metrics(
-                query=f"Métrique pour {query_desc}",
-                entities=entity_set,
-                top_k=12,
-                strict_sex_match=True,
-            )
-
-            # Validation résultat
-            if result and hasattr(result, "context_docs") and result.context_docs:
-                return {
-                    "label": self._build_entity_label(entity_set),
-                    "data": result.context_docs,
-                    "entity_set": entity_set,
-                    "result_object": result,
-                }
+            if hasattr(self.postgresql_system, "search_metrics_batch"):
+                results = await self.postgresql_system.search_metrics_batch(
+                    queries=queries,
+                    entity_sets=comparison_entities,
+                    top_k=top_k,
+                    strict_sex_match=strict_sex_match,
+                )
             else:
-                logger.debug(f"Résultat vide pour: {query_desc}")
-                return None
-
+                results = await asyncio.gather(
+                    *(
+                        self.postgresql_system.search_metrics(
+                            query=query,
+                            entities=entity_set,
+                            top_k=top_k,
+                            strict_sex_match=strict_sex_match,
+                        )
+                        for query, entity_set in zip(queries, comparison_entities)
+                    ),
+                    return_exceptions=True,
+                )
         except Exception as e:
-            logger.error(f"Erreur fetch entity {entity_set}: {e}")
+            logger.error(f"Erreur fetch entités {comparison_entities}: {e}")
+            return [None] * len(comparison_entities)
+
+        return [
+            self._entity_data(entity_set, result)
+            for entity_set, result in zip(comparison_entities, results)
+        ]
+
+    def _entity_data(self, entity_set: Dict[str, Any], result) -> Optional[Dict]:
+        """
+        Valide le résultat PostgreSQL d'une entité
+
+        Args:
+            entity_set: Dict avec breed, age_days, sex, etc.
+            result: RAGResult (ou exception levée par search_metrics)
+
+        Returns:
+            Dict avec label, data, entity_set ou None
+        """
+        if isinstance(result, Exception):
+            logger.error(f"Erreur fetch entity {entity_set}: {result}")
             return None
 
+        if result and hasattr(result, "context_docs") and result.context_docs:
+            return {
+                "label": self._build_entity_label(entity_set),
+                "data": result.context_docs,
+                "entity_set": entity_set,
+                "result_object": result,
+            }
+
+        logger.debug(
+            f"Résultat vide pour: {self._build_entity_description(entity_set)}"
+        )
+        return None
+
     def _build_entity_label(self, entity_set: Dict) -> str:
         """
         Construit un label lisible pour l'entité
@@ -656,27 +708,17 @@ class ComparisonEngine:
         logger.info("Tentative comparaison avec fallback (critères assouplis)")
 
         try:
-            # Relaxer les critères de recherche
-            entity_results = []
-            for entity_set in comparison_entities:
-                # Retirer strict_sex_match
-                relaxed_entity = entity_set.copy()
-
-                result = await self.postgresql_system.search_metrics(
-                    query=f"Métrique {self._build_entity_label(entity_set)}",
-                    entities=relaxed_entity,
-                    top_k=20,  # Plus de résultats
-                    strict_sex_match=False,  # Critères assouplis
-                )
-
-                if result and hasattr(result, "context_docs") and result.context_docs:
-                    entity_results.append(
-                        {
-                            "label": self._build_entity_label(entity_set),
-                            "data": result.context_docs,
-                            "entity_set": entity_set,
-                        }
-                    )
+            # Relaxer les critères de recherche (plus de résultats, sexe souple)
+            fetched = await self._fetch_entities_data(
+                comparison_entities,
+                queries=[
+                    f"Métrique {self._build_entity_label(entity_set)}"
+                    for entity_set in comparison_entities
+                ],
+                top_k=20,
+                strict_sex_match=False,
+            )
+            entity_results = [result for result in fetched if result]
 
             if len(entity_results) >= 2:
                 comparison_data = self._calculate_comparison(
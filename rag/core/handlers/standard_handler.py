@@ -740,7 +740,8 @@ class StandardQueryHandler(BaseQueryHandler):
                         # Always filter to 5 docs max for Context Precision
                         final_top_k = 5  # Fixed: always filter to 5 relevant docs
 
-                        reranked_texts = self.reranker.rerank(
+                        # Async: cross-encoder worker / Cohere async client
+                        reranked_texts = await self.reranker.arerank(
                             query=query,
                             documents=doc_texts,
                             top_k=final_top_k,  # Always 5 docs max
@@ -16,6 +16,7 @@ from utils.types import Dict, List, Any, Optional
 
 from .data_models import RAGResult, RAGSource
 from .query_enricher import ConversationalQueryEnricher
+from .stage_scheduler import StageScheduler
 from utils.clarification_helper import get_clarification_helper
 from utils.llm_translator import LLMTranslator
 from config.config import (
@@ -43,6 +44,7 @@ class RAGQueryProcessor:
         ood_detector=None,
         weaviate_client=None,
         enable_external_sources=False,
+        embedding_prefetcher=None,
     ):
         """
         Initialize query processor
@@ -54,6 +56,9 @@ class RAGQueryProcessor:
             ood_detector: Optional OOD detector instance
             weaviate_client: Optional Weaviate client for document ingestion
             enable_external_sources: Enable external sources search (default: False)
+            embedding_prefetcher: Optional object exposing
+                prefetch_query_embedding/discard_query_embedding (WeaviateCore)
+                to embed the query speculatively while OOD/history run
         """
         self.query_router = query_router
         self.temporal_handler = handlers.get("temporal")
@@ -62,6 +67,7 @@ class RAGQueryProcessor:
         self.calculation_handler = handlers.get("calculation")
         self.conversation_memory = conversation_memory
         self.ood_detector = ood_detector
+        self.embedding_prefetcher = embedding_prefetcher
         self.enricher = ConversationalQueryEnricher()
         self.clarification_helper = get_clarification_helper()
 
@@ -467,6 +473,13 @@ class RAGQueryProcessor:
                         },
                     )
 
+        # ⚡ Stage scheduling: the LLM OOD verdict, the contextual history and the
+        # query embedding don't depend on each other, so they run concurrently.
+        # The embedding is speculative (thrown away on OOD/clarification), and the
+        # OOD verdict is only awaited before routing, which records user context.
+        scheduler = StageScheduler(request_id)
+        llm_ood_pending = False
+
         # ⚡ OPTIMIZATION Phase 2: Quick keyword-based domain check before expensive LLM call
         # This saves ~80-100ms for 90%+ of queries that are clearly in-domain
         if self.ood_detector and not skip_ood and not skip_ood_for_followup:
@@ -480,50 +493,35 @@ class RAGQueryProcessor:
                         f"✅ IN-DOMAIN (keyword check): '{query[:60]}...' - skipping LLM verification"
                     )
                 else:
-                    # Borderline case - use LLM for accurate detection (~100ms)
+                    # Borderline case - use LLM for accurate detection (~100ms),
+                    # in a worker thread while the next stages proceed
                     logger.info(
                         f"⚠️ UNCERTAIN domain (keyword check) - using LLM verification: '{query[:60]}...'"
                     )
-                    is_in_domain, domain_score, score_details = (
-                        self.ood_detector.calculate_ood_score_multilingual(
-                            query, None, language
-                        )
+                    scheduler.start(
+                        "ood_check",
+                        self.ood_detector.calculate_ood_score_multilingual,
+                        query,
+                        None,
+                        language,
+                        in_thread=True,
                     )
-
-                    if not is_in_domain:
-                        logger.warning(
-                            f"⛔ OUT-OF-DOMAIN query detected (LLM): '{query[:60]}...'"
-                        )
-                        from config.messages import get_message
-
-                        ood_message = get_message("out_of_domain", language)
-                        return RAGResult(
-                            source=RAGSource.OOD_FILTERED,
-                            answer=ood_message,
-                            context_docs=[],  # Fixed: was 'sources'
-                            processing_time=(
-                                time.time() - start_time
-                            ),  # Fixed: was 'processing_time_ms'
-                            metadata={
-                                "ood_score": domain_score,
-                                "ood_details": score_details,
-                                "query_type": "out_of_domain",
-                                "conversation_id": tenant_id,  # Moved to metadata
-                            },
-                        )
-                    else:
-                        logger.info(
-                            f"✅ IN-DOMAIN query confirmed (LLM): '{query[:60]}...'"
-                        )
+                    llm_ood_pending = True
             except Exception as e:
                 logger.error(f"❌ OOD detection error: {e}")
                 # Continue processing on error (fail-open)
 
+        self._start_speculative_embedding(scheduler, query)
+
         # Step 1: Retrieve contextual history
-        contextual_history = await self._get_contextual_history(tenant_id, query)
+        scheduler.start(
+            "contextual_history", self._get_contextual_history, tenant_id, query
+        )
+        contextual_history = await scheduler.result("contextual_history")
 
         # Step 2: Enrich query if history available
-        enriched_query = self._enrich_query(query, contextual_history, language)
+        with scheduler.timed("enrichment"):
+            enriched_query = self._enrich_query(query, contextual_history, language)
 
         # Step 2b: Always extract entities from context if available
         extracted_entities = None
@@ -551,6 +549,44 @@ class RAGQueryProcessor:
                     "entity_extraction_failed", request_id=request_id, error=str(e)
                 )
 
+        # LLM OOD verdict (computed in parallel with the steps above)
+        if llm_ood_pending:
+            try:
+                is_in_domain, domain_score, score_details = await scheduler.result(
+                    "ood_check"
+                )
+
+                if not is_in_domain:
+                    logger.warning(
+                        f"⛔ OUT-OF-DOMAIN query detected (LLM): '{query[:60]}...'"
+                    )
+                    scheduler.cancel_speculative("out_of_domain")
+                    from config.messages import get_message
+
+                    ood_message = get_message("out_of_domain", language)
+                    return RAGResult(
+                        source=RAGSource.OOD_FILTERED,
+                        answer=ood_message,
+                        context_docs=[],  # Fixed: was 'sources'
+                        processing_time=(
+                            time.time() - start_time
+                        ),  # Fixed: was 'processing_time_ms'
+                        metadata={
+                            "ood_score": domain_score,
+                            "ood_details": score_details,
+                            "query_type": "out_of_domain",
+                            "conversation_id": tenant_id,  # Moved to metadata
+                            "stage_timings": scheduler.summary(),
+                        },
+                    )
+                else:
+                    logger.info(
+                        f"✅ IN-DOMAIN query confirmed (LLM): '{query[:60]}...'"
+                    )
+            except Exception as e:
+                logger.error(f"❌ OOD detection error: {e}")
+                # Continue processing on error (fail-open)
+
         # ⚡ OPTIMIZATION Phase 1B: Hybrid Intelligent Architecture
         # No translation needed - text-embedding-3-large supports multilingual queries natively
         #
@@ -579,13 +615,14 @@ class RAGQueryProcessor:
 
         # Step 3: Route query with context-extracted entities (original language)
         step3_start = time.time()
-        route = self.query_router.route(
-            query=query_for_routing,  # ⚡ Use original language query (Phase 1B optimization)
-            user_id=tenant_id,
-            language=language,
-            preextracted_entities=preextracted_entities or extracted_entities,
-            override_domain=saved_domain,  # 🆕 Forcer domaine sauvegardé si clarification
-        )
+        with scheduler.timed("routing"):
+            route = self.query_router.route(
+                query=query_for_routing,  # ⚡ Use original language query (Phase 1B optimization)
+                user_id=tenant_id,
+                language=language,
+                preextracted_entities=preextracted_entities or extracted_entities,
+                override_domain=saved_domain,  # 🆕 Forcer domaine sauvegardé si clarification
+            )
         step3_duration = time.time() - step3_start
 
         logger.info(
@@ -605,10 +642,13 @@ class RAGQueryProcessor:
 
         # Step 4: Check for clarification needs
         if route.destination == "needs_clarification":
+            scheduler.cancel_speculative("needs_clarification")
+
             # Build clarification message
             clarification_result = self._build_clarification_result(
                 route, language, query=query, tenant_id=tenant_id
             )
+            clarification_result.metadata["stage_timings"] = scheduler.summary()
 
             # Mark clarification as pending in memory AND save exchange immediately
             if self.conversation_memory:
@@ -656,9 +696,10 @@ class RAGQueryProcessor:
 
         # Step 6: Route to appropriate handler
         step6_start = time.time()
-        result = await self._route_to_handler(
-            route, preprocessed_data, start_time, language
-        )
+        with scheduler.timed("handler"):
+            result = await self._route_to_handler(
+                route, preprocessed_data, start_time, language
+            )
         step6_duration = time.time() - step6_start
 
         # Step 6.5: 🆕 Try external sources if low confidence and system enabled
@@ -791,6 +832,11 @@ class RAGQueryProcessor:
                 logger.error(f"❌ External sources search failed: {e}", exc_info=True)
                 # Continue with original result (fail gracefully)
 
+        # Release the speculative embedding if the handler didn't consume it
+        stage_timings = scheduler.finish()
+        if isinstance(getattr(result, "metadata", None), dict):
+            result.metadata["stage_timings"] = stage_timings
+
         # Structured logging: Query completed
         structured_logger.info(
             "query_completed",
@@ -800,10 +846,32 @@ class RAGQueryProcessor:
             response_length=len(result.answer) if hasattr(result, "answer") else 0,
             handler_duration_ms=step6_duration * 1000,
             total_duration_ms=(time.time() - start_time) * 1000,
+            stage_timings=stage_timings["stages_ms"],
+            speculation=stage_timings["speculation"],
         )
 
         return result
 
+    def _start_speculative_embedding(self, scheduler: StageScheduler, query: str):
+        """
+        Embed the query speculatively while OOD/history/routing run
+
+        Retrieval embeds the original query (see StandardHandler), so the
+        vector is ready when WeaviateCore asks for it. Released by the
+        scheduler on early exit or if no handler consumed it.
+        """
+        prefetcher = self.embedding_prefetcher
+        if prefetcher is None or not hasattr(prefetcher, "prefetch_query_embedding"):
+            return
+
+        scheduler.start(
+            "embedding",
+            prefetcher.prefetch_query_embedding,
+            query,
+            speculative=True,
+            on_release=lambda: prefetcher.discard_query_embedding(query),
+        )
+
     async def _get_contextual_history(
         self, tenant_id: str, query: str
     ) -> Optional[str]:
@@ -216,6 +216,7 @@ class InteliaRAGEngine(InitializableMixin):
                     self.weaviate_core.weaviate_client if self.weaviate_core else None
                 ),
                 enable_external_sources=enable_external,
+                embedding_prefetcher=self.weaviate_core,
             )
 
             if enable_external:
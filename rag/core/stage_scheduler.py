@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+"""
+stage_scheduler.py - Dependency-aware stage scheduling for the query pipeline
+Version: 1.0.0
+Last modified: 2025-11-13
+"""
+"""
+stage_scheduler.py - Dependency-aware stage scheduling for the query pipeline
+
+Stages that do not depend on each other (LLM OOD verdict, contextual history,
+query embedding) run concurrently instead of back to back. Speculative stages
+start before the decision that makes them useful and are released when the
+request ends early (out of domain, clarification) or when nobody consumed
+their result. Every stage duration is recorded per request.
+"""
+
+import asyncio
+import inspect
+import logging
+import time
+from contextlib import contextmanager
+from utils.types import Any, Callable, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class StageScheduler:
+    """Runs the stages of one request and records their timings"""
+
+    def __init__(self, request_id: str):
+        self.request_id = request_id
+        self.timings: Dict[str, float] = {}
+        self.speculation: Dict[str, str] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._release: Dict[str, Optional[Callable[[], bool]]] = {}
+        self._created = time.time()
+
+    def start(
+        self,
+        name: str,
+        func: Callable,
+        *args,
+        depends_on: Iterable[str] = (),
+        speculative: bool = False,
+        in_thread: bool = False,
+        on_release: Optional[Callable[[], bool]] = None,
+    ) -> asyncio.Task:
+        """
+        Start a stage without waiting for it
+
+        Args:
+            name: Stage name (key of the timings)
+            func: Sync function, coroutine function, or function returning an
+                awaitable
+            depends_on: Stages that must complete before this one starts
+            speculative: Result may be thrown away (see cancel_speculative)
+            in_thread: Run a blocking sync function in a worker thread
+            on_release: Called when a speculative stage is released; returns
+                True if its result was still unused (i.e. wasted)
+
+        Returns:
+            The asyncio task running the stage
+        """
+        dependencies = [self._tasks[dependency] for dependency in depends_on]
+
+        async def run():
+            if dependencies:
+                await asyncio.gather(*dependencies)
+
+            started = time.time()
+            try:
+                if in_thread:
+                    return await asyncio.to_thread(func, *args)
+                result = func(*args)
+                if inspect.isawaitable(result):
+                    result = await result
+                return result
+            finally:
+                self.timings[name] = round((time.time() - started) * 1000, 2)
+
+        task = asyncio.ensure_future(run())
+        self._tasks[name] = task
+        if speculative:
+            self._release[name] = on_release
+            self.speculation[name] = "pending"
+        return task
+
+    async def result(self, name: str) -> Any:
+        """Wait for a stage and return its result (exceptions propagate)"""
+        return await self._tasks[name]
+
+    @contextmanager
+    def timed(self, name: str):
+        """Time a stage executed inline by the caller"""
+        started = time.time()
+        try:
+            yield
+        finally:
+            self.timings[name] = round((time.time() - started) * 1000, 2)
+
+    def cancel_speculative(self, reason: str) -> int:
+        """
+        Cancel every pending stage after an early exit
+
+        Speculative stages are released and marked cancelled; the other
+        stages still running are cancelled as their result is no longer
+        needed either.
+        """
+        cancelled = 0
+        for name, task in self._tasks.items():
+            if name in self._release:
+                if self.speculation[name] != "pending":
+                    continue
+                self._run_release(name)
+                self.speculation[name] = "cancelled"
+            if not task.done():
+                task.cancel()
+                cancelled += 1
+            self._consume(task)
+
+        if cancelled:
+            logger.debug(
+                f"Request {self.request_id}: {cancelled} stage(s) cancelled ({reason})"
+            )
+        return cancelled
+
+    def finish(self) -> Dict[str, Any]:
+        """
+        Release speculative stages once the request is answered
+
+        A speculative result still unused at this point was wasted work and
+        is cancelled if it is still running.
+
+        Returns:
+            Timing summary of the request (see summary)
+        """
+        for name, task in self._tasks.items():
+            if self.speculation.get(name) != "pending":
+                continue
+            if self._returned_none(task):
+                self.speculation[name] = "skipped"
+                continue
+            wasted = self._run_release(name)
+            self.speculation[name] = "wasted" if wasted else "used"
+            if wasted and not task.done():
+                task.cancel()
+            self._consume(task)
+
+        return self.summary()
+
+    def summary(self) -> Dict[str, Any]:
+        """Per-stage durations (ms) and outcome of the speculative stages"""
+        return {
+            "stages_ms": dict(self.timings),
+            "speculation": dict(self.speculation),
+            "elapsed_ms": round((time.time() - self._created) * 1000, 2),
+        }
+
+    def _run_release(self, name: str) -> bool:
+        release = self._release.get(name)
+        if release is None:
+            return False
+        try:
+            return bool(release())
+        except Exception as e:
+            logger.warning(f"Speculative stage '{name}' release failed: {e}")
+            return False
+
+    @staticmethod
+    def _returned_none(task: asyncio.Task) -> bool:
+        """Stage finished without starting anything (e.g. no embedder)"""
+        return (
+            task.done()
+            and not task.cancelled()
+            and task.exception() is None
+            and task.result() is None
+        )
+
+    @staticmethod
+    def _consume(task: asyncio.Task):
+        """Retrieve the outcome of a finished task so it is never reported"""
+        if task.done() and not task.cancelled():
+            task.exception()
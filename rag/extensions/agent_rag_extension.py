@@ -664,14 +664,10 @@ class InteliaAgentRAG(InitializableMixin):
                     len(sub_queries)
                 )
 
-                # 5. Traitement parallèle des sous-requêtes
+                # 5. Traitement parallèle des sous-requêtes (recherche batch)
                 agent_decisions.append("Traitement parallèle démarré")
-                sub_results = await asyncio.gather(
-                    *[
-                        self._process_sub_query(sub_q, language, tenant_id)
-                        for sub_q in sub_queries
-                    ],
-                    return_exceptions=True,
+                sub_results = await self._process_sub_queries(
+                    sub_queries, language, tenant_id
                 )
 
                 # Filtrer les exceptions
@@ -752,6 +748,82 @@ class InteliaAgentRAG(InitializableMixin):
                     agent_decisions=[f"Erreur système: {str(e)}"],
                 )
 
+    async def _process_sub_queries(
+        self, sub_queries: List[SubQuery], language: str, tenant_id: str
+    ) -> List[Any]:
+        """
+        Traite toutes les sous-requêtes en parallèle
+
+        Les sous-requêtes documentaires passent par une recherche batch
+        (WeaviateCore.generate_responses_batch): un seul appel d'embedding,
+        recherches Weaviate simultanées, rerank groupé. Les sous-requêtes
+        métriques gardent le routage complet (PostgreSQL), et une sous-requête
+        sans résultat batch retombe sur _process_sub_query.
+
+        Returns:
+            Un RAGResult (ou une exception) par sous-requête, dans l'ordre
+        """
+        weaviate_core = getattr(self.rag_engine, "weaviate_core", None)
+        batched = []
+        if weaviate_core and hasattr(weaviate_core, "generate_responses_batch"):
+            batched = [
+                i
+                for i, sub_q in enumerate(sub_queries)
+                if sub_q.intent_type != IntentType.METRIC_QUERY
+            ]
+        if len(batched) < 2:
+            batched = []
+
+        results: List[Any] = [None] * len(sub_queries)
+
+        async def run_routed(i):
+            try:
+                results[i] = await self._process_sub_query(
+                    sub_queries[i], language, tenant_id
+                )
+            except Exception as e:
+                results[i] = e
+
+        async def run_batch():
+            try:
+                batch_results = await weaviate_core.generate_responses_batch(
+                    [sub_queries[i].query for i in batched],
+                    language=language,
+                    tenant_id=tenant_id,
+                )
+            except Exception as e:
+                logger.error(f"Erreur recherche batch sous-requêtes: {e}")
+                batch_results = [None] * len(batched)
+
+            fallback = []
+            for i, result in zip(batched, batch_results):
+                if result is not None and result.source == RAGSource.RAG_SUCCESS:
+                    results[i] = self._tag_sub_result(result, sub_queries[i])
+                else:
+                    fallback.append(i)
+            await asyncio.gather(*(run_routed(i) for i in fallback))
+
+        routed = sorted(set(range(len(sub_queries))) - set(batched))
+        await asyncio.gather(
+            *([run_batch()] if batched else []),
+            *(run_routed(i) for i in routed),
+        )
+
+        return results
+
+    def _tag_sub_result(self, result: RAGResult, sub_query: SubQuery) -> RAGResult:
+        """Enrichit le résultat avec le contexte de la sous-requête"""
+        if result.metadata is None:
+            result.metadata = {}
+        result.metadata.update(
+            {
+                "sub_query_priority": sub_query.priority,
+                "sub_query_context": sub_query.context_needed,
+                "agent_processed": True,
+            }
+        )
+        return result
+
     async def _process_sub_query(
         self, sub_query: SubQuery, language: str, tenant_id: str
     ) -> RAGResult:
@@ -763,17 +835,7 @@ class InteliaAgentRAG(InitializableMixin):
             )
 
             # Enrichir avec le contexte de la sous-requête
-            if result.metadata is None:
-                result.metadata = {}
-            result.metadata.update(
-                {
-                    "sub_query_priority": sub_query.priority,
-                    "sub_query_context": sub_query.context_needed,
-                    "agent_processed": True,
-                }
-            )
-
-            return result
+            return self._tag_sub_result(result, sub_query)
 
         except Exception as e:
             logger.error(f"Erreur traitement sous-requête '{sub_query.query}': {e}")
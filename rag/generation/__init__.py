@@ -35,6 +35,7 @@ from .entity_manager import EntityDescriptionsManager, EntityEnrichmentBuilder
 from .language_handler import LanguageHandler
 from .prompt_builder import PromptBuilder
 from .post_processor import ResponsePostProcessor
+from .stream_post_processor import StreamingPostProcessor
 from .veterinary_handler import VeterinaryHandler
 from .document_utils import DocumentUtils
 
@@ -54,6 +55,7 @@ __all__ = [
     "LanguageHandler",
     "PromptBuilder",
     "ResponsePostProcessor",
+    "StreamingPostProcessor",
     "VeterinaryHandler",
     "DocumentUtils",
     # Legacy API (DEPRECATED but still available)
@@ -21,6 +21,7 @@ from enum import Enum
 from openai import AsyncOpenAI
 
 from generation.adaptive_length import get_adaptive_length
+from generation.stream_post_processor import StreamingPostProcessor
 
 logger = logging.getLogger(__name__)
 
@@ -479,8 +480,11 @@ class LLMRouter:
             elif provider == LLMProvider.DEEPSEEK:
                 logger.info("[STREAM] Using DeepSeek streaming")
                 yield {"event": "start", "provider": "deepseek"}
-                async for chunk in self._generate_deepseek_stream(
-                    messages, temperature, max_tokens
+                async for chunk in self._post_process_stream(
+                    self._generate_deepseek_stream(messages, temperature, max_tokens),
+                    query=query,
+                    context_docs=context_docs,
+                    language=language,
                 ):
                     yield {"event": "chunk", "content": chunk}
                 yield {"event": "end", "total_tokens": 0}
@@ -488,8 +492,11 @@ class LLMRouter:
             elif provider == LLMProvider.CLAUDE_35_SONNET:
                 logger.info("[STREAM] Using Claude 3.5 Sonnet streaming")
                 yield {"event": "start", "provider": "claude"}
-                async for chunk in self._generate_claude_stream(
-                    messages, temperature, max_tokens
+                async for chunk in self._post_process_stream(
+                    self._generate_claude_stream(messages, temperature, max_tokens),
+                    query=query,
+                    context_docs=context_docs,
+                    language=language,
                 ):
                     yield {"event": "chunk", "content": chunk}
                 yield {"event": "end", "total_tokens": 0}
@@ -497,8 +504,11 @@ class LLMRouter:
             elif provider == LLMProvider.GPT_4O:
                 logger.info("[STREAM] Using GPT-4o streaming")
                 yield {"event": "start", "provider": "gpt4o"}
-                async for chunk in self._generate_gpt4o_stream(
-                    messages, temperature, max_tokens
+                async for chunk in self._post_process_stream(
+                    self._generate_gpt4o_stream(messages, temperature, max_tokens),
+                    query=query,
+                    context_docs=context_docs,
+                    language=language,
                 ):
                     yield {"event": "chunk", "content": chunk}
                 yield {"event": "end", "total_tokens": 0}
@@ -527,6 +537,44 @@ class LLMRouter:
             logger.error(f"[ERROR] {provider.value} streaming failed: {e}")
             yield {"event": "error", "error": str(e)}
 
+    async def _post_process_stream(
+        self,
+        chunks: AsyncGenerator[str, None],
+        query: Optional[str],
+        context_docs: Optional[List[Dict]],
+        language: str,
+    ) -> AsyncGenerator[str, None]:
+        """
+        Apply response post-processing to a provider stream paragraph by paragraph
+
+        Without a query, chunks are forwarded unchanged.
+
+        Args:
+            chunks: Raw text chunks from the provider
+            query: User query (for veterinary disclaimer detection)
+            context_docs: Retrieved context documents
+            language: Response language
+
+        Yields:
+            Post-processed text chunks
+        """
+        if not query:
+            async for chunk in chunks:
+                yield chunk
+            return
+
+        stream_processor = StreamingPostProcessor(
+            query=query, context_docs=context_docs, language=language
+        )
+        async for chunk in chunks:
+            cleaned = stream_processor.feed(chunk)
+            if cleaned:
+                yield cleaned
+
+        tail = stream_processor.finish()
+        if tail:
+            yield tail
+
     async def _generate_intelia_llama_stream(
         self,
         messages: List[Dict],
@@ -1,14 +1,15 @@
 # -*- coding: utf-8 -*-
 """
 post_processor.py - Response post-processing utilities
-Version: 1.5.0
-Last modified: 2025-10-31
+Version: 1.6.0
+Last modified: 2026-10-18
 """
 """
 post_processor.py - Response post-processing utilities
 Extracted from generators.py for better modularity and maintainability
 
 CHANGELOG:
+- v1.6.0: Precompiled cleanup patterns, clean_formatting()/get_disclaimer() for streaming
 - v1.5.0: Added language detection from response for accurate disclaimer language
 """
 
@@ -22,6 +23,54 @@ from utils.language_detection import detect_language_enhanced
 logger = logging.getLogger(__name__)
 
 
+# ✅ IMPROVED FORMATTING CLEANUP - compiled once at import time
+# Passes that always match disjoint text are merged into a single alternation
+# (8 passes instead of 10, same output)
+_CLEANUP_PATTERNS = [
+    # 1+2. Remove markdown headers (##, ###, ...) and list numbers (1., 2., ...)
+    (re.compile(r"^(?=[#\d])(?:#{1,6}\s+)?(?:\d+\.\s+)?", re.MULTILINE), ""),
+    # 3. Clean orphan asterisks (lines with just ** or **)
+    (re.compile(r"^\*\*\s*$", re.MULTILINE), ""),
+    # 4. COMPLETELY REMOVE bold headers (**Title:** or **Title**)
+    # This rule replaces the old rules 3-5 that tried to "fix" headers
+    (re.compile(r"\*\*([^*]+?):\*\*\s*"), ""),
+    (re.compile(r"\*\*([^*]+?)\*\*\s*:"), ""),
+    # 5. Clean orphan colons on isolated lines
+    (re.compile(r"^\s*:\s*$", re.MULTILINE), ""),
+    # 6. Fix broken titles - join short lines (titles) that are split across multiple lines
+    # Pattern: Short line ending with lowercase + newline + lowercase start = broken title
+    # Example: "Standardisation des\nprocédures" -> "Standardisation des procédures"
+    (
+        re.compile(r"^([A-ZÀ-Ý][^\n]{5,60}[a-zà-ÿ])\n([a-zà-ÿ])", re.MULTILINE),
+        r"\1 \2",
+    ),
+    # 7+8. Clean multiple empty lines (3+ → 2) and remove trailing spaces
+    (
+        re.compile(r"\n{3,}| +$", re.MULTILINE),
+        lambda m: "\n\n" if m.group(0)[0] == "\n" else "",
+    ),
+    # 9. Ensure space after bullet points
+    (re.compile(r"^-([^ ])", re.MULTILINE), r"- \1"),
+]
+
+# 10. Remove LLM-generated disclaimers (they may be in wrong language)
+# Pattern: Lines with 📋, ⚠️, or "educational purposes" or "consult"
+# Patterns needing "educational purposes" later on the line depend on the
+# order they run in, so only the last two (plain prefix-to-end-of-line
+# patterns) are merged
+_LLM_DISCLAIMER_PATTERNS = [
+    re.compile(pattern, re.IGNORECASE | re.MULTILINE)
+    for pattern in (
+        r"📋[^\n]*educational purposes[^\n]*",
+        r"⚠️\s*IMPORTANT[^\n]*educational purposes[^\n]*",
+        r"\*\*Important\*\*[^\n]*educational purposes[^\n]*",
+        r"This information is (?:for|provided for) educational purposes[^\n]*",
+        r"(?:Ces informations sont fournies à titre éducatif"
+        r"|Consult(?:ez)? (?:a|un) (?:veterinarian|vétérinaire))[^\n]*",
+    )
+]
+
+
 class ResponsePostProcessor:
     """
     Post-processor for LLM-generated responses.
@@ -32,6 +81,59 @@ class ResponsePostProcessor:
     - Remove unwanted formatting artifacts
     """
 
+    @staticmethod
+    def clean_formatting(response: str) -> str:
+        """
+        Apply formatting cleanup and remove LLM-generated disclaimers
+
+        Args:
+            response: Stripped response, or a block cut at a safe boundary
+
+        Returns:
+            Cleaned text (not stripped)
+        """
+        for pattern, replacement in _CLEANUP_PATTERNS:
+            response = pattern.sub(replacement, response)
+
+        for pattern in _LLM_DISCLAIMER_PATTERNS:
+            response = pattern.sub("", response)
+
+        return response
+
+    @staticmethod
+    def get_disclaimer(query: str, context_docs: List[Dict], language: str = "fr") -> str:
+        """
+        Get the veterinary disclaimer to append for this query (may be empty)
+
+        CRITICAL: Detect language from the QUERY (user's question), not response
+
+        Args:
+            query: Original user question
+            context_docs: Context documents used for generation
+            language: User's configured language (fallback only)
+
+        Returns:
+            Disclaimer text including its leading spacing, or ""
+        """
+        if not query or not VeterinaryHandler.is_veterinary_query(query, context_docs):
+            return ""
+
+        # Detect language from the user's QUESTION (not the response)
+        # This ensures the disclaimer matches the user's language context
+        try:
+            detection_result = detect_language_enhanced(query)
+            detected_lang = detection_result.get("language", language) if detection_result else language
+            logger.info(f"🌍 Query language detected for disclaimer: {detected_lang} (user config: {language})")
+        except Exception as e:
+            logger.warning(f"⚠️ Language detection failed, using user config: {e}")
+            detected_lang = language
+
+        # Get disclaimer in the detected query language
+        disclaimer = VeterinaryHandler.get_veterinary_disclaimer(detected_lang)
+        if disclaimer:  # Only if disclaimer is not empty
+            logger.info(f"🏥 Veterinary disclaimer added (query language: {detected_lang})")
+        return disclaimer or ""
+
     @staticmethod
     def post_process_response(
         response: str,
@@ -55,6 +157,9 @@ class ResponsePostProcessor:
         that if the LLM responds in French, the disclaimer will be in French, even
         if the user's interface is set to English.
 
+        For streamed responses, see StreamingPostProcessor which applies the
+        same passes paragraph by paragraph.
+
         Args:
             response: Response generated by the LLM
             enrichment: Context enrichment data (ContextEnrichment object)
@@ -71,80 +176,12 @@ class ResponsePostProcessor:
             >>> processor.post_process_response(response, None, [], "", "en")
             'Some text\\n\\n- First item\\n- Second item'
         """
-        response = response.strip()
-
-        # ✅ IMPROVED FORMATTING CLEANUP
-
-        # 1. Remove markdown headers (##, ###, ####, etc.) - converts "## Title" to "Title"
-        response = re.sub(r"^#{1,6}\s+", "", response, flags=re.MULTILINE)
-
-        # 2. Remove list numbers (1., 2., etc.)
-        response = re.sub(r"^\d+\.\s+", "", response, flags=re.MULTILINE)
-
-        # 3. Clean orphan asterisks (lines with just ** or **)
-        response = re.sub(r"^\*\*\s*$", "", response, flags=re.MULTILINE)
-
-        # 4. COMPLETELY REMOVE bold headers (**Title:** or **Title**)
-        # This rule replaces the old rules 3-5 that tried to "fix" headers
-        response = re.sub(r"\*\*([^*]+?):\*\*\s*", "", response)
-        response = re.sub(r"\*\*([^*]+?)\*\*\s*:", "", response)
-
-        # 5. Clean orphan colons on isolated lines
-        response = re.sub(r"^\s*:\s*$", "", response, flags=re.MULTILINE)
-
-        # 6. Fix broken titles - join short lines (titles) that are split across multiple lines
-        # Pattern: Short line ending with lowercase + newline + lowercase start = broken title
-        # Example: "Standardisation des\nprocédures" -> "Standardisation des procédures"
-        response = re.sub(
-            r"^([A-ZÀ-Ý][^\n]{5,60}[a-zà-ÿ])\n([a-zà-ÿ])",
-            r"\1 \2",
-            response,
-            flags=re.MULTILINE,
-        )
-
-        # 7. Clean multiple empty lines (3+ → 2)
-        response = re.sub(r"\n{3,}", "\n\n", response)
-
-        # 8. Remove trailing spaces
-        response = re.sub(r" +$", "", response, flags=re.MULTILINE)
-
-        # 9. Ensure space after bullet points
-        response = re.sub(r"^-([^ ])", r"- \1", response, flags=re.MULTILINE)
-
-        # 10. Remove LLM-generated disclaimers (they may be in wrong language)
-        # Pattern: Lines with 📋, ⚠️, or "educational purposes" or "consult"
-        llm_disclaimer_patterns = [
-            r"📋[^\n]*educational purposes[^\n]*",
-            r"⚠️\s*IMPORTANT[^\n]*educational purposes[^\n]*",
-            r"\*\*Important\*\*[^\n]*educational purposes[^\n]*",
-            r"This information is (for|provided for) educational purposes[^\n]*",
-            r"Ces informations sont fournies à titre éducatif[^\n]*",
-            r"Consult(ez)? (a|un) (veterinarian|vétérinaire)[^\n]*",
-        ]
-
-        for pattern in llm_disclaimer_patterns:
-            response = re.sub(pattern, "", response, flags=re.IGNORECASE | re.MULTILINE)
+        response = ResponsePostProcessor.clean_formatting(response.strip())
 
         # Clean up any trailing newlines left by disclaimer removal
         response = response.strip()
 
         # Add veterinary disclaimer if the question concerns health/disease
-        # CRITICAL: Detect language from the QUERY (user's question), not response
-        if query and VeterinaryHandler.is_veterinary_query(query, context_docs):
-            # Detect language from the user's QUESTION (not the response)
-            # This ensures the disclaimer matches the user's language context
-            try:
-                detection_result = detect_language_enhanced(query)
-                detected_lang = detection_result.get("language", language) if detection_result else language
-                logger.info(f"🌍 Query language detected for disclaimer: {detected_lang} (user config: {language})")
-            except Exception as e:
-                logger.warning(f"⚠️ Language detection failed, using user config: {e}")
-                detected_lang = language
-
-            # Get disclaimer in the detected query language
-            disclaimer = VeterinaryHandler.get_veterinary_disclaimer(detected_lang)
-            if disclaimer:  # Only if disclaimer is not empty
-                response = response + disclaimer
-                logger.info(f"🏥 Veterinary disclaimer added (query language: {detected_lang})")
-
-        return response
+        return response + ResponsePostProcessor.get_disclaimer(
+            query, context_docs, language
+        )
@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+"""
+stream_post_processor.py - Incremental post-processing for streamed responses
+Version: 1.0.0
+Last modified: 2026-10-18
+"""
+"""
+stream_post_processor.py - Incremental post-processing for streamed responses
+
+Applies ResponsePostProcessor cleanup, LLM-disclaimer removal and the
+veterinary disclaimer chunk by chunk, so streamed answers from DeepSeek,
+Claude and GPT-4o get the same text as non-streamed answers without waiting
+for the full response.
+
+Text is buffered until a safe boundary is seen: a blank line followed by the
+first character of the next paragraph (bounded lookahead). Every cleanup pass
+is line-local except a few that can consume trailing whitespace or join two
+lines; the boundary rules below exclude exactly those cases, so cleaning
+block by block produces the same text as cleaning the full response.
+"""
+
+import logging
+import re
+from typing import Dict, List, Optional
+
+from .post_processor import ResponsePostProcessor
+
+logger = logging.getLogger(__name__)
+
+# Whitespace run containing at least one blank line, followed by content
+_PARAGRAPH_BOUNDARY = re.compile(r"\s*\n\s*\n\s*(?=\S)")
+
+# Last line of a block that the header/list-number pass could extend over the boundary
+_BARE_LIST_NUMBER = re.compile(r"\s*(?:#{1,6}\s+)?\d+\.")
+
+# Characters that can safely end a block (cleanup passes never consume the
+# whitespace that follows them)
+_SAFE_BLOCK_END = set(".!?)]\"'»%")
+
+
+def _is_safe_boundary(text: str, start: int, end: int, final: bool = False) -> bool:
+    """
+    Check whether text can be cut at a paragraph boundary
+
+    Args:
+        text: Buffered text
+        start: Start of the whitespace run (end of the emitted block)
+        end: End of the whitespace run (start of the next paragraph)
+        final: Skip the bold-marker lookahead (used when forcing a cut)
+
+    Returns:
+        True if cleaning text[:start] and text[start:] separately gives the
+        same result as cleaning text
+    """
+    if start == 0:
+        return False
+
+    # Next paragraph must start with a letter (no header, list, bold or colon)
+    if not text[end].isalpha():
+        return False
+
+    # Block must not end with a marker whose pattern consumes trailing whitespace
+    last_char = text[start - 1]
+    if not (last_char.isalnum() or last_char in _SAFE_BLOCK_END):
+        return False
+    if last_char == ".":
+        line_start = text.rfind("\n", 0, start) + 1
+        if _BARE_LIST_NUMBER.fullmatch(text, line_start, start):
+            return False
+
+    if final:
+        return True
+
+    # Bold-header passes ("**...:**") may span paragraphs when a "**" before
+    # the boundary is followed by star-free text up to a closing "**" after it
+    last_star = text.rfind("*", 0, start)
+    if last_star > 0 and text[last_star - 1] == "*":
+        next_star = text.find("*", end)
+        if next_star == -1 or text[next_star + 1 : next_star + 2] in ("*", ""):
+            return False
+
+    return True
+
+
+def find_safe_cut(text: str, force: bool = False) -> int:
+    """
+    Find the last position where the buffered text can be cut
+
+    Args:
+        text: Buffered text
+        force: Accept the last paragraph boundary even if a bold marker is
+            still open (used when the buffer exceeds its lookahead budget)
+
+    Returns:
+        Cut position (0 if no safe boundary was found)
+    """
+    cut = 0
+    for match in _PARAGRAPH_BOUNDARY.finditer(text):
+        if _is_safe_boundary(text, match.start(), match.end(), final=force):
+            # Keep spaces before the first newline with the block: LLM
+            # disclaimer removal ("...[^\n]*") consumes them
+            cut = text.index("\n", match.start())
+    return cut
+
+
+class StreamingPostProcessor:
+    """
+    Chunk-by-chunk equivalent of ResponsePostProcessor.post_process_response
+
+    Usage:
+        stream_processor = StreamingPostProcessor(query, context_docs, language)
+        async for chunk in llm_chunks:
+            cleaned = stream_processor.feed(chunk)
+            if cleaned:
+                yield cleaned
+        yield stream_processor.finish()
+    """
+
+    def __init__(
+        self,
+        query: str = "",
+        context_docs: Optional[List[Dict]] = None,
+        language: str = "fr",
+        max_buffer_chars: int = 4000,
+    ) -> None:
+        """
+        Initialize streaming post-processor
+
+        Args:
+            query: Original user question
+            context_docs: Context documents used for generation
+            language: User's configured language (fallback only)
+            max_buffer_chars: Lookahead budget before a cut is forced
+        """
+        self.query = query
+        self.context_docs = context_docs or []
+        self.language = language
+        self.max_buffer_chars = max_buffer_chars
+
+        self._buffer = ""
+        self._started = False
+        # Trailing whitespace of emitted text is held back: the batch
+        # post-processor strips the response after disclaimer removal
+        self._pending_whitespace = ""
+        self._has_output = False
+
+    def feed(self, chunk: str) -> str:
+        """
+        Add a raw chunk and return the post-processed text that became final
+
+        Args:
+            chunk: Raw text chunk from the LLM
+
+        Returns:
+            Cleaned text to stream (may be empty while buffering)
+        """
+        if not chunk:
+            return ""
+
+        if not self._started:
+            chunk = chunk.lstrip()
+            if not chunk:
+                return ""
+            self._started = True
+
+        self._buffer += chunk
+
+        cut = find_safe_cut(self._buffer)
+        if not cut and len(self._buffer) > self.max_buffer_chars:
+            cut = find_safe_cut(self._buffer, force=True)
+        if not cut:
+            return ""
+
+        block, self._buffer = self._buffer[:cut], self._buffer[cut:]
+        return self._emit(ResponsePostProcessor.clean_formatting(block))
+
+    def finish(self) -> str:
+        """
+        Flush the buffer and append the veterinary disclaimer
+
+        Returns:
+            Remaining text to stream
+        """
+        tail = ""
+        if self._buffer:
+            tail = self._emit(
+                ResponsePostProcessor.clean_formatting(self._buffer.rstrip())
+            )
+        self._buffer = ""
+        self._pending_whitespace = ""
+
+        return tail + ResponsePostProcessor.get_disclaimer(
+            self.query, self.context_docs, self.language
+        )
+
+    def _emit(self, cleaned: str) -> str:
+        """Return cleaned text, deferring trailing and leading whitespace"""
+        body = cleaned.rstrip()
+        if not body:
+            self._pending_whitespace += cleaned
+            return ""
+
+        if self._has_output:
+            text = self._pending_whitespace + body
+        else:
+            text = body.lstrip()
+            self._has_output = True
+
+        self._pending_whitespace = cleaned[len(body) :]
+        return text
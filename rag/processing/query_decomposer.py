@@ -415,6 +415,53 @@ class QueryDecomposer:
 
         return results
 
+    async def execute_subqueries_batch(
+        self, sub_queries: List[SubQuery], batch_executor_fn
+    ) -> List[Dict[str, Any]]:
+        """
+        Execute all sub-queries in one batch call
+
+        Unlike execute_subqueries, the executor receives every query at once,
+        so it can embed them in one call and search/rerank them together.
+
+        Args:
+            sub_queries: List of sub-queries to execute
+            batch_executor_fn: Async function accepting (queries: List[str]) and
+                              returning one Dict[str, Any] (or exception) per query
+
+        Returns:
+            List of results, one per sub-query
+        """
+        logger.info(f"Executing {len(sub_queries)} sub-queries as one batch")
+
+        queries = [sub_query.query for sub_query in sub_queries]
+        try:
+            batch_results = list(await batch_executor_fn(queries))
+            if len(batch_results) != len(sub_queries):
+                raise ValueError(
+                    f"Batch executor returned {len(batch_results)} results "
+                    f"for {len(sub_queries)} sub-queries"
+                )
+        except Exception as e:
+            logger.error(f"Error executing sub-query batch: {e}")
+            batch_results = [e] * len(sub_queries)
+
+        results = []
+        for idx, (sub_query, result) in enumerate(zip(sub_queries, batch_results)):
+            if isinstance(result, Exception):
+                logger.error(f"Error executing sub-query {idx+1}: {result}")
+                result = {"error": str(result), "sub_query": sub_query.query}
+
+            result["sub_query_context"] = sub_query.context
+            result["sub_query_index"] = idx
+            results.append(result)
+
+        logger.info(
+            f"Executed {len(results)} sub-queries ({len([r for r in results if 'error' not in r])} successful)"
+        )
+
+        return results
+
     def aggregate_results(
         self, results: List[Dict[str, Any]], strategy: str, original_query: str
     ) -> Dict[str, Any]:
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""
+adaptive_depth.py - Profondeur de recherche adaptative (top_k dynamique)
+Version: 1.0.0
+Last modified: 2025-11-13
+"""
+"""
+adaptive_depth.py - Profondeur de recherche adaptative (top_k dynamique)
+
+La recherche hybride ramène RAG_SIMILARITY_TOP_K candidats (x2 par jambe en
+RRF intelligent) et les envoie tous au reranker, même quand les premiers
+résultats sont sans ambiguïté. En mode adaptatif, une première passe se
+limite à ADAPTIVE_DEPTH_INITIAL_K candidats; elle n'est élargie à la
+profondeur complète que si les signaux de confiance sont faibles:
+
+- score du reranker (si les documents ont été rerankés): meilleur score
+  sous ADAPTIVE_DEPTH_MIN_RERANK_SCORE -> élargir
+- confiance WeaviateCore._calculate_confidence et pertinence
+  IntelligentRRFFusion._calculate_relevance_score des candidats
+- écart relatif entre le 1er et le 5e score: un gagnant net suffit
+"""
+
+import logging
+from dataclasses import dataclass, field
+from utils.types import Dict, List, Optional
+
+from core.data_models import Document
+
+logger = logging.getLogger(__name__)
+
+# Rang du score comparé au meilleur pour l'écart relatif
+GAP_RANK = 5
+
+
+@dataclass
+class DepthDecision:
+    """Décision de profondeur pour une recherche"""
+
+    expand: bool
+    reason: str
+    depth: int
+    signals: Dict[str, Optional[float]] = field(default_factory=dict)
+
+    @property
+    def label(self) -> str:
+        return "expanded" if self.expand else "shallow"
+
+
+class AdaptiveDepthPolicy:
+    """Choisit entre la passe courte et la profondeur complète"""
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        initial_top_k: int = 20,
+        min_confidence: float = 0.7,
+        min_relevance: float = 0.06,
+        min_score_gap: float = 0.25,
+        min_rerank_score: float = 0.5,
+    ):
+        self.enabled = enabled
+        self.initial_top_k = initial_top_k
+        self.min_confidence = min_confidence
+        self.min_relevance = min_relevance
+        self.min_score_gap = min_score_gap
+        self.min_rerank_score = min_rerank_score
+
+    def initial_depth(self, top_k: int) -> int:
+        """Profondeur de la première passe"""
+        if not self.enabled or self.initial_top_k <= 0:
+            return top_k
+        return min(top_k, self.initial_top_k)
+
+    def decide(
+        self,
+        documents: List[Document],
+        depth: int,
+        confidence: float,
+        relevance: Optional[float] = None,
+    ) -> DepthDecision:
+        """
+        Évalue les candidats de la passe courte
+
+        Args:
+            documents: Candidats triés par score décroissant
+            depth: Profondeur de la passe courte
+            confidence: Confiance calculée sur les candidats
+            relevance: Pertinence RRF des candidats (None si RRF inactif)
+
+        Returns:
+            DepthDecision (expand=True: relancer à la profondeur complète)
+        """
+        scores = [doc.score for doc in documents]
+        rerank_scores = [
+            doc.metadata["rerank_score"]
+            for doc in documents
+            if doc.metadata.get("rerank_score") is not None
+        ]
+        signals = {
+            "confidence": round(confidence, 4),
+            "relevance": round(relevance, 4) if relevance is not None else None,
+            "score_gap": round(self.score_gap(scores), 4),
+            "top_rerank_score": round(max(rerank_scores), 4) if rerank_scores else None,
+        }
+
+        def decision(expand: bool, reason: str) -> DepthDecision:
+            return DepthDecision(expand, reason, depth, signals)
+
+        if not documents:
+            return decision(True, "no_candidates")
+
+        if rerank_scores and max(rerank_scores) < self.min_rerank_score:
+            return decision(True, "low_rerank_score")
+
+        relevant = relevance is None or relevance >= self.min_relevance
+        if confidence >= self.min_confidence and relevant:
+            return decision(False, "confident")
+
+        if signals["score_gap"] >= self.min_score_gap:
+            return decision(False, "clear_winner")
+
+        return decision(True, "low_confidence")
+
+    @staticmethod
+    def score_gap(scores: List[float]) -> float:
+        """Écart relatif entre le meilleur score et celui du rang GAP_RANK"""
+        if len(scores) < 2:
+            return 0.0
+        ordered = sorted(scores, reverse=True)
+        top = ordered[0]
+        if top <= 0:
+            return 0.0
+        return (top - ordered[min(GAP_RANK, len(ordered)) - 1]) / top
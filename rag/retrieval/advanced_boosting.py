@@ -2,10 +2,18 @@
 """
 Advanced Result Boosting for RAG System
 Implements quality-score boosting and entity-based filtering/boosting
+
+Breed matching reads the breed_mentions feature precomputed at ingestion
+(normalized names) when the result carries it, else the extracted breeds.
 """
 
 import logging
 from typing import List, Dict, Optional, Any
+
+import numpy as np
+
+from retrieval.fusion_engine import normalize_breed
+
 from utils.types import List as TypeList, Dict as TypeDict
 
 logger = logging.getLogger(__name__)
@@ -149,98 +157,78 @@ class AdvancedResultBoosting:
         elif query_entities is None:
             query_entities = {"breeds": [], "diseases": [], "medications": []}
 
-        boosted_results = []
-
-        for result in results:
-            original_score = result.get('score', 0.0)
-            boosted_score = original_score
-            boost_factors = []
-
-            # Get result metadata
-            metadata = result.get('metadata', {}) or {}
+        n = len(results)
+        original_scores = np.array([r.get('score', 0.0) or 0.0 for r in results], dtype=float)
+        metadatas = [r.get('metadata', {}) or {} for r in results]
+        boost_factors = [[] for _ in range(n)]
+        multipliers = np.ones(n)
+
+        # 1. Quality Score Boosting: score * (1 + quality * weight)
+        if self.enable_quality:
+            qualities = [
+                result.get('quality_score') or metadata.get('quality_score', 0.5)
+                for result, metadata in zip(results, metadatas)
+            ]
+            has_quality = np.array([q is not None for q in qualities])
+            quality_factors = np.where(
+                has_quality,
+                1 + np.array([q or 0.0 for q in qualities], dtype=float) * self.quality_boost_weight,
+                1.0
+            )
+            multipliers *= quality_factors
+            for i in np.flatnonzero(has_quality):
+                boost_factors[i].append(f"quality={quality_factors[i]:.3f}")
+
+        # 2. Entity-Based Boosting (query entities normalized once)
+        if self.enable_entity and query_entities:
+            for field, multiplier in (
+                ('breeds', self.breed_boost),
+                ('diseases', self.disease_boost),
+                ('medications', self.medication_boost),
+            ):
+                query_values = _query_values(field, query_entities.get(field))
+                if not query_values:
+                    continue
+
+                matches = np.fromiter(
+                    (
+                        _entity_match(_result_values(field, result, metadata), query_values)
+                        for result, metadata in zip(results, metadatas)
+                    ),
+                    bool,
+                    n
+                )
+                multipliers *= np.where(matches, multiplier, 1.0)
+                label = _BOOST_LABELS[field]
+                for i in np.flatnonzero(matches):
+                    boost_factors[i].append(f"{label}={multiplier}x")
+
+        boosted_scores = original_scores * multipliers
+        ratios = np.divide(
+            boosted_scores, original_scores,
+            out=np.ones(n), where=original_scores > 0
+        )
 
-            # 1. Quality Score Boosting
-            if self.enable_quality:
-                quality_score = result.get('quality_score') or metadata.get('quality_score', 0.5)
-
-                if quality_score is not None:
-                    # Apply quality boost: score * (1 + quality * weight)
-                    quality_boost_factor = 1 + (quality_score * self.quality_boost_weight)
-                    boosted_score *= quality_boost_factor
-                    boost_factors.append(f"quality={quality_boost_factor:.3f}")
-
-            # 2. Entity-Based Boosting
-            if self.enable_entity and query_entities:
-
-                # Breed matching
-                if query_entities.get('breeds'):
-                    result_breeds = result.get('breeds', []) or metadata.get('breeds', []) or []
-                    # Normalize for comparison
-                    result_breeds_lower = [b.lower() if b else '' for b in result_breeds]
-                    query_breeds_lower = [b.lower() if b else '' for b in query_entities['breeds']]
-
-                    # Check for any match (exact or partial)
-                    breed_match = any(
-                        any(qb in rb or rb in qb for rb in result_breeds_lower if rb)
-                        for qb in query_breeds_lower if qb
-                    )
-
-                    if breed_match:
-                        boosted_score *= self.breed_boost
-                        boost_factors.append(f"breed={self.breed_boost}x")
-
-                # Disease matching
-                if query_entities.get('diseases'):
-                    result_diseases = result.get('diseases', []) or metadata.get('diseases', []) or []
-                    result_diseases_lower = [d.lower() if d else '' for d in result_diseases]
-                    query_diseases_lower = [d.lower() if d else '' for d in query_entities['diseases']]
-
-                    disease_match = any(
-                        any(qd in rd or rd in qd for rd in result_diseases_lower if rd)
-                        for qd in query_diseases_lower if qd
-                    )
-
-                    if disease_match:
-                        boosted_score *= self.disease_boost
-                        boost_factors.append(f"disease={self.disease_boost}x")
-
-                # Medication matching
-                if query_entities.get('medications'):
-                    result_meds = result.get('medications', []) or metadata.get('medications', []) or []
-                    result_meds_lower = [m.lower() if m else '' for m in result_meds]
-                    query_meds_lower = [m.lower() if m else '' for m in query_entities['medications']]
-
-                    med_match = any(
-                        any(qm in rm or rm in qm for rm in result_meds_lower if rm)
-                        for qm in query_meds_lower if qm
-                    )
-
-                    if med_match:
-                        boosted_score *= self.medication_boost
-                        boost_factors.append(f"medication={self.medication_boost}x")
-
-            # Create boosted result
-            boosted_result = result.copy()
-            boosted_result['original_score'] = original_score
-            boosted_result['boosted_score'] = boosted_score
-            boosted_result['boost_factor'] = boosted_score / original_score if original_score > 0 else 1.0
-            boosted_result['boost_details'] = ' + '.join(boost_factors) if boost_factors else 'none'
+        # Re-sort by boosted score (stable, like list.sort)
+        boosted_results = []
+        for i in np.argsort(-boosted_scores, kind="stable"):
+            boosted_result = results[i].copy()
+            boosted_result['original_score'] = results[i].get('score', 0.0)
+            boosted_result['boosted_score'] = float(boosted_scores[i])
+            boosted_result['boost_factor'] = float(ratios[i])
+            boosted_result['boost_details'] = ' + '.join(boost_factors[i]) if boost_factors[i] else 'none'
 
             # Update the score field
-            boosted_result['score'] = boosted_score
+            boosted_result['score'] = float(boosted_scores[i])
 
             boosted_results.append(boosted_result)
 
-        # Re-sort by boosted score
-        boosted_results.sort(key=lambda x: x['boosted_score'], reverse=True)
-
         # Log boosting summary
-        if any(r['boost_factor'] > 1.0 for r in boosted_results):
-            boosted_count = sum(1 for r in boosted_results if r['boost_factor'] > 1.0)
-            max_boost = max(r['boost_factor'] for r in boosted_results)
+        boosted_count = int(np.count_nonzero(ratios > 1.0))
+        if boosted_count:
             logger.debug(
                 f"Boosted {boosted_count}/{len(boosted_results)} results "
-                f"(max boost: {max_boost:.2f}x)"
+                f"(max boost: {ratios.max():.2f}x)"
             )
 
         return boosted_results
@@ -269,59 +257,25 @@ class AdvancedResultBoosting:
         if not any([breeds, diseases, medications]):
             return results  # No filters specified
 
-        filtered = []
+        criteria = [
+            (field, _query_values(field, values))
+            for field, values in (
+                ('breeds', breeds),
+                ('diseases', diseases),
+                ('medications', medications),
+            )
+            if values
+        ]
+        require = all if strict_mode else any
 
+        filtered = []
         for result in results:
             metadata = result.get('metadata', {}) or {}
-
-            # Get entity lists from result
-            result_breeds = result.get('breeds', []) or metadata.get('breeds', []) or []
-            result_diseases = result.get('diseases', []) or metadata.get('diseases', []) or []
-            result_meds = result.get('medications', []) or metadata.get('medications', []) or []
-
-            # Normalize for comparison
-            result_breeds_lower = [b.lower() for b in result_breeds if b]
-            result_diseases_lower = [d.lower() for d in result_diseases if d]
-            result_meds_lower = [m.lower() for m in result_meds if m]
-
-            matches = []
-
-            # Check breed filter
-            if breeds:
-                breeds_lower = [b.lower() for b in breeds if b]
-                breed_match = any(
-                    any(qb in rb or rb in qb for rb in result_breeds_lower)
-                    for qb in breeds_lower
-                )
-                matches.append(breed_match)
-
-            # Check disease filter
-            if diseases:
-                diseases_lower = [d.lower() for d in diseases if d]
-                disease_match = any(
-                    any(qd in rd or rd in qd for rd in result_diseases_lower)
-                    for qd in diseases_lower
-                )
-                matches.append(disease_match)
-
-            # Check medication filter
-            if medications:
-                meds_lower = [m.lower() for m in medications if m]
-                med_match = any(
-                    any(qm in rm or rm in qm for rm in result_meds_lower)
-                    for qm in meds_lower
-                )
-                matches.append(med_match)
-
-            # Apply filter logic
-            if strict_mode:
-                # Require ALL matches
-                if all(matches):
-                    filtered.append(result)
-            else:
-                # Require ANY match
-                if any(matches):
-                    filtered.append(result)
+            if require(
+                _entity_match(_result_values(field, result, metadata), query_values)
+                for field, query_values in criteria
+            ):
+                filtered.append(result)
 
         logger.debug(
             f"Entity filtering: {len(results)} -> {len(filtered)} results "
@@ -347,6 +301,38 @@ class AdvancedResultBoosting:
         }
 
 
+_BOOST_LABELS = {"breeds": "breed", "diseases": "disease", "medications": "medication"}
+
+
+def _lower_values(values: Optional[List[str]]) -> List[str]:
+    """Lowercased non-empty entity values."""
+    return [v.lower() for v in values or [] if v]
+
+
+def _query_values(field: str, values: Optional[List[str]]) -> List[str]:
+    """Query entity values in the form stored on results."""
+    if field == 'breeds':
+        return [normalize_breed(v) for v in values or [] if v]
+    return _lower_values(values)
+
+
+def _result_values(field: str, result: Dict, metadata: Dict) -> List[str]:
+    """Entity values of a result (precomputed breed_mentions when available)."""
+    if field == 'breeds':
+        mentions = metadata.get('breed_mentions')
+        if mentions is None:
+            mentions = result.get('breed_mentions')
+        if mentions is not None:
+            return list(mentions)  # Already normalized at ingestion
+        return [normalize_breed(b) for b in result.get('breeds', []) or metadata.get('breeds', []) or [] if b]
+    return _lower_values(result.get(field, []) or metadata.get(field, []))
+
+
+def _entity_match(result_values: List[str], query_values: List[str]) -> bool:
+    """Any match (exact or partial) between result and query entities."""
+    return any(qv in rv or rv in qv for qv in query_values for rv in result_values)
+
+
 # Convenience function for easy import
 def create_advanced_booster(**kwargs) -> AdvancedResultBoosting:
     """Factory function to create AdvancedResultBoosting instance."""
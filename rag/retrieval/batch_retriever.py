@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+"""
+batch_retriever.py - Recherche batch multi-requêtes
+Version: 1.0.0
+Last modified: 2025-11-09
+"""
+"""
+batch_retriever.py - Recherche batch multi-requêtes
+
+Pour les requêtes décomposées (agent RAG) et comparatives:
+- un seul appel embed_documents pour toutes les sous-requêtes
+- recherches Weaviate lancées ensemble (asyncio.gather)
+- un seul rerank groupé (CohereReranker.rerank_many)
+
+La latence d'un lot suit la sous-requête la plus lente au lieu de la somme
+des sous-requêtes.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from utils.types import Any, Dict, List, Optional, Union
+
+from core.data_models import Document
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BatchQuery:
+    """Sous-requête d'un lot de recherche"""
+
+    query: str
+    search_text: Optional[str] = None  # Texte recherché (défaut: query)
+    intent_result: Any = None
+    where_filter: Optional[Dict] = None
+    alpha: Optional[float] = None
+
+    @property
+    def text(self) -> str:
+        return self.search_text or self.query
+
+
+class MultiQueryRetriever:
+    """
+    Recherche de plusieurs requêtes en un lot
+
+    Usage:
+        batch = MultiQueryRetriever(embedder, retriever, reranker)
+        documents = await batch.search_many(["poids ross 308", "poids cobb 500"])
+        # documents[i]: List[Document] de la requête i
+    """
+
+    def __init__(self, embedder, retriever, reranker=None, rerank_top_n: int = 10):
+        """
+        Args:
+            embedder: OpenAIEmbedder (embed_documents)
+            retriever: HybridWeaviateRetriever (adaptive_search)
+            reranker: CohereReranker optionnel (rerank_many)
+            rerank_top_n: Documents conservés par requête après rerank
+        """
+        self.embedder = embedder
+        self.retriever = retriever
+        self.reranker = reranker
+        self.rerank_top_n = rerank_top_n
+
+        self.stats = {
+            "batches": 0,
+            "queries": 0,
+            "embedding_calls": 0,
+            "embedding_failures": 0,
+            "search_errors": 0,
+            "rerank_batches": 0,
+            "total_duration": 0.0,
+        }
+
+    async def search_many(
+        self,
+        queries: List[Union[str, BatchQuery]],
+        top_k: int = 15,
+        min_score: float = 0.0,
+        filters: Dict[str, Any] = None,
+    ) -> List[List[Document]]:
+        """
+        Recherche toutes les requêtes du lot
+
+        Args:
+            queries: Requêtes (str ou BatchQuery)
+            top_k: Nombre de documents recherchés par requête
+            min_score: Seuil de score appliqué avant rerank
+            filters: Filtres additionnels communs (ex: {'species': 'broiler'})
+
+        Returns:
+            Une liste de Documents par requête, dans l'ordre d'entrée
+            (liste vide pour une requête en échec)
+        """
+        if not queries:
+            return []
+
+        start = time.perf_counter()
+        batch = [
+            q if isinstance(q, BatchQuery) else BatchQuery(query=q) for q in queries
+        ]
+        self.stats["batches"] += 1
+        self.stats["queries"] += len(batch)
+
+        # 1. Un seul appel d'embedding (textes identiques dédoublonnés)
+        texts = list(dict.fromkeys(q.text for q in batch))
+        vectors = await self.embedder.embed_documents(texts)
+        self.stats["embedding_calls"] += 1
+
+        if not vectors or len(vectors) != len(texts):
+            self.stats["embedding_failures"] += 1
+            logger.error(
+                f"Embedding batch échoué: {len(vectors or [])}/{len(texts)} vecteurs"
+            )
+            return [[] for _ in batch]
+
+        vector_by_text = dict(zip(texts, vectors))
+
+        # 2. Recherches Weaviate lancées ensemble
+        searches = await asyncio.gather(
+            *(
+                self.retriever.adaptive_search(
+                    query_vector=vector_by_text[q.text],
+                    query_text=q.text,
+                    top_k=top_k,
+                    intent_result=q.intent_result,
+                    where_filter=q.where_filter,
+                    alpha=q.alpha,
+                    filters=filters,
+                )
+                for q in batch
+            ),
+            return_exceptions=True,
+        )
+
+        documents = []
+        for q, result in zip(batch, searches):
+            if isinstance(result, Exception):
+                self.stats["search_errors"] += 1
+                logger.error(
+                    f"Recherche batch échouée pour '{q.query[:50]}': {result}"
+                )
+                documents.append([])
+            else:
+                documents.append([doc for doc in result if doc.score >= min_score])
+
+        # 3. Rerank groupé
+        if self.reranker and self.reranker.is_enabled():
+            documents = await self._rerank(batch, documents)
+
+        duration = time.perf_counter() - start
+        self.stats["total_duration"] += duration
+        logger.info(
+            f"Recherche batch: {len(batch)} requêtes, {len(texts)} embeddings "
+            f"en 1 appel, {sum(len(d) for d in documents)} documents en {duration:.3f}s"
+        )
+
+        return documents
+
+    async def _rerank(
+        self, batch: List[BatchQuery], documents: List[List[Document]]
+    ) -> List[List[Document]]:
+        """Rerank de toutes les requêtes ayant plus d'un document"""
+        indices = [i for i, docs in enumerate(documents) if len(docs) > 1]
+        if not indices:
+            return documents
+
+        try:
+            reranked = await self.reranker.rerank_many(
+                [batch[i].query for i in indices],
+                [
+                    [
+                        {
+                            "content": doc.content,
+                            "metadata": doc.metadata,
+                            "score": doc.score,
+                        }
+                        for doc in documents[i]
+                    ]
+                    for i in indices
+                ],
+                top_n=self.rerank_top_n,
+            )
+            self.stats["rerank_batches"] += 1
+        except Exception as e:
+            logger.error(f"Rerank batch échoué (documents d'origine conservés): {e}")
+            return documents
+
+        documents = list(documents)
+        for i, reranked_dicts in zip(indices, reranked):
+            documents[i] = [
+                Document(
+                    content=d["content"],
+                    metadata=d["metadata"],
+                    score=d["score"],
+                    explain_score=d.get("explain_score"),
+                )
+                for d in reranked_dicts
+            ]
+        return documents
+
+    def get_stats(self) -> Dict[str, Any]:
+        batches = self.stats["batches"]
+        return {
+            **self.stats,
+            "avg_queries_per_batch": (
+                self.stats["queries"] / batches if batches else 0.0
+            ),
+            "avg_batch_duration_ms": (
+                self.stats["total_duration"] / batches * 1000 if batches else 0.0
+            ),
+        }
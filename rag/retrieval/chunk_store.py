@@ -0,0 +1,441 @@
+# -*- coding: utf-8 -*-
+"""
+chunk_store.py - Stockage local des chunks par identifiant
+Version: 1.2.0
+Last modified: 2025-11-12
+"""
+"""
+chunk_store.py - Stockage local des chunks par identifiant
+
+Le cache de recherche (cache/cache_search.py) ne stocke que des listes
+(id, score). Les contenus et métadonnées sont réhydratés depuis ce store,
+alimenté par les documents déjà reçus de Weaviate: un hit du cache de
+recherche ne touche pas Weaviate.
+
+Le store suit la version de la collection: quand elle change (ingestion),
+il est vidé pour ne jamais servir un contenu obsolète.
+
+MappedChunkStore lit le store écrit par l'ingestion (knowledge-ingesters
+weaviate_integration/chunk_store.py) en mémoire mappée: contenu, métadonnées
+et features de boosting par UUID d'objet. Les recherches Weaviate ne
+demandent alors que les IDs et scores; seuls les documents du top-k final
+sont réhydratés (décodage du contenu).
+
+Format (répertoire <base>/<collection>):
+- meta.json   : version du format, collection, dimension des vecteurs
+- chunks.bin  : enregistrements métadonnées JSON + contenu UTF-8 (append-only)
+- vectors.f16 : matrice float16 des vecteurs connus (append-only)
+- index.tsv   : "uuid<TAB>offset<TAB>len_métadonnées<TAB>len_contenu<TAB>
+  ligne_vecteur", la dernière ligne d'un UUID fait foi, offset -1 =
+  suppression, ligne -1 = pas de vecteur (format 1: 4 colonnes)
+
+Les UUID modifiés sont journalisés (changes_since) pour les index dérivés
+(retrieval/local_index.py) qui se mettent à jour incrémentalement.
+"""
+
+import json
+import logging
+import mmap
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import replace
+from pathlib import Path
+from utils.types import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from core.data_models import Document
+from retrieval.rerank_service import document_id
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CHUNKS = 20_000
+
+
+class MappedChunkStore:
+    """
+    Lecture zéro-copie (mmap) du chunk store synchronisé par l'ingestion
+
+    Usage:
+        store = MappedChunkStore("chunk_store", "InteliaKnowledge")
+        metadata = store.metadata(uuid)   # propriétés Weaviate sans le contenu
+        content = store.content(uuid)     # décodé à la demande
+        vector = store.vector(uuid)       # ligne float16 (None si inconnue)
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        collection_name: Optional[str] = None,
+        refresh_interval: float = 1.0,
+    ):
+        """
+        Args:
+            directory: Répertoire de base du store (ou celui de la collection)
+            collection_name: Sous-répertoire de la collection
+            refresh_interval: Délai minimal entre deux relectures de l'index
+                déclenchées par un UUID inconnu
+        """
+        base = Path(directory)
+        self.directory = base / collection_name if collection_name else base
+        self._data_path = self.directory / "chunks.bin"
+        self._index_path = self.directory / "index.tsv"
+        self._vectors_path = self.directory / "vectors.f16"
+        self._meta_path = self.directory / "meta.json"
+        self.refresh_interval = refresh_interval
+
+        # uuid -> (offset, len métadonnées, len contenu, ligne vecteur)
+        self._index: Dict[str, Tuple[int, int, int, int]] = {}
+        self._index_pos = 0
+        self._index_identity: Optional[Tuple[int, int]] = None
+        self._mmap: Optional[mmap.mmap] = None
+        self._mapped_size = 0
+        self._vectors: Optional[np.ndarray] = None
+        self.dim: Optional[int] = None
+
+        # Journal des UUID modifiés, remis à zéro (generation + 1) au vidage
+        self._changes: List[str] = []
+        self.generation = 0
+        self._last_refresh = 0.0
+        self._lock = threading.Lock()
+
+        self.stats = {
+            "metadata_reads": 0,
+            "content_reads": 0,
+            "misses": 0,
+            "refreshes": 0,
+        }
+
+        self.refresh(force=True)
+        logger.info(f"Chunk store mappé: {len(self._index)} chunks ({self.directory})")
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, object_id: str) -> bool:
+        return self._record(object_id) is not None
+
+    def refresh(self, force: bool = False) -> int:
+        """
+        Lit les lignes d'index ajoutées depuis la dernière lecture et remappe
+        le fichier de données s'il a grossi
+
+        Returns:
+            Nombre de lignes d'index lues
+        """
+        now = time.time()
+        if not force and now - self._last_refresh < self.refresh_interval:
+            return 0
+
+        with self._lock:
+            self._last_refresh = now
+            try:
+                index_stat = self._index_path.stat()
+                index_size = index_stat.st_size
+                identity = (index_stat.st_dev, index_stat.st_ino)
+            except FileNotFoundError:
+                index_size, identity = 0, None
+
+            if self._index_pos and (
+                index_size < self._index_pos or identity != self._index_identity
+            ):
+                # Store vidé ou réécrit (collection supprimée, nouveau
+                # snapshot): relecture complète
+                self._index.clear()
+                self._index_pos = 0
+                self._mmap, self._mapped_size = None, 0
+                self._vectors, self.dim = None, None
+                self._changes = []
+                self.generation += 1
+            self._index_identity = identity
+
+            lines = []
+            if index_size > self._index_pos:
+                with open(self._index_path, "rb") as f:
+                    f.seek(self._index_pos)
+                    chunk = f.read(index_size - self._index_pos)
+                # Une ligne incomplète (écriture en cours) est relue plus tard
+                complete = chunk[: chunk.rfind(b"\n") + 1]
+                self._index_pos += len(complete)
+                lines = complete.decode("utf-8").splitlines()
+
+            for line in lines:
+                parts = line.split("\t")
+                if len(parts) not in (4, 5):
+                    continue
+                object_id, offset = parts[0], int(parts[1])
+                if offset < 0:
+                    self._index.pop(object_id, None)
+                else:
+                    vector_row = int(parts[4]) if len(parts) == 5 else -1
+                    self._index[object_id] = (
+                        offset,
+                        int(parts[2]),
+                        int(parts[3]),
+                        vector_row,
+                    )
+                self._changes.append(object_id)
+
+            self._remap()
+            self._remap_vectors()
+            if lines:
+                self.stats["refreshes"] += 1
+            return len(lines)
+
+    def _remap(self):
+        """Mappe chunks.bin en lecture (nouveau mapping si le fichier a grossi)"""
+        try:
+            data_size = self._data_path.stat().st_size
+        except FileNotFoundError:
+            return
+        if data_size == 0 or data_size == self._mapped_size:
+            return
+        with open(self._data_path, "rb") as f:
+            # Les lecteurs en cours gardent leur référence à l'ancien mapping
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._mapped_size = data_size
+
+    def _remap_vectors(self):
+        """Mappe vectors.f16 (lignes complètes uniquement)"""
+        if self.dim is None:
+            try:
+                meta = json.loads(self._meta_path.read_text(encoding="utf-8"))
+            except (FileNotFoundError, ValueError):
+                return
+            self.dim = meta.get("dim")
+            if not self.dim:
+                return
+        try:
+            rows = self._vectors_path.stat().st_size // (2 * self.dim)
+        except FileNotFoundError:
+            return
+        if rows == 0 or (self._vectors is not None and len(self._vectors) == rows):
+            return
+        self._vectors = np.memmap(
+            self._vectors_path, dtype=np.float16, mode="r", shape=(rows, self.dim)
+        )
+
+    def changes_since(
+        self, cursor: Tuple[int, int]
+    ) -> Tuple[Tuple[int, int], List[str], bool]:
+        """
+        UUID modifiés (ajout, mise à jour ou suppression) depuis un curseur
+
+        Args:
+            cursor: (generation, position) retourné par l'appel précédent,
+                (-1, 0) pour tout relire
+
+        Returns:
+            (nouveau curseur, UUID modifiés, store vidé depuis le curseur)
+        """
+        self.refresh()
+        with self._lock:
+            generation, position = cursor
+            reset = generation != self.generation
+            if reset:
+                position = 0
+            changed = self._changes[position:]
+            return (self.generation, len(self._changes)), changed, reset
+
+    def _record(self, object_id: str) -> Optional[Tuple[int, int, int, int]]:
+        record = self._index.get(object_id)
+        if record is None and self.refresh():
+            record = self._index.get(object_id)
+        if record is None or record[0] + record[1] + record[2] > self._mapped_size:
+            self.stats["misses"] += 1
+            return None
+        return record
+
+    def metadata(self, object_id: str) -> Optional[Dict[str, Any]]:
+        """Propriétés du chunk (hors contenu), None si inconnu"""
+        record = self._record(object_id)
+        if record is None:
+            return None
+        offset, metadata_len = record[0], record[1]
+        self.stats["metadata_reads"] += 1
+        return json.loads(self._mmap[offset : offset + metadata_len])
+
+    def content(self, object_id: str) -> Optional[str]:
+        """Contenu du chunk, None si inconnu"""
+        record = self._record(object_id)
+        if record is None:
+            return None
+        offset, metadata_len, content_len = record[:3]
+        start = offset + metadata_len
+        self.stats["content_reads"] += 1
+        return self._mmap[start : start + content_len].decode("utf-8")
+
+    def vector(self, object_id: str) -> Optional[np.ndarray]:
+        """Vecteur float16 du chunk (vue sur le mapping), None si absent"""
+        record = self._index.get(object_id)
+        if record is None or record[3] < 0:
+            return None
+        vectors = self._vectors
+        if vectors is None or record[3] >= len(vectors):
+            self._remap_vectors()
+            vectors = self._vectors
+            if vectors is None or record[3] >= len(vectors):
+                return None
+        return vectors[record[3]]
+
+    def get_document(self, object_id: str, score: float = 0.0) -> Optional[Document]:
+        """Document complet (contenu + métadonnées), None si inconnu"""
+        metadata = self.metadata(object_id)
+        if metadata is None:
+            return None
+        metadata["weaviate_id"] = object_id
+        return Document(
+            content=self.content(object_id) or "", metadata=metadata, score=score
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "chunks": len(self._index),
+            "mapped_bytes": self._mapped_size,
+            "vectors": 0 if self._vectors is None else len(self._vectors),
+            "directory": str(self.directory),
+        }
+
+
+def open_chunk_store(
+    collection_name: str, directory: Optional[str] = None
+) -> Optional[MappedChunkStore]:
+    """
+    Ouvre le chunk store de la collection (CHUNK_STORE_DIR)
+
+    Returns:
+        None si aucun répertoire n'est configuré ou si le store est absent
+    """
+    directory = directory or os.getenv("CHUNK_STORE_DIR")
+    if not directory:
+        return None
+    if not (Path(directory) / collection_name / "index.tsv").exists():
+        logger.warning(
+            f"Chunk store absent pour {collection_name} dans {directory} "
+            "(recherches avec contenu complet)"
+        )
+        return None
+    try:
+        return MappedChunkStore(directory, collection_name)
+    except Exception as e:
+        logger.error(f"Ouverture chunk store impossible: {e}")
+        return None
+
+
+def chunk_id(doc: Document) -> str:
+    """Identifiant d'un Document (UUID Weaviate, sinon hash du contenu)"""
+    return document_id(doc.content, {"metadata": doc.metadata})
+
+
+class ChunkStore:
+    """
+    Store LRU borné des Documents par identifiant
+
+    Usage:
+        store = ChunkStore()
+        entries = store.put_documents(documents)   # [{"id", "score"}]
+        documents = store.get_documents(entries)   # None si un id manque
+    """
+
+    def __init__(
+        self,
+        max_chunks: int = DEFAULT_MAX_CHUNKS,
+        backing: Optional[MappedChunkStore] = None,
+    ):
+        """
+        Args:
+            max_chunks: Nombre max de Documents gardés en mémoire
+            backing: Chunk store mappé consulté pour les ids absents du LRU
+        """
+        self.max_chunks = max_chunks
+        self.backing = backing
+        self._chunks: "OrderedDict[str, Document]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.version: Optional[int] = None
+
+        self.stats = {
+            "puts": 0,
+            "hydrations": 0,
+            "hydration_misses": 0,
+            "resets": 0,
+        }
+
+    def __len__(self) -> int:
+        return len(self._chunks)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._chunks
+
+    def sync_version(self, version: Optional[int]):
+        """Vide le store si la version de la collection a changé"""
+        if version is None or version == self.version:
+            return
+        if self.backing is not None:
+            self.backing.refresh(force=True)
+        with self._lock:
+            if self.version is not None and self._chunks:
+                logger.info(
+                    f"Chunk store vidé: version collection {self.version} -> {version}"
+                )
+                self._chunks.clear()
+                self.stats["resets"] += 1
+            self.version = version
+
+    def put_documents(self, documents: List[Document]) -> List[Dict[str, Any]]:
+        """Enregistre les Documents et retourne leurs entrées [{"id", "score"}]"""
+        entries = []
+        with self._lock:
+            for doc in documents:
+                doc_id = chunk_id(doc)
+                self._chunks[doc_id] = doc
+                self._chunks.move_to_end(doc_id)
+                entries.append({"id": doc_id, "score": doc.score})
+            while len(self._chunks) > self.max_chunks:
+                self._chunks.popitem(last=False)
+            self.stats["puts"] += len(documents)
+        return entries
+
+    def get_documents(self, entries: List[Dict[str, Any]]) -> Optional[List[Document]]:
+        """
+        Réhydrate des entrées [{"id", "score"}] en Documents
+
+        Returns:
+            Documents dans l'ordre des entrées, avec le score en cache;
+            None si un identifiant est absent du store (l'appelant refait
+            la recherche)
+        """
+        documents = []
+        with self._lock:
+            for entry in entries:
+                doc = self._chunks.get(entry["id"])
+                if doc is None and self.backing is not None:
+                    doc = self.backing.get_document(entry["id"])
+                    if doc is not None:
+                        self._chunks[entry["id"]] = doc
+                if doc is None:
+                    self.stats["hydration_misses"] += 1
+                    return None
+                self._chunks.move_to_end(entry["id"])
+                documents.append(
+                    replace(doc, score=entry["score"], metadata=dict(doc.metadata))
+                )
+            while len(self._chunks) > self.max_chunks:
+                self._chunks.popitem(last=False)
+        self.stats["hydrations"] += 1
+        return documents
+
+    def clear(self):
+        with self._lock:
+            self._chunks.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "size": len(self._chunks),
+            "max_chunks": self.max_chunks,
+            "version": self.version,
+            "backing": self.backing.get_stats() if self.backing else None,
+        }
@@ -29,6 +29,13 @@ import logging
 import os
 from typing import List, Tuple, Dict, Any, Optional
 
+from retrieval.rerank_service import (
+    DEFAULT_CACHE_SIZE,
+    CohereRerankBackend,
+    RerankService,
+    ScoreCache,
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -52,6 +59,7 @@ class CohereReRanker:
         api_key: Optional[str] = None,
         model: str = "rerank-multilingual-v3.0",
         enable_caching: bool = True,
+        cache_size: int = DEFAULT_CACHE_SIZE,
     ):
         """
         Initialize Cohere re-ranker
@@ -61,13 +69,23 @@ class CohereReRanker:
             model: Cohere rerank model
                 - 'rerank-multilingual-v3.0' (recommended, multilingual)
                 - 'rerank-english-v3.0' (English only, slightly faster)
-            enable_caching: Cache results for identical (query, doc) pairs
+            enable_caching: Cache scores for identical (query, doc) pairs
+            cache_size: Max cached scores (LRU)
         """
         self.api_key = api_key or os.getenv("COHERE_API_KEY")
         self.model = model
         self.enable_caching = enable_caching
         self._client = None  # Lazy loading
-        self._cache = {} if enable_caching else None
+        self._async_client = None
+        self._cache = ScoreCache(cache_size) if enable_caching else None
+        self._service = RerankService(
+            CohereRerankBackend(
+                model,
+                client_factory=lambda: self.client,
+                async_client_factory=lambda: self.async_client,
+            ),
+            self._cache,
+        )
 
         if not self.api_key:
             logger.warning(
@@ -100,6 +118,16 @@ class CohereReRanker:
 
         return self._client
 
+    @property
+    def async_client(self):
+        """Lazy load Cohere async client (None if the SDK has none)"""
+        if self._async_client is None:
+            import cohere
+
+            if hasattr(cohere, "AsyncClient"):
+                self._async_client = cohere.AsyncClient(api_key=self.api_key)
+        return self._async_client
+
     def rerank(
         self,
         query: str,
@@ -139,61 +167,76 @@ class CohereReRanker:
             return documents
 
         try:
-            # Check cache
-            cache_key = None
-            if self.enable_caching:
-                cache_key = (query, tuple(doc[:200] for doc in documents))
-                if cache_key in self._cache:
-                    cached_results = self._cache[cache_key]
-                    logger.info(f"✅ Cache hit for query: {query[:50]}...")
-                    if top_k:
-                        cached_results = cached_results[:top_k]
-                    if return_scores:
-                        return cached_results
-                    return [doc for doc, score in cached_results]
-
             logger.info(
-                f"📡 Calling Cohere API: query='{query[:50]}...', "
+                f"📡 Cohere re-ranking: query='{query[:50]}...', "
                 f"num_docs={len(documents)}, top_k={top_k}"
             )
+            # Blocks the calling thread (not for use on the event loop, see arerank)
+            scores = self._service.score(query, documents)
+        except Exception as e:
+            return self._fallback(documents, top_k, e)
 
-            # Call Cohere rerank API
-            response = self.client.rerank(
-                model=self.model,
-                query=query,
-                documents=documents,
-                top_n=top_k if top_k else len(documents),
-                return_documents=True,
-            )
-
-            # Extract results
-            results = [
-                (result.document.text, result.relevance_score)
-                for result in response.results
-            ]
-
-            logger.info(
-                f"✅ Cohere re-ranking: {len(documents)} docs → {len(results)} relevant docs"
-            )
+        return self._select(documents, scores, top_k, return_scores)
 
-            # Cache results
-            if self.enable_caching and cache_key:
-                self._cache[cache_key] = results
+    async def arerank(
+        self,
+        query: str,
+        documents: List[str],
+        top_k: Optional[int] = 5,
+        return_scores: bool = False,
+    ) -> List[str] | List[Tuple[str, float]]:
+        """
+        Async variant of rerank on Cohere's async client (event loop stays free)
 
-            # Return format
-            if return_scores:
-                return results
-            else:
-                return [doc for doc, score in results]
+        Args/Returns: see rerank
+        """
+        if not documents:
+            logger.warning("⚠️ Empty documents list - nothing to rerank")
+            return []
 
-        except Exception as e:
-            logger.error(f"❌ Cohere re-ranking error: {e}", exc_info=True)
-            # Fallback: return original documents (no filtering)
-            logger.warning("⚠️ Returning original documents (no re-ranking)")
+        if not self.api_key:
+            logger.error("❌ COHERE_API_KEY not set - cannot rerank!")
             if top_k:
                 return documents[:top_k]
             return documents
 
+        try:
+            scores = await self._service.ascore(query, documents)
+        except Exception as e:
+            return self._fallback(documents, top_k, e)
+
+        return self._select(documents, scores, top_k, return_scores)
+
+    def _select(
+        self,
+        documents: List[str],
+        scores: List[float],
+        top_k: Optional[int],
+        return_scores: bool,
+    ) -> List[str] | List[Tuple[str, float]]:
+        """Documents sorted by relevance, top_k"""
+        results = sorted(zip(documents, scores), key=lambda x: x[1], reverse=True)
+        if top_k:
+            results = results[:top_k]
+
+        logger.info(
+            f"✅ Cohere re-ranking: {len(documents)} docs → {len(results)} relevant docs"
+        )
+
+        # Return format
+        if return_scores:
+            return results
+        else:
+            return [doc for doc, score in results]
+
+    def _fallback(self, documents: List[str], top_k: Optional[int], error: Exception) -> List[str]:
+        logger.error(f"❌ Cohere re-ranking error: {error}", exc_info=True)
+        # Fallback: return original documents (no filtering)
+        logger.warning("⚠️ Returning original documents (no re-ranking)")
+        if top_k:
+            return documents[:top_k]
+        return documents
+
     def rerank_with_metadata(
         self,
         query: str,
@@ -252,7 +295,7 @@ class CohereReRanker:
         if not self.enable_caching:
             return {"enabled": False}
 
-        return {"enabled": True, "size": len(self._cache), "model": self.model}
+        return {"enabled": True, **self._cache.get_stats(), "model": self.model}
 
     def clear_cache(self):
         """Clear cache"""
@@ -8,10 +8,12 @@ Last modified: 2025-10-26
 embedder.py - Embedder OpenAI avec cache Redis externe optimisé - CORRIGÉ
 """
 
+import asyncio
 import logging
 import os
+from collections import OrderedDict
 from typing import TYPE_CHECKING
-from utils.types import List
+from utils.types import List, Optional
 from utils.utilities import METRICS
 from utils.imports_and_dependencies import AsyncOpenAI
 
@@ -23,6 +25,9 @@ else:
 
 logger = logging.getLogger(__name__)
 
+# Nombre max d'embeddings spéculatifs en vol (les plus anciens sont annulés)
+MAX_PREFETCHED_EMBEDDINGS = 256
+
 
 class OpenAIEmbedder:
     """Embedder OpenAI avec cache Redis externe optimisé"""
@@ -51,8 +56,62 @@ class OpenAIEmbedder:
         else:
             logger.info(f"Embedder initialisé avec {self.model}")
 
+        # Embeddings lancés par anticipation (texte -> tâche embed_query)
+        self._prefetched: "OrderedDict[str, asyncio.Task]" = OrderedDict()
+        self.prefetch_stats = {"started": 0, "used": 0, "discarded": 0}
+
+    def prefetch(self, text: str) -> Optional[asyncio.Task]:
+        """
+        Lance embed_query(text) en tâche de fond, sans l'attendre
+
+        Le prochain get_embedding(text) réutilise la tâche au lieu de refaire
+        l'appel OpenAI. Doit être appelé depuis la boucle d'événements.
+        """
+        if not text:
+            return None
+
+        task = self._prefetched.get(text)
+        if task is not None:
+            return task
+
+        task = asyncio.ensure_future(self.embed_query(text))
+        self._prefetched[text] = task
+        self.prefetch_stats["started"] += 1
+
+        while len(self._prefetched) > MAX_PREFETCHED_EMBEDDINGS:
+            _, oldest = self._prefetched.popitem(last=False)
+            oldest.cancel()
+            self.prefetch_stats["discarded"] += 1
+
+        return task
+
+    def discard_prefetch(self, text: str) -> bool:
+        """Annule un embedding spéculatif devenu inutile"""
+        task = self._prefetched.pop(text, None)
+        if task is None:
+            return False
+
+        task.cancel()
+        self.prefetch_stats["discarded"] += 1
+        return True
+
     async def get_embedding(self, text: str) -> List[float]:
         """CORRECTION: Méthode manquante appelée par rag_engine.py"""
+        task = self._prefetched.pop(text, None)
+        if task is not None:
+            try:
+                # shield: l'annulation de l'appelant ne doit pas être confondue
+                # avec celle de la tâche spéculative
+                embedding = await asyncio.shield(task)
+            except asyncio.CancelledError:
+                if not task.cancelled():
+                    raise
+                embedding = None
+
+            if embedding:
+                self.prefetch_stats["used"] += 1
+                return embedding
+
         return await self.embed_query(text)
 
     async def embed_query(self, text: str) -> List[float]:
@@ -21,6 +21,12 @@ from collections import deque
 from dataclasses import dataclass, asdict
 from enum import Enum
 
+from retrieval.fusion_engine import (
+    ChunkFeatureExtractor,
+    FusedRankingEngine,
+    FusionCandidates,
+)
+
 logger = logging.getLogger(__name__)
 
 # Import du breeds_registry
@@ -184,6 +190,17 @@ class IntelligentRRFFusion:
             os.getenv("GENETIC_LINE_PRIORITY_ENABLED", "true").lower() == "true"
         )
 
+        # Moteur vectorisé (RRF + boosts + diversité), features par chunk en cache
+        self.ranking_engine = FusedRankingEngine(
+            feature_extractor=(
+                ChunkFeatureExtractor.from_breeds_registry(self.breeds_registry)
+                if self.breeds_registry
+                else ChunkFeatureExtractor()
+            ),
+            genetic_boost_factor=self.genetic_boost_factor,
+            genetic_priority_enabled=self.genetic_priority_enabled,
+        )
+
         logger.info(
             f"IntelligentRRF initialisé - Enabled: {self.enabled}, Learning: {self.learning_mode}, "
             f"Genetic Boost: {self.genetic_boost_factor}x, BreedsRegistry: {self.breeds_registry is not None}"
@@ -434,7 +451,7 @@ class IntelligentRRFFusion:
         bm25_results: List[Dict],
         params: AdaptiveRRFParams,
         context: Dict,
-    ) -> List[Dict]:
+    ) -> FusionCandidates:
         """Fusion avec méthodes multiples et sélection optimale"""
 
         # Méthodes de fusion disponibles
@@ -456,170 +473,60 @@ class IntelligentRRFFusion:
         bm25_results: List[Dict],
         params: AdaptiveRRFParams,
         context: Dict,
-    ) -> List[Dict]:
-        """Fusion RRF pondérée avec boost spécialisé aviculture - MODIFIÉE AVEC BOOST LIGNÉE"""
-
-        all_docs = {}
-
-        # Traitement résultats vectoriels
-        for i, doc in enumerate(vector_results):
-            content_key = self._generate_content_key(doc)
-            specialization_boost = self._calculate_poultry_boost(doc, context)
-
-            all_docs[content_key] = {
-                "doc": doc,
-                "vector_rank": i + 1,
-                "vector_score": doc.get("score", 0.0),
-                "bm25_rank": None,
-                "bm25_score": 0.0,
-                "specialization_boost": specialization_boost,
-            }
-
-        # Traitement résultats BM25
-        for i, doc in enumerate(bm25_results):
-            content_key = self._generate_content_key(doc)
-
-            if content_key in all_docs:
-                all_docs[content_key]["bm25_rank"] = i + 1
-                all_docs[content_key]["bm25_score"] = doc.get("score", 0.0)
-            else:
-                specialization_boost = self._calculate_poultry_boost(doc, context)
-                all_docs[content_key] = {
-                    "doc": doc,
-                    "vector_rank": None,
-                    "vector_score": 0.0,
-                    "bm25_rank": i + 1,
-                    "bm25_score": doc.get("score", 0.0),
-                    "specialization_boost": specialization_boost,
-                }
-
-        # Calcul scores RRF pondérés
-        final_docs = []
-        for content_key, data in all_docs.items():
-
-            rrf_score = 0.0
-
-            # Composante vectorielle
-            if data["vector_rank"]:
-                vector_contribution = (
-                    params.vector_weight * data["specialization_boost"]
-                ) / (params.rrf_k + data["vector_rank"])
-                rrf_score += vector_contribution
-
-            # Composante BM25
-            if data["bm25_rank"]:
-                bm25_contribution = params.bm25_weight / (
-                    params.rrf_k + data["bm25_rank"]
-                )
-                rrf_score += bm25_contribution
-
-            # Score final avec multiplicateur
-            final_score = rrf_score * params.score_multiplier * params.genetic_boost
-
-            # AJOUT: Boost génétique prioritaire
-            doc = data["doc"].copy()
-            genetic_boost = self._calculate_poultry_boost(doc, context)
-            if genetic_boost > 1.5:  # Si boost significatif de lignée
-                final_score *= genetic_boost
-
-            # Enrichissement métadonnées
-            if "metadata" not in doc:
-                doc["metadata"] = {}
-
-            doc["metadata"].update(
-                {
-                    "rrf_method": "weighted_intelligent",
-                    "genetic_boost": data["specialization_boost"],
-                    "final_rrf_score": final_score,
-                    "vector_rank": data["vector_rank"],
-                    "bm25_rank": data["bm25_rank"],
-                    "context_type": context.get("query_type", "unknown"),
-                    "genetic_line_detected": context.get("genetic_line", "none"),
-                }
-            )
-
-            # AJOUT: Marquer pour debugging
-            if genetic_boost > 1.5:
-                doc["metadata"]["genetic_boost_applied"] = genetic_boost
-
-            doc["final_score"] = final_score
-            final_docs.append(doc)
-
-        return sorted(final_docs, key=lambda x: x["final_score"], reverse=True)
+    ) -> FusionCandidates:
+        """Fusion RRF pondérée avec boost spécialisé aviculture (vectorisée, voir fusion_engine)"""
+        return self.ranking_engine.weighted_rrf(
+            vector_results, bm25_results, params, context, self._generate_content_key
+        )
 
     async def _poultry_specialized_ranking(
-        self, candidates: List[Dict], context: Dict, top_k: int
+        self, candidates: FusionCandidates, context: Dict, top_k: int
     ) -> List[Dict]:
         """Post-processing avec optimisations spécialisées aviculture"""
 
-        # Filtrage diversité
-        diverse_results = self._apply_diversity_filter(candidates, context)
+        # Boost urgence médicale + cohérence lignée-métrique
+        multipliers = self.ranking_engine.post_boost(candidates, context)
 
-        # Boost urgence médicale
-        if context.get("urgency_level", 0) > 0.7:
-            diverse_results = self._boost_medical_urgency(diverse_results)
+        # Filtrage diversité + top_k
+        selected, final_scores = self.ranking_engine.select(
+            candidates, multipliers, top_k, context.get("diversity_threshold", 0.8)
+        )
 
-        # Boost cohérence lignée-métrique
-        if context.get("genetic_line") and context.get("has_performance_metric"):
-            diverse_results = self._boost_genetic_metric_coherence(
-                diverse_results, context
-            )
+        # Seuls les documents retournés sont copiés et enrichis
+        return [
+            self._build_ranked_doc(candidates, int(idx), float(score), context)
+            for idx, score in zip(selected, final_scores)
+        ]
 
-        return diverse_results[:top_k]
-
-    def _calculate_poultry_boost(self, doc: Dict, context: Dict) -> float:
-        """NOUVELLE VERSION: Calcule le boost spécialisé aviculture avec priorité lignée génétique"""
-
-        content = (doc.get("content") or "").lower()
-        metadata = doc.get("metadata", {})
-        genetic_line_doc = (metadata.get("geneticLine") or "").lower()
-
-        boost = 1.0
-
-        # BOOST PRIORITAIRE: Lignée génétique exacte
-        query_genetic = context.get("genetic_line", "")
-        if query_genetic and self.genetic_priority_enabled:
-            # Conversion pour matching
-            query_normalized = query_genetic.replace("_", " ")
-
-            # Boost majeur si lignée métadonnée correspond
-            if genetic_line_doc and (
-                query_normalized in genetic_line_doc
-                or genetic_line_doc in query_normalized
-            ):
-                boost *= self.genetic_boost_factor  # BOOST MAJEUR (2.5x par défaut)
-
-            # Boost moyen si lignée dans contenu
-            elif query_genetic in content or query_normalized in content:
-                boost *= self.genetic_boost_factor * 0.8  # 2.0x par défaut
-
-        # Boost âge précis
-        age_days = context.get("age_days")
-        if age_days:
-            age_patterns = [f"{age_days}j", f"{age_days} j", f"{age_days} jour"]
-            if any(pattern in content for pattern in age_patterns):
-                boost *= 1.4
-
-        # Boost métrique + lignée (combo parfait)
-        if (
-            context.get("genetic_line")
-            and context.get("has_performance_metric")
-            and query_genetic in content
-            and any(
-                metric in content for metric in context.get("performance_metrics", [])
-            )
-        ):
-            boost *= 1.5
+    def _build_ranked_doc(
+        self, candidates: FusionCandidates, idx: int, final_score: float, context: Dict
+    ) -> Dict:
+        """Copie d'un candidat avec ses métadonnées RRF"""
+        doc = candidates.docs[idx].copy()
+        doc["metadata"] = dict(doc.get("metadata") or {})
+
+        specialization_boost = float(candidates.specialization_boost[idx])
+        vector_rank = int(candidates.vector_rank[idx]) or None
+        bm25_rank = int(candidates.bm25_rank[idx]) or None
+
+        doc["metadata"].update(
+            {
+                "rrf_method": "weighted_intelligent",
+                "genetic_boost": specialization_boost,
+                "final_rrf_score": float(candidates.scores[idx]),
+                "vector_rank": vector_rank,
+                "bm25_rank": bm25_rank,
+                "context_type": context.get("query_type", "unknown"),
+                "genetic_line_detected": context.get("genetic_line", "none"),
+            }
+        )
 
-        # Boost source technique
-        source_type = doc.get("metadata", {}).get("source", "")
-        if any(
-            keyword in source_type.lower()
-            for keyword in ["guide", "référence", "technique", "standard"]
-        ):
-            boost *= 1.2
+        # Marquer pour debugging
+        if specialization_boost > 1.5:
+            doc["metadata"]["genetic_boost_applied"] = specialization_boost
 
-        return min(3.0, boost)  # Limite le boost maximum à 3.0x
+        doc["final_score"] = final_score
+        return doc
 
     def _classify_query_type(self, query_lower: str, entities: Dict) -> QueryType:
         """Classifie le type de requête pour optimisation"""
@@ -802,7 +709,10 @@ class IntelligentRRFFusion:
         return max_urgency
 
     def _generate_content_key(self, doc: Dict) -> str:
-        """Génère une clé unique pour le document"""
+        """Génère une clé unique pour le document (UUID Weaviate si connu)"""
+        weaviate_id = (doc.get("metadata") or {}).get("weaviate_id")
+        if weaviate_id:
+            return weaviate_id
         content = doc.get("content", "")
         title = doc.get("metadata", {}).get("title", "")
         return hashlib.md5(
@@ -933,79 +843,6 @@ class IntelligentRRFFusion:
 
     # === MÉTHODES POST-PROCESSING ===
 
-    def _apply_diversity_filter(
-        self, candidates: List[Dict], context: Dict
-    ) -> List[Dict]:
-        """Applique un filtre de diversité"""
-        if len(candidates) <= 3:
-            return candidates
-
-        diverse_results = [candidates[0]]  # Garde toujours le premier
-
-        for candidate in candidates[1:]:
-            is_diverse = True
-            candidate_content = candidate.get("content", "").lower()
-
-            for existing in diverse_results:
-                existing_content = existing.get("content", "").lower()
-
-                # Similarité simple par mots communs
-                candidate_words = set(candidate_content.split())
-                existing_words = set(existing_content.split())
-
-                if candidate_words and existing_words:
-                    overlap = len(candidate_words.intersection(existing_words))
-                    similarity = overlap / min(
-                        len(candidate_words), len(existing_words)
-                    )
-
-                    if similarity > context.get("diversity_threshold", 0.8):
-                        is_diverse = False
-                        break
-
-            if is_diverse:
-                diverse_results.append(candidate)
-
-        return diverse_results
-
-    def _boost_medical_urgency(self, results: List[Dict]) -> List[Dict]:
-        """Boost les documents d'urgence médicale"""
-        medical_keywords = [
-            "traitement",
-            "diagnostic",
-            "symptôme",
-            "maladie",
-            "vétérinaire",
-        ]
-
-        for doc in results:
-            content = doc.get("content", "").lower()
-            if any(keyword in content for keyword in medical_keywords):
-                doc["final_score"] *= 1.2
-
-        return sorted(results, key=lambda x: x["final_score"], reverse=True)
-
-    def _boost_genetic_metric_coherence(
-        self, results: List[Dict], context: Dict
-    ) -> List[Dict]:
-        """Boost la cohérence lignée-métrique"""
-        genetic_line = context.get("genetic_line", "")
-        performance_metrics = context.get("performance_metrics", [])
-
-        if not genetic_line or not performance_metrics:
-            return results
-
-        for doc in results:
-            content = doc.get("content", "").lower()
-
-            has_genetic = genetic_line in content
-            has_metric = any(metric in content for metric in performance_metrics)
-
-            if has_genetic and has_metric:
-                doc["final_score"] *= 1.3  # Boost cohérence
-
-        return sorted(results, key=lambda x: x["final_score"], reverse=True)
-
     def _detect_seasonal_context(self, query_lower: str) -> str:
         """Détecte le contexte saisonnier"""
         seasonal_keywords = {
@@ -1031,7 +868,7 @@ class IntelligentRRFFusion:
         bm25_results: List[Dict],
         params: AdaptiveRRFParams,
         context: Dict,
-    ) -> List[Dict]:
+    ) -> FusionCandidates:
         """Fusion par interpolation de scores"""
         # Implémentation alternative simple
         return await self._weighted_rrf_fusion(
@@ -1044,7 +881,7 @@ class IntelligentRRFFusion:
         bm25_results: List[Dict],
         params: AdaptiveRRFParams,
         context: Dict,
-    ) -> List[Dict]:
+    ) -> FusionCandidates:
         """Fusion Rank-Biased Precision"""
         # Implémentation alternative simple
         return await self._weighted_rrf_fusion(
@@ -0,0 +1,506 @@
+# -*- coding: utf-8 -*-
+"""
+fusion_engine.py - Moteur de fusion RRF + boosts vectorisé (NumPy)
+Version: 1.0.0
+Last modified: 2025-11-08
+"""
+"""
+fusion_engine.py - Moteur de fusion RRF + boosts vectorisé (NumPy)
+
+Les candidats (vectoriel + BM25) sont représentés par des tableaux: rangs,
+scores et features par chunk. RRF pondéré, boosts aviculture et boosts de
+post-traitement sont calculés en une passe NumPy au lieu de dicts Python
+par document.
+
+Features par chunk (ChunkFeatures):
+- Lues dans les métadonnées si elles ont été calculées à l'ingestion
+  (FEATURE_FIELDS, propriétés Weaviate filtrables remplies par
+  knowledge-ingesters core/entity_extractor.py)
+- Sinon dérivées du contenu une seule fois (content.lower() + regex) puis
+  gardées dans un cache LRU borné, partagé entre requêtes
+- Candidats issus d'une recherche IDs seuls (contenu pas encore réhydraté):
+  le contenu est lu à la demande dans le chunk store (content_source),
+  uniquement pour les candidats visités par le filtre de diversité
+
+Filtre de diversité: glouton dans l'ordre des scores RRF, avec sortie
+anticipée dès que les candidats restants ne peuvent plus entrer dans le
+top_k (même avec le boost de post-traitement maximal). Seuls les top_k
+documents retournés sont copiés et enrichis.
+"""
+
+import logging
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from retrieval.rerank_service import document_id
+
+logger = logging.getLogger(__name__)
+
+# Champs de métadonnées remplis à l'ingestion (sinon dérivés du contenu)
+FEATURE_FIELDS = (
+    "breed_mentions",
+    "age_days_mentioned",
+    "metric_mentions",
+    "is_technical_source",
+    "has_medical_terms",
+)
+
+# Lignées reconnues dans le contenu quand le breeds_registry est indisponible
+DEFAULT_BREED_NAMES = (
+    "ross 308", "ross 708", "ross",
+    "cobb 500", "cobb 700", "cobb",
+    "hubbard", "arbor acres",
+    "isa brown", "isa",
+    "lohmann brown", "lohmann",
+    "hy-line brown", "hy-line w36", "hy-line", "hyline",
+)
+
+# Clés de context["performance_metrics"] (IntelligentRRFFusion._extract_performance_metrics)
+# et termes associés; mêmes valeurs que l'ingestion (core/entity_extractor.py)
+#
+# Ces trois listes changent le classement par rapport à l'ancien appariement
+# en ligne d'IntelligentRRFFusion, volontairement: les features dérivées du
+# contenu doivent être celles calculées à l'ingestion, sinon un chunk serait
+# classé différemment selon que ses métadonnées sont présentes ou non.
+# - METRIC_TERMS: une métrique de la requête ("poids") est reconnue par ses
+#   synonymes ("weight", "masse"), plus seulement par sa clé dans le contenu
+#   (boost combo lignée + métrique 1.5x, cohérence lignée-métrique 1.3x)
+# - MEDICAL_KEYWORDS: termes anglais ajoutés (boost urgence médicale)
+# - TECHNICAL_SOURCE_KEYWORDS: "reference", "technical", "handbook" et
+#   "manual" ajoutés (boost source technique 1.2x)
+METRIC_TERMS = {
+    "fcr": ("fcr", "conversion", "feed conversion"),
+    "poids": ("poids", "weight", "masse"),
+    "mortalité": ("mortalité", "mortality"),
+    "ponte": ("ponte", "laying", "egg production"),
+    "gain": ("gain", "croissance", "growth"),
+}
+MEDICAL_KEYWORDS = (
+    "traitement", "diagnostic", "symptôme", "maladie", "vétérinaire",
+    "treatment", "diagnosis", "symptom", "disease", "veterinar",
+)
+TECHNICAL_SOURCE_KEYWORDS = (
+    "guide", "référence", "reference", "technique", "technical", "standard",
+    "handbook", "manual",
+)
+
+# "35j", "35 jours", "35-day", "day 35" (pas "135j" pour un âge de 35)
+AGE_PATTERN = re.compile(r"(?<!\d)(\d{1,3})[ -]?(?:j|days?\b)|\bday (\d{1,3})\b")
+
+# Multiplicateurs de post-traitement (urgence médicale, cohérence lignée-métrique)
+MEDICAL_URGENCY_BOOST = 1.2
+GENETIC_METRIC_COHERENCE_BOOST = 1.3
+
+DEFAULT_FEATURE_CACHE_SIZE = 20_000
+
+
+def normalize_breed(name: str) -> str:
+    """Forme de comparaison d'une lignée: "Hy-Line_Brown" -> "hy line brown" """
+    return " ".join(name.lower().replace("_", " ").replace("-", " ").split())
+
+
+def feature_metadata(properties: Dict[str, Any]) -> Dict[str, Any]:
+    """Features d'ingestion présentes dans les propriétés Weaviate d'un objet"""
+    return {field: properties[field] for field in FEATURE_FIELDS if field in properties}
+
+
+def _compact(name: str) -> str:
+    return re.sub(r"[\s_-]", "", name.lower())
+
+
+class ChunkFeatures:
+    """Faits sur un chunk utilisés par les boosts (indépendants de la requête)"""
+
+    __slots__ = (
+        "genetic_line",
+        "breeds",
+        "ages",
+        "metrics",
+        "technical_source",
+        "medical_terms",
+        "_content",
+        "_words",
+    )
+
+    def __init__(
+        self,
+        genetic_line: str,
+        breeds: frozenset,
+        ages: frozenset,
+        metrics: frozenset,
+        technical_source: bool,
+        medical_terms: bool,
+        content: Union[str, Callable[[], str]] = "",
+    ):
+        self.genetic_line = genetic_line
+        self.breeds = breeds
+        self.ages = ages
+        self.metrics = metrics
+        self.technical_source = technical_source
+        self.medical_terms = medical_terms
+        self._content = content
+        self._words = None
+
+    @property
+    def words(self) -> frozenset:
+        """Mots du contenu (filtre de diversité), calculés au premier accès"""
+        if self._words is None:
+            content = self._content() if callable(self._content) else self._content
+            self._words = frozenset(content.lower().split())
+        return self._words
+
+    def mentions_breed(self, query_breed: str) -> bool:
+        """Le contenu mentionne la lignée (forme normalisée) de la requête"""
+        return any(query_breed in breed for breed in self.breeds)
+
+
+class ChunkFeatureExtractor:
+    """Features d'un document: métadonnées d'ingestion, sinon contenu (mis en cache)"""
+
+    def __init__(
+        self,
+        breed_names: Optional[Iterable[str]] = None,
+        cache_size: int = DEFAULT_FEATURE_CACHE_SIZE,
+    ):
+        """
+        Args:
+            breed_names: Noms/alias de lignées à reconnaître dans le contenu
+            cache_size: Nombre max de chunks gardés dans le cache LRU
+        """
+        names = {normalize_breed(n) for n in (breed_names or DEFAULT_BREED_NAMES) if n}
+        # "ross308", "ross-308", "ross 308" -> "ross 308" (forme avec espaces prioritaire)
+        self._canonical = {_compact(n): n for n in sorted(names, key=lambda n: n.count(" "))}
+        # Plus longs d'abord: "ross 308" avant "ross"
+        alternation = "|".join(
+            re.escape(n).replace(r"\ ", r"[\s_-]?") for n in sorted(names, key=len, reverse=True)
+        )
+        self._breed_pattern = re.compile(rf"(?<!\w)(?:{alternation})(?!\w)")
+        self._cache: "OrderedDict[str, ChunkFeatures]" = OrderedDict()
+        self._cache_size = cache_size
+        self._lock = threading.Lock()
+        # Chunk store (MappedChunkStore) des candidats IDs seuls
+        self.content_source = None
+
+    @classmethod
+    def from_breeds_registry(cls, registry, **kwargs) -> "ChunkFeatureExtractor":
+        """Vocabulaire de lignées issu du breeds_registry (noms + alias)"""
+        names = set(DEFAULT_BREED_NAMES)
+        try:
+            for breed in registry.get_all_breeds():
+                names.add(breed)
+                names.update(a for a in registry.get_aliases(breed) if a)
+        except Exception as e:
+            logger.warning(f"Vocabulaire lignées breeds_registry indisponible: {e}")
+        return cls(breed_names=names, **kwargs)
+
+    def features(self, doc: Dict[str, Any]) -> ChunkFeatures:
+        metadata = doc.get("metadata") or {}
+        content = doc.get("content") or ""
+        if not content and metadata.get("content_pending") and self.content_source:
+            content = self._lazy_content(metadata.get("weaviate_id"))
+        genetic_line = (
+            metadata.get("geneticLine") or metadata.get("genetic_line") or ""
+        ).lower()
+
+        if all(field in metadata for field in FEATURE_FIELDS):
+            return ChunkFeatures(
+                genetic_line=genetic_line,
+                breeds=frozenset(normalize_breed(b) for b in metadata["breed_mentions"] or ()),
+                ages=frozenset(int(a) for a in metadata["age_days_mentioned"] or ()),
+                metrics=frozenset(metadata["metric_mentions"] or ()),
+                technical_source=bool(metadata["is_technical_source"]),
+                medical_terms=bool(metadata["has_medical_terms"]),
+                content=content,
+            )
+
+        if callable(content):
+            content = content()
+        key = document_id(content, doc)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                return cached
+
+        features = self.extract(content, genetic_line, metadata.get("source") or "")
+
+        with self._lock:
+            self._cache[key] = features
+            while len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        return features
+
+    def _lazy_content(self, object_id: str) -> Callable[[], str]:
+        source = self.content_source
+        return lambda: source.content(object_id) or ""
+
+    def extract(self, content: str, genetic_line: str = "", source: str = "") -> ChunkFeatures:
+        """Dérive les features d'un contenu (une passe de lowercase + regex)"""
+        content_lower = content.lower()
+        source_lower = source.lower()
+        return ChunkFeatures(
+            genetic_line=genetic_line,
+            breeds=frozenset(
+                self._canonical.get(_compact(m), normalize_breed(m))
+                for m in self._breed_pattern.findall(content_lower)
+            ),
+            ages=frozenset(
+                int(suffixed or prefixed)
+                for suffixed, prefixed in AGE_PATTERN.findall(content_lower)
+            ),
+            metrics=frozenset(
+                metric
+                for metric, terms in METRIC_TERMS.items()
+                if any(term in content_lower for term in terms)
+            ),
+            technical_source=any(k in source_lower for k in TECHNICAL_SOURCE_KEYWORDS),
+            medical_terms=any(k in content_lower for k in MEDICAL_KEYWORDS),
+            content=content,
+        )
+
+
+@dataclass
+class FusionCandidates:
+    """Candidats fusionnés (vectoriel ∪ BM25) sous forme de tableaux"""
+
+    docs: List[Dict[str, Any]]
+    features: List[ChunkFeatures]
+    vector_rank: np.ndarray  # 0 = absent des résultats vectoriels
+    bm25_rank: np.ndarray  # 0 = absent des résultats BM25
+    specialization_boost: np.ndarray
+    scores: np.ndarray  # score RRF final (avant post-traitement)
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+
+class FusedRankingEngine:
+    """RRF pondéré + boosts aviculture + diversité, vectorisés"""
+
+    def __init__(
+        self,
+        feature_extractor: Optional[ChunkFeatureExtractor] = None,
+        genetic_boost_factor: float = 2.5,
+        genetic_priority_enabled: bool = True,
+    ):
+        self.feature_extractor = feature_extractor or ChunkFeatureExtractor()
+        self.genetic_boost_factor = genetic_boost_factor
+        self.genetic_priority_enabled = genetic_priority_enabled
+
+    # === FUSION ===
+
+    def collect(
+        self,
+        vector_results: List[Dict],
+        bm25_results: List[Dict],
+        key_fn: Callable[[Dict], str],
+    ) -> Tuple[List[Dict], np.ndarray, np.ndarray]:
+        """Union des deux listes (dédupliquée par key_fn) avec leurs rangs"""
+        positions: Dict[str, int] = {}
+        docs: List[Dict] = []
+        vector_rank = np.zeros(len(vector_results) + len(bm25_results))
+        bm25_rank = np.zeros_like(vector_rank)
+
+        for rank, doc in enumerate(vector_results, start=1):
+            key = key_fn(doc)
+            if key not in positions:
+                positions[key] = len(docs)
+                docs.append(doc)
+            vector_rank[positions[key]] = rank
+
+        for rank, doc in enumerate(bm25_results, start=1):
+            key = key_fn(doc)
+            if key not in positions:
+                positions[key] = len(docs)
+                docs.append(doc)
+            bm25_rank[positions[key]] = rank
+
+        return docs, vector_rank[: len(docs)], bm25_rank[: len(docs)]
+
+    def poultry_boost(self, features: List[ChunkFeatures], context: Dict) -> np.ndarray:
+        """Boost spécialisé aviculture par candidat (lignée, âge, combo, source)"""
+        n = len(features)
+        boost = np.ones(n)
+        query_genetic = context.get("genetic_line") or ""
+        query_breed = normalize_breed(query_genetic) if query_genetic else ""
+
+        content_breed = (
+            np.fromiter((f.mentions_breed(query_breed) for f in features), bool, n)
+            if query_breed
+            else np.zeros(n, bool)
+        )
+
+        if query_breed and self.genetic_priority_enabled:
+            # Lignée en métadonnée (boost majeur), sinon dans le contenu
+            metadata_breed = np.fromiter(
+                (
+                    bool(f.genetic_line)
+                    and (query_breed in normalize_breed(f.genetic_line)
+                         or normalize_breed(f.genetic_line) in query_breed)
+                    for f in features
+                ),
+                bool,
+                n,
+            )
+            boost *= np.where(
+                metadata_breed,
+                self.genetic_boost_factor,
+                np.where(content_breed, self.genetic_boost_factor * 0.8, 1.0),
+            )
+
+        age_days = context.get("age_days")
+        if age_days:
+            try:
+                age = int(age_days)
+            except (TypeError, ValueError):
+                age = None
+            if age is not None:
+                boost *= np.where(
+                    np.fromiter((age in f.ages for f in features), bool, n), 1.4, 1.0
+                )
+
+        metrics = frozenset(context.get("performance_metrics") or ())
+        if query_breed and context.get("has_performance_metric") and metrics:
+            has_metric = np.fromiter((bool(f.metrics & metrics) for f in features), bool, n)
+            boost *= np.where(content_breed & has_metric, 1.5, 1.0)
+
+        boost *= np.where(
+            np.fromiter((f.technical_source for f in features), bool, n), 1.2, 1.0
+        )
+
+        return np.minimum(boost, 3.0)  # Limite le boost maximum à 3.0x
+
+    def weighted_rrf(
+        self,
+        vector_results: List[Dict],
+        bm25_results: List[Dict],
+        params,
+        context: Dict,
+        key_fn: Callable[[Dict], str],
+    ) -> FusionCandidates:
+        """
+        RRF pondéré avec boost aviculture
+
+        Args:
+            vector_results: Résultats vectoriels (ordre = rang)
+            bm25_results: Résultats BM25 (ordre = rang)
+            params: AdaptiveRRFParams
+            context: Contexte de requête (IntelligentRRFFusion._analyze_query_context)
+            key_fn: Clé de déduplication d'un document
+
+        Returns:
+            FusionCandidates
+        """
+        docs, vector_rank, bm25_rank = self.collect(vector_results, bm25_results, key_fn)
+        features = [self.feature_extractor.features(doc) for doc in docs]
+        boost = self.poultry_boost(features, context)
+
+        k = params.rrf_k
+        vector_part = np.where(
+            vector_rank > 0, params.vector_weight * boost / (k + vector_rank), 0.0
+        )
+        bm25_part = np.where(bm25_rank > 0, params.bm25_weight / (k + bm25_rank), 0.0)
+
+        scores = (vector_part + bm25_part) * params.score_multiplier * params.genetic_boost
+        # Boost génétique prioritaire si significatif
+        scores = np.where(boost > 1.5, scores * boost, scores)
+
+        return FusionCandidates(docs, features, vector_rank, bm25_rank, boost, scores)
+
+    # === POST-TRAITEMENT ===
+
+    def post_boost(self, candidates: FusionCandidates, context: Dict) -> np.ndarray:
+        """Multiplicateurs urgence médicale et cohérence lignée-métrique"""
+        n = len(candidates)
+        multipliers = np.ones(n)
+
+        if context.get("urgency_level", 0) > 0.7:
+            medical = np.fromiter((f.medical_terms for f in candidates.features), bool, n)
+            multipliers *= np.where(medical, MEDICAL_URGENCY_BOOST, 1.0)
+
+        genetic_line = context.get("genetic_line") or ""
+        metrics = frozenset(context.get("performance_metrics") or ())
+        if genetic_line and context.get("has_performance_metric") and metrics:
+            query_breed = normalize_breed(genetic_line)
+            coherent = np.fromiter(
+                (
+                    f.mentions_breed(query_breed) and bool(f.metrics & metrics)
+                    for f in candidates.features
+                ),
+                bool,
+                n,
+            )
+            multipliers *= np.where(coherent, GENETIC_METRIC_COHERENCE_BOOST, 1.0)
+
+        return multipliers
+
+    @staticmethod
+    def _is_diverse(words: frozenset, kept_words: List[frozenset], threshold: float) -> bool:
+        if not words:
+            return True
+        for existing in kept_words:
+            if existing:
+                overlap = len(words & existing) / min(len(words), len(existing))
+                if overlap > threshold:
+                    return False
+        return True
+
+    def select(
+        self,
+        candidates: FusionCandidates,
+        multipliers: np.ndarray,
+        top_k: int,
+        diversity_threshold: float = 0.8,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Filtre de diversité + top_k
+
+        Args:
+            candidates: Candidats fusionnés
+            multipliers: Multiplicateurs de post-traitement (post_boost)
+            top_k: Nombre de documents retournés
+            diversity_threshold: Recouvrement de mots au-delà duquel un
+                candidat est jugé redondant avec un candidat déjà gardé
+
+        Returns:
+            (indices des candidats retenus, scores finaux), triés par score final
+        """
+        scores = candidates.scores
+        if top_k <= 0 or len(scores) == 0:
+            return np.zeros(0, dtype=np.intp), np.zeros(0)
+
+        order = np.argsort(-scores, kind="stable")
+
+        if len(order) <= 3:
+            kept = order
+        else:
+            max_multiplier = float(multipliers.max()) if len(multipliers) else 1.0
+            kept_list: List[int] = []
+            kept_words: List[frozenset] = []
+            kept_final: List[float] = []
+
+            for idx in order:
+                if len(kept_list) >= top_k:
+                    # Score final du top_k courant: un candidat plus bas ne peut plus y entrer
+                    kth_final = np.partition(kept_final, -top_k)[-top_k]
+                    if scores[idx] * max_multiplier <= kth_final:
+                        break
+
+                words = candidates.features[idx].words
+                if kept_list and not self._is_diverse(words, kept_words, diversity_threshold):
+                    continue
+
+                kept_list.append(int(idx))
+                kept_words.append(words)
+                kept_final.append(float(scores[idx] * multipliers[idx]))
+
+            kept = np.array(kept_list, dtype=np.intp)
+
+        final = scores[kept] * multipliers[kept]
+        ranking = np.argsort(-final, kind="stable")[:top_k]
+        return kept[ranking], final[ranking]
@@ -11,10 +11,14 @@ CORRIGÉ: Ajout fonction hybrid_search globale pour import depuis rag_engine.py
 """
 
 import asyncio
+import functools
 import logging
 from utils.types import Dict, List, Optional
 import anyio
 
+from retrieval.fusion_engine import feature_metadata
+from retrieval.weaviate_async import SearchGate, is_async_client
+
 # === NOUVEAU: Import RRF Intelligent ===
 try:
     from retrieval.enhanced_rrf_fusion import IntelligentRRFFusion
@@ -39,11 +43,31 @@ logger = logging.getLogger(__name__)
 class OptimizedHybridRetriever:
     """Retriever hybride avec fusion optimisée des scores"""
 
-    def __init__(self, client, collection_name: str = "InteliaKnowledge", enable_advanced_boosting: bool = True):
+    def __init__(
+        self,
+        client,
+        collection_name: str = "InteliaKnowledge",
+        enable_advanced_boosting: bool = True,
+        async_client=None,
+        search_gate: Optional[SearchGate] = None,
+    ):
+        """
+        Args:
+            client: Client Weaviate (sync v4/v3, ou WeaviateAsyncClient)
+            collection_name: Collection interrogée
+            enable_advanced_boosting: Active le boosting qualité/entités
+            async_client: WeaviateAsyncClient connecté (recherches sans thread)
+            search_gate: Limite de concurrence + deadline + métriques de file
+        """
         self.client = client
         self.collection_name = collection_name
         self.is_v4 = hasattr(client, "collections")
 
+        # === Client async natif: plus de thread anyio par recherche ===
+        self.async_client = async_client or (client if is_async_client(client) else None)
+        self.search_gate = search_gate or SearchGate()
+        self._thread_limiter = None
+
         # Configuration de fusion hybride
         self.fusion_config = {
             "vector_weight": 0.7,  # Poids recherche vectorielle
@@ -138,14 +162,10 @@ class OptimizedHybridRetriever:
         """Recherche hybride utilisant le RRF intelligent"""
 
         try:
-            # 1. Recherche vectorielle étendue
-            vector_results = await self._vector_search_v4(
-                query_vector, top_k * 2, where_filter
-            )
-
-            # 2. Recherche BM25 étendue (via hybrid avec alpha=0)
-            bm25_results = await self._bm25_search_v4(
-                query_text, top_k * 2, where_filter
+            # 1-2. Recherches vectorielle et BM25 (hybrid alpha=0) étendues, en parallèle
+            vector_results, bm25_results = await asyncio.gather(
+                self._vector_search_v4(query_vector, top_k * 2, where_filter),
+                self._bm25_search_v4(query_text, top_k * 2, where_filter),
             )
 
             # 3. Fusion via RRF intelligent
@@ -167,6 +187,47 @@ class OptimizedHybridRetriever:
                 query_vector, query_text, top_k, where_filter, alpha
             )
 
+    # === EXÉCUTION DES REQUÊTES WEAVIATE ===
+
+    def _add_filter(self, search_params: Dict, where_filter: Optional[Dict]):
+        """Ajoute le filtre v4 converti aux paramètres de recherche"""
+        if where_filter:
+            v4_filter = self._convert_to_v4_filter(where_filter)
+            if v4_filter:
+                search_params["filters"] = v4_filter
+
+    async def _run_query(self, search_type: str, method: str, search_params: Dict):
+        """
+        Exécute collection.query.<method> sous le SearchGate
+
+        Client async: appel natif, aucun thread occupé. Client sync: thread
+        dédié avec un limiteur à la taille du gate (le gate reste le seul
+        point d'attente, mesuré). Un thread ne peut pas être interrompu: à la
+        deadline, le gate cesse d'attendre mais le thread continue jusqu'au
+        retour de Weaviate (borné par le timeout de requête du client) et
+        garde sa place dans le limiteur.
+        """
+        if self.async_client is not None:
+            query = self.async_client.collections.get(self.collection_name).query
+
+            def call():
+                return getattr(query, method)(**search_params)
+
+        else:
+            query = self.client.collections.get(self.collection_name).query
+            if self._thread_limiter is None:
+                self._thread_limiter = anyio.CapacityLimiter(
+                    self.search_gate.max_concurrency
+                )
+
+            def call():
+                return anyio.to_thread.run_sync(
+                    functools.partial(getattr(query, method), **search_params),
+                    limiter=self._thread_limiter,
+                )
+
+        return await self.search_gate.run(search_type, call)
+
     # === MÉTHODES RECHERCHE SÉPARÉES POUR RRF ===
 
     async def _vector_search_v4(
@@ -174,26 +235,17 @@ class OptimizedHybridRetriever:
     ) -> List[Dict]:
         """Recherche vectorielle pure pour RRF intelligent"""
 
-        def _sync_vector_search():
+        try:
             import weaviate.classes as wvc
 
-            collection = self.client.collections.get(self.collection_name)
-
             search_params = {
-                "vector": query_vector,
+                "near_vector": query_vector,
                 "limit": top_k,
                 "return_metadata": wvc.query.MetadataQuery(score=True),
             }
+            self._add_filter(search_params, where_filter)
 
-            if where_filter:
-                v4_filter = self._convert_to_v4_filter(where_filter)
-                if v4_filter:
-                    search_params["where"] = v4_filter
-
-            return collection.query.near_vector(**search_params)
-
-        try:
-            response = await anyio.to_thread.run_sync(_sync_vector_search)
+            response = await self._run_query("vector", "near_vector", search_params)
 
             documents = []
             for obj in response.objects:
@@ -207,6 +259,7 @@ class OptimizedHybridRetriever:
                         "species": obj.properties.get("species", ""),
                         "phase": obj.properties.get("phase", ""),
                         "age_band": obj.properties.get("age_band", ""),
+                        **feature_metadata(obj.properties),
                         "search_type": "vector_only",
                     },
                     "score": float(getattr(obj.metadata, "score", 0.0)),
@@ -225,11 +278,9 @@ class OptimizedHybridRetriever:
     ) -> List[Dict]:
         """Recherche BM25 pure pour RRF intelligent"""
 
-        def _sync_bm25_search():
+        try:
             import weaviate.classes as wvc
 
-            collection = self.client.collections.get(self.collection_name)
-
             # Recherche BM25 via hybrid avec alpha=0 (BM25 pur)
             search_params = {
                 "query": query_text,
@@ -237,16 +288,9 @@ class OptimizedHybridRetriever:
                 "limit": top_k,
                 "return_metadata": wvc.query.MetadataQuery(score=True),
             }
+            self._add_filter(search_params, where_filter)
 
-            if where_filter:
-                v4_filter = self._convert_to_v4_filter(where_filter)
-                if v4_filter:
-                    search_params["where"] = v4_filter
-
-            return collection.query.hybrid(**search_params)
-
-        try:
-            response = await anyio.to_thread.run_sync(_sync_bm25_search)
+            response = await self._run_query("bm25", "hybrid", search_params)
 
             documents = []
             for obj in response.objects:
@@ -260,6 +304,7 @@ class OptimizedHybridRetriever:
                         "species": obj.properties.get("species", ""),
                         "phase": obj.properties.get("phase", ""),
                         "age_band": obj.properties.get("age_band", ""),
+                        **feature_metadata(obj.properties),
                         "search_type": "bm25_only",
                     },
                     "score": float(getattr(obj.metadata, "score", 0.0)),
@@ -285,32 +330,21 @@ class OptimizedHybridRetriever:
     ) -> List[Dict]:
         """Recherche hybride native Weaviate v4 (méthode existante)"""
         try:
+            import weaviate.classes as wvc
 
-            def _sync_hybrid_search():
-                import weaviate.classes as wvc
-
-                collection = self.client.collections.get(self.collection_name)
-
-                # Paramètres de recherche hybride
-                search_params = {
-                    "query": query_text,
-                    "vector": query_vector,
-                    "alpha": alpha,  # Fusion automatique par Weaviate
-                    "limit": top_k,
-                    "return_metadata": wvc.query.MetadataQuery(
-                        score=True, explain_score=True
-                    ),
-                }
-
-                # Ajouter les filtres si présents
-                if where_filter:
-                    v4_filter = self._convert_to_v4_filter(where_filter)
-                    if v4_filter:
-                        search_params["where"] = v4_filter
-
-                return collection.query.hybrid(**search_params)
+            # Paramètres de recherche hybride
+            search_params = {
+                "query": query_text,
+                "vector": query_vector,
+                "alpha": alpha,  # Fusion automatique par Weaviate
+                "limit": top_k,
+                "return_metadata": wvc.query.MetadataQuery(
+                    score=True, explain_score=True
+                ),
+            }
+            self._add_filter(search_params, where_filter)
 
-            response = await anyio.to_thread.run_sync(_sync_hybrid_search)
+            response = await self._run_query("hybrid", "hybrid", search_params)
 
             documents = []
             for obj in response.objects:
@@ -330,6 +364,7 @@ class OptimizedHybridRetriever:
                         "species": obj.properties.get("species", ""),
                         "phase": obj.properties.get("phase", ""),
                         "age_band": obj.properties.get("age_band", ""),
+                        **feature_metadata(obj.properties),
                         "hybrid_used": True,
                         "alpha": alpha,
                         "explain_score": explain_score,
@@ -575,7 +610,19 @@ class OptimizedHybridRetriever:
                     else where_dict["path"]
                 )
                 operator = where_dict.get("operator", "Equal")
-                value = where_dict.get("valueText", where_dict.get("valueString", ""))
+                value = where_dict.get(
+                    "valueText",
+                    where_dict.get("valueString", where_dict.get("valueBoolean", "")),
+                )
+
+                # Features d'ingestion (breed_mentions, age_days_mentioned, ...)
+                if operator == "ContainsAny":
+                    values = where_dict.get("valueTextArray") or where_dict.get(
+                        "valueIntArray", []
+                    )
+                    return wvc.query.Filter.by_property(property_name).contains_any(
+                        values
+                    )
 
                 if operator == "Like":
                     return wvc.query.Filter.by_property(property_name).like(value)
@@ -611,6 +658,10 @@ class OptimizedHybridRetriever:
                 "enabled": ENABLE_INTELLIGENT_RRF,
                 "configured": bool(self.intelligent_rrf),
             },
+            "weaviate_search": {
+                "async_client": self.async_client is not None,
+                **self.search_gate.get_stats(),
+            },
             "fusion_methods": [
                 "reciprocal_rank_fusion",
                 "weighted_score_normalization",
@@ -658,6 +709,7 @@ async def hybrid_search(
     alpha: float = 0.7,
     query_context: Optional[Dict] = None,
     intent_result=None,
+    async_client=None,
 ) -> List[Dict]:
     """
     FONCTION GLOBALE HYBRID_SEARCH - CORRECTION POUR RAG_ENGINE.PY
@@ -669,7 +721,9 @@ async def hybrid_search(
         raise ValueError("Client Weaviate requis pour hybrid_search")
 
     # Créer une instance du retriever
-    retriever = OptimizedHybridRetriever(client, collection_name)
+    retriever = OptimizedHybridRetriever(
+        client, collection_name, async_client=async_client
+    )
 
     # Appeler la méthode de la classe
     return await retriever.hybrid_search(
@@ -684,10 +738,21 @@ async def hybrid_search(
 
 
 def create_hybrid_retriever(
-    client, collection_name: str = "InteliaKnowledge"
+    client,
+    collection_name: str = "InteliaKnowledge",
+    async_client=None,
+    search_gate: Optional[SearchGate] = None,
 ) -> OptimizedHybridRetriever:
-    """Factory pour créer un retriever hybride configuré"""
-    return OptimizedHybridRetriever(client, collection_name)
+    """
+    Factory pour créer un retriever hybride configuré
+
+    Args:
+        async_client: WeaviateAsyncClient connecté (WeaviateCore.weaviate_async_client)
+        search_gate: Gate partagé avec les autres retrievers (WeaviateCore.search_gate)
+    """
+    return OptimizedHybridRetriever(
+        client, collection_name, async_client=async_client, search_gate=search_gate
+    )
 
 
 # ============================================================================
@@ -0,0 +1,433 @@
+# -*- coding: utf-8 -*-
+"""
+local_index.py - Index de recherche en mémoire (vecteurs float16 + BM25)
+Version: 1.0.0
+Last modified: 2025-11-12
+"""
+"""
+local_index.py - Index de recherche en mémoire (vecteurs float16 + BM25)
+
+La base de connaissances compte quelques dizaines de milliers de chunks:
+une recherche exacte (force brute) tient en mémoire et répond sans aucun
+appel réseau. L'index est construit depuis le chunk store mappé (export
+snapshot de la collection + ingestions suivantes, voir chunk_store.py) et
+suit ses modifications incrémentalement (changes_since).
+
+- VectorIndex: matrice float16 de vecteurs normalisés, produit scalaire par
+  blocs convertis en float32, top-k par argpartition
+- BM25Index: index inversé (tokenisation "word" de Weaviate, k1=1.2, b=0.75)
+- LocalHybridIndex: fusion relativeScoreFusion (scores min-max normalisés,
+  pondérés par alpha) comme la recherche hybride Weaviate, donc comparable
+  au seuil RAG_CONFIDENCE_THRESHOLD; filtres where v3 (Equal, Like, And, Or)
+  évalués sur les métadonnées du store
+
+Utilisé par WeaviateCore quand LOCAL_INDEX_MODE vaut "primary" (toujours)
+ou "fallback" (Weaviate en erreur ou au-delà de LOCAL_INDEX_DEADLINE).
+"""
+
+import fnmatch
+import logging
+import math
+import re
+import threading
+import time
+from collections import defaultdict
+from utils.types import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from core.data_models import Document
+
+logger = logging.getLogger(__name__)
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+# Lignes converties en float32 par bloc (mémoire temporaire bornée)
+BLOCK_ROWS = 4096
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Tokenisation "word" (alphanumérique, minuscules) comme Weaviate"""
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+def matches_where(where: Optional[Dict], properties: Dict[str, Any]) -> bool:
+    """
+    Évalue un filtre where v3 ({"path", "operator", "valueText"} ou
+    {"operator": "And"/"Or", "operands"}) sur les propriétés d'un chunk
+
+    Les opérateurs inconnus valent Equal, comme _to_v4_filter.
+    """
+    if not where:
+        return True
+
+    if "path" in where:
+        path = where["path"]
+        value = properties.get(path[-1] if isinstance(path, list) else path)
+        expected = str(where.get("valueText", where.get("valueString", "")))
+        values = value if isinstance(value, list) else [value]
+        if where.get("operator") == "Like":
+            pattern = expected.lower()
+            return any(
+                v is not None and fnmatch.fnmatchcase(str(v).lower(), pattern)
+                for v in values
+            )
+        return any(v is not None and str(v) == expected for v in values)
+
+    operands = where.get("operands") or []
+    if not operands:
+        return True
+    results = (matches_where(operand, properties) for operand in operands)
+    if where.get("operator", "And").lower() == "or":
+        return any(results)
+    return all(results)
+
+
+def _normalize_scores(scores: Dict[str, float]) -> Dict[str, float]:
+    """Min-max sur [0, 1] (relativeScoreFusion); score unique -> 1.0"""
+    if not scores:
+        return {}
+    low, high = min(scores.values()), max(scores.values())
+    if high - low <= 0:
+        return {key: 1.0 for key in scores}
+    return {key: (value - low) / (high - low) for key, value in scores.items()}
+
+
+class VectorIndex:
+    """Recherche exacte cosinus sur une matrice float16 (lignes réutilisées)"""
+
+    def __init__(self, dim: int, initial_capacity: int = 1024):
+        self.dim = dim
+        self._matrix = np.zeros((initial_capacity, dim), dtype=np.float16)
+        self._alive = np.zeros(initial_capacity, dtype=bool)
+        self._ids: List[Optional[str]] = [None] * initial_capacity
+        self._rows: Dict[str, int] = {}
+        self._free: List[int] = []
+        self._size = 0  # lignes utilisées (vivantes ou libres)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, object_id: str) -> bool:
+        return object_id in self._rows
+
+    def add(self, object_id: str, vector) -> None:
+        """Ajoute ou remplace le vecteur d'un chunk"""
+        vector = np.asarray(vector, dtype=np.float32)
+        if vector.shape != (self.dim,):
+            raise ValueError(f"Dimension {vector.shape} != ({self.dim},)")
+        norm = float(np.linalg.norm(vector))
+        if norm > 0:
+            vector = vector / norm
+
+        row = self._rows.get(object_id)
+        if row is None:
+            row = self._free.pop() if self._free else self._next_row()
+            self._rows[object_id] = row
+            self._ids[row] = object_id
+        self._matrix[row] = vector
+        self._alive[row] = True
+
+    def _next_row(self) -> int:
+        if self._size == len(self._matrix):
+            capacity = len(self._matrix) * 2
+            matrix = np.zeros((capacity, self.dim), dtype=np.float16)
+            matrix[: self._size] = self._matrix[: self._size]
+            alive = np.zeros(capacity, dtype=bool)
+            alive[: self._size] = self._alive[: self._size]
+            self._matrix, self._alive = matrix, alive
+            self._ids.extend([None] * (capacity - len(self._ids)))
+        self._size += 1
+        return self._size - 1
+
+    def remove(self, object_id: str) -> None:
+        row = self._rows.pop(object_id, None)
+        if row is not None:
+            self._alive[row] = False
+            self._ids[row] = None
+            self._free.append(row)
+
+    def scores(self, query_vector) -> np.ndarray:
+        """Similarité cosinus de chaque ligne (-inf pour les lignes libres)"""
+        query = np.asarray(query_vector, dtype=np.float32)
+        if query.shape != (self.dim,):
+            raise ValueError(f"Dimension requête {query.shape} != ({self.dim},)")
+        norm = float(np.linalg.norm(query))
+        if norm > 0:
+            query = query / norm
+
+        scores = np.empty(self._size, dtype=np.float32)
+        for start in range(0, self._size, BLOCK_ROWS):
+            block = self._matrix[start : start + BLOCK_ROWS][: self._size - start]
+            scores[start : start + len(block)] = block.astype(np.float32) @ query
+        scores[~self._alive[: self._size]] = -np.inf
+        return scores
+
+    def search(
+        self,
+        query_vector,
+        top_k: int,
+        accept: Optional[Callable[[str], bool]] = None,
+    ) -> List[Tuple[str, float]]:
+        """
+        Top-k (uuid, similarité cosinus)
+
+        Args:
+            accept: Prédicat de filtre, évalué par ordre de score décroissant
+        """
+        if not self._rows or top_k <= 0:
+            return []
+        scores = self.scores(query_vector)
+
+        candidates = min(len(scores), top_k if accept is None else top_k * 4)
+        while True:
+            top = np.argpartition(-scores, candidates - 1)[:candidates]
+            top = top[np.argsort(-scores[top])]
+            results = []
+            for row in top:
+                if scores[row] == -np.inf:
+                    break
+                object_id = self._ids[row]
+                if accept is None or accept(object_id):
+                    results.append((object_id, float(scores[row])))
+                    if len(results) == top_k:
+                        return results
+            if candidates == len(scores):
+                return results
+            candidates = min(len(scores), candidates * 4)
+
+
+class BM25Index:
+    """Index inversé BM25 (termes -> {uuid: fréquence})"""
+
+    def __init__(self, k1: float = BM25_K1, b: float = BM25_B):
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[str, int]] = defaultdict(dict)
+        self._doc_terms: Dict[str, List[str]] = {}
+        self._doc_lengths: Dict[str, int] = {}
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._doc_lengths)
+
+    def add(self, object_id: str, text: str) -> None:
+        """Indexe (ou réindexe) le contenu d'un chunk"""
+        self.remove(object_id)
+        tokens = tokenize(text)
+        frequencies: Dict[str, int] = defaultdict(int)
+        for token in tokens:
+            frequencies[token] += 1
+        for term, frequency in frequencies.items():
+            self._postings[term][object_id] = frequency
+        self._doc_terms[object_id] = list(frequencies)
+        self._doc_lengths[object_id] = len(tokens)
+        self._total_length += len(tokens)
+
+    def remove(self, object_id: str) -> None:
+        terms = self._doc_terms.pop(object_id, None)
+        if terms is None:
+            return
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(object_id, None)
+                if not postings:
+                    del self._postings[term]
+        self._total_length -= self._doc_lengths.pop(object_id)
+
+    def search(
+        self,
+        query: str,
+        top_k: int,
+        accept: Optional[Callable[[str], bool]] = None,
+    ) -> List[Tuple[str, float]]:
+        """Top-k (uuid, score BM25)"""
+        count = len(self._doc_lengths)
+        if not count or top_k <= 0:
+            return []
+        average_length = self._total_length / count or 1.0
+
+        scores: Dict[str, float] = defaultdict(float)
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for object_id, frequency in postings.items():
+                length_norm = 1 - self.b + self.b * (
+                    self._doc_lengths[object_id] / average_length
+                )
+                scores[object_id] += idf * (
+                    frequency * (self.k1 + 1) / (frequency + self.k1 * length_norm)
+                )
+
+        results = []
+        for object_id, score in sorted(scores.items(), key=lambda x: -x[1]):
+            if accept is None or accept(object_id):
+                results.append((object_id, score))
+                if len(results) == top_k:
+                    break
+        return results
+
+
+class LocalHybridIndex:
+    """
+    Recherche hybride en mémoire sur le chunk store mappé
+
+    Usage:
+        index = LocalHybridIndex(mapped_store)
+        index.sync()                                  # modifications ingestion
+        documents = index.search(vector, "poids ross 308", 15, where, alpha=0.6)
+    """
+
+    def __init__(self, store, sync_interval: float = 5.0):
+        """
+        Args:
+            store: MappedChunkStore (contenu, métadonnées, vecteurs par UUID)
+            sync_interval: Délai minimal entre deux synchronisations
+                déclenchées par search()
+        """
+        self.store = store
+        self.sync_interval = sync_interval
+        self.vectors: Optional[VectorIndex] = None
+        self.bm25 = BM25Index()
+        self._cursor: Tuple[int, int] = (-1, 0)
+        self._last_sync = 0.0
+        self._lock = threading.Lock()
+
+        self.stats = {
+            "searches": 0,
+            "synced_changes": 0,
+            "rebuilds": 0,
+            "missing_vectors": 0,
+            "last_search_ms": 0.0,
+        }
+
+    def __len__(self) -> int:
+        return len(self.bm25)
+
+    @property
+    def ready(self) -> bool:
+        return self.vectors is not None and len(self.vectors) > 0
+
+    def sync(self, force: bool = False) -> int:
+        """
+        Applique les modifications du chunk store depuis la dernière
+        synchronisation (ajouts, mises à jour, suppressions)
+
+        Returns:
+            Nombre d'UUID traités
+        """
+        now = time.time()
+        if not force and now - self._last_sync < self.sync_interval:
+            return 0
+
+        with self._lock:
+            self._last_sync = now
+            self._cursor, changed, reset = self.store.changes_since(self._cursor)
+            if reset:
+                self.vectors = None
+                self.bm25 = BM25Index()
+                self.stats["missing_vectors"] = 0
+                self.stats["rebuilds"] += 1
+
+            for object_id in dict.fromkeys(changed):
+                self._apply(object_id)
+
+            self.stats["synced_changes"] += len(changed)
+            if changed:
+                logger.info(
+                    f"Index local: {len(changed)} modifications, "
+                    f"{len(self.bm25)} chunks, "
+                    f"{len(self.vectors) if self.vectors else 0} vecteurs"
+                )
+            return len(changed)
+
+    def _apply(self, object_id: str):
+        content = self.store.content(object_id)
+        if content is None:
+            self.bm25.remove(object_id)
+            if self.vectors is not None:
+                self.vectors.remove(object_id)
+            return
+
+        self.bm25.add(object_id, content)
+        vector = self.store.vector(object_id)
+        if vector is None:
+            # Vectorisé côté Weaviate: BM25 seulement jusqu'au prochain snapshot
+            self.stats["missing_vectors"] += 1
+            if self.vectors is not None:
+                self.vectors.remove(object_id)
+            return
+        if self.vectors is None:
+            self.vectors = VectorIndex(len(vector))
+        self.vectors.add(object_id, vector)
+
+    def search(
+        self,
+        query_vector: List[float],
+        query_text: str,
+        top_k: int,
+        where_filter: Optional[Dict] = None,
+        alpha: float = 0.7,
+    ) -> List[Document]:
+        """
+        Recherche hybride locale (vecteurs + BM25, fusion relative)
+
+        Returns:
+            Documents complets (contenu décodé pour le top-k seulement)
+        """
+        start = time.time()
+        self.sync()
+
+        accept = None
+        if where_filter:
+            accept = lambda object_id: matches_where(  # noqa: E731
+                where_filter, self.store.metadata(object_id) or {}
+            )
+
+        candidates = max(top_k * 2, 20)
+        with self._lock:
+            vector_hits = (
+                self.vectors.search(query_vector, candidates, accept)
+                if self.vectors is not None and alpha > 0
+                else []
+            )
+            bm25_hits = (
+                self.bm25.search(query_text, candidates, accept) if alpha < 1 else []
+            )
+
+        vector_scores = _normalize_scores(dict(vector_hits))
+        bm25_scores = _normalize_scores(dict(bm25_hits))
+        fused = {
+            object_id: alpha * vector_scores.get(object_id, 0.0)
+            + (1 - alpha) * bm25_scores.get(object_id, 0.0)
+            for object_id in {**vector_scores, **bm25_scores}
+        }
+        ranked = sorted(fused.items(), key=lambda x: -x[1])[:top_k]
+
+        documents = []
+        for object_id, score in ranked:
+            doc = self.store.get_document(object_id, score=score)
+            if doc is None:
+                continue
+            doc.metadata.update(
+                {"local_index": True, "hybrid_used": True, "alpha": alpha}
+            )
+            documents.append(doc)
+
+        elapsed_ms = (time.time() - start) * 1000
+        self.stats["searches"] += 1
+        self.stats["last_search_ms"] = round(elapsed_ms, 2)
+        return documents
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "chunks": len(self.bm25),
+            "vectors": len(self.vectors) if self.vectors else 0,
+            "dim": self.vectors.dim if self.vectors else None,
+        }
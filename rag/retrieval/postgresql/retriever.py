@@ -16,8 +16,10 @@ Version 3.4: Support du filtrage par species + mode strict/souple
 - Format documents avec 'content' + metadata
 """
 
+import asyncio
 import logging
 import re
+from collections import defaultdict
 from utils.types import Dict, List, Any, Tuple, Optional
 
 from .config import ASYNCPG_AVAILABLE
@@ -270,220 +272,458 @@ class PostgreSQLRetriever(InitializableMixin):
             async with self.pool.acquire() as conn:
                 rows = await conn.fetch(sql_query, *params)
 
-            results = []
-            for i, row in enumerate(rows):
-                try:
-                    result = MetricResult(
-                        company=row.get("company_name", "Unknown"),
-                        breed=row.get("breed_name", "Unknown"),
-                        strain=row.get("strain_name", "Unknown"),
-                        species=row.get("species", "Unknown"),
-                        metric_name=row.get("metric_name", "Unknown"),
-                        value_numeric=row.get("value_numeric"),
-                        value_text=row.get("value_text"),
-                        unit=row.get("unit"),
-                        age_min=row.get("age_min"),
-                        age_max=row.get("age_max"),
-                        sheet_name=row.get("sheet_name", ""),
-                        category=row.get("category_name", ""),
-                        sex=row.get("sex"),
-                        housing_system=row.get("housing_system"),
-                        data_type=row.get("data_type"),
-                        unit_system=row.get("unit_system"),
-                        confidence=self._calculate_relevance(
-                            query, dict(row), normalized_entities
-                        ),
-                    )
-                    results.append(result)
-                except Exception as row_error:
-                    logger.error(f"Row conversion error {i}: {row_error}")
-                    continue
+            formatted_docs = self._rows_to_docs(
+                rows, query, normalized_entities, unit_preference
+            )
+            formatted_docs = await self._rerank_docs(query, formatted_docs)
 
-            logger.info(
-                f"PostgreSQL: {len(results)} metrics found from {len(rows)} rows"
+            return self._build_metrics_result(
+                formatted_docs,
+                query,
+                normalized_entities,
+                entities,
+                strict_sex_match,
+                filters,
             )
 
-            # Conversion: Transformer MetricResult en dict avec 'content'
-            formatted_docs = []
-            for metric in results:
-                # Extraire le type de métrique de manière propre
-                metric_type_clean = self._extract_metric_type(metric.metric_name)
+        except Exception as e:
+            logger.error(f"PostgreSQL search error: {e}")
+            return RAGResult(
+                context_docs=[],
+                source=RAGSource.INTERNAL_ERROR,
+                metadata={
+                    "error": str(e),
+                    "query": query,
+                    "entities": entities,
+                    "filters": filters,
+                },
+            )
 
-                # Informations sur le sexe
-                sex_info = self._format_sex_info(metric.sex)
+    async def search_metrics_batch(
+        self,
+        queries: List[str],
+        entity_sets: List[Dict[str, Any]],
+        top_k: int = 10,
+        strict_sex_match: bool = False,
+        filters: Dict[str, Any] = None,
+    ) -> List[RAGResult]:
+        """
+        Recherche de métriques pour plusieurs jeux d'entités (comparaisons multi-races)
 
-                # Valeurs à utiliser (possiblement converties)
-                display_value = metric.value_numeric
-                display_unit = metric.unit
-                original_value = None
-                original_unit = None
-                was_converted = False
+        Les jeux qui ne diffèrent que par la race (mêmes âge, sexe, métrique et
+        unités) partagent une seule requête `s.strain_name = ANY($1)`, avec
+        top_k lignes par souche. Les autres (calcul de moulée, race sans mapping
+        PostgreSQL, souche seule dans son groupe) passent par search_metrics.
+        Toutes les requêtes partent en parallèle.
 
-                # Conversion d'unités si nécessaire
-                if (
-                    unit_preference
-                    and metric.value_numeric is not None
-                    and metric.unit
-                    and metric.unit_system
-                ):
-                    # Vérifier si conversion nécessaire
-                    needs_conversion = False
-                    if unit_preference == "metric" and metric.unit_system in [
-                        "imperial",
-                        "mixed",
-                    ]:
-                        needs_conversion = True
-                    elif unit_preference == "imperial" and metric.unit_system in [
-                        "metric",
-                        "mixed",
-                    ]:
-                        needs_conversion = True
-
-                    if needs_conversion:
-                        # Tenter la conversion
-                        converted_value, converted_unit = (
-                            UnitConverter.convert_to_preference(
-                                metric.value_numeric, metric.unit, unit_preference
-                            )
-                        )
+        Args:
+            queries: Une requête par jeu d'entités
+            entity_sets: Jeux d'entités (breed, age_days, sex, ...)
+            top_k: Nombre maximum de résultats par jeu
+            strict_sex_match: DEPRECATED - voir search_metrics
+            filters: Filtres additionnels (ex: {'species': 'broiler'})
 
-                        if converted_value is not None and converted_unit:
-                            # Conversion réussie
-                            original_value = metric.value_numeric
-                            original_unit = metric.unit
-                            display_value = round(converted_value, 2)
-                            display_unit = converted_unit
-                            was_converted = True
-                            logger.debug(
-                                f"🔄 Converted {original_value} {original_unit} → {display_value} {display_unit}"
-                            )
-
-                # Créer un contenu textuel naturel et lisible pour le LLM
-                # ✅ CORRECTION: Utiliser breed + strain pour nom complet (ex: "Cobb 500", "Ross 308")
-                full_breed_name = (
-                    f"{metric.breed} {metric.strain}" if metric.breed else metric.strain
-                )
+        Returns:
+            Un RAGResult par jeu d'entités, dans l'ordre d'entrée
+        """
+        if len(queries) != len(entity_sets):
+            raise ValueError("queries et entity_sets doivent avoir la même taille")
 
-                if display_value is not None:
-                    # Phrase complète avec contexte
-                    content = (
-                        f"At {metric.age_min} days old, {full_breed_name} {sex_info} chickens "
-                        f"have an average {metric_type_clean} of {display_value} "
-                        f"{display_unit or 'grams'}."
-                    )
-                else:
-                    # Fallback pour valeurs textuelles
-                    content = (
-                        f"For {full_breed_name} at {metric.age_min} days ({sex_info}): "
-                        f"{metric_type_clean} = {metric.value_text or 'N/A'}"
+        if not self.is_initialized or not self.pool:
+            try:
+                await self.initialize()
+            except Exception as e:
+                logger.error(f"Initialization failed: {e}")
+                return [
+                    RAGResult(
+                        context_docs=[],
+                        source=RAGSource.INTERNAL_ERROR,
+                        metadata={"error": str(e), "initialized": False},
                     )
+                    for _ in entity_sets
+                ]
+
+        groups = defaultdict(list)
+        single = []
+        for i, (query, entities) in enumerate(zip(queries, entity_sets)):
+            group = self._strain_batch_group(query, entities or {})
+            if group is None:
+                single.append(i)
+            else:
+                key, strain_name = group
+                groups[key].append((i, strain_name))
 
-                # Structurer avec metadata complète
-                metadata = {
-                    "company": metric.company,
-                    "breed": metric.breed,
-                    "strain": metric.strain,
-                    "species": metric.species,
-                    "metric_name": metric.metric_name,
-                    "value_numeric": display_value,
-                    "value_text": metric.value_text,
-                    "unit": display_unit,
-                    "age_min": metric.age_min,
-                    "age_max": metric.age_max,
-                    "category": metric.category,
-                    "sex": metric.sex,
-                    "housing_system": metric.housing_system,
-                    "data_type": metric.data_type,
-                    "unit_system": metric.unit_system,
-                }
+        batches = []
+        for members in groups.values():
+            if len({strain_name for _, strain_name in members}) > 1:
+                batches.append(members)
+            else:
+                single.extend(i for i, _ in members)
+
+        async def search_one(i):
+            return {
+                i: await self.search_metrics(
+                    query=queries[i],
+                    entities=entity_sets[i],
+                    top_k=top_k,
+                    strict_sex_match=strict_sex_match,
+                    filters=filters,
+                )
+            }
 
-                # Ajouter info de conversion si applicable
-                if was_converted:
-                    metadata["original_value"] = original_value
-                    metadata["original_unit"] = original_unit
-                    metadata["converted"] = True
-                else:
-                    metadata["converted"] = False
-
-                formatted_docs.append(
-                    {
-                        "content": content,
-                        "metadata": metadata,
-                        "score": metric.confidence,
-                    }
+        async def search_batch(members):
+            try:
+                return await self._search_strains(
+                    members, queries, entity_sets, top_k, strict_sex_match, filters
                 )
+            except Exception as e:
+                logger.error(f"PostgreSQL batch error: {e}, requêtes individuelles")
+                merged = {}
+                for partial in await asyncio.gather(
+                    *(search_one(i) for i, _ in members)
+                ):
+                    merged.update(partial)
+                return merged
 
-            # NOUVEAU: Reranking Cohere si plus de 3 résultats
-            if self.reranker and self.reranker.is_enabled() and len(formatted_docs) > 3:
-                try:
-                    logger.info(
-                        f"🔄 Applying Cohere reranking on {len(formatted_docs)} PostgreSQL results"
-                    )
+        results = {}
+        for partial in await asyncio.gather(
+            *(search_batch(members) for members in batches),
+            *(search_one(i) for i in single),
+        ):
+            results.update(partial)
 
-                    reranked_docs = await self.reranker.rerank(
-                        query=query,
-                        documents=formatted_docs,
-                        top_n=min(5, len(formatted_docs)),  # Top 5 après rerank
-                    )
+        logger.info(
+            f"PostgreSQL batch: {len(entity_sets)} jeux d'entités, "
+            f"{len(batches)} requête(s) ANY + {len(single)} individuelle(s)"
+        )
 
-                    logger.info(
-                        f"✅ PostgreSQL reranking: {len(formatted_docs)} -> {len(reranked_docs)} docs "
-                        f"(top score: {reranked_docs[0]['score']:.3f})"
-                    )
+        return [results[i] for i in range(len(entity_sets))]
+
+    def _strain_batch_group(
+        self, query: str, entities: Dict[str, Any]
+    ) -> Optional[Tuple[Tuple, str]]:
+        """
+        Clé de regroupement batch (entités hors race + unités) et nom PostgreSQL
+        de la souche, ou None si le jeu doit passer par search_metrics
+        """
+        breed = entities.get("breed")
+        if not breed:
+            return None
+
+        # Calcul de moulée et métrique 'performance' dépendent du texte de la requête
+        if entities.get("target_age_days") or entities.get("metric") == "performance":
+            return None
+
+        strain_name = self._get_db_breed_name(breed)
+        if not strain_name or strain_name == breed:
+            return None
+
+        shared = tuple(
+            sorted(
+                (key, value)
+                for key, value in self._normalize_entities(entities).items()
+                if key != "breed" and not key.startswith("_")
+            )
+        )
+        unit_preference = self._detect_unit_preference_from_query(query, entities)
+        return (shared, unit_preference), strain_name
+
+    async def _search_strains(
+        self,
+        members: List[Tuple[int, str]],
+        queries: List[str],
+        entity_sets: List[Dict[str, Any]],
+        top_k: int,
+        strict_sex_match: bool,
+        filters: Dict[str, Any] = None,
+    ) -> Dict[int, RAGResult]:
+        """Une requête ANY($n) pour un groupe de jeux ne différant que par la race"""
+        first = members[0][0]
+        shared = {
+            key: value for key, value in entity_sets[first].items() if key != "breed"
+        }
+        unit_preference = self._detect_unit_preference_from_query(
+            queries[first], entity_sets[first]
+        )
+        strain_names = sorted({strain_name for _, strain_name in members})
+
+        sql_query, params = self._build_query(
+            queries[first],
+            self._normalize_entities(shared),
+            shared,
+            top_k,
+            strict_sex_match,
+            filters,
+            unit_preference,
+            strain_names=strain_names,
+        )
+
+        async with self.pool.acquire() as conn:
+            rows = await conn.fetch(sql_query, *params)
 
-                    formatted_docs = reranked_docs
+        rows_by_strain = defaultdict(list)
+        for row in rows:
+            rows_by_strain[row.get("strain_name")].append(row)
 
-                except Exception as rerank_error:
-                    logger.error(
-                        f"PostgreSQL reranking error: {rerank_error}, using original results"
+        logger.info(
+            f"PostgreSQL ANY: {len(rows)} rows pour {len(strain_names)} souches "
+            f"({', '.join(strain_names)})"
+        )
+
+        normalized = [self._normalize_entities(entity_sets[i]) for i, _ in members]
+        docs = [
+            self._rows_to_docs(
+                rows_by_strain.get(strain_name, []),
+                queries[i],
+                normalized_entities,
+                unit_preference,
+            )
+            for (i, strain_name), normalized_entities in zip(members, normalized)
+        ]
+        docs = await asyncio.gather(
+            *(self._rerank_docs(queries[i], d) for (i, _), d in zip(members, docs))
+        )
+
+        return {
+            i: self._build_metrics_result(
+                d,
+                queries[i],
+                normalized_entities,
+                entity_sets[i],
+                strict_sex_match,
+                filters,
+            )
+            for (i, _), d, normalized_entities in zip(members, docs, normalized)
+        }
+
+    def _rows_to_docs(
+        self,
+        rows,
+        query: str,
+        normalized_entities: Dict[str, str],
+        unit_preference: Optional[str],
+    ) -> List[Dict[str, Any]]:
+        """Convertit les lignes SQL en documents formatés ('content' + metadata)"""
+        results = []
+        for i, row in enumerate(rows):
+            try:
+                result = MetricResult(
+                    company=row.get("company_name", "Unknown"),
+                    breed=row.get("breed_name", "Unknown"),
+                    strain=row.get("strain_name", "Unknown"),
+                    species=row.get("species", "Unknown"),
+                    metric_name=row.get("metric_name", "Unknown"),
+                    value_numeric=row.get("value_numeric"),
+                    value_text=row.get("value_text"),
+                    unit=row.get("unit"),
+                    age_min=row.get("age_min"),
+                    age_max=row.get("age_max"),
+                    sheet_name=row.get("sheet_name", ""),
+                    category=row.get("category_name", ""),
+                    sex=row.get("sex"),
+                    housing_system=row.get("housing_system"),
+                    data_type=row.get("data_type"),
+                    unit_system=row.get("unit_system"),
+                    confidence=self._calculate_relevance(
+                        query, dict(row), normalized_entities
+                    ),
+                )
+                results.append(result)
+            except Exception as row_error:
+                logger.error(f"Row conversion error {i}: {row_error}")
+                continue
+
+        logger.info(
+            f"PostgreSQL: {len(results)} metrics found from {len(rows)} rows"
+        )
+
+        # Conversion: Transformer MetricResult en dict avec 'content'
+        formatted_docs = []
+        for metric in results:
+            # Extraire le type de métrique de manière propre
+            metric_type_clean = self._extract_metric_type(metric.metric_name)
+
+            # Informations sur le sexe
+            sex_info = self._format_sex_info(metric.sex)
+
+            # Valeurs à utiliser (possiblement converties)
+            display_value = metric.value_numeric
+            display_unit = metric.unit
+            original_value = None
+            original_unit = None
+            was_converted = False
+
+            # Conversion d'unités si nécessaire
+            if (
+                unit_preference
+                and metric.value_numeric is not None
+                and metric.unit
+                and metric.unit_system
+            ):
+                # Vérifier si conversion nécessaire
+                needs_conversion = False
+                if unit_preference == "metric" and metric.unit_system in [
+                    "imperial",
+                    "mixed",
+                ]:
+                    needs_conversion = True
+                elif unit_preference == "imperial" and metric.unit_system in [
+                    "metric",
+                    "mixed",
+                ]:
+                    needs_conversion = True
+
+                if needs_conversion:
+                    # Tenter la conversion
+                    converted_value, converted_unit = (
+                        UnitConverter.convert_to_preference(
+                            metric.value_numeric, metric.unit, unit_preference
+                        )
                     )
 
-            # Retourner un RAGResult structuré avec documents formatés
-            if len(formatted_docs) > 0:
-                return RAGResult(
-                    context_docs=formatted_docs,
-                    source=RAGSource.RAG_SUCCESS,
-                    metadata={
-                        "count": len(formatted_docs),
-                        "query": query,
-                        "entities": normalized_entities,
-                        "strict_sex_match": strict_sex_match,
-                        "has_explicit_sex": entities.get("has_explicit_sex", False),
-                        "filters": filters,
-                        "reranked": bool(
-                            self.reranker
-                            and self.reranker.is_enabled()
-                            and len(formatted_docs) > 0
-                        ),
-                    },
+                    if converted_value is not None and converted_unit:
+                        # Conversion réussie
+                        original_value = metric.value_numeric
+                        original_unit = metric.unit
+                        display_value = round(converted_value, 2)
+                        display_unit = converted_unit
+                        was_converted = True
+                        logger.debug(
+                            f"🔄 Converted {original_value} {original_unit} → {display_value} {display_unit}"
+                        )
+
+            # Créer un contenu textuel naturel et lisible pour le LLM
+            # ✅ CORRECTION: Utiliser breed + strain pour nom complet (ex: "Cobb 500", "Ross 308")
+            full_breed_name = (
+                f"{metric.breed} {metric.strain}" if metric.breed else metric.strain
+            )
+
+            if display_value is not None:
+                # Phrase complète avec contexte
+                content = (
+                    f"At {metric.age_min} days old, {full_breed_name} {sex_info} chickens "
+                    f"have an average {metric_type_clean} of {display_value} "
+                    f"{display_unit or 'grams'}."
                 )
             else:
-                # Aucun résultat trouvé
-                return RAGResult(
-                    context_docs=[],
-                    source=RAGSource.NO_RESULTS,
-                    metadata={
-                        "count": 0,
-                        "query": query,
-                        "entities": normalized_entities,
-                        "filters": filters,
-                        "reason": "no_matching_metrics",
-                    },
+                # Fallback pour valeurs textuelles
+                content = (
+                    f"For {full_breed_name} at {metric.age_min} days ({sex_info}): "
+                    f"{metric_type_clean} = {metric.value_text or 'N/A'}"
                 )
 
-        except Exception as e:
-            logger.error(f"PostgreSQL search error: {e}")
+            # Structurer avec metadata complète
+            metadata = {
+                "company": metric.company,
+                "breed": metric.breed,
+                "strain": metric.strain,
+                "species": metric.species,
+                "metric_name": metric.metric_name,
+                "value_numeric": display_value,
+                "value_text": metric.value_text,
+                "unit": display_unit,
+                "age_min": metric.age_min,
+                "age_max": metric.age_max,
+                "category": metric.category,
+                "sex": metric.sex,
+                "housing_system": metric.housing_system,
+                "data_type": metric.data_type,
+                "unit_system": metric.unit_system,
+            }
+
+            # Ajouter info de conversion si applicable
+            if was_converted:
+                metadata["original_value"] = original_value
+                metadata["original_unit"] = original_unit
+                metadata["converted"] = True
+            else:
+                metadata["converted"] = False
+
+            formatted_docs.append(
+                {
+                    "content": content,
+                    "metadata": metadata,
+                    "score": metric.confidence,
+                }
+            )
+
+        return formatted_docs
+
+    async def _rerank_docs(
+        self, query: str, formatted_docs: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Reranking Cohere des documents PostgreSQL (si plus de 3 résultats)"""
+        # NOUVEAU: Reranking Cohere si plus de 3 résultats
+        if self.reranker and self.reranker.is_enabled() and len(formatted_docs) > 3:
+            try:
+                logger.info(
+                    f"🔄 Applying Cohere reranking on {len(formatted_docs)} PostgreSQL results"
+                )
+
+                reranked_docs = await self.reranker.rerank(
+                    query=query,
+                    documents=formatted_docs,
+                    top_n=min(5, len(formatted_docs)),  # Top 5 après rerank
+                )
+
+                logger.info(
+                    f"✅ PostgreSQL reranking: {len(formatted_docs)} -> {len(reranked_docs)} docs "
+                    f"(top score: {reranked_docs[0]['score']:.3f})"
+                )
+
+                formatted_docs = reranked_docs
+
+            except Exception as rerank_error:
+                logger.error(
+                    f"PostgreSQL reranking error: {rerank_error}, using original results"
+                )
+
+        return formatted_docs
+
+    def _build_metrics_result(
+        self,
+        formatted_docs: List[Dict[str, Any]],
+        query: str,
+        normalized_entities: Dict[str, str],
+        entities: Dict[str, Any],
+        strict_sex_match: bool,
+        filters: Dict[str, Any] = None,
+    ) -> RAGResult:
+        """Construit le RAGResult de search_metrics"""
+        # Retourner un RAGResult structuré avec documents formatés
+        if len(formatted_docs) > 0:
+            return RAGResult(
+                context_docs=formatted_docs,
+                source=RAGSource.RAG_SUCCESS,
+                metadata={
+                    "count": len(formatted_docs),
+                    "query": query,
+                    "entities": normalized_entities,
+                    "strict_sex_match": strict_sex_match,
+                    "has_explicit_sex": entities.get("has_explicit_sex", False),
+                    "filters": filters,
+                    "reranked": bool(
+                        self.reranker
+                        and self.reranker.is_enabled()
+                        and len(formatted_docs) > 0
+                    ),
+                },
+            )
+        else:
+            # Aucun résultat trouvé
             return RAGResult(
                 context_docs=[],
-                source=RAGSource.INTERNAL_ERROR,
+                source=RAGSource.NO_RESULTS,
                 metadata={
-                    "error": str(e),
+                    "count": 0,
                     "query": query,
-                    "entities": entities,
+                    "entities": normalized_entities,
                     "filters": filters,
+                    "reason": "no_matching_metrics",
                 },
             )
 
+
     async def _calculate_feed_range(
         self,
         breed: str,
@@ -788,19 +1028,26 @@ class PostgreSQLRetriever(InitializableMixin):
         strict_sex_match: bool,
         filters: Dict[str, Any] = None,
         unit_preference: Optional[str] = None,
+        strain_names: Optional[List[str]] = None,
     ) -> Tuple[str, List]:
         """
         Construit une requête SQL avec filtres adaptatifs selon has_explicit_sex, species et unit_system
 
         Args:
             unit_preference: 'metric', 'imperial', ou None (défaut: metric)
+            strain_names: Noms PostgreSQL de plusieurs souches (batch): une seule
+                requête `s.strain_name = ANY($n)`, top_k lignes par souche
         """
         conditions = []
         params = []
         param_count = 0
 
         # Filtres de base avec mapping vers noms PostgreSQL
-        if entities.get("breed"):
+        if strain_names:
+            param_count += 1
+            conditions.append(f"s.strain_name = ANY(${param_count})")
+            params.append(list(strain_names))
+        elif entities.get("breed"):
             canonical_breed = entities["breed"]
             db_breed_name = self._get_db_breed_name(canonical_breed)
 
@@ -981,18 +1228,39 @@ class PostgreSQLRetriever(InitializableMixin):
 
         where_clause = "WHERE " + " AND ".join(conditions) if conditions else ""
 
-        sql_query = f"""
-            SELECT
+        select_clause = """
                 c.company_name, b.breed_name, s.strain_name, s.species,
                 m.metric_name, m.value_numeric, m.value_text, m.unit,
                 m.age_min, m.age_max, m.sheet_name,
-                dc.category_name, d.sex, d.housing_system, d.data_type, d.unit_system
+                dc.category_name, d.sex, d.housing_system, d.data_type, d.unit_system"""
+        from_clause = """
             FROM companies c
             JOIN breeds b ON c.id = b.company_id
             JOIN strains s ON b.id = s.breed_id  
             JOIN documents d ON s.id = d.strain_id
             JOIN metrics m ON d.id = m.document_id
-            JOIN data_categories dc ON m.category_id = dc.id
+            JOIN data_categories dc ON m.category_id = dc.id"""
+
+        if strain_names:
+            # Même tri que la requête simple, appliqué par souche
+            sql_query = f"""
+                SELECT * FROM (
+                    SELECT {select_clause},
+                        ROW_NUMBER() OVER (
+                            PARTITION BY s.strain_name
+                            ORDER BY {order_sex_clause or ''} m.value_numeric DESC NULLS LAST
+                        ) AS strain_rank
+                    {from_clause}
+                    {where_clause}
+                ) ranked
+                WHERE strain_rank <= {top_k}
+                ORDER BY strain_name, strain_rank
+            """
+            return sql_query, params
+
+        sql_query = f"""
+            SELECT {select_clause}
+            {from_clause}
             {where_clause}
             ORDER BY 
                 {order_sex_clause or ''}
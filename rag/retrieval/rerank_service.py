@@ -0,0 +1,365 @@
+# -*- coding: utf-8 -*-
+"""
+rerank_service.py - Non-blocking reranking service
+Version: 1.0.0
+Last modified: 2025-11-08
+"""
+"""
+rerank_service.py - Non-blocking reranking service
+
+Shared by CohereReranker (reranker.py), CohereReRanker (cohere_reranker.py)
+and SemanticReRanker (semantic_reranker.py):
+
+- ScoreCache: bounded LRU of relevance scores keyed by (query hash, doc id,
+  content digest). Chunk ids are positional within a document, so the digest
+  keeps a re-chunked or edited document from reusing a stale score.
+- CrossEncoderPool: dedicated worker thread(s) for the local cross-encoder.
+  Requests arriving together are micro-batched into one predict() call, so
+  concurrent queries share the model instead of queueing on the event loop.
+- CohereRerankBackend: Cohere API on the async client (thread fallback for
+  SDKs without AsyncClient)
+- RerankService: cache lookup, scores only the missing documents with the
+  backend, fills the cache
+
+Scores are per (query, document) pair and do not depend on the other
+documents of the request, so partially cached requests only send the
+missing documents to the backend.
+"""
+
+import asyncio
+import hashlib
+import logging
+import queue
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_SIZE = 10_000
+
+
+def query_hash(query: str) -> str:
+    """Stable hash of a query (cache key component)"""
+    return hashlib.sha1(query.strip().encode("utf-8")).hexdigest()[:16]
+
+
+def document_id(text: str, doc: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Identity of a document for the score cache
+
+    Uses the chunk/object id when the document carries one, else a hash of
+    the full text (not a prefix: two chunks starting alike must not share
+    a score).
+    """
+    if isinstance(doc, dict):
+        metadata = doc.get("metadata") if isinstance(doc.get("metadata"), dict) else {}
+        for key in ("chunk_id", "id", "uuid", "weaviate_id"):
+            value = doc.get(key) or metadata.get(key)
+            if value:
+                return str(value)
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def content_digest(text: str) -> str:
+    """Digest of the scored text (cache key component)"""
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+class ScoreCache:
+    """Thread-safe bounded LRU cache of relevance scores"""
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._scores: "OrderedDict[Hashable, float]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[float]:
+        with self._lock:
+            score = self._scores.get(key)
+            if score is None:
+                self.misses += 1
+                return None
+            self._scores.move_to_end(key)
+            self.hits += 1
+            return score
+
+    def put(self, key: Hashable, score: float):
+        with self._lock:
+            self._scores[key] = score
+            self._scores.move_to_end(key)
+            while len(self._scores) > self.maxsize:
+                self._scores.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._scores)
+
+    def clear(self):
+        with self._lock:
+            self._scores.clear()
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._scores),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+class CrossEncoderPool:
+    """
+    Dedicated worker thread(s) running CrossEncoder.predict with micro-batching
+
+    A worker takes the first pending request, then keeps collecting requests
+    for up to max_wait_ms (or until max_batch_size pairs) and scores them all
+    in a single predict() call.
+
+    Usage:
+        pool = CrossEncoderPool(lambda: CrossEncoder(model_name))
+        scores = await pool.score([(query, doc), ...])   # async callers
+        scores = pool.score_sync([(query, doc), ...])    # sync callers
+    """
+
+    def __init__(
+        self,
+        model_loader: Callable[[], Any],
+        num_workers: int = 1,
+        max_batch_size: int = 64,
+        max_wait_ms: float = 5.0,
+    ):
+        """
+        Args:
+            model_loader: Returns the loaded model (called once, in a worker)
+            num_workers: Worker threads (1 is enough: predict is already batched)
+            max_batch_size: Max (query, doc) pairs per predict() call
+            max_wait_ms: How long a worker waits for more requests to batch
+        """
+        self.model_loader = model_loader
+        self.num_workers = num_workers
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+
+        self._queue: "queue.Queue[Optional[Tuple[List[Tuple[str, str]], Future]]]" = queue.Queue()
+        self._workers: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._model = None
+
+        self.stats = {"requests": 0, "batches": 0, "pairs": 0, "max_batch_pairs": 0}
+
+    def _ensure_started(self):
+        if self._workers:
+            return
+        with self._lock:
+            if self._workers:
+                return
+            for i in range(self.num_workers):
+                worker = threading.Thread(
+                    target=self._run, name=f"cross-encoder-{i}", daemon=True
+                )
+                worker.start()
+                self._workers.append(worker)
+
+    def _get_model(self):
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    self._model = self.model_loader()
+        return self._model
+
+    def submit(self, pairs: Sequence[Tuple[str, str]]) -> Future:
+        """Queue pairs for scoring, returns a Future of their scores"""
+        future: Future = Future()
+        if not pairs:
+            future.set_result([])
+            return future
+        self._ensure_started()
+        self._queue.put((list(pairs), future))
+        return future
+
+    async def score(self, pairs: Sequence[Tuple[str, str]]) -> List[float]:
+        """Score pairs without blocking the event loop"""
+        return await asyncio.wrap_future(self.submit(pairs))
+
+    def score_sync(self, pairs: Sequence[Tuple[str, str]]) -> List[float]:
+        """Score pairs, blocking the calling thread"""
+        return self.submit(pairs).result()
+
+    def _collect_batch(self, first) -> Tuple[list, bool]:
+        """First request + requests arriving within max_wait (bool: stop requested)"""
+        batch = [first]
+        pairs_count = len(first[0])
+        deadline = time.monotonic() + self.max_wait
+
+        while pairs_count < self.max_batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if item is None:
+                return batch, True
+            batch.append(item)
+            pairs_count += len(item[0])
+
+        return batch, False
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+
+            batch, stop = self._collect_batch(first)
+            pairs = [pair for request_pairs, _ in batch for pair in request_pairs]
+
+            try:
+                scores = [float(s) for s in self._get_model().predict(pairs)]
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+            else:
+                offset = 0
+                for request_pairs, future in batch:
+                    future.set_result(scores[offset : offset + len(request_pairs)])
+                    offset += len(request_pairs)
+
+            self.stats["requests"] += len(batch)
+            self.stats["batches"] += 1
+            self.stats["pairs"] += len(pairs)
+            self.stats["max_batch_pairs"] = max(self.stats["max_batch_pairs"], len(pairs))
+
+            if stop:
+                return
+
+    def shutdown(self):
+        """Stop the workers once the pending requests are scored"""
+        for _ in self._workers:
+            self._queue.put(None)
+        for worker in self._workers:
+            worker.join()
+        self._workers = []
+
+
+class CrossEncoderBackend:
+    """Local cross-encoder scoring through a CrossEncoderPool"""
+
+    def __init__(self, pool: CrossEncoderPool):
+        self.pool = pool
+
+    async def ascore(self, query: str, texts: List[str]) -> List[float]:
+        return await self.pool.score([(query, text) for text in texts])
+
+    def score(self, query: str, texts: List[str]) -> List[float]:
+        return self.pool.score_sync([(query, text) for text in texts])
+
+
+def _scores_by_index(response, count: int) -> List[float]:
+    """Cohere results (sorted by relevance) back in document order"""
+    scores = [0.0] * count
+    for result in response.results:
+        scores[result.index] = float(result.relevance_score)
+    return scores
+
+
+class CohereRerankBackend:
+    """Cohere Rerank API scoring (async client when available)"""
+
+    def __init__(
+        self,
+        model: str,
+        client_factory: Callable[[], Any],
+        async_client_factory: Optional[Callable[[], Any]] = None,
+    ):
+        """
+        Args:
+            model: Cohere rerank model
+            client_factory: Returns the synchronous cohere client
+            async_client_factory: Returns cohere.AsyncClient (or None)
+        """
+        self.model = model
+        self.client_factory = client_factory
+        self.async_client_factory = async_client_factory
+
+    def score(self, query: str, texts: List[str]) -> List[float]:
+        response = self.client_factory().rerank(
+            model=self.model, query=query, documents=texts, top_n=len(texts)
+        )
+        return _scores_by_index(response, len(texts))
+
+    async def ascore(self, query: str, texts: List[str]) -> List[float]:
+        async_client = self.async_client_factory() if self.async_client_factory else None
+        if async_client is None:
+            # SDK without AsyncClient: keep the blocking call off the event loop
+            return await asyncio.to_thread(self.score, query, texts)
+
+        response = await async_client.rerank(
+            model=self.model, query=query, documents=texts, top_n=len(texts)
+        )
+        return _scores_by_index(response, len(texts))
+
+
+class RerankService:
+    """
+    Relevance scores of documents for a query: score cache + backend
+
+    Usage:
+        service = RerankService(CrossEncoderBackend(pool), ScoreCache())
+        scores = await service.ascore(query, texts)   # same order as texts
+    """
+
+    def __init__(self, backend, cache: Optional[ScoreCache] = None):
+        self.backend = backend
+        self.cache = cache
+
+    def _lookup(
+        self, query: str, texts: List[str], doc_ids: Optional[List[str]]
+    ) -> Tuple[List[Tuple[str, Optional[str], str]], List[Optional[float]], List[int]]:
+        qhash = query_hash(query)
+        keys = [
+            (qhash, doc_ids[i] if doc_ids else None, content_digest(text))
+            for i, text in enumerate(texts)
+        ]
+        if self.cache is None:
+            return keys, [None] * len(texts), list(range(len(texts)))
+
+        scores = [self.cache.get(key) for key in keys]
+        missing = [i for i, score in enumerate(scores) if score is None]
+        return keys, scores, missing
+
+    def _fill(self, keys, scores, missing, new_scores) -> List[float]:
+        for i, score in zip(missing, new_scores):
+            scores[i] = score
+            if self.cache is not None:
+                self.cache.put(keys[i], score)
+        return scores
+
+    async def ascore(
+        self, query: str, texts: List[str], doc_ids: Optional[List[str]] = None
+    ) -> List[float]:
+        """Scores of texts (cached or from the backend), without blocking the loop"""
+        keys, scores, missing = self._lookup(query, texts, doc_ids)
+        new_scores = (
+            await self.backend.ascore(query, [texts[i] for i in missing]) if missing else []
+        )
+        return self._fill(keys, scores, missing, new_scores)
+
+    def score(
+        self, query: str, texts: List[str], doc_ids: Optional[List[str]] = None
+    ) -> List[float]:
+        """Synchronous variant of ascore (for callers outside the event loop)"""
+        keys, scores, missing = self._lookup(query, texts, doc_ids)
+        new_scores = self.backend.score(query, [texts[i] for i in missing]) if missing else []
+        return self._fill(keys, scores, missing, new_scores)
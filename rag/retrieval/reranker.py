@@ -11,10 +11,18 @@ Reranks retrieved documents for improved precision
 Quick Win: +25% precision improvement for ~$100/month
 """
 
+import asyncio
 import os
 import logging
 from typing import List, Dict, Any, Optional
 
+from retrieval.rerank_service import (
+    CohereRerankBackend,
+    RerankService,
+    ScoreCache,
+    document_id,
+)
+
 logger = logging.getLogger(__name__)
 
 # Import Cohere avec gestion d'erreur
@@ -50,6 +58,7 @@ class CohereReranker:
         self.api_key = os.getenv("COHERE_API_KEY")
         self.model = os.getenv("COHERE_RERANK_MODEL", "rerank-multilingual-v3.0")
         self.top_n = int(os.getenv("COHERE_RERANK_TOP_N", "3"))
+        self.score_cache = ScoreCache(int(os.getenv("COHERE_RERANK_CACHE_SIZE", "10000")))
 
         # Statistics tracking
         self.stats = {
@@ -61,6 +70,7 @@ class CohereReranker:
         }
 
         # Initialize client
+        self.async_client = None
         if not self.api_key:
             logger.warning("COHERE_API_KEY not set, reranking disabled")
             self.client = None
@@ -70,6 +80,9 @@ class CohereReranker:
         else:
             try:
                 self.client = cohere.Client(self.api_key)
+                # Async transport: the rerank round-trip no longer blocks the event loop
+                if hasattr(cohere, "AsyncClient"):
+                    self.async_client = cohere.AsyncClient(self.api_key)
                 logger.info(
                     f"Cohere Reranker initialized (model: {self.model}, top_n: {self.top_n})"
                 )
@@ -77,6 +90,15 @@ class CohereReranker:
                 logger.error(f"Failed to initialize Cohere client: {e}")
                 self.client = None
 
+        self.service = RerankService(
+            CohereRerankBackend(
+                self.model,
+                client_factory=lambda: self.client,
+                async_client_factory=lambda: self.async_client,
+            ),
+            self.score_cache,
+        )
+
     async def rerank(
         self, query: str, documents: List[Dict[str, Any]], top_n: Optional[int] = None
     ) -> List[Dict[str, Any]]:
@@ -113,6 +135,7 @@ class CohereReranker:
         try:
             # Extract document texts (handle both dict and string formats)
             doc_texts = []
+            doc_ids = []
             for doc in documents:
                 if isinstance(doc, dict):
                     # Try common content fields
@@ -125,40 +148,39 @@ class CohereReranker:
                 else:
                     text = str(doc)
                 doc_texts.append(text)
+                doc_ids.append(document_id(text, doc if isinstance(doc, dict) else None))
 
             logger.debug(
                 f"Reranking {len(doc_texts)} documents with query: '{query[:50]}...'"
             )
 
-            # Call Cohere Rerank API (synchronous)
-            # Note: Cohere SDK doesn't have async support yet, wrapping in executor would be ideal
-            results = self.client.rerank(
-                model=self.model,
-                query=query,
-                documents=doc_texts,
-                top_n=min(top_n, len(doc_texts)),
-            )
+            # Cached scores + Cohere async client for the others
+            scores = await self.service.ascore(query, doc_texts, doc_ids)
+
+            ranked_indices = sorted(
+                range(len(scores)), key=lambda i: scores[i], reverse=True
+            )[: min(top_n, len(doc_texts))]
 
             # Calculate score improvement
             original_top_score = documents[0].get("score", 0.0) if documents else 0.0
 
             # Reorder original documents based on rerank results
             reranked_docs = []
-            for result in results.results:
+            for index in ranked_indices:
                 original_doc = (
-                    documents[result.index].copy()
-                    if isinstance(documents[result.index], dict)
-                    else {"content": str(documents[result.index])}
+                    documents[index].copy()
+                    if isinstance(documents[index], dict)
+                    else {"content": str(documents[index])}
                 )
 
                 # Add rerank score and metadata
-                original_doc["rerank_score"] = result.relevance_score
-                original_doc["rerank_index"] = result.index
-                original_doc["original_rank"] = result.index + 1
+                original_doc["rerank_score"] = scores[index]
+                original_doc["rerank_index"] = index
+                original_doc["original_rank"] = index + 1
 
                 # Update main score to rerank score for consistency
                 original_doc["original_score"] = original_doc.get("score", 0.0)
-                original_doc["score"] = result.relevance_score
+                original_doc["score"] = scores[index]
 
                 # Add rerank metadata
                 if "metadata" not in original_doc:
@@ -195,6 +217,39 @@ class CohereReranker:
             self.stats["total_errors"] += 1
             return documents
 
+    async def rerank_many(
+        self,
+        queries: List[str],
+        documents_lists: List[List[Dict[str, Any]]],
+        top_n: Optional[int] = None,
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Rerank several (query, documents) requests as one batch
+
+        Cohere scores one query per rerank request, so the requests are sent
+        together on the async client instead of one after the other; documents
+        already scored for a query come from the score cache.
+
+        Args:
+            queries: One query per request
+            documents_lists: Documents to rerank for each query
+            top_n: Number of top documents to return per query
+
+        Returns:
+            Reranked documents, one list per query (input order)
+        """
+        if len(queries) != len(documents_lists):
+            raise ValueError("queries and documents_lists must have the same length")
+
+        return list(
+            await asyncio.gather(
+                *(
+                    self.rerank(query, documents, top_n)
+                    for query, documents in zip(queries, documents_lists)
+                )
+            )
+        )
+
     def is_enabled(self) -> bool:
         """Check if reranking is enabled and operational"""
         return self.client is not None
@@ -209,10 +264,12 @@ class CohereReranker:
             - total_docs_reranked: Total documents processed
             - avg_score_improvement: Average score improvement
             - total_errors: Number of errors encountered
-            - cache_hits: Number of cache hits (if caching enabled)
+            - cache_hits: Number of documents scored from the cache
         """
         return {
             **self.stats,
+            "cache_hits": self.score_cache.hits,
+            "score_cache": self.score_cache.get_stats(),
             "enabled": self.is_enabled(),
             "model": self.model if self.is_enabled() else None,
             "default_top_n": self.top_n if self.is_enabled() else None,
@@ -227,6 +284,7 @@ class CohereReranker:
             "total_errors": 0,
             "cache_hits": 0,
         }
+        self.score_cache.reset_stats()
         logger.info("Reranker statistics reset")
 
 
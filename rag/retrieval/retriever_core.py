@@ -27,11 +27,29 @@ logger = logging.getLogger(__name__)
 class HybridWeaviateRetriever(SearchMixin, AdaptiveMixin, RRFMixin):
     """Retriever hybride avec dimension vectorielle correcte dès le départ"""
 
-    def __init__(self, client, collection_name: str = "InteliaKnowledge"):
+    def __init__(
+        self,
+        client,
+        collection_name: str = "InteliaKnowledge",
+        async_client=None,
+        search_gate=None,
+    ):
+        """
+        Args:
+            client: Client Weaviate sync (v4 ou v3)
+            collection_name: Collection interrogée
+            async_client: WeaviateAsyncClient connecté (recherches sans thread)
+            search_gate: SearchGate (concurrence max, deadline, métriques de file)
+        """
         self.client = client
         self.collection_name = collection_name
         self.is_v4 = hasattr(client, "collections")
 
+        # Recherches hybride / vectorielle / relecture par IDs (_run_query)
+        self.async_client = async_client
+        self.search_gate = search_gate
+        self._thread_limiter = None
+
         # Configuration dynamique des capacités API
         self.api_capabilities = {
             "hybrid_with_vector": True,
@@ -72,6 +90,9 @@ class HybridWeaviateRetriever(SearchMixin, AdaptiveMixin, RRFMixin):
         # RRF Intelligent (sera configuré par RAG Engine)
         self.intelligent_rrf = None
 
+        # Chunk store local (recherches IDs seuls, voir set_chunk_store)
+        self.chunk_store = None
+
         # Note: La détection sera faite lors du premier appel async pour confirmer
 
     async def _ensure_dimension_detected(self):
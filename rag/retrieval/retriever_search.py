@@ -9,9 +9,14 @@ retriever_search.py - Méthodes de recherche hybride avec améliorations
 VERSION AMÉLIORÉE avec gestion d'erreur robuste
 """
 
+import functools
+import inspect
 import logging
 import time
-from utils.types import Dict, List
+
+import anyio
+
+from utils.types import Any, Dict, List, Optional
 from core.data_models import Document
 from utils.utilities import METRICS
 from utils.imports_and_dependencies import wvc
@@ -22,6 +27,151 @@ logger = logging.getLogger(__name__)
 class SearchMixin:
     """Mixin contenant les méthodes de recherche pour HybridWeaviateRetriever"""
 
+    def _search_collection(self):
+        """Collection interrogée: client async si disponible, sinon client sync"""
+        async_client = getattr(self, "async_client", None)
+        if async_client is not None:
+            return async_client.collections.get(self.collection_name)
+        return self.client.collections.get(self.collection_name)
+
+    async def _run_query(self, method, *args, **kwargs):
+        """
+        Exécute collection.query.<method> sans bloquer l'event loop
+
+        Client sync: l'appel part dans un thread anyio, ce qui permet aux
+        recherches lancées ensemble (batch multi-requêtes) de se chevaucher.
+        Client async (voir _search_collection): appel attendu directement,
+        aucun thread occupé.
+
+        Avec un SearchGate, l'appel passe sous sa limite de concurrence et sa
+        deadline. Sur le client sync, la deadline arrête seulement l'attente:
+        le thread continue jusqu'au retour de Weaviate (borné par le timeout
+        de requête du client) et garde sa place dans le limiteur de threads.
+        """
+        gate = getattr(self, "search_gate", None)
+
+        if getattr(self, "async_client", None) is not None or (
+            inspect.iscoroutinefunction(method)
+        ):
+
+            def call():
+                return method(*args, **kwargs)
+
+        else:
+            limiter = None
+            if gate is not None:
+                # Limiteur à la taille du gate: le gate reste le seul point
+                # d'attente, mesuré (pas le pool anyio de 40 threads)
+                if getattr(self, "_thread_limiter", None) is None:
+                    self._thread_limiter = anyio.CapacityLimiter(gate.max_concurrency)
+                limiter = self._thread_limiter
+
+            def call():
+                return anyio.to_thread.run_sync(
+                    functools.partial(method, *args, **kwargs), limiter=limiter
+                )
+
+        if gate is None:
+            return await call()
+        return await gate.run(getattr(method, "__name__", "query"), call)
+
+    def set_chunk_store(self, chunk_store):
+        """
+        Active les recherches IDs seuls: Weaviate ne renvoie que UUID + score,
+        métadonnées et contenu sont lus dans le chunk store local (mmap)
+        """
+        self.chunk_store = chunk_store
+
+    def _ids_only(self) -> bool:
+        store = getattr(self, "chunk_store", None)
+        return store is not None and len(store) > 0
+
+    async def _documents_from_ids(
+        self, collection, objects, extra_metadata: Dict[str, Any]
+    ) -> List[Document]:
+        """
+        Résultats IDs + scores -> Documents dont les métadonnées viennent du
+        chunk store; le contenu est réhydraté plus tard (hydrate_documents).
+        Les objets absents du store (pas encore synchronisés) sont relus dans
+        Weaviate en un seul appel.
+        """
+        documents: List[Optional[Document]] = []
+        missing: Dict[str, int] = {}
+
+        for obj in objects:
+            object_id = str(obj.uuid)
+            metadata = getattr(obj, "metadata", None)
+            score = float(getattr(metadata, "score", 0.0) or 0.0)
+            properties = self.chunk_store.metadata(object_id)
+
+            if properties is None:
+                missing[object_id] = len(documents)
+                documents.append(Document(content="", score=score))
+                continue
+
+            documents.append(
+                Document(
+                    content="",
+                    metadata={
+                        **properties,
+                        **extra_metadata,
+                        "weaviate_id": object_id,
+                        "content_pending": True,
+                    },
+                    score=score,
+                    original_distance=getattr(metadata, "distance", None),
+                )
+            )
+
+        if missing:
+            fetched = await self._fetch_objects_by_ids(collection, list(missing))
+            for object_id, position in missing.items():
+                properties = fetched.get(object_id)
+                if properties is None:
+                    documents[position] = None
+                    continue
+                documents[position] = Document(
+                    content=properties.get("content", ""),
+                    metadata={
+                        **properties,
+                        **extra_metadata,
+                        "weaviate_id": object_id,
+                    },
+                    score=documents[position].score,
+                )
+            if hasattr(METRICS, "chunk_store_miss"):
+                METRICS.chunk_store_miss(len(missing))
+
+        return [doc for doc in documents if doc is not None]
+
+    async def _fetch_objects_by_ids(
+        self, collection, object_ids: List[str]
+    ) -> Dict[str, Dict[str, Any]]:
+        """Propriétés complètes d'objets par UUID (un seul appel Weaviate)"""
+        try:
+            result = await self._run_query(
+                collection.query.fetch_objects,
+                filters=wvc.query.Filter.by_id().contains_any(object_ids),
+                limit=len(object_ids),
+            )
+        except Exception as e:
+            logger.warning(f"Relecture de {len(object_ids)} objets échouée: {e}")
+            return {}
+        return {
+            str(obj.uuid): dict(getattr(obj, "properties", {}) or {})
+            for obj in result.objects
+        }
+
+    def hydrate_documents(self, documents: List[Document]) -> List[Document]:
+        """Réhydrate depuis le chunk store le contenu des Documents IDs seuls"""
+        store = getattr(self, "chunk_store", None)
+        for doc in documents:
+            if not doc.metadata.pop("content_pending", False) or store is None:
+                continue
+            doc.content = store.content(doc.metadata["weaviate_id"]) or ""
+            doc.metadata["content_length"] = len(doc.content)
+        return documents
+
     async def hybrid_search(
         self,
         query_vector: List[float],
@@ -54,6 +204,8 @@ class SearchMixin:
                     adjusted_vector, query_text, top_k, where_filter, alpha
                 )
 
+            self.hydrate_documents(documents)
+
             # Métriques enrichies
             if hasattr(METRICS, "hybrid_search_completed"):
                 METRICS.hybrid_search_completed(
@@ -71,8 +223,8 @@ class SearchMixin:
                 METRICS.retrieval_error("hybrid_search", str(e))
 
             # Fallback vers recherche vectorielle seule
-            return await self._vector_search_fallback(
-                adjusted_vector, top_k, where_filter
+            return self.hydrate_documents(
+                await self._vector_search_fallback(adjusted_vector, top_k, where_filter)
             )
 
     async def _hybrid_search_v4_corrected(
@@ -85,7 +237,7 @@ class SearchMixin:
     ) -> List[Document]:
         """Recherche hybride avec gestion d'erreur améliorée"""
         try:
-            collection = self.client.collections.get(self.collection_name)
+            collection = self._search_collection()
 
             search_params = {
                 "query": query_text,
@@ -93,6 +245,9 @@ class SearchMixin:
                 "limit": top_k,
                 "return_metadata": wvc.query.MetadataQuery(score=True),
             }
+            ids_only = self._ids_only()
+            if ids_only:
+                search_params["return_properties"] = []
 
             # Ajouter vector seulement si supporté
             if self.api_capabilities.get("hybrid_with_vector", True):
@@ -105,7 +260,7 @@ class SearchMixin:
                     search_params["where"] = v4_filter
 
             try:
-                result = collection.query.hybrid(**search_params)
+                result = await self._run_query(collection.query.hybrid, **search_params)
             except TypeError as e:
                 # Gestion runtime des erreurs d'arguments
                 self.api_capabilities["runtime_corrections"] += 1
@@ -117,16 +272,33 @@ class SearchMixin:
                     logger.warning("Paramètre 'vector' non supporté, retry sans vector")
                     del search_params["vector"]
                     self.api_capabilities["hybrid_with_vector"] = False
-                    result = collection.query.hybrid(**search_params)
+                    result = await self._run_query(
+                        collection.query.hybrid, **search_params
+                    )
                 elif "where" in error_str and "where" in search_params:
                     logger.warning("Paramètre 'where' non supporté, retry sans filtre")
                     del search_params["where"]
                     self.api_capabilities["hybrid_with_where"] = False
-                    result = collection.query.hybrid(**search_params)
+                    result = await self._run_query(
+                        collection.query.hybrid, **search_params
+                    )
                 else:
                     # Fallback minimal
                     logger.warning("Fallback vers recherche hybride minimale")
-                    result = collection.query.hybrid(query=query_text, limit=top_k)
+                    result = await self._run_query(
+                        collection.query.hybrid, query=query_text, limit=top_k
+                    )
+
+            if ids_only:
+                return await self._documents_from_ids(
+                    collection,
+                    result.objects,
+                    {
+                        "weaviate_v4_used": True,
+                        "vector_dimension": len(query_vector),
+                        "retriever_version": "corrected_v4",
+                    },
+                )
 
             # Conversion résultats avec protection d'erreur
             documents = []
@@ -148,6 +320,7 @@ class SearchMixin:
                             "weaviate_v4_used": True,
                             "vector_dimension": len(query_vector),
                             "retriever_version": "corrected_v4",
+                            "weaviate_id": str(getattr(obj, "uuid", "")),
                             **properties,
                         },
                         score=score,
@@ -189,10 +362,11 @@ class SearchMixin:
         """Fallback vectoriel avec syntaxe v4 corrigée"""
         try:
             if self.is_v4:
-                collection = self.client.collections.get(self.collection_name)
+                collection = self._search_collection()
 
                 # S'assurer de la bonne dimension
                 adjusted_vector = self._adjust_vector_dimension(query_vector)
+                ids_only = self._ids_only()
 
                 # Syntaxe v4 pour near_vector
                 try:
@@ -201,6 +375,8 @@ class SearchMixin:
                         "limit": top_k,
                         "return_metadata": wvc.query.MetadataQuery(score=True),
                     }
+                    if ids_only:
+                        optional_params["return_properties"] = []
 
                     # Ajouter le filtre si disponible
                     if where_filter and self.api_capabilities.get(
@@ -211,7 +387,8 @@ class SearchMixin:
                             optional_params["where"] = v4_filter
 
                     # Appel avec syntaxe v4 - vector en paramètre positionnel
-                    result = collection.query.near_vector(
+                    result = await self._run_query(
+                        collection.query.near_vector,
                         adjusted_vector,
                         **optional_params,
                     )
@@ -219,12 +396,25 @@ class SearchMixin:
                 except Exception as e:
                     logger.warning(f"Erreur near_vector avec filtres: {e}")
                     # Fallback sans filtres
-                    result = collection.query.near_vector(
+                    result = await self._run_query(
+                        collection.query.near_vector,
                         adjusted_vector,
                         limit=top_k,
                         return_metadata=wvc.query.MetadataQuery(score=True),
+                        **({"return_properties": []} if ids_only else {}),
                     )
 
+                if ids_only:
+                    return await self._documents_from_ids(
+                        collection,
+                        result.objects,
+                        {
+                            "weaviate_v4_used": True,
+                            "fallback_used": True,
+                            "vector_dimension": self.working_vector_dimension,
+                            "retriever_version": "corrected_fallback",
+                        },
+                    )
                 return self._convert_v4_results_to_documents(result.objects)
             else:
                 return await self._vector_search_v3(query_vector, top_k, where_filter)
@@ -271,6 +461,7 @@ class SearchMixin:
                     "fallback_used": True,
                     "vector_dimension": self.working_vector_dimension,
                     "retriever_version": "corrected_fallback",
+                    "weaviate_id": str(getattr(obj, "uuid", "")),
                 },
                 score=score,
                 original_distance=getattr(metadata, "distance", None),
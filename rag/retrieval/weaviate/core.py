@@ -14,7 +14,7 @@ import asyncio
 import logging
 import time
 import numpy as np
-from utils.types import Dict, List, Optional, Any
+from utils.types import Dict, List, Optional, Any, Tuple, Union
 from collections import defaultdict
 
 # Imports Weaviate
@@ -37,6 +37,14 @@ from config.config import (
     ENABLE_INTELLIGENT_RRF,
     ENABLE_API_DIAGNOSTICS,
     GUARDRAILS_LEVEL,
+    LOCAL_INDEX_MODE,
+    LOCAL_INDEX_DEADLINE,
+    ADAPTIVE_RETRIEVAL_DEPTH,
+    ADAPTIVE_DEPTH_INITIAL_K,
+    ADAPTIVE_DEPTH_MIN_CONFIDENCE,
+    ADAPTIVE_DEPTH_MIN_RELEVANCE,
+    ADAPTIVE_DEPTH_MIN_GAP,
+    ADAPTIVE_DEPTH_MIN_RERANK_SCORE,
 )
 from utils.utilities import (
     METRICS,
@@ -44,11 +52,16 @@ from utils.utilities import (
     get_out_of_domain_message,
     validate_intent_result,
 )
+from retrieval.adaptive_depth import AdaptiveDepthPolicy, DepthDecision
 
 # Imports retrieval/generation
 try:
     from retrieval.embedder import OpenAIEmbedder
     from retrieval.retriever import HybridWeaviateRetriever
+    from retrieval.batch_retriever import BatchQuery, MultiQueryRetriever
+    from retrieval.chunk_store import ChunkStore, open_chunk_store
+    from retrieval.local_index import LocalHybridIndex
+    from retrieval.weaviate_async import SearchGate, connect_async_client
     from generation.generators import EnhancedResponseGenerator
 
     # 🔧 MIGRATION: LLM-based OOD detection au lieu de keyword-based
@@ -106,6 +119,9 @@ class WeaviateCore(InitializableMixin):
 
         # Composants principaux
         self.weaviate_client = None
+        # Client async (recherches sans thread), connecté à côté du client sync
+        self.weaviate_async_client = None
+        self.search_gate = None
         self.cache_manager = None
         self.embedder = None
         self.retriever = None
@@ -121,17 +137,44 @@ class WeaviateCore(InitializableMixin):
         # Cohere Reranker
         self.reranker = None
 
+        # Recherche batch multi-requêtes (créée au premier lot)
+        self.batch_retriever = None
+
+        # Chunks déjà reçus de Weaviate (réhydratation du cache de recherche)
+        self.chunk_store = ChunkStore() if RETRIEVAL_COMPONENTS_AVAILABLE else None
+
+        # Index local vecteurs + BM25 (LOCAL_INDEX_MODE, construit depuis le
+        # chunk store mappé)
+        self.local_index = None
+        self.local_index_mode = LOCAL_INDEX_MODE
+
+        # Profondeur de recherche adaptative (ADAPTIVE_RETRIEVAL_DEPTH)
+        self.depth_policy = AdaptiveDepthPolicy(
+            enabled=ADAPTIVE_RETRIEVAL_DEPTH,
+            initial_top_k=ADAPTIVE_DEPTH_INITIAL_K,
+            min_confidence=ADAPTIVE_DEPTH_MIN_CONFIDENCE,
+            min_relevance=ADAPTIVE_DEPTH_MIN_RELEVANCE,
+            min_score_gap=ADAPTIVE_DEPTH_MIN_GAP,
+            min_rerank_score=ADAPTIVE_DEPTH_MIN_RERANK_SCORE,
+        )
+
         # Statistiques
         self.optimization_stats = {
             "cache_hits": 0,
             "cache_misses": 0,
             "cache_sets": 0,
+            "retrieval_cache_hits": 0,
+            "retrieval_cache_misses": 0,
             "hybrid_searches": 0,
             "intelligent_rrf_used": 0,
             "cohere_reranking_used": 0,
             "ood_detections": 0,
             "intent_coverage_stats": defaultdict(int),
             "weaviate_capabilities": {},
+            "local_index_searches": 0,
+            "local_index_fallbacks": 0,
+            "adaptive_depth_shallow": 0,
+            "adaptive_depth_expanded": 0,
         }
 
     async def initialize(self):
@@ -193,6 +236,7 @@ class WeaviateCore(InitializableMixin):
                     intent_processor=self.intent_processor,
                 )
                 logger.info("✅ RRF Intelligent configuré avec cache")
+                self._link_chunk_store_to_rrf()
             except Exception as e:
                 logger.error(f"Erreur RRF Intelligent: {e}")
 
@@ -287,6 +331,11 @@ class WeaviateCore(InitializableMixin):
                             f"Connexion Weaviate opérationnelle: {weaviate_url}"
                         )
 
+                        if hasattr(self.weaviate_client, "collections"):
+                            await self._connect_weaviate_async(
+                                weaviate_url, weaviate_api_key, openai_api_key
+                            )
+
                         # Test de capacités v4
                         try:
                             if hasattr(self.weaviate_client, "collections"):
@@ -326,6 +375,34 @@ class WeaviateCore(InitializableMixin):
             logger.error(f"Erreur générale connexion Weaviate: {e}")
             self.weaviate_client = None
 
+    async def _connect_weaviate_async(
+        self, weaviate_url: str, weaviate_api_key: str, openai_api_key: str
+    ):
+        """
+        Connecte le WeaviateAsyncClient utilisé par le retriever pour ses
+        recherches. En cas d'échec, les recherches restent sur le client sync
+        (thread par appel).
+        """
+        headers = {"X-OpenAI-Api-Key": openai_api_key} if openai_api_key else None
+        async_client = None
+        try:
+            async_client = connect_async_client(
+                weaviate_url, api_key=weaviate_api_key, headers=headers
+            )
+            await asyncio.wait_for(async_client.connect(), timeout=15.0)
+            self.weaviate_async_client = async_client
+            logger.info("Client Weaviate async connecté (recherches sans thread)")
+        except Exception as e:
+            logger.warning(
+                f"Client Weaviate async indisponible, recherches via le client sync: {e}"
+            )
+            self.weaviate_async_client = None
+            if async_client is not None:
+                try:
+                    await async_client.close()
+                except Exception as close_error:
+                    logger.debug(f"Fermeture client Weaviate async: {close_error}")
+
     async def _initialize_base_components(self):
         """Initialise les composants de base"""
 
@@ -373,9 +450,12 @@ class WeaviateCore(InitializableMixin):
             collection_name = os.getenv("WEAVIATE_COLLECTION_NAME", "InteliaKnowledge")
             logger.info(f"🔧 Using Weaviate collection: {collection_name}")
 
+            self.search_gate = SearchGate()
             self.retriever = HybridWeaviateRetriever(
                 self.weaviate_client,
-                collection_name=collection_name
+                collection_name=collection_name,
+                async_client=self.weaviate_async_client,
+                search_gate=self.search_gate,
             )
 
             # RRF Intelligent
@@ -383,6 +463,9 @@ class WeaviateCore(InitializableMixin):
                 self.retriever.set_intelligent_rrf(self.intelligent_rrf)
                 logger.info("✅ RRF Intelligent lié au retriever")
 
+            # Chunk store local: recherches IDs + scores uniquement
+            await self._attach_chunk_store(collection_name)
+
             # Diagnostic API Weaviate
             if ENABLE_API_DIAGNOSTICS:
                 try:
@@ -399,6 +482,36 @@ class WeaviateCore(InitializableMixin):
             logger.error(f"Erreur retriever hybride: {e}")
             raise
 
+    async def _attach_chunk_store(self, collection_name: str):
+        """Branche le chunk store mappé (CHUNK_STORE_DIR) et l'index local"""
+        mapped_store = open_chunk_store(collection_name)
+        if mapped_store is None or not hasattr(self.retriever, "set_chunk_store"):
+            return
+
+        self.retriever.set_chunk_store(mapped_store)
+        self.chunk_store = ChunkStore(backing=mapped_store)
+        self._link_chunk_store_to_rrf()
+        logger.info(
+            f"✅ Chunk store local: {len(mapped_store)} chunks, "
+            "recherches Weaviate en IDs + scores"
+        )
+
+        if self.local_index_mode in ("fallback", "primary"):
+            self.local_index = LocalHybridIndex(mapped_store)
+            await asyncio.to_thread(self.local_index.sync, True)
+            logger.info(
+                f"✅ Index local ({self.local_index_mode}): "
+                f"{self.local_index.get_stats()}"
+            )
+
+    def _link_chunk_store_to_rrf(self):
+        """Contenu paresseux des candidats IDs-only pour les features RRF"""
+        backing = getattr(self.chunk_store, "backing", None)
+        engine = getattr(self.intelligent_rrf, "ranking_engine", None)
+        extractor = getattr(engine, "feature_extractor", None)
+        if backing is not None and extractor is not None:
+            extractor.content_source = backing
+
     async def _initialize_generator(self):
         """Initialise le générateur de réponses"""
 
@@ -536,6 +649,24 @@ class WeaviateCore(InitializableMixin):
                 metadata={"error": f"WeaviateCore search failed: {e}"},
             )
 
+    def prefetch_query_embedding(self, query: str) -> Optional[asyncio.Task]:
+        """
+        Lance par anticipation l'embedding que generate_response calculera
+
+        Appelé par RAGQueryProcessor pendant la vérification OOD et la
+        récupération de l'historique: l'appel OpenAI est déjà en vol (ou
+        terminé) quand la recherche demande le vecteur de la même requête.
+        """
+        if not self.embedder or not hasattr(self.embedder, "prefetch"):
+            return None
+        return self.embedder.prefetch(query)
+
+    def discard_query_embedding(self, query: str) -> bool:
+        """Libère un embedding anticipé non consommé (True s'il était inutilisé)"""
+        if not self.embedder or not hasattr(self.embedder, "discard_prefetch"):
+            return False
+        return self.embedder.discard_prefetch(query)
+
     async def generate_response(
         self,
         query: str,
@@ -635,195 +766,512 @@ class WeaviateCore(InitializableMixin):
             # Construction filtres
             where_filter = build_where_filter(intent_result)
 
-            # Recherche de documents
-            documents = []
-            if self.retriever:
-                try:
-                    search_alpha = (
-                        getattr(intent_result, "preferred_alpha", DEFAULT_ALPHA)
-                        if intent_result
-                        else DEFAULT_ALPHA
-                    )
-
-                    # Utilisation RRF intelligent si disponible
-                    if (
-                        self.intelligent_rrf
-                        and hasattr(self.intelligent_rrf, "enabled")
-                        and self.intelligent_rrf.enabled
-                        and ENABLE_INTELLIGENT_RRF
-                    ):
-
-                        documents = await self._enhanced_hybrid_search_with_rrf(
-                            query_vector,
-                            search_query,
-                            RAG_SIMILARITY_TOP_K,
-                            where_filter,
-                            search_alpha,
-                            query,
-                            intent_result,
-                        )
-                        self.optimization_stats["intelligent_rrf_used"] += 1
+            search_alpha = (
+                getattr(intent_result, "preferred_alpha", DEFAULT_ALPHA)
+                if intent_result
+                else DEFAULT_ALPHA
+            )
 
-                    else:
-                        documents = await self.retriever.adaptive_search(
-                            query_vector=query_vector,
-                            query_text=search_query,
-                            top_k=RAG_SIMILARITY_TOP_K,
-                            intent_result=intent_result,
-                            where_filter=where_filter,
-                            alpha=search_alpha,
-                            filters=filters,
-                        )
+            # Cache de recherche: ids + scores réhydratés depuis le chunk store
+            filtered_docs = await self._get_cached_retrieval(
+                query_vector, where_filter, RAG_SIMILARITY_TOP_K, search_alpha, filters
+            )
+            if filtered_docs:
+                documents_found = len(filtered_docs)
+            else:
+                search_outcome = await self._search_documents(
+                    query,
+                    search_query,
+                    query_vector,
+                    where_filter,
+                    search_alpha,
+                    intent_result,
+                    filters,
+                )
+                if isinstance(search_outcome, RAGResult):
+                    return search_outcome
+                filtered_docs, documents_found = search_outcome
 
-                    if any(doc.metadata.get("hybrid_used") for doc in documents):
-                        self.optimization_stats["hybrid_searches"] += 1
+                await self._cache_retrieval(
+                    query_vector,
+                    where_filter,
+                    RAG_SIMILARITY_TOP_K,
+                    search_alpha,
+                    filters,
+                    filtered_docs,
+                )
 
-                except Exception as e:
-                    logger.error(f"Erreur recherche hybride: {e}")
-                    return RAGResult(
-                        source=RAGSource.SEARCH_FAILED, metadata={"error": str(e)}
-                    )
+            # ✅ MODIFICATION CRITIQUE: Génération de la réponse AVEC contexte conversationnel
+            result = await self._answer_from_documents(
+                query,
+                filtered_docs,
+                documents_found,
+                conversation_context_str,
+                language,
+                intent_result,
+                start_time,
+            )
+            if result.source != RAGSource.RAG_SUCCESS:
+                return result
 
-            if not documents:
-                return RAGResult(
-                    source=RAGSource.NO_DOCUMENTS_FOUND,
-                    context_docs=[],  # Empty list to prevent NoneType errors
-                    metadata={"reason": "no_documents_returned_from_search"},
+            # Mise en cache
+            if cache_key and self.cache_manager and self.cache_manager.enabled:
+                await self._cache_response(
+                    cache_key, query, result, language, conversation_context
                 )
 
-            # Filtrage par seuil de confiance
-            effective_threshold = RAG_CONFIDENCE_THRESHOLD
-            filtered_docs = [
-                doc for doc in documents if doc.score >= effective_threshold
+            METRICS.observe_latency(time.time() - start_time)
+            return result
+
+        except Exception as e:
+            logger.error(f"Erreur génération réponse Weaviate Core: {e}")
+            return RAGResult(
+                source=RAGSource.INTERNAL_ERROR,
+                metadata={"error": str(e), "processing_time": time.time() - start_time},
+            )
+
+    async def generate_responses_batch(
+        self,
+        queries: List[str],
+        language: str = "fr",
+        tenant_id: str = "default",
+        filters: Dict[str, Any] = None,
+    ) -> List[RAGResult]:
+        """
+        Génère les réponses de plusieurs sous-requêtes avec une recherche batch
+
+        Un seul appel d'embedding, recherches Weaviate simultanées et rerank
+        groupé (MultiQueryRetriever), puis génération des réponses en parallèle.
+
+        Args:
+            queries: Sous-requêtes (agent RAG, comparaisons)
+            language: Langue de réponse
+            tenant_id: Identifiant tenant
+            filters: Filtres additionnels communs (ex: {'species': 'broiler'})
+
+        Returns:
+            Un RAGResult par sous-requête, dans l'ordre d'entrée
+        """
+        start_time = time.time()
+
+        if not self.embedder or not self.retriever:
+            return [
+                RAGResult(
+                    source=RAGSource.SEARCH_FAILED,
+                    metadata={"error": "embedder_or_retriever_unavailable"},
+                )
+                for _ in queries
             ]
 
-            if not filtered_docs:
+        if self.batch_retriever is None:
+            self.batch_retriever = MultiQueryRetriever(
+                self.embedder, self.retriever, self.reranker
+            )
+
+        intent_results = []
+        for query in queries:
+            intent_result = None
+            if self.intent_processor:
+                try:
+                    intent_result = self.intent_processor.process_query(query)
+                except Exception as e:
+                    logger.warning(f"Erreur intent processor: {e}")
+            intent_results.append(intent_result)
+
+        batch = [
+            BatchQuery(
+                query=query,
+                search_text=(
+                    getattr(intent_result, "expanded_query", query)
+                    if intent_result
+                    else query
+                ),
+                intent_result=intent_result,
+                where_filter=build_where_filter(intent_result),
+                alpha=(
+                    getattr(intent_result, "preferred_alpha", DEFAULT_ALPHA)
+                    if intent_result
+                    else DEFAULT_ALPHA
+                ),
+            )
+            for query, intent_result in zip(queries, intent_results)
+        ]
+
+        documents = await self.batch_retriever.search_many(
+            batch,
+            top_k=RAG_SIMILARITY_TOP_K,
+            min_score=RAG_CONFIDENCE_THRESHOLD,
+            filters=filters,
+        )
+
+        async def answer(query, docs, intent_result):
+            if not docs:
                 return RAGResult(
-                    source=RAGSource.LOW_CONFIDENCE,
-                    context_docs=[],  # Empty list to prevent NoneType errors
-                    metadata={
-                        "threshold": effective_threshold,
-                        "max_score": (
-                            max([d.score for d in documents]) if documents else 0
-                        ),
-                        "documents_found": len(documents),
-                        "reason": "all_documents_below_threshold",
-                    },
+                    source=RAGSource.NO_DOCUMENTS_FOUND,
+                    context_docs=[],
+                    metadata={"reason": "no_documents_returned_from_batch_search"},
                 )
+            result = await self._answer_from_documents(
+                query, docs, len(docs), "", language, intent_result, start_time
+            )
+            result.metadata["batch_retrieval"] = True
+            return result
 
-            # 🔄 COHERE RE-RANKING (independent of Intelligent RRF)
-            if self.reranker and self.reranker.is_enabled() and len(filtered_docs) > 1:
-                try:
-                    logger.info(
-                        f"🔄 Applying Cohere reranking on {len(filtered_docs)} filtered documents"
-                    )
+        results = await asyncio.gather(
+            *(
+                answer(query, docs, intent_result)
+                for query, docs, intent_result in zip(queries, documents, intent_results)
+            ),
+            return_exceptions=True,
+        )
+
+        return [
+            (
+                RAGResult(source=RAGSource.INTERNAL_ERROR, metadata={"error": str(r)})
+                if isinstance(r, Exception)
+                else r
+            )
+            for r in results
+        ]
 
-                    # Convert Documents to dicts for reranker
-                    docs_for_rerank = [
-                        {
-                            "content": doc.content,
-                            "metadata": doc.metadata,
-                            "score": doc.score,
-                        }
-                        for doc in filtered_docs
-                    ]
+    async def _answer_from_documents(
+        self,
+        query: str,
+        filtered_docs: List[Document],
+        documents_found: int,
+        conversation_context_str: str,
+        language: str,
+        intent_result,
+        start_time: float,
+    ) -> RAGResult:
+        """Génère la réponse à partir des documents filtrés (et rerankés)"""
+        if self.generator:
+            response_text = await self.generator.generate_response(
+                query,
+                filtered_docs,
+                conversation_context_str,  # ✅ Passer le contexte au générateur
+                language,
+                intent_result,
+            )
 
-                    # Rerank documents (respects top_k)
-                    reranked_dicts = await self.reranker.rerank(
-                        query=query,
-                        documents=docs_for_rerank,
-                        top_n=min(10, len(filtered_docs)),  # Top 10 or less
-                    )
+            if not response_text:
+                return RAGResult(
+                    source=RAGSource.GENERATION_FAILED,
+                    context_docs=filtered_docs,
+                    metadata={"reason": "generator_returned_empty_response"},
+                )
+        else:
+            return RAGResult(
+                source=RAGSource.GENERATION_FAILED,
+                context_docs=filtered_docs,
+                metadata={"reason": "no_generator_configured"},
+            )
 
-                    # Convert back to Documents
-                    filtered_docs = []
-                    for reranked_dict in reranked_dicts:
-                        doc = Document(
-                            content=reranked_dict["content"],
-                            metadata=reranked_dict["metadata"],
-                            score=reranked_dict["score"],  # Reranked score
-                            explain_score=reranked_dict.get("explain_score"),
-                        )
-                        filtered_docs.append(doc)
+        # Calcul confiance finale
+        final_confidence = self._calculate_confidence(filtered_docs)
+
+        # Construction résultat
+        return RAGResult(
+            source=RAGSource.RAG_SUCCESS,
+            answer=response_text,
+            confidence=final_confidence,
+            context_docs=filtered_docs,  # ✅ FIX: Peupler context_docs pour RAGAS evaluation
+            metadata={
+                "approach": "weaviate_core_v5.1",
+                "documents_found": documents_found,
+                "documents_used": len(filtered_docs),
+                "effective_threshold": RAG_CONFIDENCE_THRESHOLD,
+                "processing_time": time.time() - start_time,
+                "language_target": language,
+                "intelligent_rrf_used": bool(
+                    self.intelligent_rrf
+                    and self.optimization_stats["intelligent_rrf_used"] > 0
+                ),
+                "conversation_context_used": bool(
+                    conversation_context_str
+                ),  # ✅ Traçabilité
+            },
+        )
 
-                    logger.info(
-                        f"✅ Cohere reranking applied: {len(filtered_docs)} docs "
-                        f"(top score: {filtered_docs[0].score:.3f})"
-                    )
+    async def _search_documents(
+        self,
+        query: str,
+        search_query: str,
+        query_vector: List[float],
+        where_filter: Dict,
+        search_alpha: float,
+        intent_result,
+        filters: Dict[str, Any] = None,
+    ) -> Union[RAGResult, Tuple[List[Document], int]]:
+        """
+        Recherche Weaviate + seuil de confiance + rerank Cohere
 
-                    # Update statistics
-                    self.optimization_stats["cohere_reranking_used"] += 1
+        Returns:
+            (documents filtrés et rerankés, nombre de documents trouvés),
+            ou un RAGResult en cas d'échec / absence de résultats
+        """
 
-                except Exception as rerank_error:
-                    logger.error(
-                        f"Reranking error (using original results): {rerank_error}"
-                    )
-                    # Fallback: keep original filtered docs
+        documents = []
+        if self._local_index_usable() and self.local_index_mode == "primary":
+            documents = await self._search_local_index(
+                query_vector, search_query, where_filter, search_alpha
+            )
 
-            # ✅ MODIFICATION CRITIQUE: Génération de la réponse AVEC contexte conversationnel
-            if self.generator:
-                response_text = await self.generator.generate_response(
+        if not documents and self.retriever:
+            try:
+                weaviate_search = self._search_weaviate(
                     query,
-                    filtered_docs,
-                    conversation_context_str,  # ✅ Passer le contexte au générateur
-                    language,
+                    search_query,
+                    query_vector,
+                    where_filter,
+                    search_alpha,
                     intent_result,
+                    filters,
                 )
+                if self._local_index_usable():
+                    documents = await asyncio.wait_for(
+                        weaviate_search, LOCAL_INDEX_DEADLINE
+                    )
+                else:
+                    documents = await weaviate_search
+
+                if any(doc.metadata.get("hybrid_used") for doc in documents):
+                    self.optimization_stats["hybrid_searches"] += 1
 
-                if not response_text:
+            except Exception as e:
+                if not self._local_index_usable():
+                    logger.error(f"Erreur recherche hybride: {e}")
                     return RAGResult(
-                        source=RAGSource.GENERATION_FAILED,
-                        context_docs=filtered_docs,
-                        metadata={"reason": "generator_returned_empty_response"},
+                        source=RAGSource.SEARCH_FAILED, metadata={"error": str(e)}
                     )
-            else:
-                return RAGResult(
-                    source=RAGSource.GENERATION_FAILED,
-                    context_docs=filtered_docs,
-                    metadata={"reason": "no_generator_configured"},
+                # Deadline dépassée ou Weaviate indisponible
+                logger.warning(
+                    f"Recherche Weaviate en échec ({type(e).__name__}: {e}), "
+                    "bascule sur l'index local"
+                )
+
+            # Les retrievers absorbent les erreurs Weaviate (liste vide)
+            if (
+                not documents
+                and self.local_index_mode == "fallback"
+                and self._local_index_usable()
+            ):
+                self.optimization_stats["local_index_fallbacks"] += 1
+                documents = await self._search_local_index(
+                    query_vector, search_query, where_filter, search_alpha
                 )
 
-            # Calcul confiance finale
-            final_confidence = self._calculate_confidence(filtered_docs)
+        if not documents:
+            return RAGResult(
+                source=RAGSource.NO_DOCUMENTS_FOUND,
+                context_docs=[],  # Empty list to prevent NoneType errors
+                metadata={"reason": "no_documents_returned_from_search"},
+            )
 
-            # Construction résultat
-            result = RAGResult(
-                source=RAGSource.RAG_SUCCESS,
-                answer=response_text,
-                confidence=final_confidence,
-                context_docs=filtered_docs,  # ✅ FIX: Peupler context_docs pour RAGAS evaluation
+        # Filtrage par seuil de confiance
+        effective_threshold = RAG_CONFIDENCE_THRESHOLD
+        filtered_docs = [doc for doc in documents if doc.score >= effective_threshold]
+
+        if not filtered_docs:
+            return RAGResult(
+                source=RAGSource.LOW_CONFIDENCE,
+                context_docs=[],  # Empty list to prevent NoneType errors
                 metadata={
-                    "approach": "weaviate_core_v5.1",
-                    "documents_found": len(documents),
-                    "documents_used": len(filtered_docs),
-                    "effective_threshold": effective_threshold,
-                    "processing_time": time.time() - start_time,
-                    "language_target": language,
-                    "intelligent_rrf_used": bool(
-                        self.intelligent_rrf
-                        and self.optimization_stats["intelligent_rrf_used"] > 0
+                    "threshold": effective_threshold,
+                    "max_score": (
+                        max([d.score for d in documents]) if documents else 0
                     ),
-                    "conversation_context_used": bool(
-                        conversation_context_str
-                    ),  # ✅ Traçabilité
+                    "documents_found": len(documents),
+                    "reason": "all_documents_below_threshold",
                 },
             )
 
-            # Mise en cache
-            if cache_key and self.cache_manager and self.cache_manager.enabled:
-                await self._cache_response(
-                    cache_key, query, result, language, conversation_context
+        # 🔄 COHERE RE-RANKING (independent of Intelligent RRF)
+        if self.reranker and self.reranker.is_enabled() and len(filtered_docs) > 1:
+            try:
+                logger.info(
+                    f"🔄 Applying Cohere reranking on {len(filtered_docs)} filtered documents"
                 )
 
-            METRICS.observe_latency(time.time() - start_time)
-            return result
+                # Convert Documents to dicts for reranker
+                docs_for_rerank = [
+                    {
+                        "content": doc.content,
+                        "metadata": doc.metadata,
+                        "score": doc.score,
+                    }
+                    for doc in filtered_docs
+                ]
+
+                # Rerank documents (respects top_k)
+                reranked_dicts = await self.reranker.rerank(
+                    query=query,
+                    documents=docs_for_rerank,
+                    top_n=min(10, len(filtered_docs)),  # Top 10 or less
+                )
+
+                # Convert back to Documents
+                filtered_docs = []
+                for reranked_dict in reranked_dicts:
+                    doc = Document(
+                        content=reranked_dict["content"],
+                        metadata=reranked_dict["metadata"],
+                        score=reranked_dict["score"],  # Reranked score
+                        explain_score=reranked_dict.get("explain_score"),
+                    )
+                    filtered_docs.append(doc)
+
+                logger.info(
+                    f"✅ Cohere reranking applied: {len(filtered_docs)} docs "
+                    f"(top score: {filtered_docs[0].score:.3f})"
+                )
+
+                # Update statistics
+                self.optimization_stats["cohere_reranking_used"] += 1
+
+            except Exception as rerank_error:
+                logger.error(
+                    f"Reranking error (using original results): {rerank_error}"
+                )
+                # Fallback: keep original filtered docs
+
+        return filtered_docs, len(documents)
+
+    async def _search_weaviate(
+        self,
+        query: str,
+        search_query: str,
+        query_vector: List[float],
+        where_filter: Dict,
+        search_alpha: float,
+        intent_result,
+        filters: Dict[str, Any] = None,
+    ) -> List[Document]:
+        """
+        Recherche Weaviate (RRF intelligent si disponible, sinon adaptative)
 
+        En mode ADAPTIVE_RETRIEVAL_DEPTH, une passe courte est tentée d'abord
+        et n'est relancée à RAG_SIMILARITY_TOP_K que si la confiance est basse
+        (voir retrieval/adaptive_depth.py).
+        """
+        top_k = RAG_SIMILARITY_TOP_K
+        depth = self.depth_policy.initial_depth(top_k)
+        search_args = (
+            query,
+            search_query,
+            query_vector,
+            where_filter,
+            search_alpha,
+            intent_result,
+            filters,
+        )
+
+        documents = await self._search_weaviate_at_depth(depth, *search_args)
+        if depth >= top_k:
+            return documents
+
+        decision = self.depth_policy.decide(
+            documents,
+            depth,
+            confidence=self._calculate_confidence(documents),
+            relevance=self._fusion_relevance(documents),
+        )
+        if decision.expand:
+            documents = await self._search_weaviate_at_depth(top_k, *search_args)
+
+        self._record_depth_decision(decision, top_k if decision.expand else depth)
+        return documents
+
+    async def _search_weaviate_at_depth(
+        self,
+        top_k: int,
+        query: str,
+        search_query: str,
+        query_vector: List[float],
+        where_filter: Dict,
+        search_alpha: float,
+        intent_result,
+        filters: Dict[str, Any] = None,
+    ) -> List[Document]:
+        """Recherche Weaviate ramenant top_k candidats"""
+        if (
+            self.intelligent_rrf
+            and hasattr(self.intelligent_rrf, "enabled")
+            and self.intelligent_rrf.enabled
+            and ENABLE_INTELLIGENT_RRF
+        ):
+            documents = await self._enhanced_hybrid_search_with_rrf(
+                query_vector,
+                search_query,
+                top_k,
+                where_filter,
+                search_alpha,
+                query,
+                intent_result,
+            )
+            self.optimization_stats["intelligent_rrf_used"] += 1
+            return documents
+
+        return await self.retriever.adaptive_search(
+            query_vector=query_vector,
+            query_text=search_query,
+            top_k=top_k,
+            intent_result=intent_result,
+            where_filter=where_filter,
+            alpha=search_alpha,
+            filters=filters,
+        )
+
+    def _fusion_relevance(self, documents: List[Document]) -> Optional[float]:
+        """Pertinence des candidats selon le RRF intelligent (None si inactif)"""
+        if not self.intelligent_rrf or not documents:
+            return None
+        try:
+            return self.intelligent_rrf._calculate_relevance_score(
+                [{"final_score": doc.score} for doc in documents]
+            )
         except Exception as e:
-            logger.error(f"Erreur génération réponse Weaviate Core: {e}")
-            return RAGResult(
-                source=RAGSource.INTERNAL_ERROR,
-                metadata={"error": str(e), "processing_time": time.time() - start_time},
+            logger.debug(f"Pertinence RRF indisponible: {e}")
+            return None
+
+    def _record_depth_decision(self, decision: DepthDecision, candidates: int):
+        """Trace la décision de profondeur (statistiques + METRICS)"""
+        self.optimization_stats[f"adaptive_depth_{decision.label}"] += 1
+        METRICS.retrieval_depth_decided(decision.label, decision.reason, candidates)
+        logger.info(
+            f"Profondeur adaptative: {decision.label} ({decision.reason}, "
+            f"{candidates} candidats, signaux: {decision.signals})"
+        )
+
+    def _local_index_usable(self) -> bool:
+        return (
+            self.local_index is not None
+            and self.local_index_mode in ("fallback", "primary")
+            and len(self.local_index) > 0
+        )
+
+    async def _search_local_index(
+        self,
+        query_vector: List[float],
+        search_query: str,
+        where_filter: Dict,
+        search_alpha: float,
+    ) -> List[Document]:
+        """Recherche hybride en mémoire (aucun appel réseau)"""
+        try:
+            documents = await asyncio.to_thread(
+                self.local_index.search,
+                query_vector,
+                search_query,
+                RAG_SIMILARITY_TOP_K,
+                where_filter,
+                search_alpha,
             )
+        except Exception as e:
+            logger.error(f"Erreur index local: {e}")
+            return []
+        self.optimization_stats["local_index_searches"] += 1
+        return documents
 
     async def _enhanced_hybrid_search_with_rrf(
         self,
@@ -908,6 +1356,9 @@ class WeaviateCore(InitializableMixin):
                     logger.warning(f"Erreur conversion document: {doc_error}")
                     continue
 
+            # Chunk store local: contenu décodé pour le top-k final seulement
+            self.retriever.hydrate_documents(final_documents)
+
             # NOUVEAU: Reranking Cohere APRÈS RRF
             if (
                 self.reranker
@@ -945,6 +1396,7 @@ class WeaviateCore(InitializableMixin):
                             score=reranked_dict["score"],  # Score reranké
                             explain_score=reranked_dict.get("explain_score"),
                         )
+                        doc.metadata["rerank_score"] = reranked_dict.get("rerank_score")
                         final_documents.append(doc)
 
                     logger.info(
@@ -1171,6 +1623,90 @@ class WeaviateCore(InitializableMixin):
         except Exception as e:
             logger.warning(f"Erreur mise en cache: {e}")
 
+    def _collection_name(self) -> str:
+        return getattr(self.retriever, "collection_name", None) or os.getenv(
+            "WEAVIATE_COLLECTION_NAME", "InteliaKnowledge"
+        )
+
+    def _retrieval_cache_enabled(self) -> bool:
+        return bool(
+            self.chunk_store is not None
+            and self.cache_manager
+            and self.cache_manager.enabled
+            and hasattr(self.cache_manager, "get_search_results")
+        )
+
+    async def _get_cached_retrieval(
+        self,
+        query_vector: List[float],
+        where_filter: Dict,
+        top_k: int,
+        alpha: float,
+        filters: Dict[str, Any] = None,
+    ) -> Optional[List[Document]]:
+        """Documents depuis le cache de recherche, sans appel Weaviate"""
+
+        if not self._retrieval_cache_enabled():
+            return None
+
+        try:
+            collection = self._collection_name()
+            self.chunk_store.sync_version(
+                await self.cache_manager.get_collection_version(collection)
+            )
+            entries = await self.cache_manager.get_search_results(
+                query_vector,
+                {"where": where_filter, "filters": filters},
+                top_k,
+                alpha=alpha,
+                collection=collection,
+            )
+            # Un chunk absent du store local = miss (nouvelle recherche)
+            documents = self.chunk_store.get_documents(entries) if entries else None
+        except Exception as e:
+            logger.warning(f"Erreur consultation cache de recherche: {e}")
+            return None
+
+        if not documents:
+            self.optimization_stats["retrieval_cache_misses"] += 1
+            METRICS.cache_miss("retrieval")
+            return None
+
+        for doc in documents:
+            doc.metadata["retrieval_cache_hit"] = True
+
+        self.optimization_stats["retrieval_cache_hits"] += 1
+        METRICS.cache_hit("retrieval")
+        logger.debug(f"Cache de recherche: {len(documents)} documents réhydratés")
+        return documents
+
+    async def _cache_retrieval(
+        self,
+        query_vector: List[float],
+        where_filter: Dict,
+        top_k: int,
+        alpha: float,
+        filters: Dict[str, Any],
+        documents: List[Document],
+    ):
+        """Met en cache les ids + scores fusionnés/rerankés"""
+
+        if not self._retrieval_cache_enabled() or not documents:
+            return
+
+        try:
+            entries = self.chunk_store.put_documents(documents)
+            await self.cache_manager.set_search_results(
+                query_vector,
+                {"where": where_filter, "filters": filters},
+                top_k,
+                entries,
+                alpha=alpha,
+                collection=self._collection_name(),
+            )
+        except Exception as e:
+            logger.warning(f"Erreur mise en cache de recherche: {e}")
+
     def get_stats(self) -> Dict[str, Any]:
         """Statistiques Weaviate Core"""
 
@@ -1195,11 +1731,35 @@ class WeaviateCore(InitializableMixin):
         if self.reranker:
             stats["reranker_stats"] = self.reranker.get_stats()
 
+        if self.batch_retriever:
+            stats["batch_retrieval_stats"] = self.batch_retriever.get_stats()
+
+        if self.embedder and hasattr(self.embedder, "prefetch_stats"):
+            stats["embedding_prefetch_stats"] = self.embedder.prefetch_stats.copy()
+
+        if self.chunk_store is not None:
+            stats["chunk_store_stats"] = self.chunk_store.get_stats()
+        if self.search_gate is not None:
+            stats["search_gate_stats"] = self.search_gate.get_stats()
+        if self.local_index is not None:
+            stats["local_index_stats"] = {
+                "mode": self.local_index_mode,
+                **self.local_index.get_stats(),
+            }
+
         return stats
 
     async def close(self):
         """Fermeture propre Weaviate Core"""
 
+        if self.weaviate_async_client is not None:
+            try:
+                await self.weaviate_async_client.close()
+                logger.info("Client Weaviate async fermé")
+            except Exception as e:
+                logger.warning(f"Erreur fermeture client Weaviate async: {e}")
+            self.weaviate_async_client = None
+
         if hasattr(self.weaviate_client, "close"):
             try:
                 await self.weaviate_client.close()
@@ -0,0 +1,242 @@
+# -*- coding: utf-8 -*-
+"""
+weaviate_async.py - Recherche Weaviate async native
+Version: 1.0.0
+Last modified: 2025-11-08
+"""
+"""
+weaviate_async.py - Recherche Weaviate async native
+
+- connect_async_client(): WeaviateAsyncClient (cloud ou local) avec pool de
+  connexions HTTP dimensionné explicitement et timeout de requête
+- SearchGate: nombre maximal de recherches simultanées, deadline par appel
+  (attente en file + exécution) et métriques d'attente en file
+
+WeaviateCore connecte le client async à côté du client sync et le passe au
+retriever (async_client=); il le ferme dans close(). Si la connexion async
+échoue, les recherches restent sur le client sync.
+
+Avec le client async, une recherche n'occupe plus de thread: le débit sous
+concurrence est limité par Weaviate (et par la limite explicite du gate),
+pas par le pool de threads anyio (40 threads par défaut) où les recherches
+attendaient sans que cela soit visible.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from utils.metrics_collector import METRICS
+
+logger = logging.getLogger(__name__)
+
+# Configuration (variables d'environnement)
+MAX_CONCURRENT_SEARCHES = int(os.getenv("WEAVIATE_MAX_CONCURRENT_SEARCHES", "64"))
+SEARCH_TIMEOUT = float(os.getenv("WEAVIATE_SEARCH_TIMEOUT", "10"))
+POOL_CONNECTIONS = int(os.getenv("WEAVIATE_POOL_CONNECTIONS", "20"))
+POOL_MAXSIZE = int(os.getenv("WEAVIATE_POOL_MAXSIZE", "100"))
+
+QUEUE_WAIT_SAMPLES = 1000
+
+
+class SearchDeadlineExceeded(asyncio.TimeoutError):
+    """Recherche non terminée avant sa deadline (attente en file comprise)"""
+
+
+def is_async_client(client) -> bool:
+    """True pour un weaviate.WeaviateAsyncClient"""
+    try:
+        from weaviate import WeaviateAsyncClient
+    except ImportError:
+        return False
+    return isinstance(client, WeaviateAsyncClient)
+
+
+def connect_async_client(
+    weaviate_url: str,
+    api_key: str = "",
+    headers: Optional[Dict[str, str]] = None,
+    pool_connections: int = POOL_CONNECTIONS,
+    pool_maxsize: int = POOL_MAXSIZE,
+    query_timeout: float = SEARCH_TIMEOUT,
+):
+    """
+    Crée un WeaviateAsyncClient (à connecter avec `await client.connect()`)
+
+    Args:
+        weaviate_url: URL du cluster (cloud si "weaviate.cloud", sinon locale)
+        api_key: Clé API Weaviate (requise pour le cloud)
+        headers: Headers additionnels (X-OpenAI-Api-Key, ...)
+        pool_connections: Nombre de pools de connexions HTTP
+        pool_maxsize: Connexions max par pool
+        query_timeout: Timeout des requêtes côté client (secondes)
+    """
+    import weaviate
+    from weaviate.classes.init import AdditionalConfig, Auth, Timeout
+    from weaviate.config import ConnectionConfig
+
+    additional_config = AdditionalConfig(
+        connection=ConnectionConfig(
+            session_pool_connections=pool_connections,
+            session_pool_maxsize=pool_maxsize,
+        ),
+        timeout=Timeout(query=query_timeout),
+    )
+
+    if "weaviate.cloud" in weaviate_url:
+        return weaviate.use_async_with_weaviate_cloud(
+            cluster_url=weaviate_url,
+            auth_credentials=Auth.api_key(api_key),
+            headers=headers,
+            additional_config=additional_config,
+            skip_init_checks=True,
+        )
+
+    host = weaviate_url.replace("http://", "").replace("https://", "")
+    return weaviate.use_async_with_local(
+        host=host, headers=headers, additional_config=additional_config
+    )
+
+
+class SearchGate:
+    """
+    Limite de recherches simultanées + deadline par appel + métriques de file
+
+    La deadline n'interrompt vraiment que les appels async. Un appel sync
+    lancé dans un thread (anyio.to_thread) ne peut pas être abandonné: le
+    gate lève SearchDeadlineExceeded et libère sa place, mais le thread
+    continue jusqu'au retour de Weaviate, borné par le timeout de requête
+    du client.
+
+    Usage:
+        gate = SearchGate(max_concurrency=64, timeout=10.0)
+        response = await gate.run("hybrid", lambda: collection.query.hybrid(...))
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = MAX_CONCURRENT_SEARCHES,
+        timeout: float = SEARCH_TIMEOUT,
+    ):
+        """
+        Args:
+            max_concurrency: Recherches simultanées max (au-delà: attente en file)
+            timeout: Deadline par appel en secondes (attente + exécution)
+        """
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop = None
+        self._queue_waits: deque = deque(maxlen=QUEUE_WAIT_SAMPLES)
+
+        self.stats = {
+            "searches": 0,
+            "timeouts": 0,
+            "errors": 0,
+            "in_flight": 0,
+            "max_in_flight": 0,
+            "waiting": 0,
+            "max_waiting": 0,
+            "total_queue_wait": 0.0,
+            "max_queue_wait": 0.0,
+        }
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        # Un sémaphore par event loop (tests, workers recréant leur loop)
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._loop = loop
+        return self._semaphore
+
+    async def run(
+        self,
+        search_type: str,
+        call: Callable[[], Awaitable[Any]],
+        timeout: Optional[float] = None,
+    ) -> Any:
+        """
+        Exécute une recherche sous la limite de concurrence
+
+        Args:
+            search_type: Libellé pour les métriques (vector, bm25, hybrid)
+            call: Fabrique de la coroutine de recherche
+            timeout: Deadline de l'appel (défaut: self.timeout)
+
+        Raises:
+            SearchDeadlineExceeded: deadline dépassée (en file ou en cours)
+        """
+        timeout = self.timeout if timeout is None else timeout
+        semaphore = self._get_semaphore()
+        start = time.perf_counter()
+
+        self.stats["waiting"] += 1
+        self.stats["max_waiting"] = max(self.stats["max_waiting"], self.stats["waiting"])
+        try:
+            await asyncio.wait_for(semaphore.acquire(), timeout)
+        except asyncio.TimeoutError:
+            self._record(search_type, time.perf_counter() - start, 0.0, "timeout")
+            raise SearchDeadlineExceeded(
+                f"Recherche {search_type}: {timeout:.1f}s écoulées en file d'attente"
+            )
+        finally:
+            self.stats["waiting"] -= 1
+
+        queue_wait = time.perf_counter() - start
+        self.stats["in_flight"] += 1
+        self.stats["max_in_flight"] = max(
+            self.stats["max_in_flight"], self.stats["in_flight"]
+        )
+        outcome = "error"
+        try:
+            result = await asyncio.wait_for(call(), max(timeout - queue_wait, 0.0))
+            outcome = "ok"
+            return result
+        except asyncio.TimeoutError:
+            outcome = "timeout"
+            raise SearchDeadlineExceeded(
+                f"Recherche {search_type}: deadline {timeout:.1f}s dépassée"
+            )
+        finally:
+            self.stats["in_flight"] -= 1
+            semaphore.release()
+            self._record(
+                search_type, queue_wait, time.perf_counter() - start - queue_wait, outcome
+            )
+
+    def _record(self, search_type: str, queue_wait: float, duration: float, outcome: str):
+        self.stats["searches"] += 1
+        if outcome == "timeout":
+            self.stats["timeouts"] += 1
+        elif outcome == "error":
+            self.stats["errors"] += 1
+        self.stats["total_queue_wait"] += queue_wait
+        self.stats["max_queue_wait"] = max(self.stats["max_queue_wait"], queue_wait)
+        self._queue_waits.append(queue_wait)
+
+        METRICS.weaviate_search_observed(search_type, queue_wait, duration, outcome)
+
+        if queue_wait > 0.1:
+            logger.debug(
+                f"Recherche {search_type}: {queue_wait * 1000:.0f}ms en file "
+                f"({self.stats['in_flight']}/{self.max_concurrency} en cours)"
+            )
+
+    def get_stats(self) -> Dict[str, Any]:
+        waits = sorted(self._queue_waits)
+        searches = self.stats["searches"]
+        return {
+            **self.stats,
+            "max_concurrency": self.max_concurrency,
+            "timeout": self.timeout,
+            "avg_queue_wait_ms": (
+                self.stats["total_queue_wait"] / searches * 1000 if searches else 0.0
+            ),
+            "p95_queue_wait_ms": (
+                waits[int(0.95 * (len(waits) - 1))] * 1000 if waits else 0.0
+            ),
+        }
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+benchmark_local_index.py - Recall@k de l'index local face à Weaviate
+Version: 1.0.0
+Last modified: 2025-11-12
+"""
+"""
+benchmark_local_index.py - Recall@k de l'index local face à Weaviate
+
+Pour chaque question des golden datasets (evaluation/), compare les top-k
+UUID de la recherche hybride Weaviate (référence) et de l'index local en
+mémoire (retrieval/local_index.py), au même alpha et au même embedding.
+Rapporte recall@k (part des UUID Weaviate retrouvés localement) et les
+latences des deux recherches.
+
+Prérequis: chunk store exporté (knowledge-ingesters
+export_chunk_store_snapshot.py) sous CHUNK_STORE_DIR, WEAVIATE_URL,
+WEAVIATE_API_KEY, OPENAI_API_KEY.
+
+Usage:
+    python scripts/benchmark_local_index.py [--k 5 10 15] [--alpha 0.6]
+                                            [--output logs/local_index.json]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from openai import AsyncOpenAI  # noqa: E402
+
+from evaluation.golden_dataset_intelia import get_intelia_test_dataset  # noqa: E402
+from evaluation.golden_dataset_weaviate import get_weaviate_test_dataset  # noqa: E402
+from evaluation.golden_dataset_weaviate_v2 import (  # noqa: E402
+    get_weaviate_v2_test_dataset,
+)
+from retrieval.chunk_store import open_chunk_store  # noqa: E402
+from retrieval.embedder import OpenAIEmbedder  # noqa: E402
+from retrieval.local_index import LocalHybridIndex  # noqa: E402
+from retrieval.weaviate.core import WeaviateCore  # noqa: E402
+
+DATASETS = {
+    "intelia": get_intelia_test_dataset,
+    "weaviate": get_weaviate_test_dataset,
+    "weaviate_v2": get_weaviate_v2_test_dataset,
+}
+
+
+def recall_at_k(reference: List[str], candidate: List[str], k: int) -> float:
+    """Part des k premiers UUID de référence présents dans les k candidats"""
+    expected = set(reference[:k])
+    if not expected:
+        return 1.0
+    return len(expected & set(candidate[:k])) / len(expected)
+
+
+async def run(args) -> Dict[str, Any]:
+    collection_name = os.getenv("WEAVIATE_COLLECTION_NAME", "InteliaKnowledge")
+    store = open_chunk_store(collection_name)
+    if store is None:
+        raise SystemExit("Chunk store introuvable (CHUNK_STORE_DIR)")
+
+    index = LocalHybridIndex(store)
+    build_start = time.time()
+    index.sync(force=True)
+    build_seconds = time.time() - build_start
+    print(f"Index local: {index.get_stats()} ({build_seconds:.1f}s)")
+
+    core = WeaviateCore(openai_client=None)
+    await core._connect_weaviate()
+    collection = core.weaviate_client.collections.get(collection_name)
+    embedder = OpenAIEmbedder(AsyncOpenAI())
+    max_k = max(args.k)
+
+    report = {"build_seconds": build_seconds, "index": index.get_stats()}
+    try:
+        for name, loader in DATASETS.items():
+            recalls = {k: [] for k in args.k}
+            weaviate_ms, local_ms = [], []
+
+            for case in loader():
+                question = case["question"]
+                vector = await embedder.get_embedding(question)
+
+                start = time.time()
+                response = collection.query.hybrid(
+                    query=question,
+                    vector=vector,
+                    alpha=args.alpha,
+                    limit=max_k,
+                    return_properties=[],
+                )
+                weaviate_ms.append((time.time() - start) * 1000)
+                reference = [str(obj.uuid) for obj in response.objects]
+
+                start = time.time()
+                local_docs = index.search(vector, question, max_k, alpha=args.alpha)
+                local_ms.append((time.time() - start) * 1000)
+                candidate = [doc.metadata["weaviate_id"] for doc in local_docs]
+
+                for k in args.k:
+                    recalls[k].append(recall_at_k(reference, candidate, k))
+
+            report[name] = {
+                "questions": len(weaviate_ms),
+                **{f"recall@{k}": float(np.mean(v)) for k, v in recalls.items()},
+                "weaviate_p50_ms": float(np.percentile(weaviate_ms, 50)),
+                "local_p50_ms": float(np.percentile(local_ms, 50)),
+                "local_p95_ms": float(np.percentile(local_ms, 95)),
+            }
+            print(f"{name}: {report[name]}")
+    finally:
+        core.weaviate_client.close()
+
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--k", type=int, nargs="+", default=[5, 10, 15])
+    parser.add_argument("--alpha", type=float, default=0.6)
+    parser.add_argument("--output", default="logs/local_index_benchmark.json")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Rapport: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -34,6 +34,7 @@ from .models import GuardrailResult, VerificationLevel
 from .core import GuardrailsOrchestrator
 from .cache import GuardrailCache
 from .evidence_checker import EvidenceChecker
+from .evidence_index import EvidenceIndex
 from .hallucination_detector import HallucinationDetector
 from .relevance_checker import RelevanceChecker  # NEW: Add relevance checker
 from .claims_extractor import ClaimsExtractor
@@ -49,6 +50,7 @@ __all__ = [
     # Components (for advanced usage)
     "GuardrailCache",
     "EvidenceChecker",
+    "EvidenceIndex",
     "HallucinationDetector",
     "RelevanceChecker",  # NEW: Export relevance checker
     "ClaimsExtractor",
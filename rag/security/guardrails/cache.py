@@ -49,15 +49,33 @@ class GuardrailCache:
             Cache key or None if generation fails
         """
         try:
-            content_hash = hashlib.md5(
-                f"{query}|{response}|{len(context_docs)}|{verification_level.value}".encode(),
+            key_hash = hashlib.md5(
+                f"{query}|{response}|{verification_level.value}".encode(),
                 usedforsecurity=False,
-            ).hexdigest()
-            return f"guardrail_{content_hash}"
+            )
+            # Hash the document identities, not their count: another set of
+            # documents of the same size must not reuse the result. Order does
+            # not affect the verification, so identities are sorted.
+            for identity in sorted(self._document_identity(d) for d in context_docs):
+                key_hash.update(f"|{identity}".encode())
+            return f"guardrail_{key_hash.hexdigest()}"
         except Exception as e:
             logger.warning(f"Failed to generate cache key: {e}")
             return None
 
+    @staticmethod
+    def _document_identity(doc: Dict) -> str:
+        """
+        Identity of a context document for the cache key
+
+        Source and title when present, plus a digest of the content: the
+        content is what the verification depends on.
+        """
+        content_digest = hashlib.md5(
+            str(doc.get("content", "")).encode(), usedforsecurity=False
+        ).hexdigest()
+        return f"{doc.get('source', '')}:{doc.get('title', '')}:{content_digest}"
+
     def get(self, cache_key: str) -> Optional[GuardrailResult]:
         """
         Get result from cache
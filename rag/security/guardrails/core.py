@@ -19,6 +19,7 @@ from .models import GuardrailResult, VerificationLevel
 from .config import get_thresholds
 from .cache import GuardrailCache
 from .evidence_checker import EvidenceChecker
+from .evidence_index import EvidenceIndex
 from .hallucination_detector import HallucinationDetector
 from .relevance_checker import RelevanceChecker
 
@@ -100,11 +101,16 @@ class GuardrailsOrchestrator:
                     cached_result.metadata["cache_hit"] = True
                     return cached_result
 
+            # Documents indexed once, shared by evidence and hallucination checks
+            evidence_index = EvidenceIndex(context_docs)
+
             # Parallel verification tasks
             verification_tasks = [
-                self.evidence_checker._check_evidence_support(response, context_docs),
+                self.evidence_checker._check_evidence_support(
+                    response, context_docs, evidence_index
+                ),
                 self.hallucination_detector._detect_hallucination_risk(
-                    response, context_docs
+                    response, context_docs, evidence_index
                 ),
                 self.relevance_checker.check_response_relevance(
                     query, response
@@ -17,7 +17,8 @@ Classes:
 import asyncio
 import re
 import logging
-from utils.types import Dict, List, Tuple
+from utils.types import Dict, List, Optional, Tuple
+from .evidence_index import EvidenceIndex
 from .text_analyzer import TextAnalyzer
 
 logger = logging.getLogger(__name__)
@@ -55,7 +56,10 @@ class EvidenceChecker:
         ]
 
     async def _check_evidence_support(
-        self, response: str, context_docs: List[Dict]
+        self,
+        response: str,
+        context_docs: List[Dict],
+        index: Optional[EvidenceIndex] = None,
     ) -> Tuple[float, Dict]:
         """
         Verify optimized documentary support for response.
@@ -67,6 +71,8 @@ class EvidenceChecker:
         Args:
             response: The response text to verify
             context_docs: List of context documents with 'content' field
+            index: Evidence index of context_docs shared for the request
+                (built here if None)
 
         Returns:
             Tuple containing:
@@ -96,9 +102,12 @@ class EvidenceChecker:
             if not claims:
                 return 0.5, {"no_factual_claims": True}
 
+            if index is None:
+                index = EvidenceIndex(context_docs)
+
             # Parallel verification of support for each claim
             support_tasks = [
-                self._find_enhanced_claim_support(claim, context_docs)
+                self._find_enhanced_claim_support(claim, context_docs, index)
                 for claim in claims
             ]
 
@@ -153,7 +162,10 @@ class EvidenceChecker:
             return 0.5, {"error": str(e)}
 
     async def _find_enhanced_claim_support(
-        self, claim: str, context_docs: List[Dict]
+        self,
+        claim: str,
+        context_docs: List[Dict],
+        index: Optional[EvidenceIndex] = None,
     ) -> float:
         """
         Search for enhanced support of a claim with semantic similarity.
@@ -163,9 +175,13 @@ class EvidenceChecker:
         - Key element matching (numbers, technical terms)
         - Fuzzy matching for variations
 
+        The documents are looked up in the evidence index rather than
+        normalized again for every claim.
+
         Args:
             claim: The claim text to verify
             context_docs: List of context documents to search
+            index: Evidence index of context_docs (built here if None)
 
         Returns:
             float: Maximum support score found (0.0 to 1.0), where:
@@ -184,41 +200,13 @@ class EvidenceChecker:
             True
         """
         try:
-            max_support = 0.0
-            claim_words = set(TextAnalyzer._normalize_text(claim).split())
+            if index is None:
+                index = EvidenceIndex(context_docs)
 
             # Extract key elements from the claim
             key_elements = TextAnalyzer._extract_key_elements(claim)
 
-            for doc in context_docs:
-                content = doc.get("content", "")
-                if not content:
-                    continue
-
-                content_normalized = TextAnalyzer._normalize_text(content)
-                content_words = set(content_normalized.split())
-
-                # Basic lexical similarity
-                if claim_words and content_words:
-                    overlap = len(claim_words.intersection(content_words))
-                    lexical_similarity = overlap / len(claim_words)
-
-                    # Bonus for key elements
-                    key_matches = sum(
-                        1 for key in key_elements if key in content_normalized
-                    )
-                    key_bonus = (
-                        (key_matches / len(key_elements)) * 0.3 if key_elements else 0
-                    )
-
-                    similarity = min(1.0, lexical_similarity + key_bonus)
-                    max_support = max(max_support, similarity)
-
-                # Check direct presence with variations
-                if TextAnalyzer._fuzzy_match(claim, content):
-                    max_support = max(max_support, 0.9)
-
-            return min(1.0, max_support)
+            return index.claim_support(claim, key_elements)
 
         except Exception as e:
             logger.warning(f"Erreur recherche support claim: {e}")
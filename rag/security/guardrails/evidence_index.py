@@ -0,0 +1,223 @@
+# -*- coding: utf-8 -*-
+"""
+evidence_index.py - Per-request evidence index for guardrails verification
+Version: 1.0.0
+Last modified: 2025-11-13
+"""
+"""
+evidence_index.py - Per-request evidence index for guardrails verification
+
+The context documents are normalized and indexed once per verify_response
+call. EvidenceChecker and HallucinationDetector then score every claim with
+index lookups instead of re-normalizing each document for each claim, so the
+verification cost no longer grows with claims x documents x content length.
+
+Classes:
+    EvidenceIndex: Normalized tokens, inverted token -> documents map and
+        extracted numerics of the context documents
+"""
+
+import re
+import logging
+from collections import Counter
+from utils.types import Dict, List, Optional, Set, Tuple
+
+from .text_analyzer import TextAnalyzer
+
+logger = logging.getLogger(__name__)
+
+# Number followed by its unit (letters, %, °) as found in document content
+NUMERIC_PATTERN = re.compile(r"(\d+[.,]?\d*)\s*([a-z%°]+)")
+
+# Relative tolerance when matching a numeric claim against the documents
+NUMERIC_TOLERANCE = 0.15
+
+
+class EvidenceIndex:
+    """
+    Evidence index over the context documents of one verification.
+
+    Built once from the context documents, then shared by the verification
+    modules for the whole request. Matching semantics are those of the
+    previous per-document scans (token overlap, substring presence in the
+    normalized content, numeric tolerance), only the lookups changed.
+
+    Attributes:
+        documents: Normalized content of each non-empty document
+        postings: Inverted index token -> ids of the documents containing it
+        numerics: Values found in the documents, by the unit that follows them
+    """
+
+    def __init__(self, context_docs: List[Dict]):
+        """
+        Build the index
+
+        Args:
+            context_docs: List of context documents with 'content' field
+        """
+        self.documents: List[str] = []
+        self.postings: Dict[str, Set[int]] = {}
+        self.numerics: Dict[str, List[float]] = {}
+        raw_content: List[str] = []
+        self._fragment_cache: Dict[str, Set[int]] = {}
+
+        for doc in context_docs:
+            content = doc.get("content", "")
+            if not content:
+                continue
+
+            doc_id = len(self.documents)
+            normalized = TextAnalyzer._normalize_text(content)
+            self.documents.append(normalized)
+            for token in set(normalized.split()):
+                self.postings.setdefault(token, set()).add(doc_id)
+
+            raw = content.lower()
+            raw_content.append(raw)
+            for value_str, unit in NUMERIC_PATTERN.findall(raw):
+                try:
+                    value = float(value_str.replace(",", "."))
+                except ValueError:
+                    continue
+                self.numerics.setdefault(unit, []).append(value)
+
+        # Documents never contain this separator, so no match spans two of them
+        self._raw_text = "\x00".join(raw_content)
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def docs_containing(self, fragment: str) -> Set[int]:
+        """
+        Documents whose normalized content contains a fragment (substring).
+
+        A fragment without whitespace can only occur inside a single token,
+        so the vocabulary is searched instead of the documents. Results are
+        memoized: the same key elements and words recur across claims.
+
+        Args:
+            fragment: Text searched in the normalized content
+
+        Returns:
+            Set[int]: Ids of the matching documents (do not modify)
+        """
+        cached = self._fragment_cache.get(fragment)
+        if cached is not None:
+            return cached
+
+        if fragment.split() != [fragment]:
+            # Empty or multi-word fragment (e.g. "ross 308"): scan the documents
+            matches = {
+                doc_id
+                for doc_id, normalized in enumerate(self.documents)
+                if fragment in normalized
+            }
+        else:
+            matches = set()
+            for token, token_docs in self.postings.items():
+                if fragment in token:
+                    matches.update(token_docs)
+
+        self._fragment_cache[fragment] = matches
+        return matches
+
+    def claim_support(self, claim: str, key_elements: List[str]) -> float:
+        """
+        Best support score of a claim across the documents.
+
+        Per document: lexical overlap of the claim words plus a bonus for key
+        elements present (up to 0.3), and 0.9 when more than 60% of the
+        significant claim segments (length > 3) appear in the document.
+
+        Args:
+            claim: The claim text to verify
+            key_elements: Key elements extracted from the claim by the caller
+
+        Returns:
+            float: Maximum support score found (0.0 to 1.0)
+        """
+        claim_normalized = TextAnalyzer._normalize_text(claim)
+        claim_words = set(claim_normalized.split())
+
+        overlap = Counter(
+            doc_id for word in claim_words for doc_id in self.postings.get(word, ())
+        )
+        key_matches = Counter(
+            doc_id for key in key_elements for doc_id in self.docs_containing(key)
+        )
+        segments = [seg for seg in claim_normalized.split() if len(seg) > 3]
+        segment_matches = Counter(
+            doc_id for seg in segments for doc_id in self.docs_containing(seg)
+        )
+
+        max_support = 0.0
+        # Only documents sharing a word or a key element with the claim score
+        if claim_words:
+            for doc_id in set(overlap) | set(key_matches):
+                if not self.documents[doc_id]:
+                    continue
+                lexical_similarity = overlap[doc_id] / len(claim_words)
+                key_bonus = (
+                    (key_matches[doc_id] / len(key_elements)) * 0.3
+                    if key_elements
+                    else 0
+                )
+                similarity = min(1.0, lexical_similarity + key_bonus)
+                max_support = max(max_support, similarity)
+
+        if segments and any(
+            count / len(segments) > 0.6 for count in segment_matches.values()
+        ):
+            max_support = max(max_support, 0.9)
+
+        return min(1.0, max_support)
+
+    def numeric_supported(self, numeric_text: str) -> bool:
+        """
+        Check that a numeric value is found in the documents.
+
+        Exact presence of the value with its unit, or a value within ±15%
+        followed by the same unit.
+
+        Args:
+            numeric_text: Value with unit as written in the response (e.g. "2.5kg")
+
+        Returns:
+            bool: True if the value is supported by a document
+        """
+        parsed = self._parse_numeric(numeric_text)
+        if parsed is None:
+            return False
+        value, unit = parsed
+
+        if numeric_text.lower() in self._raw_text:
+            return True
+
+        if value == 0:
+            return False
+
+        for doc_unit, values in self.numerics.items():
+            if not doc_unit.startswith(unit):
+                continue
+            if any(
+                abs(doc_value - value) / value <= NUMERIC_TOLERANCE
+                for doc_value in values
+            ):
+                return True
+
+        return False
+
+    @staticmethod
+    def _parse_numeric(numeric_text: str) -> Optional[Tuple[float, str]]:
+        """Value and unit of a numeric claim, None if it cannot be parsed"""
+        number_match = re.search(r"(\d+[.,]?\d*)\s*([a-zA-Z%°]+)", numeric_text)
+        if not number_match:
+            return None
+        try:
+            value = float(number_match.group(1).replace(",", "."))
+        except ValueError:
+            return None
+        return value, number_match.group(2).lower()
+
+
+__all__ = ["EvidenceIndex"]
@@ -14,9 +14,10 @@ in AI-generated responses. Extracted from advanced_guardrails.py for better modu
 import asyncio
 import re
 import logging
-from utils.types import Dict, List, Tuple
+from utils.types import Dict, List, Optional, Tuple
 
 from .config import HALLUCINATION_PATTERNS
+from .evidence_index import EvidenceIndex
 
 logger = logging.getLogger(__name__)
 
@@ -29,10 +30,21 @@ class HallucinationDetector:
         self.hallucination_patterns = HALLUCINATION_PATTERNS
 
     async def _detect_hallucination_risk(
-        self, response: str, context_docs: List[Dict]
+        self,
+        response: str,
+        context_docs: List[Dict],
+        index: Optional[EvidenceIndex] = None,
     ) -> Tuple[float, Dict]:
-        """Détection améliorée du risque d'hallucination"""
+        """
+        Détection améliorée du risque d'hallucination
+
+        Args:
+            index: Index des documents partagé pour la requête (construit si None)
+        """
         try:
+            if index is None:
+                index = EvidenceIndex(context_docs)
+
             risk_score = 0.0
             detected_patterns = []
             response_lower = response.lower()
@@ -54,7 +66,7 @@ class HallucinationDetector:
 
             # Détection d'affirmations sans support avec parallélisme
             unsupported_statements = await self._find_unsupported_statements_parallel(
-                response, context_docs
+                response, context_docs, index
             )
             risk_score += 0.2 * len(unsupported_statements)
 
@@ -67,7 +79,7 @@ class HallucinationDetector:
 
             if numeric_claims:
                 verification_tasks = [
-                    self._verify_enhanced_numeric_claim(numeric, context_docs)
+                    self._verify_enhanced_numeric_claim(numeric, context_docs, index)
                     for numeric in numeric_claims
                 ]
 
@@ -146,16 +158,24 @@ class HallucinationDetector:
                 (r"meilleur|supérieur|excellent", r"pire|inférieur|mauvais"),
             ]
 
+            # Patterns évalués une fois par phrase, pas pour chaque paire
+            positives = [
+                [bool(re.search(pos, s.lower())) for pos, _ in contradiction_pairs]
+                for s in sentences
+            ]
+            negatives = [
+                [bool(re.search(neg, s.lower())) for _, neg in contradiction_pairs]
+                for s in sentences
+            ]
+
             for i, sentence1 in enumerate(sentences):
+                if not any(positives[i]):
+                    continue
                 for j, sentence2 in enumerate(sentences[i + 1 :], i + 1):
-                    for pos_pattern, neg_pattern in contradiction_pairs:
-                        if re.search(pos_pattern, sentence1.lower()) and re.search(
-                            neg_pattern, sentence2.lower()
-                        ):
-                            contradictions.append(
-                                f"Contradiction entre phrases {i+1} et {j+1}: '{sentence1[:50]}...' vs '{sentence2[:50]}...'"
-                            )
-                            break
+                    if any(p and n for p, n in zip(positives[i], negatives[j])):
+                        contradictions.append(
+                            f"Contradiction entre phrases {i+1} et {j+1}: '{sentence1[:50]}...' vs '{sentence2[:50]}...'"
+                        )
 
         except Exception as e:
             logger.warning(f"Erreur détection contradictions: {e}")
@@ -165,7 +185,10 @@ class HallucinationDetector:
     # Helper methods
 
     async def _find_unsupported_statements_parallel(
-        self, response: str, context_docs: List[Dict]
+        self,
+        response: str,
+        context_docs: List[Dict],
+        index: Optional[EvidenceIndex] = None,
     ) -> List[str]:
         """Recherche parallélisée des affirmations non supportées"""
         try:
@@ -176,9 +199,12 @@ class HallucinationDetector:
             if not sentences:
                 return []
 
+            if index is None:
+                index = EvidenceIndex(context_docs)
+
             # Vérification parallèle du support
             support_tasks = [
-                self._find_enhanced_claim_support(sentence, context_docs)
+                self._find_enhanced_claim_support(sentence, context_docs, index)
                 for sentence in sentences
             ]
 
@@ -200,90 +226,37 @@ class HallucinationDetector:
             return []
 
     async def _find_enhanced_claim_support(
-        self, claim: str, context_docs: List[Dict]
+        self,
+        claim: str,
+        context_docs: List[Dict],
+        index: Optional[EvidenceIndex] = None,
     ) -> float:
-        """Recherche de support améliorée avec similarité sémantique"""
+        """Recherche de support d'une affirmation via l'index des documents"""
         try:
-            max_support = 0.0
-            claim_words = set(self._normalize_text(claim).split())
+            if index is None:
+                index = EvidenceIndex(context_docs)
 
             # Extraction des éléments clés de la claim
             key_elements = self._extract_key_elements(claim)
 
-            for doc in context_docs:
-                content = doc.get("content", "")
-                if not content:
-                    continue
-
-                content_normalized = self._normalize_text(content)
-                content_words = set(content_normalized.split())
-
-                # Similarité lexicale de base
-                if claim_words and content_words:
-                    overlap = len(claim_words.intersection(content_words))
-                    lexical_similarity = overlap / len(claim_words)
-
-                    # Bonus pour éléments clés
-                    key_matches = sum(
-                        1 for key in key_elements if key in content_normalized
-                    )
-                    key_bonus = (
-                        (key_matches / len(key_elements)) * 0.3 if key_elements else 0
-                    )
-
-                    similarity = min(1.0, lexical_similarity + key_bonus)
-                    max_support = max(max_support, similarity)
-
-                # Vérification de présence directe avec variations
-                if self._fuzzy_match(claim, content):
-                    max_support = max(max_support, 0.9)
-
-            return min(1.0, max_support)
+            return index.claim_support(claim, key_elements)
 
         except Exception as e:
             logger.warning(f"Erreur recherche support claim: {e}")
             return 0.3
 
     async def _verify_enhanced_numeric_claim(
-        self, numeric_text: str, context_docs: List[Dict]
+        self,
+        numeric_text: str,
+        context_docs: List[Dict],
+        index: Optional[EvidenceIndex] = None,
     ) -> bool:
-        """Vérification améliorée des valeurs numériques"""
+        """Vérification améliorée des valeurs numériques (exacte ou à ±15%)"""
         try:
-            # Extraction du nombre et de l'unité
-            number_match = re.search(r"(\d+[.,]?\d*)\s*([a-zA-Z%°]+)", numeric_text)
-            if not number_match:
-                return False
-
-            value_str = number_match.group(1)
-            unit = number_match.group(2).lower()
-
-            try:
-                value = float(value_str.replace(",", "."))
-            except ValueError:
-                return False
-
-            # Recherche dans les documents avec tolérance
-            for doc in context_docs:
-                content = doc.get("content", "").lower()
-
-                # Recherche exacte
-                if numeric_text.lower() in content:
-                    return True
-
-                # Recherche avec tolérance de ±15%
-                similar_pattern = rf"(\d+[.,]?\d*)\s*{re.escape(unit)}"
-                matches = re.findall(similar_pattern, content, re.IGNORECASE)
-
-                for match in matches:
-                    try:
-                        doc_value = float(match.replace(",", "."))
-                        tolerance = 0.15  # ±15%
-                        if abs(doc_value - value) / value <= tolerance:
-                            return True
-                    except ValueError:
-                        continue
+            if index is None:
+                index = EvidenceIndex(context_docs)
 
-            return False
+            return index.numeric_supported(numeric_text)
 
         except Exception as e:
             logger.warning(f"Erreur vérification numérique: {e}")
@@ -307,52 +280,5 @@ class HallucinationDetector:
 
         return key_elements
 
-    def _fuzzy_match(self, claim: str, content: str) -> bool:
-        """Correspondance floue entre claim et contenu"""
-        claim_norm = self._normalize_text(claim)
-        content_norm = self._normalize_text(content)
-
-        # Recherche de segments significatifs
-        claim_segments = [seg for seg in claim_norm.split() if len(seg) > 3]
-
-        if not claim_segments:
-            return False
-
-        matches = sum(1 for seg in claim_segments if seg in content_norm)
-        return (matches / len(claim_segments)) > 0.6
-
-    def _normalize_text(self, text: str) -> str:
-        """Normalisation de texte pour comparaisons"""
-        # Conversion en minuscules
-        normalized = text.lower()
-
-        # Suppression accents (version simple)
-        accent_map = {
-            "é": "e",
-            "è": "e",
-            "ê": "e",
-            "ë": "e",
-            "à": "a",
-            "â": "a",
-            "ä": "a",
-            "ù": "u",
-            "û": "u",
-            "ü": "u",
-            "ô": "o",
-            "ö": "o",
-            "î": "i",
-            "ï": "i",
-            "ç": "c",
-        }
-
-        for accented, simple in accent_map.items():
-            normalized = normalized.replace(accented, simple)
-
-        # Suppression ponctuation excessive
-        normalized = re.sub(r"[^\w\s\d.,%-]", " ", normalized)
-        normalized = re.sub(r"\s+", " ", normalized).strip()
-
-        return normalized
-
 
 __all__ = ["HallucinationDetector"]
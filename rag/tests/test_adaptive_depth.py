@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+"""
+test_adaptive_depth.py - Tests for adaptive retrieval depth (dynamic top_k)
+
+Covers the depth policy decisions (confident, clear winner, low confidence,
+low rerank score) and WeaviateCore running a shallow pass first, expanding to
+RAG_SIMILARITY_TOP_K only when confidence is low, and recording the decision
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import retrieval.weaviate.core as weaviate_core_module
+from core.data_models import Document
+from retrieval.adaptive_depth import AdaptiveDepthPolicy
+from retrieval.weaviate.core import WeaviateCore
+from utils.utilities import METRICS
+
+
+def docs(*scores, rerank=None):
+    return [
+        Document(
+            content=f"chunk {i}",
+            metadata={"rerank_score": rerank[i] if rerank else None},
+            score=score,
+        )
+        for i, score in enumerate(scores)
+    ]
+
+
+def policy():
+    return AdaptiveDepthPolicy(
+        enabled=True,
+        initial_top_k=5,
+        min_confidence=0.7,
+        min_relevance=0.06,
+        min_score_gap=0.25,
+        min_rerank_score=0.5,
+    )
+
+
+class TestAdaptiveDepthPolicy:
+    def test_initial_depth(self):
+        assert policy().initial_depth(135) == 5
+        assert policy().initial_depth(3) == 3
+        assert AdaptiveDepthPolicy(enabled=False).initial_depth(135) == 135
+
+    def test_confident_results_stay_shallow(self):
+        decision = policy().decide(docs(0.9, 0.88, 0.85), 5, 0.9, relevance=0.088)
+
+        assert not decision.expand
+        assert decision.reason == "confident"
+        assert decision.label == "shallow"
+
+    def test_clear_winner_stays_shallow(self):
+        decision = policy().decide(docs(0.9, 0.6, 0.5, 0.4, 0.3), 5, 0.55)
+
+        assert not decision.expand
+        assert decision.reason == "clear_winner"
+        assert decision.signals["score_gap"] == round(0.6 / 0.9, 4)
+
+    def test_flat_weak_scores_expand(self):
+        decision = policy().decide(docs(0.6, 0.59, 0.58, 0.58, 0.57), 5, 0.6)
+
+        assert decision.expand
+        assert decision.reason == "low_confidence"
+
+    def test_low_rerank_score_expands(self):
+        candidates = docs(0.9, 0.88, rerank=[0.3, 0.2])
+
+        decision = policy().decide(candidates, 5, 0.9, relevance=0.09)
+
+        assert decision.expand
+        assert decision.reason == "low_rerank_score"
+
+
+class FakeRetriever:
+    def __init__(self, scores_by_depth):
+        self.scores_by_depth = scores_by_depth
+        self.calls = []
+
+    async def adaptive_search(self, top_k, **kwargs):
+        self.calls.append(top_k)
+        return docs(*self.scores_by_depth[top_k])
+
+
+def search(core):
+    return asyncio.run(
+        core._search_weaviate(
+            "poids ross 308", "poids ross 308", [0.1] * 8, None, 0.6, None
+        )
+    )
+
+
+def make_core(monkeypatch, retriever):
+    monkeypatch.setattr(weaviate_core_module, "RAG_SIMILARITY_TOP_K", 40)
+    core = WeaviateCore(openai_client=None)
+    core.retriever = retriever
+    core.depth_policy = policy()
+    return core
+
+
+class TestWeaviateCoreAdaptiveDepth:
+    def test_confident_query_uses_shallow_pass_only(self, monkeypatch):
+        retriever = FakeRetriever({5: (0.95, 0.9, 0.9, 0.88, 0.87)})
+        core = make_core(monkeypatch, retriever)
+        shallow_before = METRICS.search_stats["adaptive_depth_shallow"]
+
+        documents = search(core)
+
+        assert retriever.calls == [5]
+        assert len(documents) == 5
+        assert core.optimization_stats["adaptive_depth_shallow"] == 1
+        assert METRICS.search_stats["adaptive_depth_shallow"] == shallow_before + 1
+
+    def test_low_confidence_expands_to_full_depth(self, monkeypatch):
+        retriever = FakeRetriever(
+            {5: (0.6, 0.59, 0.58, 0.58, 0.57), 40: (0.8,) + (0.6,) * 39}
+        )
+        core = make_core(monkeypatch, retriever)
+
+        documents = search(core)
+
+        assert retriever.calls == [5, 40]
+        assert len(documents) == 40
+        assert core.optimization_stats["adaptive_depth_expanded"] == 1
+
+    def test_disabled_policy_keeps_full_depth(self, monkeypatch):
+        retriever = FakeRetriever({40: (0.9,) * 40})
+        core = make_core(monkeypatch, retriever)
+        core.depth_policy = AdaptiveDepthPolicy(enabled=False)
+
+        search(core)
+
+        assert retriever.calls == [40]
+        assert core.optimization_stats["adaptive_depth_shallow"] == 0
@@ -0,0 +1,295 @@
+# -*- coding: utf-8 -*-
+"""
+test_batch_retrieval.py - Tests for the multi-query batched retrieval API
+
+Covers MultiQueryRetriever (one embed_documents call, concurrent searches,
+one grouped rerank), PostgreSQLRetriever.search_metrics_batch (breeds sharing
+the same criteria fetched with a single ANY($1) query) and the agent routing
+of decomposed sub-queries to the batch path
+"""
+
+import asyncio
+import time
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.data_models import Document, RAGResult, RAGSource
+from extensions.agent_rag_extension import InteliaAgentRAG, SubQuery
+from processing.intent_types import IntentType
+from retrieval.batch_retriever import BatchQuery, MultiQueryRetriever
+from retrieval.postgresql.retriever import PostgreSQLRetriever
+
+
+class FakeEmbedder:
+    def __init__(self):
+        self.calls = []
+
+    async def embed_documents(self, texts):
+        self.calls.append(list(texts))
+        return [[float(len(text))] for text in texts]
+
+
+class FakeRetriever:
+    """adaptive_search with latency; records concurrency"""
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def adaptive_search(self, query_vector, query_text, top_k, **kwargs):
+        self.calls.append((query_vector, query_text, kwargs))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+        if "broken" in query_text:
+            raise RuntimeError("weaviate down")
+        return [
+            Document(content=f"{query_text} doc {i}", score=1.0 - i * 0.3)
+            for i in range(3)
+        ]
+
+
+class FakeReranker:
+    def __init__(self):
+        self.calls = []
+
+    def is_enabled(self):
+        return True
+
+    async def rerank_many(self, queries, documents_lists, top_n=None):
+        self.calls.append((queries, documents_lists))
+        return [list(reversed(docs))[:top_n] for docs in documents_lists]
+
+
+class TestMultiQueryRetriever:
+    def test_one_embedding_call_and_concurrent_searches(self):
+        embedder, retriever = FakeEmbedder(), FakeRetriever(delay=0.05)
+        batch = MultiQueryRetriever(embedder, retriever)
+        queries = [f"poids souche {i} à 35 jours" for i in range(8)]
+
+        start = time.perf_counter()
+        documents = asyncio.run(batch.search_many(queries, top_k=5))
+        elapsed = time.perf_counter() - start
+
+        assert embedder.calls == [queries]
+        assert retriever.max_in_flight == 8
+        assert elapsed < 0.3  # concurrent, not 8 x 50 ms
+        assert [docs[0].content for docs in documents] == [
+            f"{q} doc 0" for q in queries
+        ]
+
+    def test_duplicate_texts_embedded_once(self):
+        embedder, retriever = FakeEmbedder(), FakeRetriever(delay=0)
+        batch = MultiQueryRetriever(embedder, retriever)
+
+        queries = [
+            BatchQuery(query="fcr ross", search_text="fcr ross 308 expanded"),
+            BatchQuery(query="fcr ross 308", search_text="fcr ross 308 expanded"),
+            "ventilation tunnel",
+        ]
+        documents = asyncio.run(batch.search_many(queries))
+
+        assert embedder.calls == [["fcr ross 308 expanded", "ventilation tunnel"]]
+        assert len(documents) == 3
+        assert retriever.calls[0][0] == retriever.calls[1][0]
+
+    def test_min_score_failed_search_and_grouped_rerank(self):
+        reranker = FakeReranker()
+        batch = MultiQueryRetriever(
+            FakeEmbedder(), FakeRetriever(delay=0), reranker, rerank_top_n=2
+        )
+
+        documents = asyncio.run(
+            batch.search_many(["ponte", "broken query", "litière"], min_score=0.5)
+        )
+
+        # One rerank call for every query that kept more than one document
+        assert len(reranker.calls) == 1
+        assert reranker.calls[0][0] == ["ponte", "litière"]
+        assert documents[1] == []
+        assert [d.content for d in documents[0]] == ["ponte doc 1", "ponte doc 0"]
+        assert batch.get_stats()["search_errors"] == 1
+
+    def test_embedding_failure_returns_empty_lists(self):
+        embedder = FakeEmbedder()
+
+        async def failing(texts):
+            return []
+
+        embedder.embed_documents = failing
+        retriever = FakeRetriever(delay=0)
+        batch = MultiQueryRetriever(embedder, retriever)
+
+        assert asyncio.run(batch.search_many(["a", "b"])) == [[], []]
+        assert retriever.calls == []
+
+
+ROWS = [
+    {
+        "company_name": "Aviagen" if strain == "308/308 FF" else "Cobb",
+        "breed_name": "Ross" if strain == "308/308 FF" else "Cobb",
+        "strain_name": strain,
+        "species": "broiler",
+        "metric_name": "body_weight for males",
+        "value_numeric": value,
+        "unit": "grams",
+        "age_min": 35,
+        "age_max": 35,
+        "sex": "male",
+        "unit_system": "metric",
+    }
+    for strain, value in [("308/308 FF", 2400.0), ("500", 2350.0), ("Hubbard", 2000.0)]
+]
+
+
+class FakeConnection:
+    def __init__(self, calls, delay):
+        self.calls = calls
+        self.delay = delay
+
+    async def fetch(self, sql, *params):
+        self.calls.append((sql, params))
+        await asyncio.sleep(self.delay)
+        if "ANY(" in sql:
+            return [r for r in ROWS if r["strain_name"] in params[0]]
+        return [r for r in ROWS if r["strain_name"] == params[0]]
+
+
+class FakePool:
+    def __init__(self, delay=0.0):
+        self.calls = []
+        self.delay = delay
+
+    def acquire(self):
+        pool = self
+
+        class Context:
+            async def __aenter__(self):
+                return FakeConnection(pool.calls, pool.delay)
+
+            async def __aexit__(self, *exc):
+                return False
+
+        return Context()
+
+
+def make_pg_retriever(delay=0.0):
+    retriever = PostgreSQLRetriever({})
+    retriever.breeds_registry = SimpleNamespace(
+        get_db_name=lambda breed: {"ross 308": "308/308 FF", "cobb 500": "500"}.get(
+            breed
+        )
+    )
+    retriever.reranker = None
+    retriever.pool = FakePool(delay)
+    retriever.is_initialized = True
+    return retriever
+
+
+class TestPostgreSQLBatch:
+    def test_breeds_share_one_any_query(self):
+        retriever = make_pg_retriever(delay=0.05)
+        entity_sets = [
+            {"breed": "ross 308", "age_days": 35, "sex": "male", "_comparison_label": "A"},
+            {"breed": "cobb 500", "age_days": 35, "sex": "male", "_comparison_label": "B"},
+        ]
+
+        results = asyncio.run(
+            retriever.search_metrics_batch(
+                ["poids ross 308", "poids cobb 500"], entity_sets, top_k=12
+            )
+        )
+
+        assert len(retriever.pool.calls) == 1
+        sql, params = retriever.pool.calls[0]
+        assert "s.strain_name = ANY($1)" in sql
+        assert "PARTITION BY s.strain_name" in sql and "strain_rank <= 12" in sql
+        assert params[0] == ["308/308 FF", "500"]
+
+        assert [r.source for r in results] == [RAGSource.RAG_SUCCESS] * 2
+        assert [r.context_docs[0]["metadata"]["strain"] for r in results] == [
+            "308/308 FF",
+            "500",
+        ]
+        assert results[1].metadata["query"] == "poids cobb 500"
+
+    def test_unbatchable_sets_run_concurrently(self):
+        retriever = make_pg_retriever(delay=0.05)
+        entity_sets = [
+            {"breed": "ross 308", "age_days": 35, "sex": "male"},
+            {"breed": "cobb 500", "age_days": 35, "sex": "male"},
+            {"breed": "ross 308", "age_days": 35, "sex": "female"},  # other criteria
+            {"breed": "hubbard", "age_days": 35},  # no DB mapping: LIKE query
+        ]
+
+        start = time.perf_counter()
+        results = asyncio.run(
+            retriever.search_metrics_batch(["q"] * 4, entity_sets, top_k=5)
+        )
+        elapsed = time.perf_counter() - start
+
+        sqls = [sql for sql, _ in retriever.pool.calls]
+        assert len(sqls) == 3
+        assert sum("ANY(" in sql for sql in sqls) == 1
+        assert elapsed < 0.12  # three queries in parallel
+        assert len(results) == 4
+        assert results[3].source == RAGSource.NO_RESULTS  # '%hubbard%' vs exact rows
+
+
+class FakeWeaviateCore:
+    def __init__(self):
+        self.batches = []
+
+    async def generate_responses_batch(self, queries, language="fr", tenant_id=""):
+        self.batches.append(queries)
+        return [
+            RAGResult(source=RAGSource.RAG_SUCCESS, answer=f"batch: {q}", confidence=0.8)
+            if "vide" not in q
+            else RAGResult(source=RAGSource.NO_DOCUMENTS_FOUND)
+            for q in queries
+        ]
+
+
+class FakeEngine:
+    def __init__(self):
+        self.weaviate_core = FakeWeaviateCore()
+        self.routed = []
+
+    async def generate_response(self, query, tenant_id="", language="fr"):
+        self.routed.append(query)
+        return RAGResult(source=RAGSource.RAG_SUCCESS, answer=f"routed: {query}", confidence=0.7)
+
+
+class TestAgentSubQueries:
+    def test_document_sub_queries_are_batched(self):
+        engine = FakeEngine()
+        agent = InteliaAgentRAG(engine)
+        sub_queries = [
+            SubQuery("Poids Ross 308 à 35 jours", IntentType.METRIC_QUERY),
+            SubQuery("Causes de mortalité élevée", IntentType.DIAGNOSIS_TRIAGE),
+            SubQuery("Protocole de traitement", IntentType.PROTOCOL_QUERY),
+            SubQuery("Réponse vide", IntentType.PROTOCOL_QUERY),
+        ]
+
+        results = asyncio.run(agent._process_sub_queries(sub_queries, "fr", "t1"))
+
+        assert engine.weaviate_core.batches == [
+            ["Causes de mortalité élevée", "Protocole de traitement", "Réponse vide"]
+        ]
+        # Metric sub-query keeps the routed path; empty batch result falls back
+        assert sorted(engine.routed) == ["Poids Ross 308 à 35 jours", "Réponse vide"]
+        assert [r.answer for r in results] == [
+            "routed: Poids Ross 308 à 35 jours",
+            "batch: Causes de mortalité élevée",
+            "batch: Protocole de traitement",
+            "routed: Réponse vide",
+        ]
+        assert all(r.metadata["agent_processed"] for r in results)
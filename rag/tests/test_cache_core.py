@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+"""
+test_cache_core.py - Tests for RedisCacheCore admission and eviction
+
+Covers the single round-trip write path (SET + HyperLogLog count in one
+pipeline, no KEYS/INFO), admission on sampled memory stats with background
+purge, the background sampler enforcing namespace limits, SCAN-based sampled
+LFU eviction (with idle-time fallback) and SCAN-based pattern invalidation
+"""
+
+import asyncio
+import fnmatch
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from cache.cache_core import CacheConfig, CacheStatus, RedisCacheCore
+
+
+class ResponseError(Exception):
+    pass
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.ops = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.ops.append((name, args, kwargs))
+            return self
+
+        return queue
+
+    async def execute(self, raise_on_error=True):
+        self.redis.round_trips += 1
+        results = []
+        for name, args, kwargs in self.ops:
+            try:
+                results.append(await getattr(self.redis, name)(*args, **kwargs))
+            except Exception as e:
+                if raise_on_error:
+                    raise
+                results.append(e)
+        return results
+
+
+class FakeRedis:
+    """Key/value store with the commands used by RedisCacheCore"""
+
+    def __init__(self, lfu=True):
+        self.data, self.ttls, self.freq, self.idle = {}, {}, {}, {}
+        self.hll = {}
+        self.lfu = lfu
+        self.round_trips = 0
+        self.commands = []
+        self.used_memory = 0
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def set(self, key, value, ex=None):
+        self.commands.append("set")
+        self.data[key] = value
+        self.ttls[key] = ex if ex is not None else -1
+        return True
+
+    async def pfadd(self, key, *values):
+        self.hll.setdefault(key, set()).update(values)
+        return 1
+
+    async def pfcount(self, *keys):
+        return len(set().union(*(self.hll.get(k, set()) for k in keys)))
+
+    async def expire(self, key, seconds):
+        return True
+
+    async def ttl(self, key):
+        return self.ttls.get(key, -2) if key in self.data else -2
+
+    async def object(self, infotype, key):
+        if infotype == "freq":
+            if not self.lfu:
+                raise ResponseError("An LFU maxmemory policy is not selected")
+            return self.freq.get(key, 0)
+        return self.idle.get(key, 0)
+
+    async def scan(self, cursor=0, match=None, count=None):
+        self.commands.append("scan")
+        keys = sorted(k for k in self.data if fnmatch.fnmatch(k, match))
+        batch = keys[cursor : cursor + count]
+        next_cursor = cursor + count if cursor + count < len(keys) else 0
+        return next_cursor, batch
+
+    async def unlink(self, *keys):
+        removed = [k for k in keys if self.data.pop(k, None) is not None]
+        return len(removed)
+
+    async def info(self, section=None):
+        self.commands.append("info")
+        return {"used_memory": self.used_memory}
+
+    async def dbsize(self):
+        return len(self.data)
+
+    async def keys(self, pattern):
+        raise AssertionError("KEYS must not be used")
+
+
+def make_core(redis, **config):
+    core = RedisCacheCore(
+        CacheConfig(
+            purge_threshold_mb=85,
+            warning_threshold_mb=70,
+            max_keys_per_namespace=config.pop("max_keys", 1000),
+            eviction_sample_size=config.pop("sample", 500),
+            **config,
+        )
+    )
+    core.client = redis
+    core.enabled = True
+    core.is_initialized = True
+    core.status = CacheStatus.HEALTHY
+    return core
+
+
+class TestWritePath:
+    def test_set_is_a_single_round_trip(self):
+        redis = FakeRedis()
+        core = make_core(redis)
+
+        assert asyncio.run(core.set("q1", {"answer": 42}, namespace="responses"))
+
+        assert redis.round_trips == 1
+        assert redis.commands == ["set"]
+        assert "resp:q1" in redis.data
+        counts = asyncio.run(core._estimate_namespace_keys(["responses"]))
+        assert counts == {"responses": 1}
+
+    def test_over_limit_refuses_and_purges_in_background(self):
+        redis = FakeRedis()
+        core = make_core(redis)
+        core.stats.memory_usage_mb = 90
+
+        async def scenario():
+            stored = await core.set("q1", "x", namespace="searches")
+            purge = core._purge_task
+            await purge
+            return stored, purge
+
+        stored, purge = asyncio.run(scenario())
+
+        assert not stored
+        assert purge is not None
+        assert core.protection_stats["memory_limit_hits"] == 1
+        assert "set" not in redis.commands
+
+
+def fill(core, namespace, count):
+    async def write():
+        for i in range(count):
+            await core.set(f"k{i:03d}", i, namespace=namespace)
+
+    asyncio.run(write())
+
+
+class TestEviction:
+    def test_sampled_lfu_evicts_least_used(self):
+        redis = FakeRedis()
+        core = make_core(redis, sample=10)
+        fill(core, "searches", 20)
+        for i in range(20):
+            redis.freq[f"search:k{i:03d}"] = i
+
+        deleted = asyncio.run(core._purge_namespace("searches", 0.5))
+
+        assert deleted == 10
+        # Lowest frequencies of each 10-key sample went first
+        kept = [f"search:k{i:03d}" for i in (*range(5, 10), *range(15, 20))]
+        assert sorted(redis.data) == kept
+        assert core._lfu_supported is True
+
+    def test_idle_time_fallback_without_lfu_policy(self):
+        redis = FakeRedis(lfu=False)
+        core = make_core(redis)
+        fill(core, "searches", 4)
+        redis.idle.update({"search:k000": 10, "search:k003": 500})
+
+        asyncio.run(core._purge_namespace("searches", 0.5))
+        assert core._lfu_supported is False
+
+        fill(core, "searches", 4)
+        asyncio.run(core._purge_namespace("searches", 0.25))
+        assert "search:k003" not in redis.data  # idlest key evicted
+
+    def test_collection_version_counters_are_never_evicted(self):
+        redis = FakeRedis()
+        core = make_core(redis)
+        fill(core, "searches", 4)
+        redis.data["search:version:InteliaKnowledge"] = b"7"
+        redis.ttls["search:version:InteliaKnowledge"] = -1
+        for i in range(4):
+            redis.freq[f"search:k{i:03d}"] = 5  # counter is the least used key
+
+        deleted = asyncio.run(core._purge_namespace("searches", 1.0))
+
+        assert deleted == 4
+        assert list(redis.data) == ["search:version:InteliaKnowledge"]
+
+    def test_sampler_enforces_namespace_limit(self):
+        redis = FakeRedis()
+        core = make_core(redis, max_keys=10)
+        fill(core, "searches", 20)
+
+        asyncio.run(core._sample_cache_state())
+
+        assert core.protection_stats["namespace_limit_hits"] == 1
+        assert len(redis.data) == 16  # 20% of the namespace evicted
+        assert core.stats.key_count == 20
+
+    def test_invalidate_pattern_uses_scan(self):
+        redis = FakeRedis()
+        core = make_core(redis, sample=3)
+        fill(core, "searches", 7)
+        asyncio.run(core.set("other", 1, namespace="responses"))
+
+        deleted = asyncio.run(core.invalidate_pattern("*", namespace="searches"))
+
+        assert deleted == 7
+        assert list(redis.data) == ["resp:other"]
+        assert "scan" in redis.commands
@@ -0,0 +1,236 @@
+# -*- coding: utf-8 -*-
+"""
+test_chunk_store.py - Tests for the local memory-mapped chunk store
+
+Covers MappedChunkStore reading the files written by ingestion (incremental
+index refresh, deletions, store reset), ChunkStore falling back to the mapped
+store, IDs-only Weaviate searches hydrated from the store (with a single
+fetch for objects not yet synced), and lazy content in feature extraction
+"""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from retrieval.chunk_store import ChunkStore, MappedChunkStore, open_chunk_store
+from retrieval.fusion_engine import ChunkFeatureExtractor
+from retrieval.retriever import HybridWeaviateRetriever
+
+
+def write_chunks(directory, chunks):
+    """Append records the way knowledge-ingesters LocalChunkStore does"""
+    directory.mkdir(parents=True, exist_ok=True)
+    data_path, index_path = directory / "chunks.bin", directory / "index.tsv"
+    offset = data_path.stat().st_size if data_path.exists() else 0
+    with open(data_path, "ab") as data, open(index_path, "a") as index:
+        for object_id, properties in chunks.items():
+            if properties is None:
+                index.write(f"{object_id}\t-1\t0\t0\n")
+                continue
+            metadata = {k: v for k, v in properties.items() if k != "content"}
+            metadata_bytes = json.dumps(metadata, ensure_ascii=False).encode("utf-8")
+            content_bytes = properties["content"].encode("utf-8")
+            data.write(metadata_bytes + content_bytes)
+            index.write(
+                f"{object_id}\t{offset}\t{len(metadata_bytes)}\t{len(content_bytes)}\n"
+            )
+            offset += len(metadata_bytes) + len(content_bytes)
+
+
+def chunk(content, **metadata):
+    return {"content": content, "title": content.split()[0], **metadata}
+
+
+class TestMappedChunkStore:
+    def test_reads_metadata_and_content_by_uuid(self, tmp_path):
+        write_chunks(
+            tmp_path / "KB",
+            {"uuid-1": chunk("poids Ross 308 à 35 jours", species="broiler")},
+        )
+        store = MappedChunkStore(str(tmp_path), "KB")
+
+        assert len(store) == 1
+        assert store.metadata("uuid-1") == {"title": "poids", "species": "broiler"}
+        assert store.content("uuid-1") == "poids Ross 308 à 35 jours"
+        assert store.content("unknown") is None
+
+        doc = store.get_document("uuid-1", score=0.5)
+        assert doc.metadata["weaviate_id"] == "uuid-1"
+        assert doc.score == 0.5
+
+    def test_incremental_refresh_updates_and_deletions(self, tmp_path):
+        write_chunks(tmp_path / "KB", {"a": chunk("fcr cobb"), "b": chunk("ponte")})
+        store = MappedChunkStore(str(tmp_path), "KB", refresh_interval=0)
+
+        write_chunks(tmp_path / "KB", {"a": chunk("fcr cobb 500 v2"), "b": None})
+        write_chunks(tmp_path / "KB", {"c": chunk("ventilation tunnel")})
+
+        assert store.content("c") == "ventilation tunnel"  # unknown id -> refresh
+        assert store.content("a") == "fcr cobb 500 v2"
+        assert "b" not in store
+        assert len(store) == 2
+
+    def test_cleared_store_is_reread(self, tmp_path):
+        write_chunks(tmp_path / "KB", {"a": chunk("fcr cobb"), "b": chunk("ponte")})
+        store = MappedChunkStore(str(tmp_path), "KB")
+
+        for name in ("chunks.bin", "index.tsv"):
+            (tmp_path / "KB" / name).unlink()
+        write_chunks(tmp_path / "KB", {"z": chunk("eau")})
+        store.refresh(force=True)
+
+        assert len(store) == 1
+        assert store.content("z") == "eau"
+
+    def test_open_requires_configured_existing_store(self, tmp_path, monkeypatch):
+        monkeypatch.delenv("CHUNK_STORE_DIR", raising=False)
+        assert open_chunk_store("KB") is None
+
+        monkeypatch.setenv("CHUNK_STORE_DIR", str(tmp_path))
+        assert open_chunk_store("KB") is None
+
+        write_chunks(tmp_path / "KB", {"a": chunk("fcr cobb")})
+        assert len(open_chunk_store("KB")) == 1
+
+    def test_chunk_store_hydrates_from_backing(self, tmp_path):
+        write_chunks(tmp_path / "KB", {"a": chunk("fcr cobb")})
+        store = ChunkStore(backing=MappedChunkStore(str(tmp_path), "KB"))
+
+        docs = store.get_documents([{"id": "a", "score": 0.7}])
+
+        assert docs[0].content == "fcr cobb"
+        assert docs[0].score == 0.7
+        assert "a" in store
+        assert store.get_documents([{"id": "b", "score": 0.1}]) is None
+
+
+UUID_1, UUID_2, UUID_3 = (f"00000000-0000-0000-0000-00000000000{i}" for i in "123")
+
+
+class FakeQuery:
+    """v4 query API returning UUIDs + scores (properties only when asked)"""
+
+    def __init__(self, properties):
+        self.properties = properties
+        self.calls = []
+
+    def _object(self, object_id, score=0.0, with_properties=True):
+        return SimpleNamespace(
+            uuid=object_id,
+            properties=self.properties[object_id] if with_properties else {},
+            metadata=SimpleNamespace(score=score, explain_score=None, distance=None),
+        )
+
+    def hybrid(self, **params):
+        self.calls.append(("hybrid", params))
+        with_properties = params.get("return_properties") != []
+        return SimpleNamespace(
+            objects=[
+                self._object(object_id, 1.0 / (i + 1), with_properties)
+                for i, object_id in enumerate(self.properties)
+            ]
+        )
+
+    def fetch_objects(self, filters=None, limit=None):
+        self.calls.append(("fetch_objects", {"limit": limit}))
+        return SimpleNamespace(
+            objects=[self._object(object_id) for object_id in (UUID_3,)]
+        )
+
+
+def make_retriever(tmp_path, query):
+    client = SimpleNamespace(
+        collections=SimpleNamespace(get=lambda name: SimpleNamespace(query=query))
+    )
+    retriever = HybridWeaviateRetriever(client, collection_name="KB")
+    retriever.set_chunk_store(MappedChunkStore(str(tmp_path), "KB"))
+    return retriever
+
+
+class TestIdsOnlySearch:
+    def test_skeletons_hydrated_from_store(self, tmp_path):
+        write_chunks(
+            tmp_path / "KB",
+            {
+                UUID_1: chunk("poids Ross 308", species="broiler"),
+                UUID_2: chunk("fcr Cobb 500", species="broiler"),
+            },
+        )
+        query = FakeQuery(
+            {
+                UUID_1: chunk("poids Ross 308"),
+                UUID_2: chunk("fcr Cobb 500"),
+                UUID_3: chunk("ponte Lohmann", species="layer"),
+            }
+        )
+        retriever = make_retriever(tmp_path, query)
+
+        docs = asyncio.run(
+            retriever._hybrid_search_v4_corrected([0.1] * 8, "poids", 3, None, 0.5)
+        )
+
+        hybrid_params = query.calls[0][1]
+        assert hybrid_params["return_properties"] == []
+        assert [c[0] for c in query.calls] == ["hybrid", "fetch_objects"]
+
+        assert [d.metadata["weaviate_id"] for d in docs] == [UUID_1, UUID_2, UUID_3]
+        assert docs[0].content == "" and docs[0].metadata["content_pending"]
+        assert docs[0].metadata["species"] == "broiler"
+        # Not yet synced to the store: fetched with its content
+        assert docs[2].content == "ponte Lohmann"
+        assert docs[2].score == 1.0 / 3
+
+        retriever.hydrate_documents(docs)
+        assert [d.content for d in docs[:2]] == ["poids Ross 308", "fcr Cobb 500"]
+        assert not any("content_pending" in d.metadata for d in docs)
+        assert docs[0].metadata["content_length"] == len("poids Ross 308")
+
+    def test_full_properties_without_store(self, tmp_path):
+        query = FakeQuery({"uuid-1": chunk("poids Ross 308")})
+        client = SimpleNamespace(
+            collections=SimpleNamespace(get=lambda name: SimpleNamespace(query=query))
+        )
+        retriever = HybridWeaviateRetriever(client, collection_name="KB")
+
+        docs = asyncio.run(
+            retriever._hybrid_search_v4_corrected([0.1] * 8, "poids", 3, None, 0.5)
+        )
+
+        assert "return_properties" not in query.calls[0][1]
+        assert docs[0].content == "poids Ross 308"
+
+
+class TestLazyContentFeatures:
+    def test_pending_content_read_only_when_words_needed(self, tmp_path):
+        write_chunks(tmp_path / "KB", {"uuid-1": chunk("Ross 308 poids 35 jours")})
+        source = MappedChunkStore(str(tmp_path), "KB")
+        extractor = ChunkFeatureExtractor()
+        extractor.content_source = source
+
+        skeleton = {
+            "content": "",
+            "metadata": {
+                "weaviate_id": "uuid-1",
+                "content_pending": True,
+                "breed_mentions": ["ross 308"],
+                "age_days_mentioned": [35],
+                "metric_mentions": ["weight"],
+                "is_technical_source": True,
+                "has_medical_terms": False,
+            },
+        }
+        features = extractor.features(skeleton)
+
+        assert source.stats["content_reads"] == 0
+        assert "poids" in features.words
+        assert source.stats["content_reads"] == 1
+
+        legacy = {
+            "content": "",
+            "metadata": {"weaviate_id": "uuid-1", "content_pending": True},
+        }
+        assert extractor.features(legacy).ages == frozenset({35})
@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""
+test_evidence_index.py - Tests for the shared guardrails evidence index
+
+Covers claim support by index lookups (same scores as the former per-document
+scan), numeric verification (exact and ±15%), a single index built per
+verify_response and shared by both checkers, and guardrail cache keys derived
+from document identities instead of the document count
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import security.guardrails.core as guardrails_core
+from security.guardrails import (
+    EvidenceChecker,
+    EvidenceIndex,
+    GuardrailCache,
+    GuardrailsOrchestrator,
+    HallucinationDetector,
+    TextAnalyzer,
+    VerificationLevel,
+)
+
+DOCS = [
+    {"content": "Ross 308 broiler weight: 2.5kg at day 42, FCR de 1.65."},
+    {"content": "La température optimale est de 32°C pour les poussins."},
+    {"content": ""},
+    {"content": "Cobb 500: mortalité de 3% et densité de 18 sujets/m²."},
+]
+
+CLAIMS = [
+    "Ross 308 atteint 2.5kg en 42 jours",
+    "La température optimale pour les poussins est de 32°C",
+    "Le Cobb 500 présente une mortalité de 3%",
+    "Les poules pondeuses préfèrent la musique classique",
+    "FCR",
+]
+
+
+def scan_support(claim, key_elements, context_docs):
+    """Per-document scan used before the index (reference scores)"""
+    max_support = 0.0
+    claim_words = set(TextAnalyzer._normalize_text(claim).split())
+    for doc in context_docs:
+        content = doc.get("content", "")
+        if not content:
+            continue
+        content_normalized = TextAnalyzer._normalize_text(content)
+        content_words = set(content_normalized.split())
+        if claim_words and content_words:
+            overlap = len(claim_words.intersection(content_words))
+            key_matches = sum(1 for key in key_elements if key in content_normalized)
+            key_bonus = (key_matches / len(key_elements)) * 0.3 if key_elements else 0
+            similarity = min(1.0, overlap / len(claim_words) + key_bonus)
+            max_support = max(max_support, similarity)
+        if TextAnalyzer._fuzzy_match(claim, content):
+            max_support = max(max_support, 0.9)
+    return min(1.0, max_support)
+
+
+class TestEvidenceIndex:
+    def test_claim_support_matches_document_scan(self):
+        index = EvidenceIndex(DOCS)
+        detector = HallucinationDetector()
+
+        for claim in CLAIMS:
+            for key_elements in (
+                TextAnalyzer._extract_key_elements(claim),
+                detector._extract_key_elements(claim),
+            ):
+                expected = scan_support(claim, key_elements, DOCS)
+                assert index.claim_support(claim, key_elements) == expected, claim
+
+    def test_index_skips_empty_documents(self):
+        index = EvidenceIndex(DOCS)
+
+        assert len(index) == 3
+        assert index.postings["ross"] == {0}
+        assert index.docs_containing("oussin") == {1}
+        assert index.docs_containing("ross 308") == {0}
+
+    def test_numeric_claims(self):
+        index = EvidenceIndex(DOCS)
+
+        assert index.numeric_supported("2.5kg")  # exact
+        assert index.numeric_supported("2,7 kg")  # within 15%
+        assert index.numeric_supported("30°C")
+        assert not index.numeric_supported("3.5kg")
+        assert not index.numeric_supported("2.5 j")  # other unit
+        assert not index.numeric_supported("kg")
+
+
+class CountingIndex(EvidenceIndex):
+    built = 0
+
+    def __init__(self, context_docs):
+        CountingIndex.built += 1
+        super().__init__(context_docs)
+
+
+class FakeRelevanceChecker:
+    async def check_response_relevance(self, query, response):
+        return True, 0.9, {}
+
+
+class TestSharedIndex:
+    def test_verify_response_builds_one_index(self, monkeypatch):
+        monkeypatch.setattr(guardrails_core, "EvidenceIndex", CountingIndex)
+        CountingIndex.built = 0
+        orchestrator = GuardrailsOrchestrator(client=None, enable_cache=False)
+        orchestrator.relevance_checker = FakeRelevanceChecker()
+        response = " ".join(f"{claim}." for claim in CLAIMS * 10)
+
+        result = asyncio.run(orchestrator.verify_response("ross 308", response, DOCS))
+
+        assert CountingIndex.built == 1
+        assert result.metadata["evidence_details"]["total_claims"] == 30
+        assert result.metadata["hallucination_details"]["numeric_claims"] == 40
+
+    def test_checkers_build_their_own_index_when_called_alone(self):
+        score, details = asyncio.run(
+            EvidenceChecker()._check_evidence_support(CLAIMS[0], DOCS)
+        )
+        risk, _ = asyncio.run(
+            HallucinationDetector()._detect_hallucination_risk(CLAIMS[0], DOCS)
+        )
+
+        assert details["support_distribution"]["moderate"] == 1
+        assert score == 0.6
+        assert risk < 0.5
+
+
+class TestGuardrailCacheKey:
+    def key(self, docs):
+        return GuardrailCache().generate_key(
+            "q", "r", docs, VerificationLevel.STANDARD
+        )
+
+    def test_key_depends_on_documents_not_their_count(self):
+        other = [{"content": "autre document"}] + DOCS[1:]
+
+        assert self.key(DOCS) != self.key(other)
+        assert self.key(DOCS) == self.key(list(reversed(DOCS)))
+        assert self.key(DOCS) == self.key([dict(doc) for doc in DOCS])
@@ -0,0 +1,341 @@
+# -*- coding: utf-8 -*-
+"""
+test_fusion_engine.py - Tests for the vectorized RRF fusion engine
+
+Covers weighted RRF ordering, poultry boosts, features read from ingestion
+metadata, the ranking changes brought by the ingestion term lists (metric
+synonyms, English medical and technical-source terms), the early-exit diversity selection (checked against the exhaustive
+filter), IntelligentRRFFusion end to end, vectorized AdvancedResultBoosting
+and its breed_mentions filters, and a k=20/100/500 microbenchmark (run with
+-s to see the timings)
+"""
+
+import asyncio
+import random
+import time
+import pytest
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from retrieval.advanced_boosting import AdvancedResultBoosting
+from retrieval.enhanced_rrf_fusion import AdaptiveRRFParams, IntelligentRRFFusion
+from retrieval.fusion_engine import (
+    FEATURE_FIELDS,
+    ChunkFeatureExtractor,
+    FusedRankingEngine,
+    FusionCandidates,
+    feature_metadata,
+)
+
+WORDS = (
+    "ross 308 cobb 500 poids fcr mortalité ponte gain ventilation litière eau "
+    "aliment température densité vaccin maladie traitement diagnostic lot "
+    "croissance jours semaine poulet dinde oeuf éclosion couvoir"
+).split()
+
+
+def make_doc(i, content, **metadata):
+    return {"content": content, "metadata": {"title": f"doc {i}", **metadata}}
+
+
+def random_docs(n, seed=0):
+    rng = random.Random(seed)
+    return [
+        make_doc(i, " ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 40))) + f" {i}j")
+        for i in range(n)
+    ]
+
+
+def key_fn(doc):
+    return doc["metadata"]["title"]
+
+
+def exhaustive_selection(candidates, multipliers, top_k, threshold):
+    """Original algorithm: diversity filter over every candidate, then top_k"""
+    order = np.argsort(-candidates.scores, kind="stable")
+    if len(order) <= 3:
+        kept = list(order)
+    else:
+        kept = []
+        for idx in order:
+            words = candidates.features[idx].words
+            if kept and not FusedRankingEngine._is_diverse(
+                words, [candidates.features[k].words for k in kept], threshold
+            ):
+                continue
+            kept.append(idx)
+    finals = candidates.scores[kept] * multipliers[kept]
+    ranking = np.argsort(-finals, kind="stable")[:top_k]
+    return [int(kept[i]) for i in ranking]
+
+
+class TestWeightedRRF:
+    def test_rrf_ordering_without_boost(self):
+        engine = FusedRankingEngine()
+        docs = [make_doc(i, f"contenu {i}") for i in range(4)]
+        params = AdaptiveRRFParams(rrf_k=60, vector_weight=0.5, bm25_weight=0.5)
+
+        candidates = engine.weighted_rrf(
+            [docs[0], docs[1], docs[2]], [docs[1], docs[3]], params, {}, key_fn
+        )
+
+        # docs[1] appears in both lists and wins
+        assert key_fn(candidates.docs[int(np.argmax(candidates.scores))]) == "doc 1"
+        assert list(candidates.vector_rank) == [1, 2, 3, 0]
+        assert list(candidates.bm25_rank) == [0, 1, 0, 2]
+        expected = (0.5 / 62 + 0.5 / 61) * params.score_multiplier
+        assert candidates.scores[1] == pytest.approx(expected)
+
+    def test_genetic_line_boost(self):
+        engine = FusedRankingEngine(genetic_boost_factor=2.5)
+        docs = [
+            make_doc(0, "ventilation du bâtiment"),
+            make_doc(1, "Poids Ross-308 à 35 jours"),
+            make_doc(2, "standard", geneticLine="Ross 308"),
+        ]
+        context = {"genetic_line": "ross_308", "age_days": 35}
+        boost = engine.poultry_boost(
+            [engine.feature_extractor.features(d) for d in docs], context
+        )
+
+        assert boost[0] == 1.0
+        assert boost[1] == pytest.approx(min(2.5 * 0.8 * 1.4, 3.0))
+        assert boost[2] == pytest.approx(2.5)
+
+    def test_age_pattern_does_not_match_inside_numbers(self):
+        features = ChunkFeatureExtractor().extract("lot de 135j et semaine 2")
+        assert 35 not in features.ages
+        assert 135 in features.ages
+
+    def test_ingestion_metadata_features(self):
+        extractor = ChunkFeatureExtractor()
+        doc = make_doc(
+            0,
+            "texte sans mention",
+            breed_mentions=["Cobb 500"],
+            age_days_mentioned=[21],
+            metric_mentions=["fcr"],
+            is_technical_source=True,
+            has_medical_terms=False,
+        )
+        features = extractor.features(doc)
+
+        assert features.mentions_breed("cobb 500")
+        assert features.ages == frozenset({21})
+        assert features.technical_source
+        assert len(extractor._cache) == 0  # no content extraction needed
+
+    def test_weaviate_properties_to_metadata(self):
+        properties = {
+            "content": "x",
+            "breed_mentions": ["ross 308"],
+            "age_days_mentioned": [35],
+            "metric_mentions": [],
+            "is_technical_source": False,
+            "has_medical_terms": True,
+        }
+        assert set(feature_metadata(properties)) == set(FEATURE_FIELDS)
+        assert feature_metadata({"content": "x"}) == {}
+
+    def test_english_content_features(self):
+        features = ChunkFeatureExtractor().extract(
+            "Ross 308 body weight at day 35 and 42 days, disease control"
+        )
+        assert features.ages == frozenset({35, 42})
+        assert features.metrics == frozenset({"poids"})
+        assert features.medical_terms
+
+    def test_metric_synonyms_trigger_breed_metric_boosts(self):
+        # Former matching looked for the key itself ("poids" in content)
+        engine = FusedRankingEngine(genetic_priority_enabled=False)
+        docs = [
+            make_doc(0, "Ross 308 body weight objectives"),
+            make_doc(1, "Ross 308 ventilation"),
+        ]
+        context = {
+            "genetic_line": "ross 308",
+            "has_performance_metric": True,
+            "performance_metrics": ["poids"],
+        }
+        features = [engine.feature_extractor.features(d) for d in docs]
+        candidates = engine.weighted_rrf(docs, [], AdaptiveRRFParams(), context, key_fn)
+
+        assert list(engine.poultry_boost(features, context)) == [1.5, 1.0]
+        assert list(engine.post_boost(candidates, context)) == [1.3, 1.0]
+
+    def test_english_medical_terms_get_urgency_boost(self):
+        engine = FusedRankingEngine()
+        docs = [
+            make_doc(0, "Disease diagnosis and treatment by the veterinarian"),
+            make_doc(1, "Lighting program"),
+        ]
+        candidates = engine.weighted_rrf(docs, [], AdaptiveRRFParams(), {}, key_fn)
+
+        multipliers = engine.post_boost(candidates, {"urgency_level": 0.9})
+
+        assert list(multipliers) == [1.2, 1.0]
+
+    def test_english_technical_sources_are_boosted(self):
+        engine = FusedRankingEngine()
+        sources = [
+            "Ross Broiler Handbook",
+            "Technical note",
+            "Cobb reference manual",
+            "Guide d'élevage",
+            "Blog post",
+        ]
+        docs = [make_doc(i, f"contenu {i}", source=src) for i, src in enumerate(sources)]
+
+        boost = engine.poultry_boost(
+            [engine.feature_extractor.features(d) for d in docs], {}
+        )
+
+        assert list(boost) == [1.2, 1.2, 1.2, 1.2, 1.0]
+
+    def test_content_features_are_cached(self):
+        extractor = ChunkFeatureExtractor(cache_size=2)
+        doc = make_doc(0, "cobb500 fcr 42j", chunk_id="c0")
+
+        first = extractor.features(doc)
+        assert extractor.features(doc) is first
+        assert first.breeds == frozenset({"cobb 500"})
+        assert first.metrics == frozenset({"fcr"})
+
+
+class TestSelection:
+    def test_early_exit_matches_exhaustive_filter(self):
+        engine = FusedRankingEngine()
+        rng = np.random.default_rng(1)
+
+        for trial in range(30):
+            n = int(rng.integers(4, 120))
+            docs = random_docs(n, seed=trial)
+            features = [engine.feature_extractor.features(d) for d in docs]
+            candidates = FusionCandidates(
+                docs, features, np.arange(1, n + 1), np.zeros(n), np.ones(n), rng.random(n)
+            )
+            multipliers = np.where(rng.random(n) > 0.7, 1.56, 1.0)
+            top_k = int(rng.integers(1, 25))
+            threshold = float(rng.choice([0.5, 0.8, 0.95]))
+
+            selected, finals = engine.select(candidates, multipliers, top_k, threshold)
+
+            assert list(selected) == exhaustive_selection(
+                candidates, multipliers, top_k, threshold
+            )
+            assert np.all(np.diff(finals) <= 0)
+
+    def test_duplicates_removed(self):
+        engine = FusedRankingEngine()
+        docs = [make_doc(i, "poids ross 308 à 35 jours") for i in range(3)] + [
+            make_doc(3, "ventilation tunnel en été"),
+            make_doc(4, "programme lumineux pondeuses"),
+        ]
+        features = [engine.feature_extractor.features(d) for d in docs]
+        candidates = FusionCandidates(
+            docs, features, np.arange(1, 6), np.zeros(5), np.ones(5),
+            np.array([5.0, 4.0, 3.0, 2.0, 1.0]),
+        )
+
+        selected, _ = engine.select(candidates, np.ones(5), top_k=5)
+        assert list(selected) == [0, 3, 4]
+
+
+class TestIntelligentRRFFusion:
+    def test_enhanced_fusion_output(self, monkeypatch):
+        monkeypatch.setenv("ENABLE_INTELLIGENT_RRF", "true")
+        monkeypatch.setenv("RRF_LEARNING_MODE", "false")
+        fusion = IntelligentRRFFusion()
+
+        docs = random_docs(40)
+        docs[7]["content"] = "Poids Ross 308 à 35 jours: 2.2 kg, fcr 1.5 selon le guide"
+        vector, bm25 = docs[:30], [docs[7]] + list(reversed(docs[10:]))
+
+        intent = SimpleNamespace(
+            detected_entities={"line": "ross_308", "age_days": 35},
+            intent_type="metric_query",
+            confidence=0.9,
+        )
+
+        results = asyncio.run(
+            fusion.enhanced_fusion(
+                vector, bm25, 0.7, 10, {"query": "poids ross 308 à 35 jours"}, intent
+            )
+        )
+
+        assert 0 < len(results) <= 10
+        assert results[0]["metadata"]["title"] == "doc 7"
+        assert results[0]["metadata"]["rrf_method"] == "weighted_intelligent"
+        assert results[0]["metadata"]["genetic_boost_applied"] > 1.5
+        assert [r["final_score"] for r in results] == sorted(
+            (r["final_score"] for r in results), reverse=True
+        )
+        # Input documents are not mutated
+        assert "rrf_method" not in docs[7]["metadata"]
+
+
+class TestAdvancedBoosting:
+    def test_boost_results(self):
+        booster = AdvancedResultBoosting()
+        results = [
+            {"content": "a", "score": 0.5, "metadata": {"quality_score": 0.0}},
+            {"content": "b", "score": 0.4, "breeds": ["Ross 308"], "quality_score": 1.0},
+            {"content": "c", "score": 0.0, "metadata": {"diseases": ["coccidiose"]}},
+        ]
+
+        boosted = booster.boost_results(
+            results, {"breeds": ["ross 308"], "diseases": ["Coccidiose"], "medications": []}
+        )
+
+        assert [r["content"] for r in boosted] == ["b", "a", "c"]
+        assert boosted[0]["score"] == pytest.approx(0.4 * 1.2 * 1.3)
+        assert boosted[0]["boost_details"] == "quality=1.200 + breed=1.3x"
+        assert boosted[2]["boost_factor"] == 1.0
+        assert "disease=1.2x" in boosted[2]["boost_details"]
+
+
+    def test_filter_by_precomputed_breed_mentions(self):
+        booster = AdvancedResultBoosting()
+        results = [
+            {"content": "a", "metadata": {"breed_mentions": ["hy line brown"]}},
+            {"content": "b", "metadata": {"breed_mentions": []}, "breeds": ["Hy-Line Brown"]},
+            {"content": "c", "breeds": ["Hy-Line Brown"]},
+        ]
+
+        filtered = booster.filter_by_entities(results, breeds=["hy_line_brown"])
+
+        # Precomputed features take precedence over the extracted breeds
+        assert [r["content"] for r in filtered] == ["a", "c"]
+
+
+class TestFusionBenchmark:
+    def test_fusion_latency(self, monkeypatch):
+        monkeypatch.setenv("ENABLE_INTELLIGENT_RRF", "true")
+        monkeypatch.setenv("RRF_LEARNING_MODE", "false")
+        fusion = IntelligentRRFFusion()
+        query = {"query": "poids ross 308 à 35 jours fcr"}
+        intent = SimpleNamespace(
+            detected_entities={"line": "ross_308", "age_days": 35},
+            intent_type="metric_query",
+            confidence=0.9,
+        )
+
+        for k in (20, 100, 500):
+            docs = random_docs(k * 2, seed=k)
+            vector, bm25 = docs[:k], docs[k // 2 : k // 2 + k]
+
+            async def run():
+                await fusion.enhanced_fusion(vector, bm25, 0.7, 10, query, intent)  # warm caches
+                start = time.perf_counter()
+                for _ in range(20):
+                    await fusion.enhanced_fusion(vector, bm25, 0.7, 10, query, intent)
+                return (time.perf_counter() - start) / 20
+
+            elapsed = asyncio.run(run())
+            print(f"\nenhanced_fusion k={k}: {elapsed * 1000:.2f} ms")
+            assert elapsed < 1.0
@@ -0,0 +1,252 @@
+# -*- coding: utf-8 -*-
+"""
+test_local_index.py - Tests for the in-process vector + BM25 index
+
+Covers exact float16 vector top-k, BM25 ranking, v3 where-filter evaluation,
+incremental sync from the memory-mapped chunk store (updates, deletions,
+store reset), and WeaviateCore serving retrieval from the local index when
+Weaviate breaches its deadline or when the index is the primary path
+"""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import retrieval.weaviate.core as weaviate_core_module
+from core.data_models import Document
+from retrieval.chunk_store import MappedChunkStore
+from retrieval.local_index import (
+    BM25Index,
+    LocalHybridIndex,
+    VectorIndex,
+    matches_where,
+)
+from retrieval.weaviate.core import WeaviateCore
+
+DIM = 16
+
+
+def vector(seed):
+    return np.random.default_rng(seed).normal(size=DIM).astype(np.float32)
+
+
+def write_chunks(directory, chunks):
+    """Append records and float16 vectors the way LocalChunkStore does"""
+    directory.mkdir(parents=True, exist_ok=True)
+    (directory / "meta.json").write_text(json.dumps({"format": 2, "dim": DIM}))
+    data_path, index_path = directory / "chunks.bin", directory / "index.tsv"
+    vectors_path = directory / "vectors.f16"
+    offset = data_path.stat().st_size if data_path.exists() else 0
+    row = vectors_path.stat().st_size // (2 * DIM) if vectors_path.exists() else 0
+
+    with open(data_path, "ab") as data, open(index_path, "a") as index, open(
+        vectors_path, "ab"
+    ) as vectors:
+        for object_id, chunk in chunks.items():
+            if chunk is None:
+                index.write(f"{object_id}\t-1\t0\t0\t-1\n")
+                continue
+            properties, seed = chunk
+            metadata = {k: v for k, v in properties.items() if k != "content"}
+            metadata_bytes = json.dumps(metadata).encode("utf-8")
+            content_bytes = properties["content"].encode("utf-8")
+            data.write(metadata_bytes + content_bytes)
+            vector_row = -1
+            if seed is not None:
+                vectors.write(vector(seed).astype(np.float16).tobytes())
+                vector_row, row = row, row + 1
+            index.write(
+                f"{object_id}\t{offset}\t{len(metadata_bytes)}\t"
+                f"{len(content_bytes)}\t{vector_row}\n"
+            )
+            offset += len(metadata_bytes) + len(content_bytes)
+
+
+class TestVectorIndex:
+    def test_top_k_matches_exact_search(self):
+        index = VectorIndex(DIM, initial_capacity=4)  # forces growth
+        vectors = {f"id-{i}": vector(i) for i in range(50)}
+        for object_id, v in vectors.items():
+            index.add(object_id, v)
+
+        query = vector(1000)
+        exact = sorted(
+            vectors,
+            key=lambda i: -float(
+                vectors[i] @ query / np.linalg.norm(vectors[i]) / np.linalg.norm(query)
+            ),
+        )
+        results = index.search(query, 5)
+
+        assert [object_id for object_id, _ in results] == exact[:5]
+        assert results[0][1] >= results[-1][1]
+
+    def test_filter_removal_and_row_reuse(self):
+        index = VectorIndex(DIM)
+        for i in range(10):
+            index.add(f"id-{i}", vector(i))
+
+        index.remove("id-3")
+        index.add("id-new", vector(3))
+
+        results = index.search(vector(3), 10, accept=lambda i: i != "id-5")
+        ids = [object_id for object_id, _ in results]
+        assert ids[0] == "id-new"
+        assert "id-3" not in ids and "id-5" not in ids
+        assert len(ids) == 9 and len(index) == 10
+
+
+class TestBM25Index:
+    def test_ranking_and_removal(self):
+        index = BM25Index()
+        index.add("a", "Poids Ross 308 à 35 jours: 2,2 kg")
+        index.add("b", "Mortalité et poids des Cobb 500")
+        index.add("c", "Ventilation tunnel en été")
+
+        ids = [i for i, _ in index.search("poids ross 308", 3)]
+        assert ids == ["a", "b"]
+
+        index.remove("a")
+        assert [i for i, _ in index.search("poids ross 308", 3)] == ["b"]
+        assert len(index) == 2
+
+
+class TestWhereFilter:
+    def test_equal_like_and_or(self):
+        properties = {"species": "broiler", "breed_mentions": ["ross 308"]}
+        broiler = {"path": ["species"], "operator": "Equal", "valueText": "broiler"}
+        ross = {"path": ["breed_mentions"], "operator": "Like", "valueText": "ROSS*"}
+        layer = {"path": ["species"], "operator": "Equal", "valueText": "layer"}
+
+        assert matches_where(broiler, properties)
+        assert matches_where(ross, properties)
+        assert not matches_where(layer, properties)
+        both = {"operator": "And", "operands": [broiler, layer]}
+        either = {"operator": "Or", "operands": [broiler, layer]}
+        assert not matches_where(both, properties)
+        assert matches_where(either, properties)
+
+
+def chunk(content, seed, **metadata):
+    return ({"content": content, **metadata}, seed)
+
+
+class TestLocalHybridIndex:
+    def test_incremental_sync_and_filtered_search(self, tmp_path):
+        write_chunks(
+            tmp_path / "KB",
+            {
+                "a": chunk("poids ross 308 à 35 jours", 1, species="broiler"),
+                "b": chunk("ponte lohmann brown", 2, species="layer"),
+                "c": chunk("poids cobb 500", None, species="broiler"),
+            },
+        )
+        store = MappedChunkStore(str(tmp_path), "KB", refresh_interval=0)
+        index = LocalHybridIndex(store)
+        index.sync(force=True)
+
+        assert index.get_stats()["vectors"] == 2
+        assert index.get_stats()["missing_vectors"] == 1
+
+        docs = index.search(vector(1), "poids ross 308", 3, alpha=0.5)
+        assert docs[0].metadata["weaviate_id"] == "a"
+        assert docs[0].content == "poids ross 308 à 35 jours"
+        assert docs[0].score == 1.0
+        assert docs[0].metadata["local_index"]
+
+        layer = {"path": ["species"], "operator": "Equal", "valueText": "layer"}
+        docs = index.search(vector(1), "poids ross 308", 3, layer, alpha=0.5)
+        assert [d.metadata["weaviate_id"] for d in docs] == ["b"]
+
+        # Ingestion events: "a" deleted, "d" added
+        write_chunks(tmp_path / "KB", {"a": None, "d": chunk("eau de boisson", 4)})
+        assert index.sync(force=True) == 2
+        docs = index.search(vector(4), "eau", 3, alpha=0.5)
+        ids = [d.metadata["weaviate_id"] for d in docs]
+        assert ids[0] == "d" and "a" not in ids
+
+    def test_store_reset_rebuilds(self, tmp_path):
+        write_chunks(tmp_path / "KB", {"a": chunk("poids ross", 1)})
+        store = MappedChunkStore(str(tmp_path), "KB", refresh_interval=0)
+        index = LocalHybridIndex(store)
+        index.sync(force=True)
+
+        for name in ("chunks.bin", "index.tsv", "vectors.f16"):
+            (tmp_path / "KB" / name).unlink()
+        write_chunks(tmp_path / "KB", {"z": chunk("ventilation", 9)})
+        index.sync(force=True)
+
+        assert len(index) == 1
+        assert index.get_stats()["rebuilds"] == 2  # initial build + reset
+        docs = index.search(vector(9), "ventilation", 1)
+        assert docs[0].metadata["weaviate_id"] == "z"
+
+
+class SlowRetriever:
+    def __init__(self, delay):
+        self.delay = delay
+        self.calls = 0
+
+    async def adaptive_search(self, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return [Document(content="weaviate", metadata={}, score=0.9)]
+
+
+def make_core(tmp_path, mode, delay):
+    write_chunks(
+        tmp_path / "KB",
+        {
+            "a": chunk("poids ross 308 à 35 jours", 1),
+            "b": chunk("ponte lohmann", 2),
+        },
+    )
+    index = LocalHybridIndex(MappedChunkStore(str(tmp_path), "KB"))
+    index.sync(force=True)
+
+    core = WeaviateCore(openai_client=None)
+    core.retriever = SlowRetriever(delay)
+    core.local_index = index
+    core.local_index_mode = mode
+    return core
+
+
+def search(core):
+    return asyncio.run(
+        core._search_documents(
+            "poids ross 308", "poids ross 308", vector(1).tolist(), None, 0.6, None
+        )
+    )
+
+
+class TestWeaviateCoreLocalIndex:
+    def test_deadline_breach_served_locally(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(weaviate_core_module, "LOCAL_INDEX_DEADLINE", 0.05)
+        core = make_core(tmp_path, "fallback", delay=1.0)
+
+        docs, found = search(core)
+
+        assert docs[0].metadata["weaviate_id"] == "a"
+        assert core.optimization_stats["local_index_fallbacks"] == 1
+
+    def test_weaviate_within_deadline_is_used(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(weaviate_core_module, "LOCAL_INDEX_DEADLINE", 1.0)
+        core = make_core(tmp_path, "fallback", delay=0)
+
+        docs, found = search(core)
+
+        assert docs[0].content == "weaviate"
+        assert core.optimization_stats["local_index_searches"] == 0
+
+    def test_primary_mode_skips_weaviate(self, tmp_path):
+        core = make_core(tmp_path, "primary", delay=0)
+
+        docs, found = search(core)
+
+        assert core.retriever.calls == 0
+        assert docs[0].metadata["weaviate_id"] == "a"
@@ -5,6 +5,7 @@ test_query_decomposer.py - Comprehensive Tests for QueryDecomposer (Phase 3.1)
 Tests query decomposition for complex multi-criteria queries
 """
 
+import asyncio
 import pytest
 import sys
 from pathlib import Path
@@ -330,6 +331,47 @@ class TestSubQueryExecution:
         assert results[0]["sub_query_context"] == {"factor": "nutrition", "index": 0}
         assert results[0]["sub_query_index"] == 0
 
+    def test_execute_subqueries_batch(self, decomposer):
+        """Test that the batch executor receives every query in one call"""
+        sub_queries = [
+            SubQuery(query="FCR Ross 308", context={"factor": "nutrition"}, priority=1),
+            SubQuery(query="Error query", context={"factor": "density"}, priority=1),
+        ]
+        calls = []
+
+        async def batch_executor(queries):
+            calls.append(queries)
+            return [
+                Exception("Mock error") if "Error" in q else {"answer": f"Result for {q}"}
+                for q in queries
+            ]
+
+        results = asyncio.run(
+            decomposer.execute_subqueries_batch(sub_queries, batch_executor)
+        )
+
+        assert calls == [["FCR Ross 308", "Error query"]]
+        assert results[0]["answer"] == "Result for FCR Ross 308"
+        assert "error" in results[1]
+        assert [r["sub_query_index"] for r in results] == [0, 1]
+        assert results[1]["sub_query_context"] == {"factor": "density"}
+
+    def test_execute_subqueries_batch_failure(self, decomposer):
+        """Test that a failing batch marks every sub-query as failed"""
+        sub_queries = [
+            SubQuery(query="Query 1", context={}),
+            SubQuery(query="Query 2", context={}),
+        ]
+
+        async def batch_executor(queries):
+            raise Exception("Mock batch error")
+
+        results = asyncio.run(
+            decomposer.execute_subqueries_batch(sub_queries, batch_executor)
+        )
+
+        assert all(r["error"] == "Mock batch error" for r in results)
+
 
 class TestResultAggregation:
     """Test aggregate_results() for combine/compare/synthesize strategies"""
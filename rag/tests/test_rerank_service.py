@@ -0,0 +1,222 @@
+# -*- coding: utf-8 -*-
+"""
+test_rerank_service.py - Tests for the non-blocking reranking service
+
+Covers the bounded score cache, cross-encoder micro-batching, cache-aware
+scoring of partially cached requests, and checks that arerank() leaves the
+event loop free while the model runs
+"""
+
+import asyncio
+import threading
+import time
+import pytest
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from retrieval.rerank_service import (
+    CohereRerankBackend,
+    CrossEncoderBackend,
+    CrossEncoderPool,
+    RerankService,
+    ScoreCache,
+    document_id,
+)
+from retrieval.semantic_reranker import SemanticReRanker
+
+
+class FakeCrossEncoder:
+    """Scores a pair by the number of query words found in the document"""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.batch_sizes = []
+        self.threads = set()
+
+    def predict(self, pairs):
+        self.batch_sizes.append(len(pairs))
+        self.threads.add(threading.current_thread().name)
+        time.sleep(self.delay)
+        return [
+            sum(word in doc.lower() for word in query.lower().split()) / 4
+            for query, doc in pairs
+        ]
+
+
+class TestScoreCache:
+    def test_lru_eviction(self):
+        cache = ScoreCache(maxsize=2)
+        cache.put("a", 0.1)
+        cache.put("b", 0.2)
+        assert cache.get("a") == 0.1  # "a" becomes most recent
+        cache.put("c", 0.3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 0.1
+        assert cache.get("c") == 0.3
+        assert len(cache) == 2
+
+    def test_stats(self):
+        cache = ScoreCache(maxsize=10)
+        cache.put("a", 0.5)
+        cache.get("a")
+        cache.get("missing")
+
+        stats = cache.get_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+
+    def test_document_id_uses_full_text_or_chunk_id(self):
+        prefix = "x" * 300
+        assert document_id(prefix + "a") != document_id(prefix + "b")
+        assert document_id("text", {"chunk_id": "c1"}) == "c1"
+        assert document_id("text", {"metadata": {"chunk_id": "c2"}}) == "c2"
+
+
+class TestCrossEncoderPool:
+    def test_concurrent_requests_are_micro_batched(self):
+        model = FakeCrossEncoder(delay=0.05)
+        pool = CrossEncoderPool(lambda: model, max_batch_size=64, max_wait_ms=20)
+
+        async def run():
+            requests = [
+                [(f"query {i}", f"doc {i} about query"), (f"query {i}", "other")]
+                for i in range(8)
+            ]
+            return requests, await asyncio.gather(*(pool.score(r) for r in requests))
+
+        requests, results = asyncio.run(run())
+        pool.shutdown()
+
+        assert model.threads == {"cross-encoder-0"}
+        assert pool.stats["requests"] == 8
+        assert pool.stats["batches"] < 8
+        assert pool.stats["max_batch_pairs"] > 2
+
+        # Each request gets its own scores back, in order
+        for request, scores in zip(requests, results):
+            assert scores == FakeCrossEncoder().predict(request)
+
+    def test_max_batch_size(self):
+        model = FakeCrossEncoder(delay=0.01)
+        pool = CrossEncoderPool(lambda: model, max_batch_size=4, max_wait_ms=50)
+
+        futures = [pool.submit([("q", f"d{i}")] * 2) for i in range(6)]
+        for future in futures:
+            assert len(future.result(timeout=5)) == 2
+        pool.shutdown()
+
+        assert max(model.batch_sizes) <= 4
+
+    def test_model_error_propagates(self):
+        class Broken:
+            def predict(self, pairs):
+                raise RuntimeError("model failure")
+
+        pool = CrossEncoderPool(lambda: Broken(), max_wait_ms=1)
+        with pytest.raises(RuntimeError):
+            pool.score_sync([("q", "d")])
+        pool.shutdown()
+
+
+class TestRerankService:
+    def test_only_missing_documents_are_scored(self):
+        model = FakeCrossEncoder()
+        pool = CrossEncoderPool(lambda: model, max_wait_ms=1)
+        service = RerankService(CrossEncoderBackend(pool), ScoreCache())
+
+        first = service.score("ross weight", ["ross 308 weight", "ventilation"])
+        second = service.score("ross weight", ["ventilation", "ross weight gain", "ross 308 weight"])
+        pool.shutdown()
+
+        assert model.batch_sizes == [2, 1]
+        assert second[0] == first[1]
+        assert second[2] == first[0]
+        assert service.cache.hits == 2
+
+    def test_same_chunk_id_with_new_content_is_rescored(self):
+        model = FakeCrossEncoder()
+        pool = CrossEncoderPool(lambda: model, max_wait_ms=1)
+        service = RerankService(CrossEncoderBackend(pool), ScoreCache())
+
+        before = service.score("ross weight", ["ventilation"], ["guide.pdf#chunk_3"])
+        # Document re-chunked: chunk_3 now holds other text
+        after = service.score("ross weight", ["ross 308 weight"], ["guide.pdf#chunk_3"])
+        again = service.score("ross weight", ["ross 308 weight"], ["guide.pdf#chunk_3"])
+        pool.shutdown()
+
+        assert model.batch_sizes == [1, 1]
+        assert before == [0.0] and after == again == [0.5]
+
+    def test_cohere_backend_async_transport(self):
+        calls = []
+
+        class FakeAsyncClient:
+            async def rerank(self, model, query, documents, top_n):
+                calls.append(documents)
+                results = [
+                    SimpleNamespace(index=i, relevance_score=1.0 / (i + 1))
+                    for i in range(len(documents))
+                ]
+                return SimpleNamespace(results=list(reversed(results)))
+
+        def no_sync_client():
+            raise AssertionError("sync client must not be used from arerank")
+
+        backend = CohereRerankBackend(
+            "rerank-multilingual-v3.0", no_sync_client, lambda: FakeAsyncClient()
+        )
+        service = RerankService(backend, ScoreCache())
+
+        scores = asyncio.run(service.ascore("q", ["a", "b", "c"]))
+        assert scores == [1.0, 0.5, 1.0 / 3]
+
+        asyncio.run(service.ascore("q", ["c", "d"]))
+        assert calls == [["a", "b", "c"], ["d"]]
+
+
+class TestSemanticReRankerAsync:
+    def test_arerank_keeps_event_loop_free(self):
+        reranker = SemanticReRanker(score_threshold=0.0, max_wait_ms=1)
+        reranker._model = FakeCrossEncoder(delay=0.2)
+        docs = ["ross 308 weight at 35 days", "ventilation", "ross 308 feed"]
+
+        async def run():
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    await asyncio.sleep(0.01)
+                    ticks += 1
+
+            task = asyncio.create_task(ticker())
+            ranked = await reranker.arerank("ross 308 weight", docs, top_k=2, return_scores=True)
+            task.cancel()
+            return ranked, ticks
+
+        ranked, ticks = asyncio.run(run())
+        reranker._pool.shutdown()
+
+        assert [doc for doc, _ in ranked] == [docs[0], docs[2]]
+        assert ticks >= 5  # loop kept running during the 200 ms predict
+
+    def test_sync_and_async_share_cache(self):
+        reranker = SemanticReRanker(score_threshold=0.0, max_wait_ms=1)
+        model = FakeCrossEncoder()
+        reranker._model = model
+        docs = ["ross 308 weight", "ventilation"]
+
+        sync_result = reranker.rerank("ross weight", docs, top_k=None, return_scores=True)
+        async_result = asyncio.run(
+            reranker.arerank("ross weight", docs, top_k=None, return_scores=True)
+        )
+        reranker._pool.shutdown()
+
+        assert sync_result == async_result
+        assert model.batch_sizes == [2]
+        assert reranker.get_cache_stats()["hits"] == 2
@@ -0,0 +1,242 @@
+# -*- coding: utf-8 -*-
+"""
+test_retrieval_cache.py - Tests for the retrieval-level search results cache
+
+Covers the quantized embedding signature, SearchResultsCache keys and
+collection version invalidation, ChunkStore hydration, and WeaviateCore
+serving a repeated retrieval (different language, same topic) from the cache
+without calling the retriever
+"""
+
+import asyncio
+import time
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from cache.cache_search import SearchResultsCache, embedding_signature
+from cache.redis_cache_manager import RAGCacheManager
+from core.data_models import Document, RAGSource
+from retrieval.chunk_store import ChunkStore, chunk_id
+from retrieval.weaviate.core import WeaviateCore
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def setex(self, key, ttl, value):
+        self.data[key] = value
+        return True
+
+    async def incr(self, key):
+        self.data[key] = int(self.data.get(key) or 0) + 1
+        return self.data[key]
+
+
+class FakeCore:
+    """RedisCacheCore subset used by SearchResultsCache (values kept as-is)"""
+
+    def __init__(self):
+        self.client = FakeRedis()
+        self.values = {}
+
+    def _is_operational(self):
+        return True
+
+    def _build_key(self, key, namespace):
+        return f"search:{key}" if namespace == "searches" else f"{namespace}:{key}"
+
+    async def get(self, key, namespace="default"):
+        return self.values.get(self._build_key(key, namespace))
+
+    async def set(self, key, value, ttl=None, namespace="default"):
+        self.values[self._build_key(key, namespace)] = value
+        return True
+
+
+def vector(seed, dim=64):
+    return np.random.default_rng(seed).normal(size=dim).tolist()
+
+
+class TestEmbeddingSignature:
+    def test_stable_under_float_noise_and_scale(self):
+        base = vector(1)
+        noisy = (np.array(base) * 3.0 + 1e-6).tolist()
+
+        assert embedding_signature(base) == embedding_signature(noisy)
+        assert embedding_signature(base) != embedding_signature(vector(2))
+
+
+class TestSearchResultsCache:
+    def test_key_components_and_version_invalidation(self):
+        cache = SearchResultsCache(FakeCore())
+        results = [{"id": "a", "score": 0.9}, {"id": "b", "score": 0.7}]
+
+        query_vector, broiler = vector(1), {"species": "broiler"}
+
+        async def run():
+            await cache.set(query_vector, broiler, 10, 0.7, "KB", results)
+            same = await cache.get(query_vector, broiler, 10, 0.7, "KB")
+            layer = {"species": "layer"}
+            other_filter = await cache.get(query_vector, layer, 10, 0.7, "KB")
+            other_top_k = await cache.get(query_vector, broiler, 5, 0.7, "KB")
+            other_alpha = await cache.get(query_vector, broiler, 10, 0.3, "KB")
+
+            await cache.bump_collection_version("KB")
+            after_bump = await cache.get(query_vector, broiler, 10, 0.7, "KB")
+            return same, other_filter, other_top_k, other_alpha, after_bump
+
+        same, other_filter, other_top_k, other_alpha, after_bump = asyncio.run(run())
+
+        assert same == results
+        assert other_filter is other_top_k is other_alpha is after_bump is None
+        assert cache.get_stats()["collection_versions"] == {"KB": 1}
+
+    def test_collections_at_the_same_version_do_not_share_entries(self):
+        cache = SearchResultsCache(FakeCore())
+        results = [{"id": "a", "score": 0.9}]
+
+        async def run():
+            await cache.set(vector(1), None, 10, 0.7, "KB", results)
+            return (
+                await cache.get(vector(1), None, 10, 0.7, "KB"),
+                await cache.get(vector(1), None, 10, 0.7, "Archive"),
+            )
+
+        same, other_collection = asyncio.run(run())
+
+        assert same == results
+        assert other_collection is None
+
+    def test_version_read_from_redis_after_refresh_window(self):
+        core = FakeCore()
+        cache = SearchResultsCache(core)
+        cache.version_refresh_seconds = 0
+
+        async def run():
+            before = await cache.get_collection_version("KB")
+            await core.client.incr("search:version:KB")  # bumped by ingestion
+            return before, await cache.get_collection_version("KB")
+
+        assert asyncio.run(run()) == (0, 1)
+
+
+class TestChunkStore:
+    def test_hydration_uses_cached_scores_and_ids(self):
+        store = ChunkStore()
+        docs = [
+            Document(content="poids ross 308", metadata={"weaviate_id": "uuid-1"}),
+            Document(content="fcr cobb 500", score=0.4),
+        ]
+        entries = store.put_documents(docs)
+
+        assert entries[0]["id"] == "uuid-1"
+        assert entries[1]["id"] == chunk_id(docs[1])
+
+        hydrated = store.get_documents([{"id": e["id"], "score": 0.8} for e in entries])
+        assert [d.content for d in hydrated] == ["poids ross 308", "fcr cobb 500"]
+        assert [d.score for d in hydrated] == [0.8, 0.8]
+        assert store.get_documents([{"id": "unknown", "score": 1.0}]) is None
+
+    def test_version_change_clears_store(self):
+        store = ChunkStore()
+        store.sync_version(1)
+        store.put_documents([Document(content="a")])
+        store.sync_version(1)
+        assert len(store) == 1
+
+        store.sync_version(2)
+        assert len(store) == 0
+        assert store.get_stats()["resets"] == 1
+
+
+class FakeEmbedder:
+    async def get_embedding(self, text):
+        return vector(len(text))
+
+
+class FakeRetriever:
+    collection_name = "InteliaKnowledge"
+
+    def __init__(self):
+        self.calls = 0
+
+    async def adaptive_search(self, query_vector, query_text, top_k, **kwargs):
+        self.calls += 1
+        return [
+            Document(
+                content=f"{query_text} chunk {i}",
+                metadata={"weaviate_id": f"uuid-{i}"},
+                score=0.9 - i * 0.1,
+            )
+            for i in range(3)
+        ]
+
+
+class FakeGenerator:
+    async def generate_response(self, query, docs, context, language, intent):
+        return f"[{language}] " + " | ".join(d.content for d in docs)
+
+
+def make_core():
+    manager = RAGCacheManager()
+    manager.core = FakeCore()
+    manager.search = SearchResultsCache(manager.core)
+    manager.enabled = True
+    manager.is_initialized = True
+
+    core = WeaviateCore(openai_client=None)
+    core.cache_manager = manager
+    core.chunk_store = ChunkStore()
+    core.embedder = FakeEmbedder()
+    core.retriever = FakeRetriever()
+    core.generator = FakeGenerator()
+    return core
+
+
+def generate(core, language, context=None):
+    return asyncio.run(
+        core.generate_response(
+            "poids ross 308 à 35 jours",
+            None,
+            context or [],
+            language,
+            time.time(),
+            "tenant",
+        )
+    )
+
+
+class TestWeaviateCoreRetrievalCache:
+    def test_repeated_retrieval_skips_weaviate(self):
+        core = make_core()
+
+        first = generate(core, "fr")
+        # Different generation inputs: the response cache misses
+        second = generate(core, "en", [{"question": "q", "answer": "a"}])
+
+        assert first.source == second.source == RAGSource.RAG_SUCCESS
+        assert core.retriever.calls == 1
+        assert second.answer.startswith("[en]")
+        assert [d.content for d in second.context_docs] == [
+            d.content for d in first.context_docs
+        ]
+        assert all(d.metadata["retrieval_cache_hit"] for d in second.context_docs)
+        assert core.optimization_stats["retrieval_cache_hits"] == 1
+
+    def test_ingestion_bump_invalidates(self):
+        core = make_core()
+
+        generate(core, "fr")
+        asyncio.run(core.cache_manager.bump_collection_version("InteliaKnowledge"))
+        generate(core, "en")
+
+        assert core.retriever.calls == 2
+        assert core.chunk_store.get_stats()["resets"] == 1
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""
+test_stage_scheduler.py - Tests for speculative stage scheduling
+
+Covers concurrent stages with dependencies and per-stage timings, release of
+speculative stages on early exit (cancelled) or after the answer (used or
+wasted), and the embedder reusing a speculatively started embedding
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.stage_scheduler import StageScheduler
+from retrieval.embedder import OpenAIEmbedder
+
+
+class TestStageScheduler:
+    def test_independent_stages_overlap(self):
+        async def scenario():
+            scheduler = StageScheduler("req-1")
+            started = time.time()
+            scheduler.start("ood_check", time.sleep, 0.1, in_thread=True)
+            scheduler.start("history", asyncio.sleep, 0.1)
+            scheduler.start("after_history", lambda: "done", depends_on=("history",))
+            result = await scheduler.result("after_history")
+            await scheduler.result("ood_check")
+            return scheduler, result, time.time() - started
+
+        scheduler, result, elapsed = asyncio.run(scenario())
+
+        assert result == "done"
+        assert elapsed < 0.18  # both 100 ms stages ran concurrently
+        timings = scheduler.summary()["stages_ms"]
+        assert set(timings) == {"ood_check", "history", "after_history"}
+        assert timings["ood_check"] >= 90
+        assert timings["after_history"] < 50  # dependency wait not counted
+
+    def test_early_exit_cancels_speculative_stages(self):
+        released = []
+
+        async def scenario():
+            scheduler = StageScheduler("req-2")
+            task = scheduler.start(
+                "embedding",
+                asyncio.sleep,
+                10,
+                speculative=True,
+                on_release=lambda: released.append("embedding") or True,
+            )
+            scheduler.start("history", asyncio.sleep, 10)
+            await asyncio.sleep(0)
+            cancelled = scheduler.cancel_speculative("out_of_domain")
+            await asyncio.sleep(0)
+            return scheduler, task, cancelled
+
+        scheduler, task, cancelled = asyncio.run(scenario())
+
+        assert cancelled == 2
+        assert task.cancelled()
+        assert released == ["embedding"]
+        assert scheduler.summary()["speculation"] == {"embedding": "cancelled"}
+
+    def test_finish_reports_used_wasted_and_skipped(self):
+        async def scenario():
+            scheduler = StageScheduler("req-3")
+            scheduler.start(
+                "consumed",
+                asyncio.sleep,
+                0,
+                [1.0],
+                speculative=True,
+                on_release=lambda: False,
+            )
+            unused = scheduler.start(
+                "unused", asyncio.sleep, 10, speculative=True, on_release=lambda: True
+            )
+            scheduler.start("no_embedder", lambda: None, speculative=True)
+            await asyncio.sleep(0.01)
+            summary = scheduler.finish()
+            await asyncio.sleep(0)
+            return summary, unused
+
+        summary, unused = asyncio.run(scenario())
+
+        assert summary["speculation"] == {
+            "consumed": "used",
+            "unused": "wasted",
+            "no_embedder": "skipped",
+        }
+        assert unused.cancelled()
+
+
+class FakeEmbeddings:
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.calls = []
+
+    async def create(self, **params):
+        self.calls.append(params["input"])
+        await asyncio.sleep(self.delay)
+        return SimpleNamespace(data=[SimpleNamespace(embedding=[0.1, 0.2])])
+
+
+def make_embedder():
+    embeddings = FakeEmbeddings()
+    client = SimpleNamespace(api_key="sk-test", embeddings=embeddings)
+    return OpenAIEmbedder(client, model="text-embedding-ada-002"), embeddings
+
+
+class TestEmbeddingPrefetch:
+    def test_prefetched_embedding_is_reused(self):
+        embedder, embeddings = make_embedder()
+
+        async def scenario():
+            embedder.prefetch("poids ross 308")
+            await asyncio.sleep(0.02)  # OOD / history running meanwhile
+            started = time.time()
+            vector = await embedder.get_embedding("poids ross 308")
+            return vector, time.time() - started
+
+        vector, waited = asyncio.run(scenario())
+
+        assert vector == [0.1, 0.2]
+        assert embeddings.calls == ["poids ross 308"]
+        assert waited < 0.045  # only the remainder of the call
+        assert embedder.prefetch_stats == {"started": 1, "used": 1, "discarded": 0}
+
+    def test_discarded_prefetch_falls_back_to_fresh_call(self):
+        embedder, embeddings = make_embedder()
+
+        async def scenario():
+            task = embedder.prefetch("ventilation")
+            await asyncio.sleep(0)
+            assert embedder.discard_prefetch("ventilation")
+            assert not embedder.discard_prefetch("ventilation")
+            vector = await embedder.get_embedding("ventilation")
+            return task, vector
+
+        task, vector = asyncio.run(scenario())
+
+        assert task.cancelled()
+        assert vector == [0.1, 0.2]
+        assert len(embeddings.calls) == 2
+        assert embedder.prefetch_stats["discarded"] == 1
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""
+test_stream_post_processor.py - Tests for incremental streaming post-processing
+
+Checks that StreamingPostProcessor produces the same text as
+ResponsePostProcessor.post_process_response, and benchmarks both on long
+responses (run with -s to see timings)
+"""
+
+import random
+import statistics
+import time
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from generation.post_processor import ResponsePostProcessor
+from generation.stream_post_processor import StreamingPostProcessor, find_safe_cut
+
+
+PARAGRAPHS = [
+    "## Recommandations pour réduire la mortalité",
+    "**Points clés:**\n\n1. Surveillance de la température\n2. Contrôle de l'humidité",
+    "La mortalité peut être causée par la coccidiose ou la bronchite infectieuse.   ",
+    "Standardisation des\nprocédures de nettoyage entre les lots.",
+    "-Vérifier la ventilation\n-Contrôler la densité",
+    "**Important**: la qualité de l'eau reste un facteur déterminant.",
+    "Le poids moyen d'un Ross 308 à 35 jours est d'environ 2,2 kg.",
+    "Consultez un vétérinaire pour établir un diagnostic précis.",
+    "📋 This information is provided for educational purposes only.",
+]
+
+
+def build_response(num_paragraphs: int, seed: int = 0) -> str:
+    """Build a long LLM-like response from sample paragraphs"""
+    rng = random.Random(seed)
+    return "\n\n".join(rng.choice(PARAGRAPHS) for _ in range(num_paragraphs)) + "\n"
+
+
+def stream_response(response: str, query: str = "", seed: int = 0):
+    """Feed a response in token-sized chunks, return (text, finish_ms)"""
+    rng = random.Random(seed)
+    stream = StreamingPostProcessor(query=query, context_docs=[], language="fr")
+
+    parts = []
+    i = 0
+    while i < len(response):
+        j = i + rng.randint(1, 8)
+        parts.append(stream.feed(response[i:j]))
+        i = j
+
+    start = time.perf_counter()
+    parts.append(stream.finish())
+    return "".join(parts), (time.perf_counter() - start) * 1000
+
+
+class TestSafeCut:
+    """Test find_safe_cut() boundary rules"""
+
+    def test_cut_before_plain_paragraph(self):
+        assert find_safe_cut("First paragraph.\n\nSecond") == len("First paragraph.")
+
+    def test_no_cut_before_header(self):
+        assert find_safe_cut("First paragraph.\n\n## Title") == 0
+
+    def test_no_cut_inside_bold_header(self):
+        assert find_safe_cut("**Title:**\n\nText") == 0
+
+    def test_no_cut_on_single_newline(self):
+        assert find_safe_cut("Standardisation des\nprocédures") == 0
+
+
+class TestStreamingEquivalence:
+    """Streaming output must match batch post-processing"""
+
+    @pytest.mark.parametrize("seed", range(20))
+    def test_matches_batch(self, seed):
+        response = build_response(30, seed)
+        expected = ResponsePostProcessor.post_process_response(
+            response, None, [], "", "fr"
+        )
+        text, _ = stream_response(response, seed=seed)
+        assert text == expected
+
+    def test_response_ending_with_llm_disclaimer(self):
+        """Whitespace before a removed trailing disclaimer is not streamed"""
+        response = "Texte utile.\n\nConsultez un vétérinaire rapidement.\n"
+        text, _ = stream_response(response)
+        assert text == "Texte utile."
+
+    def test_leading_whitespace_stripped(self):
+        text, _ = stream_response("\n\n   Bonjour.\n\nSuite du texte.")
+        assert text == "Bonjour.\n\nSuite du texte."
+
+
+class TestStreamingBenchmark:
+    """Post-processing time left after the last token"""
+
+    @pytest.mark.parametrize("num_paragraphs", [20, 100, 400])
+    def test_long_response_latency(self, num_paragraphs):
+        response = build_response(num_paragraphs)
+
+        batch_times = []
+        finish_times = []
+        for _ in range(20):
+            start = time.perf_counter()
+            ResponsePostProcessor.post_process_response(response, None, [], "", "fr")
+            batch_times.append((time.perf_counter() - start) * 1000)
+
+            _, finish_ms = stream_response(response)
+            finish_times.append(finish_ms)
+
+        print(
+            f"\n{len(response):>7} chars | batch after last token: "
+            f"{statistics.median(batch_times):.3f} ms | "
+            f"streaming after last token: {statistics.median(finish_times):.3f} ms"
+        )
@@ -0,0 +1,242 @@
+# -*- coding: utf-8 -*-
+"""
+test_weaviate_async.py - Tests for the async-native Weaviate search path
+
+Covers the SearchGate (concurrency limit, per-call deadline, queue-wait
+metrics) and OptimizedHybridRetriever on an async client: searches run
+concurrently on the event loop without worker threads, and the sync client
+fallback still works
+"""
+
+import asyncio
+import threading
+import time
+import pytest
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from retrieval.hybrid_retriever import OptimizedHybridRetriever
+from retrieval.weaviate_async import SearchDeadlineExceeded, SearchGate
+
+
+def make_response(n, prefix="doc"):
+    return SimpleNamespace(
+        objects=[
+            SimpleNamespace(
+                properties={"content": f"{prefix} {i}", "title": f"{prefix} {i}"},
+                metadata=SimpleNamespace(score=1.0 / (i + 1), explain_score=None),
+            )
+            for i in range(n)
+        ]
+    )
+
+
+class FakeAsyncQuery:
+    """Async query API: records calls, concurrency and calling threads"""
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.threads = set()
+
+    async def _search(self, method, **params):
+        self.calls.append((method, params))
+        self.threads.add(threading.current_thread().name)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+        return make_response(3, method)
+
+    async def hybrid(self, **params):
+        return await self._search("hybrid", **params)
+
+    async def near_vector(self, **params):
+        return await self._search("near_vector", **params)
+
+
+class FakeSyncQuery:
+    def __init__(self):
+        self.threads = set()
+
+    def hybrid(self, **params):
+        self.threads.add(threading.current_thread().name)
+        time.sleep(0.01)
+        return make_response(2, "sync")
+
+
+def make_client(query):
+    return SimpleNamespace(collections=SimpleNamespace(get=lambda name: SimpleNamespace(query=query)))
+
+
+def make_retriever(query, **gate_kwargs):
+    return OptimizedHybridRetriever(
+        make_client(query),
+        enable_advanced_boosting=False,
+        async_client=make_client(query) if isinstance(query, FakeAsyncQuery) else None,
+        search_gate=SearchGate(**gate_kwargs),
+    )
+
+
+class TestSearchGate:
+    def test_concurrency_limit_and_queue_wait(self):
+        gate = SearchGate(max_concurrency=2, timeout=5.0)
+
+        async def search():
+            await asyncio.sleep(0.05)
+            return "ok"
+
+        async def run():
+            return await asyncio.gather(*(gate.run("hybrid", search) for _ in range(6)))
+
+        assert asyncio.run(run()) == ["ok"] * 6
+
+        stats = gate.get_stats()
+        assert stats["searches"] == 6
+        assert stats["max_in_flight"] == 2
+        assert stats["max_waiting"] >= 4
+        assert stats["max_queue_wait"] >= 0.09  # last pair waited two rounds
+        assert stats["in_flight"] == 0 and stats["waiting"] == 0
+
+    def test_deadline_includes_queue_wait(self):
+        gate = SearchGate(max_concurrency=1, timeout=0.1)
+
+        async def slow():
+            await asyncio.sleep(0.08)
+
+        async def run():
+            return await asyncio.gather(
+                gate.run("hybrid", slow),
+                gate.run("hybrid", slow),
+                return_exceptions=True,
+            )
+
+        first, second = asyncio.run(run())
+        assert first is None
+        assert isinstance(second, SearchDeadlineExceeded)
+        assert gate.get_stats()["timeouts"] == 1
+
+    def test_errors_release_the_slot(self):
+        gate = SearchGate(max_concurrency=1, timeout=1.0)
+
+        async def broken():
+            raise RuntimeError("weaviate down")
+
+        async def run():
+            with pytest.raises(RuntimeError):
+                await gate.run("vector", broken)
+            return await gate.run("vector", lambda: asyncio.sleep(0, result="ok"))
+
+        assert asyncio.run(run()) == "ok"
+        assert gate.get_stats()["errors"] == 1
+
+
+class TestAsyncRetriever:
+    def test_searches_run_on_the_event_loop(self):
+        query = FakeAsyncQuery(delay=0.05)
+        retriever = make_retriever(query, max_concurrency=16)
+
+        async def run():
+            start = time.perf_counter()
+            results = await asyncio.gather(
+                *(retriever._hybrid_search_v4([0.1, 0.2], f"q{i}", 5, None, 0.7) for i in range(10))
+            )
+            return results, time.perf_counter() - start
+
+        results, elapsed = asyncio.run(run())
+
+        assert all(len(r) == 3 for r in results)
+        assert query.threads == {threading.main_thread().name}
+        assert query.max_in_flight == 10
+        assert elapsed < 0.3  # concurrent, not 10 x 50 ms
+
+    def test_vector_and_bm25_params(self):
+        query = FakeAsyncQuery(delay=0)
+        retriever = make_retriever(query)
+        where = {"path": ["breed_mentions"], "operator": "ContainsAny", "valueTextArray": ["ross 308"]}
+
+        async def run():
+            return await asyncio.gather(
+                retriever._vector_search_v4([0.1, 0.2], 8, where),
+                retriever._bm25_search_v4("poids ross", 8, None),
+            )
+
+        vector, bm25 = asyncio.run(run())
+
+        (vector_method, vector_params), (bm25_method, bm25_params) = query.calls
+        assert vector_method == "near_vector"
+        assert vector_params["near_vector"] == [0.1, 0.2]
+        assert "filters" in vector_params
+        assert bm25_method == "hybrid" and bm25_params["alpha"] == 0.0
+        assert [d["search_type"] for d in vector + bm25] == ["vector"] * 3 + ["bm25"] * 3
+
+    def test_deadline_returns_no_results(self):
+        query = FakeAsyncQuery(delay=0.5)
+        retriever = make_retriever(query, timeout=0.05)
+
+        documents = asyncio.run(retriever._vector_search_v4([0.1], 5, None))
+
+        assert documents == []
+        assert retriever.search_gate.get_stats()["timeouts"] == 1
+
+    def test_sync_client_fallback(self):
+        query = FakeSyncQuery()
+        retriever = make_retriever(query, max_concurrency=4)
+
+        documents = asyncio.run(retriever._hybrid_search_v4([0.1], "q", 5, None, 0.5))
+
+        assert [d["content"] for d in documents] == ["sync 0", "sync 1"]
+        assert threading.main_thread().name not in query.threads
+
+
+class TestWeaviateCoreRetriever:
+    """HybridWeaviateRetriever as built by WeaviateCore (async_client + gate)"""
+
+    def make(self, query, async_client=True, **gate_kwargs):
+        from retrieval.retriever_core import HybridWeaviateRetriever
+
+        return HybridWeaviateRetriever(
+            make_client(FakeSyncQuery()),
+            async_client=make_client(query) if async_client else None,
+            search_gate=SearchGate(**gate_kwargs),
+        )
+
+    def test_hybrid_search_uses_the_async_client(self):
+        query = FakeAsyncQuery(delay=0.05)
+        retriever = self.make(query, max_concurrency=16)
+
+        async def run():
+            start = time.perf_counter()
+            await asyncio.gather(
+                *(
+                    retriever._hybrid_search_v4_corrected([0.1] * 4, f"q{i}", 5, None, 0.7)
+                    for i in range(10)
+                )
+            )
+            return time.perf_counter() - start
+
+        elapsed = asyncio.run(run())
+
+        assert [method for method, _ in query.calls] == ["hybrid"] * 10
+        assert query.threads == {threading.main_thread().name}
+        assert elapsed < 0.3
+        stats = retriever.search_gate.get_stats()
+        assert stats["searches"] == 10 and stats["max_in_flight"] == 10
+
+    def test_sync_client_runs_under_the_gate(self):
+        query = FakeSyncQuery()
+        retriever = self.make(None, async_client=False, max_concurrency=2)
+        retriever.client = make_client(query)
+
+        asyncio.run(retriever._hybrid_search_v4_corrected([0.1] * 4, "q", 5, None, 0.5))
+
+        assert threading.main_thread().name not in query.threads
+        assert retriever.search_gate.get_stats()["searches"] == 1
+        assert retriever._thread_limiter.total_tokens == 2
@@ -114,6 +114,29 @@ class MetricsCollector:
                 self.search_stats["total_duration"] / searches
             )
 
+    def weaviate_search_observed(
+        self, search_type: str, queue_wait: float, duration: float, outcome: str
+    ):
+        """Trace une recherche Weaviate: attente en file, durée, issue (ok/timeout/error)"""
+        self.search_stats[f"weaviate_{search_type}_{outcome}"] += 1
+        self.search_stats["weaviate_searches"] += 1
+        self.search_stats["weaviate_total_queue_wait"] += queue_wait
+        self.search_stats["weaviate_total_duration"] += duration
+        self.search_stats["weaviate_max_queue_wait"] = max(
+            self.search_stats["weaviate_max_queue_wait"], queue_wait
+        )
+
+    def retrieval_depth_decided(self, decision: str, reason: str, candidates: int):
+        """Trace une décision de profondeur adaptative (shallow/expanded)"""
+        self.search_stats[f"adaptive_depth_{decision}"] += 1
+        self.search_stats[f"adaptive_depth_reason_{reason}"] += 1
+        self.search_stats["adaptive_depth_decisions"] += 1
+        self.search_stats["adaptive_depth_total_candidates"] += candidates
+        self.search_stats["adaptive_depth_avg_candidates"] = (
+            self.search_stats["adaptive_depth_total_candidates"]
+            / self.search_stats["adaptive_depth_decisions"]
+        )
+
     def retrieval_error(self, error_type: str, error_msg: str):
         """Trace les erreurs de récupération"""
         self.search_stats[f"error_{error_type}"] += 1